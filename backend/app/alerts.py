@@ -0,0 +1,427 @@
+import os
+import hmac
+import socket
+import select
+import logging
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import select as sql_select, text
+from sqlalchemy.exc import OperationalError
+from .database import SessionLocal
+from .model import AlertSubscriber, AlertOutbox, parse_affected_etfs
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+logger = logging.getLogger(__name__)
+
+# 신호 커밋 직후 디스패처를 깨우는 로컬 UDP 포트 (크롤러/분석기가 다른 프로세스여도 즉시 전달)
+NOTIFY_PORT = int(os.getenv("ALERT_NOTIFY_PORT", "8765"))
+SUBSCRIBER_KINDS = ("webhook", "socket")
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 300.0
+METRIC_WINDOW = 1000
+# 구독 관리 API 토큰 (X-Alert-Token 헤더) - 없으면 API로 구독을 등록/조회/해지할 수 없음
+# (인증 없이 임의 주소를 등록하면 서버가 내부 호스트로 신호를 보내는 SSRF 통로가 됨)
+ADMIN_TOKEN_ENV = "ALERT_ADMIN_TOKEN"
+# 허용 발송 대상 (콤마 구분: webhook/tcp 호스트명 또는 unix:/경로 접두사), 비어 있으면 형식만 검사
+TARGET_ALLOWLIST_ENV = "ALERT_TARGET_ALLOWLIST"
+
+class AlertSubscriberIn(BaseModel):
+    """알림 구독 등록 요청 (target: webhook URL 또는 unix:/경로, tcp:호스트:포트)"""
+    name: str
+    kind: str = "webhook"
+    target: str
+    symbols: Optional[List[str]] = None
+    signal_types: Optional[List[str]] = None
+    min_confidence: float = 0.0  # 0~100 (신호 confidence와 같은 퍼센트)
+    batch_size: int = 20
+
+def subscriber_dict(subscriber: AlertSubscriber) -> dict:
+    return {
+        "id": subscriber.id,
+        "name": subscriber.name,
+        "kind": subscriber.kind,
+        "target": subscriber.target,
+        "symbols": subscriber.symbols,
+        "signal_types": subscriber.signal_types,
+        "min_confidence": subscriber.min_confidence,
+        "batch_size": subscriber.batch_size,
+        "is_active": subscriber.is_active,
+        "created_at": subscriber.created_at
+    }
+
+def check_admin_token(token: Optional[str]) -> bool:
+    expected = os.getenv(ADMIN_TOKEN_ENV)
+    return bool(expected) and token is not None and hmac.compare_digest(token.encode(), expected.encode())
+
+def target_allowlist() -> List[str]:
+    return [item.strip() for item in os.getenv(TARGET_ALLOWLIST_ENV, "").split(",") if item.strip()]
+
+def validate_target(kind: str, target: str, allowlist: Optional[List[str]] = None):
+    """발송 대상 형식 검사 + 허용 목록 확인 (허용되지 않으면 ValueError)"""
+    allowlist = target_allowlist() if allowlist is None else allowlist
+    hosts = {item.lower() for item in allowlist if not item.startswith("unix:")}
+    prefixes = [os.path.normpath(item[len("unix:"):]) for item in allowlist if item.startswith("unix:")]
+
+    if kind == "webhook":
+        url = urlparse(target)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"webhook 대상은 http(s) URL이어야 합니다: {target}")
+        allowed = url.hostname.lower() in hosts
+    else:
+        scheme, _, address = target.partition(":")
+        if scheme == "unix":
+            path = os.path.normpath(address)
+            if not path.startswith("/"):
+                raise ValueError(f"unix 소켓 대상은 절대 경로여야 합니다: {target}")
+            allowed = any(path == prefix or path.startswith(prefix.rstrip("/") + "/") for prefix in prefixes)
+        elif scheme == "tcp":
+            host, _, port = address.rpartition(":")
+            if not port.isdigit() or not 0 < int(port) < 65536:
+                raise ValueError(f"tcp 대상은 tcp:호스트:포트 형식이어야 합니다: {target}")
+            allowed = (host or "127.0.0.1").lower() in hosts
+        else:
+            raise ValueError(f"소켓 대상은 unix:/경로 또는 tcp:호스트:포트 형식이어야 합니다: {target}")
+    if allowlist and not allowed:
+        raise ValueError(f"허용되지 않은 알림 대상입니다 ({TARGET_ALLOWLIST_ENV}): {target}")
+
+def create_subscriber(db, data: AlertSubscriberIn) -> AlertSubscriber:
+    if data.kind not in SUBSCRIBER_KINDS:
+        raise ValueError(f"지원하지 않는 구독 방식입니다: {data.kind}")
+    validate_target(data.kind, data.target)
+    subscriber = AlertSubscriber(
+        name=data.name,
+        kind=data.kind,
+        target=data.target,
+        symbols=[s.upper() for s in data.symbols] if data.symbols else None,
+        signal_types=[t.upper() for t in data.signal_types] if data.signal_types else None,
+        min_confidence=data.min_confidence,
+        batch_size=max(1, data.batch_size)
+    )
+    db.add(subscriber)
+    db.commit()
+    return subscriber
+
+def deactivate_subscriber(db, subscriber: AlertSubscriber) -> int:
+    """구독 해지 + 대기 중인 알림 취소 (한 트랜잭션), 취소한 알림 수 반환
+
+    발송 중(sending)인 배치는 이미 전송이 시작됐으므로 그대로 두고 결과만 기록됨
+    """
+    subscriber.is_active = False
+    cancelled = db.query(AlertOutbox).filter(
+        AlertOutbox.subscriber_id == subscriber.id,
+        AlertOutbox.status == "pending"
+    ).update({"status": "cancelled"}, synchronize_session=False)
+    db.commit()
+    return cancelled
+
+def matches(subscriber: dict, signal_type: Optional[str], confidence: Optional[float], symbols: set) -> bool:
+    """구독 필터 (심볼 교집합, 최소 신뢰도, 신호 종류) 통과 여부"""
+    if subscriber["signal_types"] and (signal_type or "").upper() not in subscriber["signal_types"]:
+        return False
+    if (confidence or 0) < (subscriber["min_confidence"] or 0):
+        return False
+    if subscriber["symbols"] and not symbols.intersection(subscriber["symbols"]):
+        return False
+    return True
+
+def enqueue_signal_alerts(connection, signal) -> int:
+    """신호 저장과 같은 트랜잭션에서 조건에 맞는 구독자별 outbox 행 추가 (커밋되면 유실 없음)"""
+    table = AlertSubscriber.__table__
+    try:
+        subscribers = [
+            dict(row._mapping) for row in
+            connection.execute(sql_select(table).where(table.c.is_active == True)).fetchall()
+        ]
+    except OperationalError:
+        # init_db 이전의 DB (구독 테이블 없음) - 신호 저장은 막지 않음
+        return 0
+    if not subscribers:
+        return 0
+
+    impacts = parse_affected_etfs(signal.affected_etfs, signal.signal_type)
+    symbols = {impact["symbol"] for impact in impacts}
+    targets = [s for s in subscribers if matches(s, signal.signal_type, signal.confidence, symbols)]
+    if not targets:
+        return 0
+
+    statement = connection.execute(
+        text("SELECT original_text, korean_translation, posted_at FROM trump_statements WHERE id = :id"),
+        {"id": signal.statement_id}
+    ).fetchone()
+    now = datetime.utcnow()
+    payload = {
+        "signal_id": signal.id,
+        "signal_type": signal.signal_type,
+        "confidence": signal.confidence,
+        "affected_etfs": impacts,
+        "entry_timing": signal.entry_timing,
+        "expected_duration": signal.expected_duration,
+        "statement_id": signal.statement_id,
+        "statement": {
+            "original": statement.original_text,
+            "korean": statement.korean_translation,
+            "posted_at": str(statement.posted_at) if statement.posted_at else None
+        } if statement else None,
+        "created_at": now.isoformat()
+    }
+    connection.execute(AlertOutbox.__table__.insert(), [
+        {"subscriber_id": s["id"], "signal_id": signal.id, "payload": payload,
+         "status": "pending", "attempts": 0, "next_attempt_at": now, "created_at": now}
+        for s in targets
+    ])
+    return len(targets)
+
+def notify_dispatcher(port: int = NOTIFY_PORT):
+    """디스패처 깨우기 (UDP 1바이트, 받는 쪽이 없어도 무시 - 디스패처는 주기적 폴링으로도 확인)"""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(b"!", ("127.0.0.1", port))
+    except OSError:
+        pass
+
+class AlertMetrics:
+    """전달 지연(outbox 적재 -> 구독자 응답)과 처리 건수 집계"""
+
+    def __init__(self, window: int = METRIC_WINDOW):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(lambda: deque(maxlen=window))
+        self.counts = defaultdict(int)
+
+    def record(self, subscriber_id: int, delivered: int, latencies: List[float]):
+        with self._lock:
+            self.latencies[subscriber_id].extend(latencies)
+            self.latencies["all"].extend(latencies)
+            self.counts["delivered"] += delivered
+            self.counts["batches"] += 1
+
+    def incr(self, key: str, value: int = 1):
+        with self._lock:
+            self.counts[key] += value
+
+    def snapshot(self) -> dict:
+        def summary(values):
+            values = sorted(values)
+            if not values:
+                return {"count": 0}
+            pick = lambda q: round(values[min(len(values) - 1, int(len(values) * q))] * 1000, 2)
+            return {"count": len(values), "p50_ms": pick(0.5), "p90_ms": pick(0.9),
+                    "p99_ms": pick(0.99), "max_ms": round(values[-1] * 1000, 2)}
+
+        with self._lock:
+            return {
+                "counts": dict(self.counts),
+                "latency": {str(key): summary(values) for key, values in self.latencies.items()}
+            }
+
+class AlertDispatcher:
+    """outbox 기반 신호 알림 발송기
+
+    - 신호 커밋 시 UDP 알림으로 즉시 깨어나 대기 중인 outbox 행을 구독자별 배치로 발송
+    - 실패하면 지수 백오프로 재시도, MAX_ATTEMPTS 초과 시 failed (행은 남으므로 재시작해도 유실 없음)
+    - 발송 중(sending) 상태로 남은 행은 시작 시 pending으로 되돌림
+    """
+
+    def __init__(self, session_factory=SessionLocal, notify_port: int = NOTIFY_PORT,
+                 poll_interval: float = 1.0, timeout: float = 5.0, workers: int = 4):
+        self.session_factory = session_factory
+        self.notify_port = notify_port
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.metrics = AlertMetrics()
+        self.http = requests.Session() if requests is not None else None
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._stop = threading.Event()
+        self._thread = None
+        self._sock = None
+
+    def _bind(self):
+        try:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._sock.bind(("127.0.0.1", self.notify_port))
+            self._sock.setblocking(False)
+        except OSError as e:
+            logger.warning(f"알림 포트 {self.notify_port} 사용 불가, 폴링만 사용: {str(e)}")
+            self._sock = None
+
+    def _wait(self, timeout: float):
+        if self._sock is None:
+            self._stop.wait(timeout)
+            return
+        ready, _, _ = select.select([self._sock], [], [], timeout)
+        if ready:
+            try:
+                while self._sock.recv(64):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def recover(self):
+        """이전 실행에서 발송 중 상태로 남은 행을 재발송 대상으로 되돌림"""
+        db = self.session_factory()
+        try:
+            AlertOutbox.__table__.create(bind=db.get_bind(), checkfirst=True)
+            reset = db.query(AlertOutbox).filter(AlertOutbox.status == "sending").update(
+                {"status": "pending"}, synchronize_session=False
+            )
+            db.commit()
+            if reset:
+                logger.info(f"🔁 발송 중이던 알림 {reset}건을 재발송 대기로 복구")
+        finally:
+            db.close()
+
+    def _claim(self) -> Dict[int, tuple]:
+        """발송 시각이 된 pending 행을 구독자별 배치 크기만큼 sending으로 선점"""
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            batches = {}
+            for subscriber in db.query(AlertSubscriber).filter(AlertSubscriber.is_active == True).all():
+                rows = db.query(AlertOutbox).filter(
+                    AlertOutbox.subscriber_id == subscriber.id,
+                    AlertOutbox.status == "pending",
+                    AlertOutbox.next_attempt_at <= now
+                ).order_by(AlertOutbox.id).limit(subscriber.batch_size or 1).all()
+                if rows:
+                    batches[subscriber.id] = (
+                        subscriber_dict(subscriber),
+                        [{"id": row.id, "payload": row.payload, "attempts": row.attempts or 0,
+                          "created_at": row.created_at} for row in rows]
+                    )
+                    for row in rows:
+                        row.status = "sending"
+            db.commit()
+            return batches
+        finally:
+            db.close()
+
+    def _send(self, subscriber: dict, payloads: List[dict]):
+        if subscriber["kind"] == "webhook":
+            if self.http is None:
+                raise RuntimeError("requests 패키지가 설치되지 않았습니다.")
+            response = self.http.post(
+                subscriber["target"], data=orjson.dumps({"alerts": payloads}),
+                headers={"Content-Type": "application/json"}, timeout=self.timeout
+            )
+            response.raise_for_status()
+            return
+
+        # 로컬 소켓: 알림마다 JSON 한 줄 (unix:/경로 또는 tcp:호스트:포트)
+        scheme, _, address = subscriber["target"].partition(":")
+        if scheme == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            target = address
+        else:
+            host, _, port = address.rpartition(":")
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            target = (host or "127.0.0.1", int(port))
+        with sock:
+            sock.settimeout(self.timeout)
+            sock.connect(target)
+            sock.sendall(b"".join(orjson.dumps(payload) + b"\n" for payload in payloads))
+
+    def _deliver(self, subscriber: dict, rows: List[dict]):
+        payloads = [{**row["payload"], "alert_id": row["id"]} for row in rows]
+        error = None
+        try:
+            self._send(subscriber, payloads)
+        except Exception as e:
+            error = str(e)[:500]
+
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            ids = [row["id"] for row in rows]
+            if error is None:
+                db.query(AlertOutbox).filter(AlertOutbox.id.in_(ids)).update(
+                    {"status": "delivered", "delivered_at": now, "last_error": None}, synchronize_session=False
+                )
+                self.metrics.record(subscriber["id"], len(rows), [(now - row["created_at"]).total_seconds() for row in rows])
+            else:
+                attempts = max(row["attempts"] for row in rows) + 1
+                if attempts >= MAX_ATTEMPTS:
+                    values = {"status": "failed", "attempts": AlertOutbox.attempts + 1, "last_error": error}
+                    self.metrics.incr("failed", len(rows))
+                    logger.error(f"❌ 알림 발송 포기 ({subscriber['name']}, {len(rows)}건): {error}")
+                else:
+                    delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+                    values = {"status": "pending", "attempts": AlertOutbox.attempts + 1, "last_error": error,
+                              "next_attempt_at": now + timedelta(seconds=delay)}
+                    self.metrics.incr("retried", len(rows))
+                    logger.warning(f"⚠️ 알림 발송 실패 ({subscriber['name']}), {delay:g}초 후 재시도: {error}")
+                db.query(AlertOutbox).filter(AlertOutbox.id.in_(ids)).update(values, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def dispatch_once(self) -> int:
+        """대기 중인 알림을 모두 발송 (구독자별 배치는 병렬), 처리한 행 수 반환"""
+        total = 0
+        while True:
+            batches = self._claim()
+            if not batches:
+                return total
+            futures = [self._executor.submit(self._deliver, subscriber, rows) for subscriber, rows in batches.values()]
+            for future in futures:
+                future.result()
+            total += sum(len(rows) for _, rows in batches.values())
+
+    def next_retry_in(self) -> float:
+        """가장 빠른 재시도 예정까지 남은 시간 (폴링 간격 상한)"""
+        db = self.session_factory()
+        try:
+            due = db.query(AlertOutbox.next_attempt_at).filter(AlertOutbox.status == "pending").order_by(
+                AlertOutbox.next_attempt_at
+            ).limit(1).scalar()
+        finally:
+            db.close()
+        if due is None:
+            return self.poll_interval
+        return max(0.0, min(self.poll_interval, (due - datetime.utcnow()).total_seconds()))
+
+    def run(self):
+        self.recover()
+        while not self._stop.is_set():
+            try:
+                self.dispatch_once()
+                timeout = self.next_retry_in()
+            except Exception as e:
+                logger.error(f"알림 발송 루프 오류: {str(e)}")
+                timeout = self.poll_interval
+            self._wait(timeout)
+
+    def start(self):
+        """백그라운드 스레드에서 발송 루프 실행"""
+        self._stop.clear()
+        self._bind()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        notify_dispatcher(self.notify_port)
+        if self._thread:
+            self._thread.join(timeout)
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+        self._executor.shutdown(wait=False)
+
+    def pending_count(self) -> int:
+        db = self.session_factory()
+        try:
+            return db.query(AlertOutbox).filter(AlertOutbox.status.in_(("pending", "sending"))).count()
+        finally:
+            db.close()
@@ -0,0 +1,255 @@
+import heapq
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from .model import TrumpStatement
+from .market_calendar import NYSE, KRX
+from .relevance_filter import RelevanceClassifier, tokenize
+
+logger = logging.getLogger(__name__)
+
+# 발언 본문에 이 단어가 있으면 해당 거래소 세션도 고려 (미국 상장 ETF가 대부분이라 NYSE는 항상 포함)
+REGION_TERMS = {
+    "KRX": {"korea", "korean", "seoul", "samsung", "hyundai", "won", "kospi", "한국", "원화", "코스피", "삼성"},
+}
+CALENDARS = {"NYSE": NYSE, "KRX": KRX}
+
+# 우선순위 = 가중 합 (각 성분 0~1, 합 최대 1)
+WEIGHTS = {"relevance": 0.5, "session": 0.3, "recency": 0.2}
+RECENCY_HALF_LIFE = timedelta(hours=6)
+# 개장 전 이 시간 안이면 개장에 가까울수록 세션 점수 상승
+PREOPEN_WINDOW = timedelta(hours=2)
+# 기아 방지: FAIR_SHARE번 꺼낼 때마다 한 번은 STARVATION_AFTER 이상 기다린 가장 오래된 발언을 꺼냄
+# (밀린 발언이 많아도 처리량의 1/FAIR_SHARE는 오래된 순서로 진행되므로 대기 시간이 유한)
+STARVATION_AFTER = timedelta(minutes=10)
+FAIR_SHARE = 5
+# 세션/최신성 점수는 시간에 따라 바뀌므로 이 간격마다 전체 재계산
+RESCORE_INTERVAL = timedelta(minutes=1)
+METRIC_WINDOW = 1000
+
+def statement_regions(text: str) -> List[str]:
+    """발언이 영향을 줄 거래소 (분석 전이라 본문 어휘로 추정)"""
+    tokens = set(tokenize(text))
+    return ["NYSE"] + [code for code, terms in REGION_TERMS.items() if tokens & terms]
+
+def session_score(regions: List[str], at: datetime) -> float:
+    """장중 1.0, 개장 PREOPEN_WINDOW 전부터 0.6 -> 1.0, 하루 안에 개장 0.2, 그 외 0 (거래소 중 최대)"""
+    best = 0.0
+    for code in regions:
+        calendar = CALENDARS[code]
+        if calendar.is_open(at):
+            return 1.0
+        until = calendar.next_open(at).replace(tzinfo=None) - at
+        if until <= PREOPEN_WINDOW:
+            best = max(best, 1.0 - 0.4 * until / PREOPEN_WINDOW)
+        elif until <= timedelta(days=1):
+            best = max(best, 0.2)
+    return best
+
+def recency_score(posted_at: Optional[datetime], at: datetime) -> float:
+    if posted_at is None:
+        return 0.0
+    age = max((at - posted_at).total_seconds(), 0.0)
+    return 0.5 ** (age / RECENCY_HALF_LIFE.total_seconds())
+
+class QueuedStatement:
+    """큐에 들어간 미분석 발언 (분석 전 점수만 보관)"""
+    __slots__ = ("statement_id", "posted_at", "enqueued_at", "relevance", "regions", "cheap", "priority", "key")
+
+    def __init__(self, statement_id: int, posted_at: Optional[datetime], enqueued_at: datetime,
+                 relevance: float, regions: List[str], cheap: bool):
+        self.statement_id = statement_id
+        self.posted_at = posted_at
+        self.enqueued_at = enqueued_at
+        self.relevance = relevance
+        self.regions = regions
+        self.cheap = cheap  # 사전 필터에서 걸러질 발언 (LLM 호출 없음)
+        self.priority = 0.0
+        self.key = None
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+class QueueMetrics:
+    """큐 깊이와 대기 시간(저장 -> 분석 시작), 기아 방지 몫으로 꺼낸 건수 집계"""
+
+    def __init__(self, window: int = METRIC_WINDOW):
+        self._lock = threading.Lock()
+        self.waits = {"all": deque(maxlen=window), "relevant": deque(maxlen=window)}
+        self.counts = {"enqueued": 0, "popped": 0, "cheap": 0, "starved": 0, "signals": 0, "stale": 0, "retried": 0}
+
+    def record_pop(self, item: QueuedStatement, wait: float, starved: bool = False):
+        with self._lock:
+            self.counts["popped"] += 1
+            self.counts["cheap"] += item.cheap
+            self.counts["starved"] += starved
+            self.waits["all"].append(wait)
+            if not item.cheap:
+                self.waits["relevant"].append(wait)
+
+    def incr(self, key: str, value: int = 1):
+        with self._lock:
+            self.counts[key] += value
+
+    def snapshot(self, depth: int, oldest_wait: Optional[float]) -> dict:
+        def summary(values):
+            values = sorted(values)
+            if not values:
+                return {"count": 0}
+            pick = lambda q: round(values[min(len(values) - 1, int(len(values) * q))], 1)
+            return {"count": len(values), "p50_s": pick(0.5), "p90_s": pick(0.9), "max_s": round(values[-1], 1)}
+
+        with self._lock:
+            return {
+                "depth": depth,
+                "oldest_wait_s": round(oldest_wait, 1) if oldest_wait is not None else None,
+                "counts": dict(self.counts),
+                "wait": {key: summary(values) for key, values in self.waits.items()},
+            }
+
+class PriorityAnalysisQueue:
+    """미분석 발언 우선순위 큐 (최신성 + 영향 거래소 세션 + 사전 관련성 점수)
+
+    - 사전 필터에서 걸러질 발언은 LLM 호출이 없어 먼저 비움 (짧은 작업 우선, drain의 limit에 포함하지 않음)
+    - 우선순위 힙과 저장 시각 힙을 함께 두고, FAIR_SHARE번에 한 번은 오래 기다린 발언을 꺼냄 (기아 방지)
+    - 세션/최신성 점수는 시간에 따라 바뀌므로 RESCORE_INTERVAL마다 전체 재계산 후 힙 재구성
+    - 꺼낸 항목은 _queued에서만 지우고 힙에서는 맨 앞에 올라올 때 건너뜀 (지연 삭제)
+    """
+
+    def __init__(self, relevance_filter: Optional[RelevanceClassifier] = None,
+                 starvation_after: timedelta = STARVATION_AFTER, fair_share: int = FAIR_SHARE,
+                 rescore_interval: timedelta = RESCORE_INTERVAL):
+        self.relevance_filter = relevance_filter or RelevanceClassifier.load()
+        self.starvation_after = starvation_after
+        self.fair_share = fair_share
+        self.rescore_interval = rescore_interval
+        self.metrics = QueueMetrics()
+        self.last_statement_id = 0
+        self.rescored_at = None
+        self.pops = 0
+        self._heap: List[QueuedStatement] = []
+        self._fifo: List[tuple] = []
+        self._queued: Dict[int, QueuedStatement] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._queued)
+
+    def _score(self, item: QueuedStatement, at: datetime):
+        item.priority = (
+            WEIGHTS["relevance"] * item.relevance
+            + WEIGHTS["session"] * session_score(item.regions, at)
+            + WEIGHTS["recency"] * recency_score(item.posted_at, at)
+        )
+        item.key = (not item.cheap, -item.priority, item.statement_id)
+
+    def _rescore(self, at: datetime):
+        for item in self._queued.values():
+            self._score(item, at)
+        self._heap = list(self._queued.values())
+        heapq.heapify(self._heap)
+        self._fifo = [(item.enqueued_at, item.statement_id, item) for item in self._queued.values()]
+        heapq.heapify(self._fifo)
+        self.rescored_at = at
+
+    def _add(self, item: QueuedStatement, at: datetime):
+        self._score(item, at)
+        self._queued[item.statement_id] = item
+        heapq.heappush(self._heap, item)
+        heapq.heappush(self._fifo, (item.enqueued_at, item.statement_id, item))
+
+    def _oldest(self) -> Optional[QueuedStatement]:
+        """저장 시각 힙의 맨 앞 (이미 꺼낸 항목은 정리)"""
+        while self._fifo and self._queued.get(self._fifo[0][1]) is not self._fifo[0][2]:
+            heapq.heappop(self._fifo)
+        return self._fifo[0][2] if self._fifo else None
+
+    def push(self, statement_id: int, text: str, posted_at: Optional[datetime] = None,
+             enqueued_at: Optional[datetime] = None, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.utcnow()
+        relevance = self.relevance_filter.score(text)
+        item = QueuedStatement(statement_id, posted_at, enqueued_at or now, relevance,
+                               statement_regions(text), relevance < self.relevance_filter.threshold)
+        with self._lock:
+            if statement_id in self._queued:
+                return False
+            self._add(item, now)
+        self.metrics.incr("enqueued")
+        return True
+
+    def requeue(self, item: QueuedStatement, now: Optional[datetime] = None):
+        """분석에 실패한 발언을 원래 저장 시각(대기 시간 유지)으로 다시 넣음
+
+        기아 방지 몫으로 꺼낸 항목은 우선순위 힙에 남아 있을 수 있으므로 같은 객체를 재사용하지 않고 새로 만듦
+        """
+        fresh = QueuedStatement(item.statement_id, item.posted_at, item.enqueued_at,
+                                item.relevance, item.regions, item.cheap)
+        with self._lock:
+            if item.statement_id in self._queued:
+                return
+            self._add(fresh, now or datetime.utcnow())
+        self.metrics.incr("retried")
+
+    def load_pending(self, db, now: Optional[datetime] = None) -> int:
+        """크롤러/수집기가 저장한 새 미분석 발언을 큐에 추가 (id 워터마크 이후만)"""
+        rows = db.query(
+            TrumpStatement.id, TrumpStatement.original_text, TrumpStatement.posted_at, TrumpStatement.created_at
+        ).filter(
+            TrumpStatement.id > self.last_statement_id,
+            TrumpStatement.is_analyzed == False,
+            TrumpStatement.trade_relevance.is_(None)
+        ).order_by(TrumpStatement.id).all()
+        added = 0
+        for row in rows:
+            added += self.push(row.id, row.original_text or "", row.posted_at, row.created_at, now)
+            self.last_statement_id = max(self.last_statement_id, row.id)
+        if added:
+            logger.info(f"🗂️ 분석 큐 적재: {added}개 (대기 {len(self)}개)")
+        return added
+
+    def pop(self, now: Optional[datetime] = None) -> Optional[QueuedStatement]:
+        now = now or datetime.utcnow()
+        with self._lock:
+            if not self._queued:
+                return None
+            if self.rescored_at is None or now - self.rescored_at >= self.rescore_interval:
+                self._rescore(now)
+            self.pops += 1
+            oldest = self._oldest()
+            starved = self.pops % self.fair_share == 0 and now - oldest.enqueued_at >= self.starvation_after
+            if starved:
+                item = oldest
+            else:
+                while self._queued.get(self._heap[0].statement_id) is not self._heap[0]:
+                    heapq.heappop(self._heap)
+                item = heapq.heappop(self._heap)
+            del self._queued[item.statement_id]
+        wait = max((now - item.enqueued_at).total_seconds(), 0.0)
+        self.metrics.record_pop(item, wait, starved)
+        return item
+
+    def drain(self, limit: int, now: Optional[datetime] = None) -> Iterator[QueuedStatement]:
+        """우선순위 순으로 LLM 분석 대상 최대 limit개 꺼냄 (꺼낼 때마다 현재 시각 기준)
+
+        사전 필터에서 걸러질 발언은 LLM 호출이 없으므로 limit에 세지 않고 함께 꺼냄
+        """
+        taken = 0
+        while taken < limit:
+            item = self.pop(now)
+            if item is None:
+                return
+            taken += not item.cheap
+            yield item
+
+    def oldest_wait(self, now: Optional[datetime] = None) -> Optional[float]:
+        now = now or datetime.utcnow()
+        with self._lock:
+            oldest = self._oldest()
+            return (now - oldest.enqueued_at).total_seconds() if oldest else None
+
+    def snapshot(self, now: Optional[datetime] = None) -> dict:
+        """큐 깊이/대기 시간 지표"""
+        return self.metrics.snapshot(len(self), self.oldest_wait(now))
@@ -0,0 +1,305 @@
+import sys
+import math
+import time
+import zlib
+import queue
+import logging
+import bisect
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from .database import SessionLocal
+from .model import BackfillWatermark, ETFPrice
+from .bulk_insert import bulk_insert_prices
+from .market_calendar import calendar_for_symbol
+
+logger = logging.getLogger(__name__)
+
+# 봉 간격별 분 단위 길이 (일봉은 None)와 요청 1회당 기간 (yfinance 간격별 조회 제한 이내)
+INTERVAL_MINUTES = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60, "1d": None}
+CHUNK_DAYS = {"1m": 7, "5m": 30, "15m": 30, "30m": 30, "1h": 180, "1d": 365}
+
+class BarProvider:
+    """과거 봉 제공자 인터페이스
+
+    get_bars는 [start, end) 구간의 봉을 시각 순으로 반환
+    (timestamp: naive UTC - 일봉은 해당 거래일 폐장 시각, close, volume)
+    """
+
+    def get_bars(self, symbol: str, start: datetime, end: datetime, interval: str) -> List[dict]:
+        raise NotImplementedError
+
+class YFinanceBarProvider(BarProvider):
+    """yfinance 과거 시세 제공자"""
+
+    def get_bars(self, symbol, start, end, interval):
+        import yfinance as yf
+
+        hist = yf.Ticker(symbol).history(start=start, end=end, interval=interval, auto_adjust=False)
+        if hist.empty:
+            return []
+        calendar = calendar_for_symbol(symbol)
+        bars = []
+        for ts, close, volume in zip(hist.index, hist["Close"], hist["Volume"]):
+            if interval == "1d":
+                stamp = calendar.session(ts.date())[1]
+            else:
+                stamp = ts.tz_convert("UTC") if ts.tzinfo else ts.tz_localize("UTC")
+                stamp = stamp.to_pydatetime()
+            bars.append({"timestamp": stamp.replace(tzinfo=None), "close": float(close), "volume": int(volume)})
+        return bars
+
+class FixtureBarProvider(BarProvider):
+    """테스트/벤치마크용 로컬 봉 생성기
+
+    거래소 캘린더의 정규장 시간에만 봉을 만들고, 가격은 (심볼, 시각)만으로 결정되어
+    청크 분할이나 재시작 여부와 관계없이 항상 같은 값을 반환
+    """
+
+    def __init__(self, seed: int = 0, volatility: float = 0.01, delay: float = 0.0):
+        self.seed = seed
+        self.volatility = volatility
+        self.delay = delay  # 네트워크 지연 흉내 (요청당 초)
+
+    def _noise(self, symbol: str, stamp: datetime) -> float:
+        return zlib.crc32(f"{self.seed}|{symbol}|{stamp:%Y%m%d%H%M}".encode()) / 0xFFFFFFFF - 0.5
+
+    def get_bars(self, symbol, start, end, interval):
+        if self.delay:
+            time.sleep(self.delay)
+        calendar = calendar_for_symbol(symbol)
+        minutes = INTERVAL_MINUTES[interval]
+        seed = zlib.crc32(f"{self.seed}|{symbol}".encode())
+        base = 20000 + seed % 20000 if ".KS" in symbol else 30 + seed % 570
+        phase = (seed % 360) * math.pi / 180
+
+        bars = []
+        day = start.date()
+        while day <= end.date():
+            if calendar.is_trading_day(day):
+                open_at, close_at = calendar.session(day)
+                open_at, close_at = open_at.replace(tzinfo=None), close_at.replace(tzinfo=None)
+                if minutes is None:
+                    stamps = [close_at]
+                else:
+                    count = int((close_at - open_at).total_seconds() // (minutes * 60))
+                    stamps = [open_at + timedelta(minutes=minutes * i) for i in range(count)]
+                for stamp in stamps:
+                    if start <= stamp < end:
+                        noise = self._noise(symbol, stamp)
+                        trend = 0.3 * math.sin(2 * math.pi * stamp.toordinal() / 365 + phase)
+                        bars.append({
+                            "timestamp": stamp,
+                            "close": round(base * math.exp(trend + self.volatility * noise), 4),
+                            "volume": int(100000 * (1.5 + noise))
+                        })
+            day += timedelta(days=1)
+        return bars
+
+class BackfillEngine:
+    """심볼별 과거 시세 백필
+
+    - 심볼마다 워터마크(마지막 적재 봉 시각) 이후 구간만 청크로 나눠 조회
+    - 조회는 스레드 풀에서 병렬로, 적재는 호출 스레드 하나에서 executemany로 일괄 처리 (SQLite 단일 쓰기)
+    - 청크 행과 워터마크를 같은 트랜잭션으로 커밋하므로 중단 후 재실행하면 정확히 이어서 적재
+    """
+
+    def __init__(self, provider: BarProvider, symbols: Dict[str, str], interval: str = "1d",
+                 session_factory=SessionLocal, workers: int = 4, chunk_days: Optional[int] = None):
+        if interval not in INTERVAL_MINUTES:
+            raise ValueError(f"지원하지 않는 봉 간격: {interval} ({', '.join(INTERVAL_MINUTES)})")
+        self.provider = provider
+        self.symbols = symbols
+        self.interval = interval
+        self.session_factory = session_factory
+        self.workers = workers
+        self.chunk_days = chunk_days or CHUNK_DAYS[interval]
+        self.stats = {"symbols": 0, "chunks": 0, "rows": 0, "failed": 0, "write_seconds": 0.0, "elapsed": 0.0}
+
+    def load_watermarks(self, db) -> Dict[str, BackfillWatermark]:
+        rows = db.query(BackfillWatermark).filter(BackfillWatermark.interval == self.interval).all()
+        return {row.symbol: row for row in rows}
+
+    def plan_chunks(self, start: datetime, end: datetime, watermark: Optional[datetime] = None):
+        """[start, end)를 chunk_days 단위 구간으로 분할 (워터마크 이후부터)"""
+        if watermark and watermark >= start:
+            start = watermark + timedelta(seconds=1)
+        chunks = []
+        while start < end:
+            chunk_end = min(start + timedelta(days=self.chunk_days), end)
+            chunks.append((start, chunk_end))
+            start = chunk_end
+        return chunks
+
+    def _fetch_symbol(self, symbol: str, chunks, results: "queue.Queue", stop: threading.Event):
+        """한 심볼의 청크를 순서대로 조회해 적재 큐에 전달 (심볼 내 순서 보장)"""
+        try:
+            for chunk_start, chunk_end in chunks:
+                if stop.is_set():
+                    break
+                bars = self.provider.get_bars(symbol, chunk_start, chunk_end, self.interval)
+                results.put((symbol, bars))
+        except Exception as e:
+            logger.error(f"{symbol} 과거 시세 조회 오류: {str(e)}")
+            results.put((symbol, e))
+        finally:
+            results.put((symbol, None))
+
+    def bar_span(self) -> timedelta:
+        minutes = INTERVAL_MINUTES[self.interval]
+        return timedelta(minutes=minutes) if minutes else timedelta(days=1)
+
+    def covered_timestamps(self, db, symbol: str, bars: List[dict]) -> List[datetime]:
+        """청크 구간에 이미 있는 시세 시각 (실시간 시세나 다른 간격 백필)"""
+        span = self.bar_span()
+        rows = db.query(ETFPrice.timestamp).filter(
+            ETFPrice.symbol == symbol,
+            ETFPrice.timestamp > bars[0]["timestamp"] - span,
+            ETFPrice.timestamp < bars[-1]["timestamp"] + span
+        ).order_by(ETFPrice.timestamp).all()
+        return [row.timestamp for row in rows]
+
+    def is_covered(self, timestamps: List[datetime], stamp: datetime) -> bool:
+        """봉 구간에 이미 시세가 있는지 (분봉: [시작, 시작+간격), 일봉: (폐장-1일, 폐장])
+
+        etf_prices는 심볼별 단일 시세 이력이므로 같은 구간을 중복 적재하지 않음
+        """
+        span = self.bar_span()
+        if INTERVAL_MINUTES[self.interval]:
+            index = bisect.bisect_left(timestamps, stamp)
+            return index < len(timestamps) and timestamps[index] < stamp + span
+        index = bisect.bisect_right(timestamps, stamp)
+        return index > 0 and timestamps[index - 1] > stamp - span
+
+    def _write_chunk(self, db, symbol: str, bars: List[dict], state: dict) -> int:
+        """청크 행 일괄 삽입 + 워터마크 갱신 (한 트랜잭션)
+
+        이미 시세가 있는 봉 구간은 건너뛰고 워터마크만 진행
+        """
+        last_timestamp, last_close = state.get("last_timestamp"), state.get("last_close")
+        covered = self.covered_timestamps(db, symbol, bars) if bars else []
+        rows = []
+        for bar in bars:
+            if last_timestamp and bar["timestamp"] <= last_timestamp:
+                continue
+            change_percent = (bar["close"] - last_close) / last_close * 100 if last_close else 0.0
+            if self.is_covered(covered, bar["timestamp"]):
+                last_timestamp, last_close = bar["timestamp"], bar["close"]
+                continue
+            rows.append({
+                "symbol": symbol,
+                "description": self.symbols[symbol],
+                "price": bar["close"],
+                "change_percent": round(change_percent, 4),
+                "volume": bar["volume"],
+                "timestamp": bar["timestamp"]
+            })
+            last_timestamp, last_close = bar["timestamp"], bar["close"]
+        if last_timestamp == state.get("last_timestamp"):
+            return 0
+
+        if rows:
+            bulk_insert_prices(db, rows)
+        db.merge(BackfillWatermark(
+            symbol=symbol,
+            interval=self.interval,
+            last_timestamp=last_timestamp,
+            last_close=last_close,
+            rows=state.get("rows", 0) + len(rows),
+            updated_at=datetime.utcnow()
+        ))
+        db.commit()
+        state.update(last_timestamp=last_timestamp, last_close=last_close, rows=state.get("rows", 0) + len(rows))
+        return len(rows)
+
+    def run(self, start: datetime, end: Optional[datetime] = None) -> dict:
+        """start~end(기본: 현재) 구간 백필 실행 후 통계 반환"""
+        end = end or datetime.utcnow()
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            BackfillWatermark.__table__.create(bind=db.get_bind(), checkfirst=True)
+            watermarks = self.load_watermarks(db)
+            states, plans = {}, {}
+            for symbol in self.symbols:
+                mark = watermarks.get(symbol)
+                states[symbol] = {
+                    "last_timestamp": mark.last_timestamp if mark else None,
+                    "last_close": mark.last_close if mark else None,
+                    "rows": mark.rows if mark else 0
+                }
+                chunks = self.plan_chunks(start, end, states[symbol]["last_timestamp"])
+                if chunks:
+                    plans[symbol] = chunks
+            logger.info(f"⏪ 과거 시세 백필 시작: {len(plans)}개 종목, {sum(map(len, plans.values()))}개 청크 ({self.interval})")
+
+            # 큐 크기를 제한해 조회가 적재보다 빨라도 메모리에 쌓이는 청크 수를 제한
+            results = queue.Queue(maxsize=self.workers * 2)
+            stop = threading.Event()
+            pending = list(plans.items())
+            running = 0
+
+            def launch():
+                nonlocal running
+                while pending and running < self.workers:
+                    symbol, chunks = pending.pop(0)
+                    threading.Thread(target=self._fetch_symbol, args=(symbol, chunks, results, stop), daemon=True).start()
+                    running += 1
+
+            launch()
+            try:
+                while running:
+                    symbol, bars = results.get()
+                    if bars is None:
+                        running -= 1
+                        self.stats["symbols"] += 1
+                        launch()
+                        continue
+                    if isinstance(bars, Exception):
+                        self.stats["failed"] += 1
+                        continue
+                    write_started = time.perf_counter()
+                    self.stats["rows"] += self._write_chunk(db, symbol, bars, states[symbol])
+                    self.stats["write_seconds"] += time.perf_counter() - write_started
+                    self.stats["chunks"] += 1
+            except BaseException:
+                stop.set()
+                db.rollback()
+                raise
+        finally:
+            db.close()
+
+        self.stats["elapsed"] = time.perf_counter() - started
+        rate = self.stats["rows"] / self.stats["write_seconds"] if self.stats["write_seconds"] else 0
+        logger.info(
+            f"✅ 백필 완료: {self.stats['rows']:,}행, {self.stats['chunks']}개 청크, "
+            f"실패 {self.stats['failed']}개 종목, 적재 {rate:,.0f}행/초, 총 {self.stats['elapsed']:.1f}초"
+        )
+        return self.stats
+
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from app.database import init_db
+    from app.etf_universe import ETF_SYMBOLS
+
+    parser = argparse.ArgumentParser(description='ETF 과거 시세 백필 (중단 후 재실행하면 이어서 적재)')
+    parser.add_argument('--years', type=float, default=5, help='조회 기간(년)')
+    parser.add_argument('--interval', type=str, default="1d", choices=list(INTERVAL_MINUTES), help='봉 간격')
+    parser.add_argument('--symbols', type=str, default=None, help='대상 심볼 (쉼표 구분, 기본: 전체 ETF)')
+    parser.add_argument('--workers', type=int, default=4, help='병렬 조회 스레드 수')
+    parser.add_argument('--fixture', action='store_true', help='yfinance 대신 로컬 생성 봉 사용')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    symbols = ETF_SYMBOLS
+    if args.symbols:
+        symbols = {s.strip().upper(): ETF_SYMBOLS.get(s.strip().upper(), s.strip().upper()) for s in args.symbols.split(",")}
+
+    provider = FixtureBarProvider() if args.fixture else YFinanceBarProvider()
+    engine = BackfillEngine(provider, symbols, interval=args.interval, workers=args.workers)
+    end = datetime.utcnow()
+    engine.run(end - timedelta(days=365 * args.years), end)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Dict
+from .model import ETFPrice
+from .etf_universe import ETF_SYMBOLS
+
+PRICE_COLUMNS = ("symbol", "description", "price", "change_percent", "volume", "timestamp")
+BATCH_ROWS = 50_000
+
+def _to_python(values) -> list:
+    """numpy/pandas 배열을 DB 드라이버가 받는 파이썬 값 리스트로 변환 (NaN/NaT는 None)"""
+    if hasattr(values, "dt"):  # pandas datetime Series
+        if values.dt.tz is not None:
+            values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+        return [None if v is None or v != v else v.to_pydatetime() for v in values]
+    if getattr(getattr(values, "dtype", None), "kind", None) == "M":
+        # numpy datetime64: [ns] 등은 tolist()가 정수를 반환하므로 마이크로초 단위로 맞춘 뒤 변환 (NaT -> None)
+        return values.astype("datetime64[us]").tolist()
+    if hasattr(values, "tolist"):
+        values = values.tolist()
+    return [None if isinstance(v, float) and v != v else v for v in values]
+
+def columns_from(data) -> Dict[str, list]:
+    """DataFrame, 배열 dict, dict 목록을 컬럼별 파이썬 리스트로 정규화하고 기본값 채움"""
+    if hasattr(data, "columns"):  # pandas DataFrame
+        columns = {name: _to_python(data[name]) for name in data.columns if name in PRICE_COLUMNS}
+    elif isinstance(data, dict):
+        columns = {name: _to_python(values) for name, values in data.items() if name in PRICE_COLUMNS}
+    else:
+        data = list(data)
+        columns = {name: [row.get(name) for row in data] for name in PRICE_COLUMNS if data and name in data[0]}
+
+    for required in ("symbol", "price"):
+        if required not in columns:
+            raise ValueError(f"가격 데이터에 필수 컬럼이 없습니다: {required}")
+    size = len(columns["symbol"])
+    for name, values in columns.items():
+        if len(values) != size:
+            raise ValueError(f"컬럼 길이가 다릅니다: {name} ({len(values)} != {size})")
+
+    if "description" not in columns:
+        columns["description"] = [ETF_SYMBOLS.get(symbol) for symbol in columns["symbol"]]
+    columns.setdefault("change_percent", [0.0] * size)
+    columns.setdefault("volume", [0] * size)
+    columns.setdefault("timestamp", [datetime.utcnow()] * size)
+    return columns
+
+def bulk_insert_prices(connection, data, batch_size: int = BATCH_ROWS) -> int:
+    """ORM 객체 없이 Core insert executemany로 etf_prices 일괄 삽입
+
+    data: DataFrame, {컬럼: 배열} dict, 또는 행 dict 목록 (fetch 단계 출력 그대로)
+    connection: Connection 또는 Session - 커밋은 호출자가 담당
+    """
+    columns = columns_from(data)
+    names = [name for name in PRICE_COLUMNS if name in columns]
+    rows = [dict(zip(names, values)) for values in zip(*(columns[name] for name in names))]
+    table = ETFPrice.__table__
+    for offset in range(0, len(rows), batch_size):
+        connection.execute(table.insert(), rows[offset:offset + batch_size])
+    return len(rows)
@@ -0,0 +1,248 @@
+import os
+import sys
+import logging
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import orjson
+from sqlalchemy import select, Integer, Float, Boolean, DateTime, JSON
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow import fs as pafs
+except ImportError:  # pyarrow가 없으면 내보내기/읽기 기능만 비활성화
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# 기본 내보내기 위치: backend/parquet (PARQUET_DIR 환경 변수로 변경 가능)
+PARQUET_DIR = Path(os.getenv("PARQUET_DIR", Path(__file__).resolve().parent.parent / "parquet"))
+WATERMARK_NAME = "_watermarks.json"
+CHUNK_ROWS = 100_000
+
+# 테이블별 파티션 기준 시각 컬럼 (year=YYYY/month=MM 하이브 파티션)
+EXPORT_TABLES = {
+    "trump_statements": "posted_at",
+    "taco_signals": "created_at",
+    "etf_prices": "timestamp",
+}
+
+# 발언은 크롤링 직후 저장되고 분석 결과가 나중에 채워지므로 분석(또는 사전 필터 점수 기록)이 끝난 뒤에만 내보냄
+# 이 시간이 지나도 처리되지 않은 발언은 그대로 내보내 워터마크가 멈추지 않도록 함
+SETTLE_AFTER = timedelta(days=1)
+
+# 문자열 배열로 저장할 JSON 컬럼 (나머지 JSON 컬럼은 JSON 텍스트로 저장)
+LIST_COLUMNS = {("trump_statements", "keywords")}
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet 내보내기/읽기에는 pyarrow가 필요합니다: pip install pyarrow")
+
+def _get_table(name: str):
+    from .database import Base
+    from . import model  # noqa: F401 - 모델을 메타데이터에 등록
+
+    return Base.metadata.tables[name]
+
+def arrow_schema(table) -> "pa.Schema":
+    """SQLAlchemy 컬럼 타입으로 고정 Arrow 스키마 생성 (청크마다 추론 타입이 달라지지 않도록)"""
+    _require_pyarrow()
+    fields = []
+    for column in table.columns:
+        if (table.name, column.name) in LIST_COLUMNS:
+            arrow_type = pa.list_(pa.string())
+        elif isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+def _column_values(table, column, rows) -> list:
+    values = [row[column.name] for row in rows]
+    if isinstance(column.type, JSON) and (table.name, column.name) not in LIST_COLUMNS:
+        return [orjson.dumps(v).decode() if v is not None else None for v in values]
+    return values
+
+def load_watermarks(out_dir: Path = PARQUET_DIR) -> Dict[str, int]:
+    path = Path(out_dir) / WATERMARK_NAME
+    if not path.exists():
+        return {}
+    return orjson.loads(path.read_bytes())
+
+def save_watermarks(watermarks: Dict[str, int], out_dir: Path = PARQUET_DIR):
+    """워터마크 파일 원자적 교체 (파케이 파일을 모두 쓴 뒤에만 호출)"""
+    path = Path(out_dir) / WATERMARK_NAME
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(orjson.dumps(watermarks, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, path)
+
+def _write_partitions(name: str, schema, table, rows, time_column: str, out_dir: Path) -> int:
+    """청크를 year/month 파티션으로 나눠 part-<첫 id>.parquet 파일로 기록"""
+    partitions: Dict[tuple, list] = {}
+    for row in rows:
+        ts = row[time_column] or datetime(1970, 1, 1)
+        partitions.setdefault((ts.year, ts.month), []).append(row)
+
+    for (year, month), part_rows in partitions.items():
+        part_dir = out_dir / name / f"year={year}" / f"month={month:02d}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        arrays = [
+            pa.array(_column_values(table, column, part_rows), type=field.type)
+            for column, field in zip(table.columns, schema)
+        ]
+        path = part_dir / f"part-{part_rows[0]['id']:012d}.parquet"
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(pa.Table.from_arrays(arrays, schema=schema), tmp, compression="zstd")
+        os.replace(tmp, path)
+    return len(partitions)
+
+def is_settled(name: str, row, now: datetime) -> bool:
+    """내보낸 뒤 더 바뀌지 않을 행인지 (발언은 분석 완료/사전 필터 점수 기록 또는 SETTLE_AFTER 경과)"""
+    if name != "trump_statements" or row["is_analyzed"] or row["trade_relevance"] is not None:
+        return True
+    return row["created_at"] is None or now - row["created_at"] > SETTLE_AFTER
+
+def export_table(connection, name: str, out_dir: Path = PARQUET_DIR, since_id: int = 0,
+                 chunk_rows: int = CHUNK_ROWS, now: Optional[datetime] = None) -> dict:
+    """since_id 이후 새 행만 id 순으로 청크 단위 내보내기 (메모리는 청크 크기로 제한)
+
+    아직 분석 대기 중인 발언이 나오면 그 앞까지만 내보내고 워터마크를 멈춤 (다음 sync에서 이어서 내보냄)
+    """
+    _require_pyarrow()
+    now = now or datetime.utcnow()
+    table = _get_table(name)
+    schema = arrow_schema(table)
+    time_column = EXPORT_TABLES[name]
+    last_id, exported, files = since_id, 0, 0
+
+    while True:
+        rows = connection.execute(
+            select(table).where(table.c.id > last_id).order_by(table.c.id).limit(chunk_rows)
+        ).mappings().all()
+        settled = next((i for i, row in enumerate(rows) if not is_settled(name, row, now)), len(rows))
+        if settled:
+            files += _write_partitions(name, schema, table, rows[:settled], time_column, Path(out_dir))
+            exported += settled
+            last_id = rows[settled - 1]["id"]
+        if settled < chunk_rows or settled < len(rows):
+            break
+
+    return {"table": name, "exported": exported, "files": files, "watermark": last_id}
+
+def sync(engine, out_dir: Path = PARQUET_DIR, tables: Optional[List[str]] = None,
+         chunk_rows: int = CHUNK_ROWS) -> List[dict]:
+    """지난 워터마크 이후 추가된 행만 파케이에 이어 쓰기
+
+    id 기준 증분이라 이미 내보낸 행의 수정(예: is_active 변경)은 반영되지 않음 - 필요하면 --full로 재생성
+    (분석 결과가 나중에 채워지는 발언은 처리가 끝난 뒤에 내보냄)
+    """
+    _require_pyarrow()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    watermarks = load_watermarks(out_dir)
+    results = []
+    with engine.connect() as connection:
+        for name in tables or EXPORT_TABLES:
+            result = export_table(connection, name, out_dir, watermarks.get(name, 0), chunk_rows)
+            watermarks[name] = result["watermark"]
+            save_watermarks(watermarks, out_dir)
+            logger.info(f"🧱 {name}: {result['exported']}행 내보내기 (워터마크 id {result['watermark']})")
+            results.append(result)
+    return results
+
+def _partition_filter(start: Optional[datetime], end: Optional[datetime]):
+    """기간 조건을 year/month 파티션 조건으로 변환해 불필요한 파일을 열지 않도록 함"""
+    expression = None
+    if start:
+        expression = (ds.field("year") > start.year) | (
+            (ds.field("year") == start.year) & (ds.field("month") >= start.month)
+        )
+    if end:
+        upper = (ds.field("year") < end.year) | (
+            (ds.field("year") == end.year) & (ds.field("month") <= end.month)
+        )
+        expression = upper if expression is None else expression & upper
+    return expression
+
+def read_table(name: str, columns: Optional[List[str]] = None, filters=None,
+               start: Optional[datetime] = None, end: Optional[datetime] = None,
+               out_dir: Path = PARQUET_DIR, as_arrow: bool = False):
+    """파케이 이력 읽기 (메모리 맵, 컬럼 선택, 조건 푸시다운)
+
+    filters: pyarrow 스타일 조건 목록 예) [("symbol", "in", ["SPY", "QQQ"]), ("price", ">", 100)]
+    start/end: 파티션 시각 컬럼 기준 기간 [start, end)
+    """
+    _require_pyarrow()
+    path = Path(out_dir) / name
+    if not path.exists():
+        raise FileNotFoundError(f"내보낸 파케이 데이터가 없습니다: {path} (columnar_export --sync 실행 필요)")
+
+    dataset = ds.dataset(
+        str(path),
+        format="parquet",
+        partitioning="hive",
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+    time_column = EXPORT_TABLES[name]
+    expression = _partition_filter(start, end)
+    if start:
+        expression = expression & (ds.field(time_column) >= pa.scalar(start, pa.timestamp("us")))
+    if end:
+        expression = expression & (ds.field(time_column) < pa.scalar(end, pa.timestamp("us")))
+    if filters:
+        condition = pq.filters_to_expression(filters)
+        expression = condition if expression is None else expression & condition
+
+    if columns is None:
+        columns = [field.name for field in dataset.schema if field.name not in ("year", "month")]
+    result = dataset.to_table(columns=columns, filter=expression)
+    return result if as_arrow else result.to_pandas()
+
+if __name__ == "__main__":
+    import time
+    import argparse
+    import shutil
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from app.database import engine
+
+    parser = argparse.ArgumentParser(description='이력 데이터 파케이 내보내기/조회')
+    parser.add_argument('--sync', action='store_true', help='워터마크 이후 새 행만 내보내기 (--read가 없으면 기본 동작)')
+    parser.add_argument('--full', action='store_true', help='기존 파케이를 지우고 전체 재생성')
+    parser.add_argument('--tables', type=str, default=None, help='대상 테이블 (쉼표 구분)')
+    parser.add_argument('--out', type=str, default=str(PARQUET_DIR), help='파케이 디렉토리')
+    parser.add_argument('--read', type=str, default=None, help='조회할 테이블')
+    parser.add_argument('--columns', type=str, default=None, help='조회 컬럼 (쉼표 구분)')
+    parser.add_argument('--symbol', type=str, default=None, help='etf_prices 심볼 조건')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    out = Path(args.out)
+    tables = args.tables.split(",") if args.tables else None
+
+    if args.full:
+        shutil.rmtree(out, ignore_errors=True)
+    if args.sync or args.full or not args.read:
+        for result in sync(engine, out, tables):
+            print(f"{result['table']:<18} {result['exported']:>9,}행  파일 {result['files']:>4}개  워터마크 {result['watermark']}")
+
+    if args.read:
+        started = time.perf_counter()
+        frame = read_table(
+            args.read,
+            columns=args.columns.split(",") if args.columns else None,
+            filters=[("symbol", "=", args.symbol)] if args.symbol else None,
+            out_dir=out
+        )
+        print(frame.tail(10))
+        print(f"\n{len(frame):,}행 조회 ({(time.perf_counter() - started) * 1000:.1f} ms)")
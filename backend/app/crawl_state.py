@@ -0,0 +1,130 @@
+import logging
+from datetime import datetime
+from typing import List, Optional
+from .database import SessionLocal
+from .model import TrumpStatement, CrawlState
+
+logger = logging.getLogger(__name__)
+
+class CrawlStateStore:
+    """크롤링 진행 상태 저장소
+
+    수집한 게시글을 배치 단위로 저장하면서 같은 트랜잭션에서 진행 상태(최신/최오래된 게시 시각,
+    스크롤 횟수)를 갱신하므로, 크롤러가 중간에 죽어도 마지막 배치까지는 저장되고 그 지점부터 재개 가능
+
+    이전 최신 게시글보다 새 게시글은 pending_newest에만 보관하고, 크롤러가 이전 최신 게시글(또는 피드 끝)에
+    도달했을 때(mark_caught_up) 기록함 - 중간에 죽으면 그 사이 게시글이 수집된 구간으로 취급되지 않도록
+    """
+
+    def __init__(self, source: str, session_factory=SessionLocal):
+        self.source = source
+        self.session_factory = session_factory
+        self.state = self.load()
+        self.pending_newest = None  # (게시 시각, 게시글 id) - 이전 최신 경계까지 이어지기 전의 새 최신 경계
+
+    def load(self) -> dict:
+        db = self.session_factory()
+        try:
+            CrawlState.__table__.create(bind=db.get_bind(), checkfirst=True)
+            row = db.get(CrawlState, self.source)
+            if row is None:
+                return {
+                    "newest_post_id": None, "newest_posted_at": None, "oldest_posted_at": None,
+                    "scroll_count": 0, "total_saved": 0, "history_complete": False
+                }
+            return {
+                "newest_post_id": row.newest_post_id,
+                "newest_posted_at": row.newest_posted_at,
+                "oldest_posted_at": row.oldest_posted_at,
+                "scroll_count": row.scroll_count or 0,
+                "total_saved": row.total_saved or 0,
+                "history_complete": bool(row.history_complete)
+            }
+        finally:
+            db.close()
+
+    def is_covered(self, posted_at: Optional[datetime]) -> bool:
+        """이미 저장을 마친 구간(oldest~newest)에 속한 게시글인지"""
+        newest, oldest = self.state["newest_posted_at"], self.state["oldest_posted_at"]
+        if posted_at is None or newest is None or oldest is None:
+            return False
+        return oldest <= posted_at <= newest
+
+    def _save_state(self, db):
+        db.merge(CrawlState(source=self.source, updated_at=datetime.utcnow(), **self.state))
+
+    def _persist(self):
+        db = self.session_factory()
+        try:
+            self._save_state(db)
+            db.commit()
+        finally:
+            db.close()
+
+    def flush(self, posts: List[dict], scroll_count: Optional[int] = None, caught_up: bool = False) -> int:
+        """게시글 배치 저장 + 진행 상태 갱신 (한 트랜잭션), 새로 저장한 개수 반환
+
+        posts: {'content', 'timestamp', 'post_id', 'data_index'} 목록 (source가 있으면 발언 출처로 사용)
+        caught_up: 이 배치로 이전 최신 경계까지 빈틈없이 수집했으면 True (최신 경계를 같은 트랜잭션에 기록)
+        """
+        db = self.session_factory()
+        try:
+            texts = [post["content"] for post in posts]
+            existing = {
+                row.original_text for row in
+                db.query(TrumpStatement.original_text).filter(TrumpStatement.original_text.in_(texts)).all()
+            } if texts else set()
+
+            saved = 0
+            for post in posts:
+                if post["content"] in existing:
+                    continue
+                existing.add(post["content"])
+                db.add(TrumpStatement(
+                    original_text=post["content"],
+                    source=post.get("source") or f"Truth Social (index: {post.get('data_index', 'unknown')})",
+                    posted_at=post["timestamp"],
+                ))
+                saved += 1
+
+            state = self.state
+            newest = max(posts, key=lambda post: post["timestamp"]) if posts else None
+            if newest and state["newest_posted_at"] is None:
+                # 첫 수집은 피드 맨 위부터 이어서 저장하므로 바로 기록
+                state["newest_posted_at"], state["newest_post_id"] = newest["timestamp"], newest.get("post_id")
+            elif newest and newest["timestamp"] > state["newest_posted_at"]:
+                if self.pending_newest is None or newest["timestamp"] > self.pending_newest[0]:
+                    self.pending_newest = (newest["timestamp"], newest.get("post_id"))
+            if caught_up and self.pending_newest is not None:
+                state["newest_posted_at"], state["newest_post_id"] = self.pending_newest
+                self.pending_newest = None
+            # 피드는 최신순이므로 배치의 마지막 게시글이 과거 수집 경계 (맨 위 고정 게시글에 끌려가지 않도록 min 대신 사용)
+            if posts and (state["oldest_posted_at"] is None or posts[-1]["timestamp"] < state["oldest_posted_at"]):
+                state["oldest_posted_at"] = posts[-1]["timestamp"]
+            if scroll_count is not None:
+                state["scroll_count"] = max(state["scroll_count"], scroll_count)
+            state["total_saved"] += saved
+            self._save_state(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            self.state = self.load()
+            raise
+        finally:
+            db.close()
+
+        logger.info(f"💾 크롤링 배치 저장: {len(posts)}개 중 {saved}개 신규 (누적 {self.state['total_saved']}개)")
+        return saved
+
+    def mark_caught_up(self):
+        """이전 최신 게시글(또는 피드 끝)까지 빈틈없이 수집했으므로 보류한 최신 경계를 기록"""
+        if self.pending_newest is None:
+            return
+        self.state["newest_posted_at"], self.state["newest_post_id"] = self.pending_newest
+        self.pending_newest = None
+        self._persist()
+
+    def mark_history_complete(self):
+        """피드 끝(또는 최대 스크롤)까지 과거 수집을 마쳤음을 기록"""
+        self.state["history_complete"] = True
+        self._persist()
@@ -1,7 +1,6 @@
 import sys
 import os
 from pathlib import Path
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -17,25 +16,43 @@ current_dir = Path(__file__).resolve().parent
 backend_dir = current_dir.parent
 sys.path.append(str(backend_dir))
 
-from app.database import Base, get_db
+from app.database import Base, get_db, init_db
 from app.model import TrumpStatement
+from app.crawl_state import CrawlStateStore
+from app.driver_pool import DriverPool, create_chrome_driver, crawl_accounts
+
+# 증분 수집 시 이미 저장된 게시글이 연속으로 이만큼 나오면 중단 (맨 위 고정 게시글 대비)
+KNOWN_STREAK_TO_STOP = 5
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class TruthSocialScraper:
-    def __init__(self):
-        # Chrome 브라우저 설정
-        options = webdriver.ChromeOptions()
-        # options.add_argument('--headless')  # 테스트할 때는 주석 처리
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    def __init__(self, driver=None, account="realDonaldTrump"):
+        # driver를 주면(DriverPool 세션) 재사용하고 크롤링 후에도 종료하지 않음
+        self.owns_driver = driver is None
+        if driver is None:
+            # Chrome 브라우저 설정 (테스트할 때는 창을 띄움)
+            driver = create_chrome_driver(headless=False)
         
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = driver
         self.wait = WebDriverWait(self.driver, 20)
-        self.base_url = "https://truthsocial.com/@realDonaldTrump"
+        self.base_url = f"https://truthsocial.com/@{account}"
+    
+    def open_timeline(self, timeout=15):
+        """타임라인 열기 - 이미 열려 있는(예열된) 세션이면 새로고침, 게시글이 보이면 바로 진행"""
+        started = time.time()
+        if self.driver.current_url.rstrip('/') == self.base_url:
+            self.driver.refresh()
+        else:
+            self.driver.get(self.base_url)
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.XPATH, "//div[@data-index][@data-item-index]"))
+            )
+        except TimeoutException:
+            logger.warning(f"{timeout}초 안에 게시글이 나타나지 않았습니다.")
+        logger.info(f"타임라인 로딩 {time.time() - started:.1f}초")
     
     def wait_for_page_load(self, delay=15):
         """페이지 로딩을 기다림"""
@@ -75,15 +92,40 @@ class TruthSocialScraper:
             
         logger.info("스크롤 완료")
 
-    def get_trump_posts(self, max_scrolls=5):
+    def extract_post_id(self, post_container):
+        """게시글 링크(/posts/<id>)에서 게시글 id 추출 (없으면 None)"""
+        try:
+            link = post_container.find_element(By.XPATH, ".//a[contains(@href, '/posts/')]")
+            return link.get_attribute('href').rstrip('/').split('/')[-1]
+        except NoSuchElementException:
+            return None
+
+    def get_trump_posts(self, max_scrolls=5, state_store=None, batch_size=20):
+        """게시글 수집
+
+        state_store(CrawlStateStore)가 주어지면 batch_size개마다 DB에 저장하고 진행 상태를 기록
+        - 과거 수집이 끝나지 않았으면 저장된 구간은 빠르게 스크롤로 건너뛰고 그 이전부터 이어서 수집
+        - 과거 수집이 끝났으면 마지막으로 저장한 게시글에 도달할 때까지만 수집 (증분)
+        이 경우 메모리에는 배치 하나만 유지하고 빈 목록을 반환
+        """
+        collected_posts = []
+        last_index = -1  # data-index는 스크롤 순서대로 증가하므로 최고값만 기억 (메모리 일정)
+        first_index = None
+        scroll_count = 0
+        known_streak = 0
+        covered_streak = 0
+        caught_up = False  # 이전 최신 게시글(또는 피드 끝)까지 빈틈없이 수집했는지
+        reached_end = False
+        stop_at = None
+        if state_store and state_store.state["history_complete"]:
+            stop_at = state_store.state["newest_posted_at"]
+            logger.info(f"증분 수집: {stop_at} 이후 게시글만 수집합니다.")
+        elif state_store and state_store.state["oldest_posted_at"]:
+            logger.info(f"과거 수집 재개: {state_store.state['oldest_posted_at']} 이전 게시글부터 수집합니다.")
+
         try:
             logger.info(f"Truth Social 접속 시도: {self.base_url}")
-            self.driver.get(self.base_url)
-            time.sleep(15)  # 초기 로딩 대기
-            
-            collected_posts = []
-            processed_indices = set()
-            scroll_count = 0
+            self.open_timeline()  # 초기 로딩 대기 (최대 15초)
             
             while scroll_count < max_scrolls:
                 # 현재 화면에 보이는 게시글들 찾기 (새로운 선택자 사용)
@@ -93,15 +135,44 @@ class TruthSocialScraper:
                 )
                 
                 logger.info(f"현재 화면에서 발견된 게시글 컨테이너: {len(current_posts)}개")
+                skipped_covered = 0
                 
                 # 현재 보이는 게시글들 처리
                 for post_container in current_posts:
+                    data_index = None
                     try:
                         # data-index 확인
                         data_index = post_container.get_attribute('data-index')
-                        if data_index in processed_indices:
+                        if int(data_index) <= last_index:
                             continue
                         
+                        # 시간 정보 찾기 (저장된 구간이면 본문을 읽지 않고 건너뜀)
+                        try:
+                            time_element = post_container.find_element(
+                                By.XPATH,
+                                ".//time[@title]"
+                            )
+                            time_str = time_element.get_attribute('title')
+                            parsed_date = self.parse_date(time_str)
+                        except NoSuchElementException:
+                            logger.warning(f"시간 정보를 찾을 수 없음 (index: {data_index}), 현재 시간 사용")
+                            parsed_date = datetime.utcnow()
+                        
+                        if state_store and state_store.is_covered(parsed_date) and stop_at is None:
+                            last_index = int(data_index)
+                            skipped_covered += 1
+                            # 저장된 구간에 연속으로 들어섰으면 새 게시글 구간은 빈틈없이 수집한 것
+                            covered_streak += 1
+                            caught_up = caught_up or covered_streak >= KNOWN_STREAK_TO_STOP
+                            continue
+                        covered_streak = 0
+                        if stop_at and parsed_date <= stop_at:
+                            # 맨 위 고정 게시글 때문에 한 번에 멈추지 않고 연속으로 확인
+                            known_streak += 1
+                            last_index = int(data_index)
+                            continue
+                        known_streak = 0
+                        
                         # 게시글 내용 찾기 (새로운 구조에 맞춤)
                         try:
                             # 먼저 data-markup="true"인 p 태그를 찾고, 그 안의 p 태그에서 텍스트 추출
@@ -131,28 +202,24 @@ class TruthSocialScraper:
                             logger.warning(f"빈 게시글 건너뜀 (index: {data_index})")
                             continue
                         
-                        # 시간 정보 찾기
-                        try:
-                            time_element = post_container.find_element(
-                                By.XPATH,
-                                ".//time[@title]"
-                            )
-                            time_str = time_element.get_attribute('title')
-                            parsed_date = self.parse_date(time_str)
-                        except NoSuchElementException:
-                            logger.warning(f"시간 정보를 찾을 수 없음 (index: {data_index}), 현재 시간 사용")
-                            parsed_date = datetime.utcnow()
-                        
                         logger.info(f"새 게시글 수집 (index: {data_index}): {content[:100]}...")
                         logger.info(f"작성 시간: {parsed_date}")
                         
                         collected_posts.append({
                             'content': content,
                             'timestamp': parsed_date,
-                            'data_index': data_index
+                            'data_index': data_index,
+                            'post_id': self.extract_post_id(post_container)
                         })
                         
-                        processed_indices.add(data_index)
+                        last_index = int(data_index)
+                        if first_index is None:
+                            first_index = last_index
+                        
+                        # 배치가 차면 저장하고 메모리에서 비움
+                        if state_store and len(collected_posts) >= batch_size:
+                            state_store.flush(collected_posts, scroll_count)
+                            collected_posts = []
                         
                         # 각 게시글 처리 후 짧은 대기
                         time.sleep(random.uniform(0.3, 0.7))
@@ -161,10 +228,14 @@ class TruthSocialScraper:
                         logger.error(f"게시글 처리 중 오류 (index: {data_index}): {str(e)}")
                         continue
                 
-                logger.info(f"현재까지 수집된 총 게시글: {len(collected_posts)}개")
-                if processed_indices:
-                    sorted_indices = sorted([int(x) for x in processed_indices])
-                    logger.info(f"처리된 인덱스: {sorted_indices}")
+                if skipped_covered:
+                    logger.info(f"이미 저장된 구간 게시글 {skipped_covered}개 건너뜀")
+                logger.info(f"현재 배치 게시글: {len(collected_posts)}개, 처리한 마지막 인덱스: {last_index}")
+                
+                if stop_at and known_streak >= KNOWN_STREAK_TO_STOP:
+                    logger.info("마지막으로 저장한 게시글에 도달해 증분 수집을 종료합니다.")
+                    caught_up = True
+                    break
                 
                 # 다음 스크롤 수행
                 if scroll_count < max_scrolls - 1:
@@ -178,24 +249,46 @@ class TruthSocialScraper:
                     
                     self.driver.execute_script(f"window.scrollTo({{top: {new_position}, behavior: 'smooth'}});")
                     
-                    # 새로운 컨텐츠 로딩 대기
-                    time.sleep(random.uniform(4, 6))
+                    # 새로운 컨텐츠 로딩 대기 (저장된 구간을 건너뛰는 중이면 짧게)
+                    time.sleep(random.uniform(1, 2) if skipped_covered and not collected_posts else random.uniform(4, 6))
+                    
+                    if self.driver.execute_script("return window.pageYOffset;") <= current_position:
+                        reached_end = True
+                        logger.info("피드 끝에 도달했습니다.")
+                        break
                 
                 scroll_count += 1
             
-            logger.info(f"최종 수집된 게시글: {len(collected_posts)}개")
-            if processed_indices:
-                sorted_indices = sorted([int(x) for x in processed_indices])
-                logger.info(f"수집된 인덱스 범위: {min(sorted_indices)} ~ {max(sorted_indices)}")
+            if first_index is not None:
+                logger.info(f"수집된 인덱스 범위: {first_index} ~ {last_index}")
+            
+            if state_store:
+                if collected_posts:
+                    state_store.flush(collected_posts, scroll_count)
+                    collected_posts = []
+                if caught_up or reached_end:
+                    state_store.mark_caught_up()
+                if stop_at is None and reached_end:
+                    state_store.mark_history_complete()
+                logger.info(f"최종 누적 저장 게시글: {state_store.state['total_saved']}개")
+            else:
+                logger.info(f"최종 수집된 게시글: {len(collected_posts)}개")
             
             return collected_posts
             
         except Exception as e:
             logger.error(f"스크래핑 중 오류 발생: {str(e)}")
+            # 마지막 배치라도 저장해 다음 실행이 이어받을 수 있도록 함
+            if state_store and collected_posts:
+                try:
+                    state_store.flush(collected_posts, scroll_count)
+                except Exception as flush_error:
+                    logger.error(f"마지막 배치 저장 실패: {str(flush_error)}")
             return []
             
         finally:
-            self.driver.quit()
+            if self.owns_driver:
+                self.driver.quit()
         
     def save_to_db(self, posts):
         """수집한 게시글을 데이터베이스에 저장"""
@@ -231,11 +324,18 @@ class TruthSocialScraper:
         finally:
             db.close()
 
-def main():
+def main(max_scrolls=1000, batch_size=20, no_state=False):
     try:
         scraper = TruthSocialScraper()
-        # 스크롤 5번만 실행
-        posts = scraper.get_trump_posts(max_scrolls=1000)
+        
+        if not no_state:
+            init_db()  # 발언 저장 시 색인 테이블(지문 등)이 필요
+            # 배치마다 저장하고 진행 상태를 기록 (중단 후 재실행하면 이어서 수집)
+            store = CrawlStateStore(f"truth_social:{scraper.base_url.rsplit('/', 1)[-1]}")
+            scraper.get_trump_posts(max_scrolls=max_scrolls, state_store=store, batch_size=batch_size)
+            return
+        
+        posts = scraper.get_trump_posts(max_scrolls=max_scrolls)
         
         if posts:
             print("\n=== 수집된 게시글 ===")
@@ -254,5 +354,37 @@ def main():
     except Exception as e:
         logger.error(f"실행 중 오류 발생: {e}")
 
+def watch(accounts, pool_size=2, interval=300, max_scrolls=5, batch_size=20):
+    """장중 반복 크롤링: 헤드리스 브라우저 풀을 유지하며 interval초마다 계정들을 동시에 증분 수집"""
+    init_db()
+    with DriverPool(size=pool_size, factory=lambda: create_chrome_driver(headless=True)) as pool:
+        if len(accounts) == 1:
+            pool.warm_up(f"https://truthsocial.com/@{accounts[0]}")
+        try:
+            while True:
+                started = time.time()
+                durations = crawl_accounts(pool, accounts, max_scrolls=max_scrolls, batch_size=batch_size)
+                for account, seconds in durations.items():
+                    logger.info(f"@{account} 크롤링 {seconds:.1f}초")
+                logger.info(f"브라우저 풀 상태: {pool.stats}")
+                time.sleep(max(0, interval - (time.time() - started)))
+        except KeyboardInterrupt:
+            logger.info("사용자 중단 요청으로 반복 크롤링을 종료합니다.")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    
+    arg_parser = argparse.ArgumentParser(description='Truth Social 트럼프 게시글 크롤링')
+    arg_parser.add_argument('--scrolls', type=int, default=1000, help='최대 스크롤 횟수')
+    arg_parser.add_argument('--batch-size', type=int, default=20, help='게시글 배치 저장 단위')
+    arg_parser.add_argument('--no-state', action='store_true', help='진행 상태 없이 끝까지 수집 후 한 번에 저장 (기존 방식)')
+    arg_parser.add_argument('--watch', action='store_true', help='브라우저 풀을 유지하며 반복 크롤링 (장중용)')
+    arg_parser.add_argument('--accounts', type=str, default="realDonaldTrump", help='반복 크롤링 계정 (쉼표 구분)')
+    arg_parser.add_argument('--pool-size', type=int, default=2, help='브라우저 세션 수 (동시 크롤링 수)')
+    arg_parser.add_argument('--interval', type=float, default=300, help='반복 크롤링 간격(초)')
+    args = arg_parser.parse_args()
+    
+    if args.watch:
+        watch(args.accounts.split(","), args.pool_size, args.interval, args.scrolls, args.batch_size)
+    else:
+        main(args.scrolls, args.batch_size, args.no_state)
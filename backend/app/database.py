@@ -1,7 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import json
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,6 +24,9 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# migrate_db의 일회성 보정 단계 (SQLite user_version에 기록)
+PERCENT_SCALE_VERSION = 1
+
 def get_db():
     db = SessionLocal()
     try:
@@ -31,4 +35,44 @@ def get_db():
         db.close()
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    from .search import init_search_index
+    from .signal_index import backfill_signal_impacts
+    from .near_dup import backfill_fingerprints
+
+    Base.metadata.create_all(bind=engine)
+    migrate_db()
+    init_search_index(engine)
+    backfill_signal_impacts(engine)
+    backfill_fingerprints(engine)
+
+def migrate_db():
+    """기존 데이터베이스를 현재 스키마 형식에 맞게 보정 (여러 번 실행해도 안전)"""
+    from .model import normalize_keywords, PERCENT_COLUMNS
+
+    with engine.begin() as conn:
+        # 기존 테이블에 새로 정의된 인덱스 추가 (create_all은 기존 테이블의 인덱스를 만들지 않음)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+        # keywords: 콤마 구분 문자열 -> JSON 배열
+        rows = conn.execute(text(
+            "SELECT id, keywords FROM trump_statements WHERE keywords IS NOT NULL"
+        )).fetchall()
+        for row_id, raw in rows:
+            try:
+                if isinstance(json.loads(raw), list):
+                    continue
+            except (TypeError, ValueError):
+                pass
+            conn.execute(
+                text("UPDATE trump_statements SET keywords = :keywords WHERE id = :id"),
+                {"keywords": json.dumps(normalize_keywords(raw), ensure_ascii=False), "id": row_id}
+            )
+
+        # 0~1 비율로 저장된 이전 신뢰도/관련성 -> 0~100 퍼센트
+        # (1은 두 표기 모두 가능해 값으로 구분할 수 없으므로 user_version으로 한 번만 실행)
+        if conn.execute(text("PRAGMA user_version")).scalar() < PERCENT_SCALE_VERSION:
+            for table, column in PERCENT_COLUMNS:
+                conn.execute(text(f"UPDATE {table} SET {column} = {column} * 100 WHERE {column} > 0 AND {column} <= 1"))
+            conn.execute(text(f"PRAGMA user_version = {PERCENT_SCALE_VERSION}"))
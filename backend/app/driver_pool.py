@@ -0,0 +1,188 @@
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil이 없으면 브라우저 JS 힙 사용량으로 메모리 판단
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+def create_chrome_driver(headless: bool = True):
+    """크롤러용 Chrome 세션 생성 (TruthSocialScraper와 같은 옵션)"""
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    return webdriver.Chrome(options=options)
+
+class PooledDriver:
+    """풀에서 빌려주는 브라우저 세션 (사용 횟수와 생성 시각 추적)"""
+
+    def __init__(self, driver, session_id: int):
+        self.driver = driver
+        self.session_id = session_id
+        self.pages = 0
+        self.created_at = time.monotonic()
+        self.last_url = None
+
+    def memory_mb(self) -> Optional[float]:
+        """브라우저 프로세스 트리 RSS (psutil 없으면 JS 힙) - 측정 불가면 None"""
+        try:
+            if psutil is not None:
+                process = psutil.Process(self.driver.service.process.pid)
+                processes = [process] + process.children(recursive=True)
+                return sum(p.memory_info().rss for p in processes) / 1024 / 1024
+            used = self.driver.execute_script("return performance.memory && performance.memory.usedJSHeapSize")
+            return used / 1024 / 1024 if used else None
+        except Exception:
+            return None
+
+    def is_healthy(self) -> bool:
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"브라우저 세션 {self.session_id} 종료 오류: {str(e)}")
+
+class DriverPool:
+    """장기 실행 헤드리스 브라우저 세션 풀
+
+    - acquire()로 빌리고 반납 시 상태 점검: 응답 없음, max_pages 초과, max_memory_mb 초과면 새 세션으로 교체
+    - warm_up(url)으로 미리 페이지를 열어 두면 첫 크롤링의 브라우저 기동/초기 로딩 비용이 사라짐
+    - 세션 수만큼 여러 계정/타임라인을 동시에 크롤링 가능
+    """
+
+    def __init__(self, size: int = 2, factory: Callable = create_chrome_driver,
+                 max_pages: int = 50, max_memory_mb: float = 1500):
+        self.size = size
+        self.factory = factory
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._closed = False
+        self.stats = {"created": 0, "recycled": 0, "unhealthy": 0, "acquired": 0}
+        for _ in range(size):
+            self._idle.put(self._create())
+
+    def _create(self) -> PooledDriver:
+        with self._lock:
+            self._next_id += 1
+            session_id = self._next_id
+        started = time.perf_counter()
+        session = PooledDriver(self.factory(), session_id)
+        self.stats["created"] += 1
+        logger.info(f"🌐 브라우저 세션 {session_id} 생성 ({time.perf_counter() - started:.1f}초)")
+        return session
+
+    def _replace(self, session: PooledDriver, reason: str) -> PooledDriver:
+        logger.info(f"♻️  브라우저 세션 {session.session_id} 교체: {reason}")
+        session.quit()
+        return self._create()
+
+    def warm_up(self, url: str):
+        """모든 유휴 세션에서 url을 미리 열어 둠"""
+        sessions = []
+        while not self._idle.empty():
+            sessions.append(self._idle.get_nowait())
+        for session in sessions:
+            try:
+                session.driver.get(url)
+                session.last_url = url
+            except Exception as e:
+                logger.warning(f"브라우저 세션 {session.session_id} 예열 실패: {str(e)}")
+            self._idle.put(session)
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """세션 대여 (유휴 세션이 없으면 timeout까지 대기)"""
+        if self._closed:
+            raise RuntimeError("이미 종료된 브라우저 풀입니다.")
+        session = self._idle.get(timeout=timeout)
+        if not session.is_healthy():
+            self.stats["unhealthy"] += 1
+            try:
+                session = self._replace(session, "응답 없음")
+            except Exception as e:
+                # 종료된 세션을 되돌려 풀 크기 유지 (다음 대여 때 상태 점검에서 다시 교체 시도)
+                logger.error(f"브라우저 세션 재생성 실패: {str(e)}")
+                self._idle.put(session)
+                raise
+        self.stats["acquired"] += 1
+        try:
+            yield session
+        finally:
+            session.pages += 1
+            self._release(session)
+
+    def _release(self, session: PooledDriver):
+        if self._closed:
+            session.quit()
+            return
+        reason = None
+        if not session.is_healthy():
+            self.stats["unhealthy"] += 1
+            reason = "응답 없음"
+        elif session.pages >= self.max_pages:
+            reason = f"{session.pages}페이지 사용"
+        else:
+            memory = session.memory_mb()
+            if memory is not None and memory > self.max_memory_mb:
+                reason = f"메모리 {memory:.0f}MB"
+        if reason:
+            self.stats["recycled"] += 1
+            try:
+                session = self._replace(session, reason)
+            except Exception as e:
+                # 새 세션 생성 실패 시 풀 크기를 유지하기 위해 다음 대여 때 다시 시도
+                logger.error(f"브라우저 세션 재생성 실패: {str(e)}")
+        self._idle.put(session)
+
+    def close(self):
+        self._closed = True
+        while not self._idle.empty():
+            self._idle.get_nowait().quit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def crawl_accounts(pool: DriverPool, accounts: List[str], max_scrolls: int = 5,
+                   batch_size: int = 20, use_state: bool = True) -> dict:
+    """여러 계정 타임라인을 풀 크기만큼 동시에 크롤링 (계정별 진행 상태 사용)"""
+    from concurrent.futures import ThreadPoolExecutor
+    from .crowling import TruthSocialScraper
+    from .crawl_state import CrawlStateStore
+
+    def crawl(account):
+        with pool.acquire() as session:
+            started = time.perf_counter()
+            scraper = TruthSocialScraper(driver=session.driver, account=account)
+            store = CrawlStateStore(f"truth_social:@{account}") if use_state else None
+            posts = scraper.get_trump_posts(max_scrolls=max_scrolls, state_store=store, batch_size=batch_size)
+            if not use_state:
+                scraper.save_to_db(posts)
+            return account, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        return dict(executor.map(crawl, accounts))
@@ -0,0 +1,61 @@
+# 트럼프 관련 미국 + 한국 ETF 목록 (심볼: 설명)
+ETF_SYMBOLS = {
+    # === 미국 ETF ===
+    # 주요 지수 ETF
+    'SPY': 'S&P 500 ETF',
+    'QQQ': 'NASDAQ 100 ETF',
+    'DIA': 'Dow Jones ETF',
+    'IWM': '러셀 2000 소형주 ETF',
+    'VTI': '전체 주식시장 ETF',
+
+    # 금융 섹터 (트럼프 정책에 민감)
+    'XLF': '금융 섹터 ETF',
+    'KBE': '은행업 ETF',
+    'KRE': '지역은행 ETF',
+
+    # 에너지 섹터 (석유, 가스 정책)
+    'XLE': '에너지 섹터 ETF',
+    'XOP': '석유가스 탐사개발 ETF',
+    'USO': '원유 ETF',
+
+    # 기술 섹터 (규제 정책 영향)
+    'XLK': '기술 섹터 ETF',
+    'SOXX': '반도체 ETF',
+    'ARKK': '혁신기술 ETF',
+
+    # 헬스케어 (의료정책)
+    'XLV': '헬스케어 섹터 ETF',
+    'IBB': '바이오테크 ETF',
+
+    # 인프라/산업 (인프라 정책)
+    'XLI': '산업 섹터 ETF',
+    'IYT': '교통 ETF',
+    'ITB': '건설 ETF',
+
+    # 방위산업 (국방 정책)
+    'ITA': '항공우주/방위 ETF',
+    'PPA': '항공우주/방위 ETF',
+
+    # 무역/관세 관련
+    'EWJ': '일본 ETF',
+    'FXI': '중국 ETF',
+    'EWG': '독일 ETF',
+    'EWC': '캐나다 ETF',
+
+    # 금리/통화 관련
+    'TLT': '장기 국채 ETF',
+    'UUP': '달러 강세 ETF',
+    'GLD': '금 ETF',
+
+    # 소비재 (경제정책)
+    'XLY': '소비재 ETF',
+    'XLP': '필수소비재 ETF',
+    'XRT': '소매업 ETF',
+
+    # === 한국 ETF ===
+    # 한국 주요 지수
+    '069500.KS': 'KODEX 200 ETF',
+    '102110.KS': 'TIGER 200 ETF',
+    '226490.KS': 'KODEX 코스닥150 ETF',
+    '229200.KS': 'KODEX 코스닥150선물인버스',
+}
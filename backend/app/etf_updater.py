@@ -17,74 +17,17 @@ sys.path.append(str(backend_dir))
 
 from app.database import Base, engine, get_db
 from app.model import ETFPrice
+from app.etf_universe import ETF_SYMBOLS
+from app.market_calendar import needs_refresh, group_symbols_by_calendar
+from app.bulk_insert import bulk_insert_prices, PRICE_COLUMNS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ETFPriceUpdater:
     def __init__(self):
-        # 트럼프 관련 미국 + 한국 ETF들
-        self.etf_symbols = {
-            # === 미국 ETF ===
-            # 주요 지수 ETF
-            'SPY': 'S&P 500 ETF',
-            'QQQ': 'NASDAQ 100 ETF', 
-            'DIA': 'Dow Jones ETF',
-            'IWM': '러셀 2000 소형주 ETF',
-            'VTI': '전체 주식시장 ETF',
-            
-            # 금융 섹터 (트럼프 정책에 민감)
-            'XLF': '금융 섹터 ETF',
-            'KBE': '은행업 ETF',
-            'KRE': '지역은행 ETF',
-            
-            # 에너지 섹터 (석유, 가스 정책)
-            'XLE': '에너지 섹터 ETF',
-            'XOP': '석유가스 탐사개발 ETF',
-            'USO': '원유 ETF',
-            
-            # 기술 섹터 (규제 정책 영향)
-            'XLK': '기술 섹터 ETF',
-            'SOXX': '반도체 ETF',
-            'ARKK': '혁신기술 ETF',
-            
-            # 헬스케어 (의료정책)
-            'XLV': '헬스케어 섹터 ETF',
-            'IBB': '바이오테크 ETF',
-            
-            # 인프라/산업 (인프라 정책)
-            'XLI': '산업 섹터 ETF',
-            'IYT': '교통 ETF',
-            'ITB': '건설 ETF',
-            
-            # 방위산업 (국방 정책)
-            'ITA': '항공우주/방위 ETF',
-            'PPA': '항공우주/방위 ETF',
-            
-            # 무역/관세 관련
-            'EWJ': '일본 ETF',
-            'FXI': '중국 ETF',
-            'EWG': '독일 ETF',
-            'EWC': '캐나다 ETF',
-            
-            # 금리/통화 관련
-            'TLT': '장기 국채 ETF',
-            'UUP': '달러 강세 ETF',
-            'GLD': '금 ETF',
-            
-            # 소비재 (경제정책)
-            'XLY': '소비재 ETF',
-            'XLP': '필수소비재 ETF',
-            'XRT': '소매업 ETF',
-            
-            # === 한국 ETF ===
-            # 한국 주요 지수
-            '069500.KS': 'KODEX 200 ETF',
-            '102110.KS': 'TIGER 200 ETF',
-            '226490.KS': 'KODEX 코스닥150 ETF',
-            '229200.KS': 'KODEX 코스닥150선물인버스',
-            
-        }
+        # 트럼프 관련 미국 + 한국 ETF들 (etf_universe.ETF_SYMBOLS)
+        self.etf_symbols = dict(ETF_SYMBOLS)
 
     def reset_etf_table(self):
         """etf_prices 테이블만 삭제하고 다시 생성"""
@@ -185,8 +128,25 @@ class ETFPriceUpdater:
             logger.error(f"{symbol} 데이터 가져오기 오류: {str(e)}")
             return None
     
-    def update_all_etfs(self):
-        """모든 ETF 가격 정보 업데이트"""
+    def symbols_to_refresh(self, db, now=None):
+        """장중이거나 마지막 폐장 이후 시세가 없는 심볼만 선택 (휴장 시장 건너뜀)"""
+        from sqlalchemy import func
+
+        last_updated = dict(
+            db.query(ETFPrice.symbol, func.max(ETFPrice.timestamp)).group_by(ETFPrice.symbol).all()
+        )
+        due = {
+            symbol: description for symbol, description in self.etf_symbols.items()
+            if needs_refresh(symbol, last_updated.get(symbol), now)
+        }
+        for market, symbols in group_symbols_by_calendar(self.etf_symbols).items():
+            skipped = [s for s in symbols if s not in due]
+            if skipped:
+                logger.info(f"⏸️  {market} 휴장 중: {len(skipped)}개 종목 건너뜀 (마지막 종가 저장됨)")
+        return due
+
+    def update_all_etfs(self, market_hours_only=True):
+        """모든 ETF 가격 정보 업데이트 (market_hours_only이면 휴장 시장은 건너뜀)"""
         logger.info("미국 + 한국 ETF 가격 업데이트 시작...")
         
         # 테이블 구조 먼저 확인
@@ -199,28 +159,20 @@ class ETFPriceUpdater:
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_db)
         db = SessionLocal()
         
-        updated_count = 0
+        # 조회 결과를 컬럼별로 모아 ORM 객체 없이 한 번에 저장
+        prices = {column: [] for column in PRICE_COLUMNS}
         
         try:
-            for symbol, description in self.etf_symbols.items():
+            symbols = self.symbols_to_refresh(db) if market_hours_only else self.etf_symbols
+            for symbol, description in symbols.items():
                 logger.info(f"{symbol} ({description}) 업데이트 중...")
                 
                 etf_data = self.get_etf_data(symbol)
                 if etf_data is None:
                     continue
                 
-                # 데이터베이스에 저장 (description 포함)
-                etf_price = ETFPrice(
-                    symbol=etf_data['symbol'],
-                    description=etf_data['description'],
-                    price=etf_data['price'],
-                    change_percent=etf_data['change_percent'],
-                    volume=etf_data['volume'],
-                    timestamp=etf_data['timestamp']
-                )
-                
-                db.add(etf_price)
-                updated_count += 1
+                for column in PRICE_COLUMNS:
+                    prices[column].append(etf_data[column])
                 
                 # 한국/미국 구분 표시
                 market_flag = "🇰🇷" if ".KS" in symbol else "🇺🇸"
@@ -232,6 +184,7 @@ class ETFPriceUpdater:
                 else:
                     logger.info(f"{market_flag} {symbol}: ${etf_data['price']:.2f} ({etf_data['change_percent']:+.2f}%) {change_indicator}")
             
+            updated_count = bulk_insert_prices(db, prices)
             db.commit()
             logger.info(f"ETF 가격 업데이트 완료: {updated_count}개 종목")
             
@@ -242,6 +195,26 @@ class ETFPriceUpdater:
         finally:
             db.close()
     
+    def stream_prices(self, provider=None, interval=5.0, commit_interval=30.0, duration=None):
+        """장기 실행 모드: 일정 간격으로 시세를 폴링해 변경분만 일괄 저장"""
+        from app.quote_stream import QuoteStreamer, YFinanceQuoteProvider
+
+        engine_db = create_engine("sqlite:///./taco_trading.db")
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_db)
+
+        streamer = QuoteStreamer(
+            provider or YFinanceQuoteProvider(),
+            self.etf_symbols,
+            session_factory=SessionLocal,
+            interval=interval,
+            commit_interval=commit_interval
+        )
+        try:
+            streamer.run(duration=duration)
+        except KeyboardInterrupt:
+            logger.info("사용자 중단 요청으로 스트리밍을 종료합니다.")
+        return streamer.stats
+
     def get_latest_prices(self):
         """최신 ETF 가격 조회"""
         engine_db = create_engine("sqlite:///./taco_trading.db")
@@ -305,6 +278,12 @@ if __name__ == "__main__":
     parser.add_argument('--check', action='store_true', help='테이블 구조 확인')
     parser.add_argument('--update', action='store_true', help='ETF 가격 업데이트')
     parser.add_argument('--show', action='store_true', help='현재 가격 조회')
+    parser.add_argument('--stream', action='store_true', help='실시간 시세 스트리밍 (장기 실행)')
+    parser.add_argument('--interval', type=float, default=5.0, help='스트리밍 폴링 간격(초)')
+    parser.add_argument('--commit-interval', type=float, default=30.0, help='스트리밍 일괄 저장 간격(초)')
+    parser.add_argument('--duration', type=float, default=None, help='스트리밍 실행 시간(초, 기본: 무제한)')
+    parser.add_argument('--simulate', action='store_true', help='로컬 시뮬레이션 시세 사용')
+    parser.add_argument('--all-markets', action='store_true', help='휴장 여부와 관계없이 모든 종목 조회')
     
     args = parser.parse_args()
     
@@ -315,10 +294,14 @@ if __name__ == "__main__":
     elif args.check:
         updater.check_table_structure()
     elif args.update:
-        updater.update_all_etfs()
+        updater.update_all_etfs(market_hours_only=not args.all_markets)
     elif args.show:
         display_current_prices()
+    elif args.stream:
+        from app.quote_stream import SimulatedQuoteProvider
+        provider = SimulatedQuoteProvider() if args.simulate else None
+        updater.stream_prices(provider, args.interval, args.commit_interval, args.duration)
     else:
         # 기본 동작: 업데이트 후 조회
-        updater.update_all_etfs()
+        updater.update_all_etfs(market_hours_only=not args.all_markets)
         display_current_prices()
\ No newline at end of file
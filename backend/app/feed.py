@@ -0,0 +1,120 @@
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from .model import TrumpStatement, TACOSignal
+
+# 필요한 컬럼만 튜플로 조회해 ORM 객체 생성 비용을 줄임
+SIGNAL_COLUMNS = (
+    TACOSignal.id,
+    TACOSignal.signal_type,
+    TACOSignal.confidence,
+    TACOSignal.affected_etfs,
+    TACOSignal.created_at,
+    TACOSignal.entry_timing,
+    TrumpStatement.original_text,
+    TrumpStatement.korean_translation,
+    TrumpStatement.keywords,
+    TrumpStatement.posted_at,
+)
+
+FEED_COLUMNS = (
+    TrumpStatement.id,
+    TrumpStatement.original_text,
+    TrumpStatement.korean_translation,
+    TrumpStatement.keywords,
+    TrumpStatement.taco_probability,
+    TrumpStatement.source,
+    TrumpStatement.posted_at,
+)
+
+def format_time_ago(posted_at: datetime, now: datetime) -> str:
+    """게시 시각을 'n일 전' 형태의 상대 시간으로 변환"""
+    if posted_at is None:
+        return ""
+    time_diff = now - posted_at
+    if time_diff.days > 0:
+        return f"{time_diff.days}일 전"
+    if time_diff.seconds > 3600:
+        return f"{time_diff.seconds // 3600}시간 전"
+    if time_diff.seconds > 60:
+        return f"{time_diff.seconds // 60}분 전"
+    return "방금 전"
+
+def build_latest_signals(db: Session, limit: int = 10) -> dict:
+    """최신 TACO 신호 응답 데이터 생성 (발언과 한 번의 조인으로 조회)"""
+    rows = db.query(*SIGNAL_COLUMNS).join(
+        TrumpStatement, TrumpStatement.id == TACOSignal.statement_id
+    ).filter(
+        TACOSignal.is_active == True
+    ).order_by(TACOSignal.created_at.desc()).limit(limit).all()
+
+    # datetime 값은 orjson이 ISO 8601 문자열로 직렬화
+    return {"signals": [
+        {
+            "id": row.id,
+            "signal_type": row.signal_type,
+            "confidence": row.confidence,
+            "statement": {
+                "original": row.original_text,
+                "korean": row.korean_translation,
+                "keywords": row.keywords or [],
+                "posted_at": row.posted_at
+            },
+            "affected_etfs": row.affected_etfs,
+            "created_at": row.created_at,
+            "entry_timing": row.entry_timing
+        }
+        for row in rows
+    ]}
+
+def build_trump_feed(db: Session, limit: int = 20) -> dict:
+    """트럼프 발언 피드 응답 데이터 생성"""
+    rows = db.query(*FEED_COLUMNS).filter(
+        TrumpStatement.is_analyzed == True
+    ).order_by(TrumpStatement.posted_at.desc()).limit(limit).all()
+
+    now = datetime.now()
+    return {"statements": [
+        {
+            "id": row.id,
+            "original_text": row.original_text,
+            "korean_translation": row.korean_translation,
+            "keywords": row.keywords or [],
+            "taco_probability": row.taco_probability,
+            "source": row.source,
+            "posted_at": row.posted_at,
+            "time_ago": format_time_ago(row.posted_at, now)
+        }
+        for row in rows
+    ]}
+
+def build_performance(db: Session, portfolio=None) -> dict:
+    """TACO 성과 데이터 (모의 투자 포트폴리오 기준, 없으면 DB 신호/가격 이력으로 재구성)"""
+    if portfolio is None:
+        from .paper_trading import PaperPortfolio
+        portfolio = PaperPortfolio()
+        portfolio.refresh(db=db)
+    return portfolio.performance()
+
+# 응답 내용이 바뀌었는지 판단하는 (최신 행 시각, 행 수, ...) - HTTP 캐시 검증자로 사용
+# 스트리밍 분석은 신호를 먼저 저장하고 세부 분석/번역을 나중에 채우므로 채워진 발언 수도 포함
+def latest_signals_version(db: Session):
+    return db.query(
+        func.max(TACOSignal.created_at), func.count(TACOSignal.id),
+        func.count(TrumpStatement.trade_relevance), func.count(TrumpStatement.korean_translation)
+    ).join(
+        TrumpStatement, TrumpStatement.id == TACOSignal.statement_id
+    ).filter(
+        TACOSignal.is_active == True
+    ).one()
+
+def trump_feed_version(db: Session):
+    return db.query(
+        func.max(TrumpStatement.created_at), func.count(TrumpStatement.id),
+        func.count(TrumpStatement.trade_relevance), func.count(TrumpStatement.korean_translation)
+    ).filter(
+        TrumpStatement.is_analyzed == True
+    ).one()
+
+def performance_version(db: Session):
+    return db.query(func.max(TACOSignal.created_at), func.count(TACOSignal.id)).one()
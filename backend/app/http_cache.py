@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 협상
+    brotli = None
+
+# 이 크기 미만의 응답은 압축 이득보다 CPU 비용이 커서 그대로 전송
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+def choose_encoding(accept_encoding: str, available: Optional[Iterable[str]] = None) -> Optional[str]:
+    """Accept-Encoding에서 사용할 인코딩 선택 (br 우선, q=0은 제외)
+
+    available: 제공 가능한 인코딩 (기본값은 이 프로세스에서 압축 가능한 인코딩)
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+    if available is None:
+        available = ("br", "gzip") if brotli else ("gzip",)
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, 0) > 0:
+            return encoding
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+class CompressionMiddleware:
+    """JSON/텍스트 응답을 gzip/brotli로 압축하는 ASGI 미들웨어
+
+    이미 Content-Encoding이 있는 응답(사전 압축 스냅샷 등)과 작은 응답은 그대로 통과
+    """
+
+    def __init__(self, app, minimum_size: int = MIN_COMPRESS_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        # HEAD는 본문이 없으므로 그대로 통과 (빈 본문 압축 크기로 content-length를 바꾸지 않도록)
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict((k.decode().lower(), v.decode()) for k, v in scope.get("headers", []))
+        encoding = choose_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        body_parts = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                response_headers = dict((k.decode().lower(), v.decode()) for k, v in message.get("headers", []))
+                content_type = response_headers.get("content-type", "")
+                if "content-encoding" in response_headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough:
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            raw_headers = [(k, v) for k, v in start_message.get("headers", []) if k.lower() != b"content-length"]
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                raw_headers.append((b"content-encoding", encoding.encode()))
+            raw_headers.append((b"vary", b"Accept-Encoding"))
+            raw_headers.append((b"content-length", str(len(body)).encode()))
+            await send({**start_message, "headers": raw_headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+def conditional_response(request: Request, response: Response, last_modified: Optional[datetime],
+                         *validators, max_age: int = 30) -> Optional[Response]:
+    """최신 행 시각으로 캐시 헤더를 설정하고, 조건부 요청이 일치하면 304 응답 반환
+
+    validators: 최신 시각 외에 응답 내용을 결정하는 값 (쿼리 파라미터, 행 수 등)
+    If-Modified-Since는 시각만 비교하므로 validators가 있으면 무시하고 ETag로만 304 판단
+    """
+    key = "|".join([last_modified.isoformat() if last_modified else ""] + [str(v) for v in validators])
+    etag = f'W/"{hashlib.sha1(f"{request.url.path}?{request.url.query}|{key}".encode()).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}, must-revalidate"}
+    if last_modified:
+        headers["Last-Modified"] = _http_date(last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+    elif last_modified and not validators and request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+            current = parsedate_to_datetime(headers["Last-Modified"])
+            if current <= since:
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    response.headers.update(headers)
+    return None
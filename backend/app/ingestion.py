@@ -0,0 +1,408 @@
+import os
+import re
+import html
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from .database import SessionLocal
+from .crawl_state import CrawlStateStore
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "TacoTrading-Ingestion/1.0"
+# 실패 후 재시도 대기: 기본 간격에서 시작해 연속 실패마다 두 배 (최대 MAX_BACKOFF)
+MAX_BACKOFF = 3600.0
+
+class RateLimited(Exception):
+    """소스가 429로 응답함 (retry_after초 뒤 재시도)"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"rate limited, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+class RateLimiter:
+    """period초 동안 calls회까지 허용하는 슬라이딩 창 제한 (API 할당량 단위와 같음)
+
+    한도에 닿으면 가장 오래된 호출이 창에서 빠질 때까지 호출한 스레드만 대기
+    """
+
+    def __init__(self, calls: int, period: float):
+        self.calls = calls
+        self.period = period
+        self._times = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._times and now - self._times[0] >= self.period:
+                    self._times.popleft()
+                if len(self._times) < self.calls:
+                    self._times.append(now)
+                    return
+                wait = self.period - (now - self._times[0])
+            time.sleep(wait)
+
+_TAG = re.compile(r"<[^>]+>")
+_BREAK = re.compile(r"<br\s*/?>|</p>", re.IGNORECASE)
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+
+def clean_text(text: Optional[str]) -> str:
+    """HTML 태그/엔티티 제거, 공백 정리 (소스별 본문을 TrumpStatement.original_text 형식으로)"""
+    if not text:
+        return ""
+    text = html.unescape(_TAG.sub("", _BREAK.sub("\n", text)))
+    lines = [_SPACES.sub(" ", line).strip() for line in text.split("\n")]
+    return "\n".join(line for line in lines if line)
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+    """ISO 8601 시각 -> naive UTC (DB의 다른 시각 컬럼과 같은 형식)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+class Connector:
+    """수집 소스 공통 인터페이스
+
+    fetch(state)는 워터마크(CrawlState: newest_post_id/newest_posted_at) 이후 항목을
+    {'content', 'timestamp', 'post_id', 'source'} 형식(최신순)으로, 이전 워터마크까지 빠짐없이 받았는지와 함께 반환
+    (max_pages나 결과 한도에서 멈추면 False -> 최신 경계를 옮기지 않아 건너뛴 구간이 남지 않음)
+    HTTP 호출은 get()을 거치므로 소스별 호출 한도가 적용되고, base_url만 바꾸면 로컬 스텁으로 확인 가능
+    """
+    name = "connector"
+    default_base_url = ""
+    default_interval = 300.0
+    default_rate_limit = (60, 60.0)
+
+    def __init__(self, base_url: Optional[str] = None, interval: Optional[float] = None,
+                 rate_limit: Optional[Tuple[int, float]] = None, max_pages: int = 10, timeout: float = 10.0):
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.interval = interval or self.default_interval
+        self.limiter = RateLimiter(*(rate_limit or self.default_rate_limit))
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+
+    @property
+    def source(self) -> str:
+        """CrawlState 키 (소스별 워터마크)"""
+        return self.name
+
+    def get(self, path: str, params: Optional[dict] = None, allow_status: Tuple[int, ...] = ()) -> dict:
+        self.limiter.acquire()
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        if response.status_code == 429:
+            raise RateLimited(float(response.headers.get("Retry-After") or self.interval))
+        if response.status_code not in allow_status:
+            response.raise_for_status()
+        return response.json()
+
+    def fetch(self, state: dict) -> Tuple[List[dict], bool]:
+        raise NotImplementedError
+
+class NewsAPIConnector(Connector):
+    """NewsAPI /v2/everything 전체 페이지 수집 (publishedAt 최신순, 워터마크 시각까지)"""
+    name = "newsapi"
+    default_base_url = "https://newsapi.org"
+    default_interval = 900.0
+    default_rate_limit = (100, 86400.0)  # 개발자 요금제: 하루 100회
+    page_size = 100
+
+    def __init__(self, api_key: str, query: str = "Trump", days: int = 7, **kwargs):
+        super().__init__(**kwargs)
+        self.query = query
+        self.days = days
+        self.session.headers["X-Api-Key"] = api_key
+
+    @property
+    def source(self) -> str:
+        return f"{self.name}:{self.query}"
+
+    def fetch_articles(self, since: Optional[datetime] = None) -> List[dict]:
+        """since 이후 기사를 마지막 페이지(또는 max_pages)까지 수집 (NewsAPI 원본 형식)"""
+        return self.fetch_pages(since)[0]
+
+    def fetch_pages(self, since: Optional[datetime] = None) -> Tuple[List[dict], bool]:
+        """fetch_articles + 마지막 페이지까지 받았는지 (max_pages/결과 한도에서 멈추면 False)"""
+        since = since or datetime.utcnow() - timedelta(days=self.days)
+        articles = []
+        for page in range(1, self.max_pages + 1):
+            data = self.get("/v2/everything", {
+                "q": self.query,
+                "from": since.strftime("%Y-%m-%dT%H:%M:%S"),
+                "sortBy": "publishedAt",
+                "language": "en",
+                "pageSize": self.page_size,
+                "page": page,
+            }, allow_status=(426,))
+            if data.get("status") != "ok":
+                # 요금제 결과 한도(maximumResultsReached)면 받은 데까지만 사용
+                if data.get("code") != "maximumResultsReached":
+                    raise RuntimeError(f"NewsAPI 오류: {data.get('code')} {data.get('message')}")
+                return articles, False
+            batch = data.get("articles") or []
+            articles.extend(batch)
+            if not batch or page * self.page_size >= data.get("totalResults", 0):
+                return articles, True
+        return articles, False
+
+    def fetch(self, state: dict) -> Tuple[List[dict], bool]:
+        watermark = state.get("newest_posted_at")
+        articles, caught_up = self.fetch_pages(watermark)
+        posts = []
+        for article in articles:
+            posted_at = parse_time(article.get("publishedAt"))
+            content = clean_text(article.get("description"))
+            if not content or posted_at is None or (watermark and posted_at < watermark):
+                continue
+            posts.append({
+                "content": content,
+                "timestamp": posted_at,
+                "post_id": None,
+                "source": (article.get("source") or {}).get("name") or "Unknown",
+            })
+        return posts, caught_up
+
+class XConnector(Connector):
+    """X(트위터) API v2 사용자 타임라인 (since_id 워터마크, next_token 페이지 넘김, 리트윗/답글 제외)"""
+    name = "x"
+    default_base_url = "https://api.twitter.com"
+    default_interval = 300.0
+    default_rate_limit = (5, 900.0)
+    page_size = 100
+
+    def __init__(self, bearer_token: str, username: str = "realDonaldTrump", **kwargs):
+        super().__init__(**kwargs)
+        self.username = username
+        self.user_id = None
+        self.session.headers["Authorization"] = f"Bearer {bearer_token}"
+
+    @property
+    def source(self) -> str:
+        return f"{self.name}:@{self.username}"
+
+    def fetch(self, state: dict) -> Tuple[List[dict], bool]:
+        if self.user_id is None:
+            self.user_id = self.get(f"/2/users/by/username/{self.username}")["data"]["id"]
+        params = {"max_results": self.page_size, "tweet.fields": "created_at", "exclude": "retweets,replies"}
+        if state.get("newest_post_id"):
+            params["since_id"] = state["newest_post_id"]
+        posts = []
+        for _ in range(self.max_pages):
+            data = self.get(f"/2/users/{self.user_id}/tweets", params)
+            for tweet in data.get("data") or []:
+                content = clean_text(tweet.get("text"))
+                posted_at = parse_time(tweet.get("created_at"))
+                if content and posted_at:
+                    posts.append({"content": content, "timestamp": posted_at, "post_id": tweet["id"],
+                                  "source": f"X (@{self.username})"})
+            next_token = (data.get("meta") or {}).get("next_token")
+            if not next_token:
+                return posts, True
+            params["pagination_token"] = next_token
+        return posts, False
+
+class TruthSocialConnector(Connector):
+    """Truth Social 계정 게시글 (Mastodon 호환 API: since_id 워터마크, max_id로 과거 페이지)
+
+    Cloudflare 등으로 API가 막힌 환경에서는 기존 selenium 크롤러(crowling.py)를 사용
+    """
+    name = "truth_social_api"
+    default_base_url = "https://truthsocial.com"
+    default_interval = 60.0
+    default_rate_limit = (30, 60.0)
+    page_size = 40
+
+    def __init__(self, account: str = "realDonaldTrump", **kwargs):
+        super().__init__(**kwargs)
+        self.account = account
+        self.account_id = None
+
+    @property
+    def source(self) -> str:
+        return f"{self.name}:@{self.account}"
+
+    def fetch(self, state: dict) -> Tuple[List[dict], bool]:
+        if self.account_id is None:
+            self.account_id = self.get("/api/v1/accounts/lookup", {"acct": self.account})["id"]
+        params = {"limit": self.page_size, "exclude_replies": "true"}
+        if state.get("newest_post_id"):
+            params["since_id"] = state["newest_post_id"]
+        posts = []
+        for _ in range(self.max_pages):
+            statuses = self.get(f"/api/v1/accounts/{self.account_id}/statuses", params)
+            for status in statuses:
+                content = clean_text(status.get("content"))
+                posted_at = parse_time(status.get("created_at"))
+                if content and posted_at and not status.get("reblog"):
+                    posts.append({"content": content, "timestamp": posted_at, "post_id": status["id"],
+                                  "source": f"Truth Social (@{self.account})"})
+            if len(statuses) < self.page_size:
+                return posts, True
+            params["max_id"] = statuses[-1]["id"]
+        return posts, False
+
+CONNECTORS = {
+    "newsapi": NewsAPIConnector,
+    "x": XConnector,
+    "truth_social_api": TruthSocialConnector,
+}
+
+def build_connectors(names: Optional[List[str]] = None) -> List[Connector]:
+    """환경 변수로 커넥터 구성 (names가 없으면 자격 증명이 있는 소스만)"""
+    news_key, x_token = os.getenv("NEWSAPI_KEY"), os.getenv("X_BEARER_TOKEN")
+    if names is None:
+        names = [name for name, enabled in (("newsapi", news_key), ("x", x_token)) if enabled]
+    connectors = []
+    for name in names:
+        base_url = os.getenv(f"{name.upper()}_BASE_URL")
+        if name == "newsapi":
+            if not news_key:
+                logger.warning("NEWSAPI_KEY가 없어 NewsAPI 수집을 건너뜁니다.")
+                continue
+            connectors.append(NewsAPIConnector(news_key, query=os.getenv("NEWSAPI_QUERY", "Trump"), base_url=base_url))
+        elif name == "x":
+            if not x_token:
+                logger.warning("X_BEARER_TOKEN이 없어 X 수집을 건너뜁니다.")
+                continue
+            connectors.append(XConnector(x_token, username=os.getenv("X_USERNAME", "realDonaldTrump"), base_url=base_url))
+        elif name == "truth_social_api":
+            connectors.append(TruthSocialConnector(os.getenv("TRUTH_SOCIAL_ACCOUNT", "realDonaldTrump"), base_url=base_url))
+        else:
+            raise ValueError(f"지원하는 소스: {', '.join(CONNECTORS)}")
+    return connectors
+
+class IngestionRunner:
+    """여러 소스를 asyncio로 동시에 폴링 (커넥터별 독립 루프/간격/백오프)
+
+    커넥터 호출(requests)은 스레드에서 실행되므로 느리거나 호출 한도에 걸린 소스가 다른 소스를 늦추지 않음
+    가져온 항목과 워터마크는 CrawlStateStore로 한 트랜잭션에 저장 -> 실패한 폴링은 워터마크를 옮기지 않음
+    """
+
+    def __init__(self, connectors: List[Connector], session_factory=SessionLocal):
+        self.connectors = connectors
+        self.session_factory = session_factory
+        self.stats: Dict[str, dict] = {
+            c.source: {"polls": 0, "fetched": 0, "saved": 0, "errors": 0, "last_error": None,
+                       "last_poll_at": None, "last_duration": None}
+            for c in connectors
+        }
+        self._loop = None
+        self._stop_event = None
+        self._thread = None
+
+    def poll(self, connector: Connector) -> int:
+        """커넥터 한 번 수집 + 저장 (동기), 새로 저장한 발언 수 반환"""
+        started = time.monotonic()
+        store = CrawlStateStore(connector.source, self.session_factory)
+        posts, caught_up = connector.fetch(store.state)
+        posts = sorted(posts, key=lambda post: post["timestamp"], reverse=True)
+        # 이전 워터마크까지 다 받았을 때만 최신 경계를 옮김 (max_pages/결과 한도에서 멈추면 그대로 두고 다음 폴링에서 다시 수집)
+        saved = store.flush(posts, caught_up=caught_up) if posts else 0
+        if not caught_up:
+            logger.warning(f"{connector.source}: 이전 워터마크까지 수집하지 못해 최신 경계를 유지합니다 (max_pages={connector.max_pages})")
+        stats = self.stats[connector.source]
+        stats["polls"] += 1
+        stats["fetched"] += len(posts)
+        stats["saved"] += saved
+        stats["last_poll_at"] = datetime.utcnow()
+        stats["last_duration"] = round(time.monotonic() - started, 3)
+        return saved
+
+    async def poll_async(self, connector: Connector) -> Optional[int]:
+        """스레드에서 poll 실행, 오류는 소스별 통계에 기록하고 None 반환 (RateLimited는 그대로 전달)"""
+        try:
+            return await asyncio.to_thread(self.poll, connector)
+        except RateLimited:
+            raise
+        except Exception as e:
+            stats = self.stats[connector.source]
+            stats["errors"] += 1
+            stats["last_error"] = str(e)
+            logger.error(f"{connector.source} 수집 오류: {str(e)}")
+            return None
+
+    async def run_once(self) -> Dict[str, Optional[int]]:
+        """모든 소스를 동시에 한 번씩 수집"""
+        async def one(connector):
+            try:
+                return await self.poll_async(connector)
+            except RateLimited as e:
+                logger.warning(f"{connector.source} 호출 한도 초과: {e.retry_after:.0f}초 뒤 재시도 필요")
+                return None
+
+        results = await asyncio.gather(*(one(c) for c in self.connectors))
+        return {c.source: saved for c, saved in zip(self.connectors, results)}
+
+    async def _connector_loop(self, connector: Connector):
+        failures = 0
+        while not self._stop_event.is_set():
+            try:
+                saved = await self.poll_async(connector)
+                failures = failures + 1 if saved is None else 0
+                delay = connector.interval if saved is not None else min(connector.interval * 2 ** failures, MAX_BACKOFF)
+                if saved:
+                    logger.info(f"📰 {connector.source}: 새 발언 {saved}개")
+            except RateLimited as e:
+                delay = max(connector.interval, e.retry_after)
+                logger.warning(f"{connector.source} 호출 한도 초과: {delay:.0f}초 대기")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        """커넥터마다 독립 루프를 돌며 stop()까지 수집"""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        await asyncio.gather(*(self._connector_loop(c) for c in self.connectors))
+
+    def start(self):
+        """백그라운드 스레드의 이벤트 루프에서 run() 실행"""
+        self._thread = threading.Thread(target=asyncio.run, args=(self.run(),), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        if self._loop and self._stop_event:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+        if self._thread:
+            self._thread.join(timeout)
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+    from pathlib import Path
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from app.database import init_db
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='다중 소스 발언 수집 (NewsAPI, X, Truth Social API)')
+    parser.add_argument('--sources', type=str, help=f'수집할 소스 (쉼표 구분, 기본: 자격 증명이 있는 소스) - {", ".join(CONNECTORS)}')
+    parser.add_argument('--watch', action='store_true', help='한 번 수집 후 종료하지 않고 소스별 간격으로 계속 수집')
+    args = parser.parse_args()
+
+    init_db()
+    runner = IngestionRunner(build_connectors(args.sources.split(",") if args.sources else None))
+    if not runner.connectors:
+        logger.warning("수집할 소스가 없습니다. (NEWSAPI_KEY / X_BEARER_TOKEN 또는 --sources)")
+    elif args.watch:
+        try:
+            asyncio.run(runner.run())
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(asyncio.run(runner.run_once()))
@@ -1,13 +1,41 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, FileResponse, Response
 from sqlalchemy.orm import Session
-from .database import get_db, init_db
-from .model import TrumpStatement, TACOSignal, ETFPrice
+from .database import get_db, init_db, SessionLocal
+from .model import TrumpStatement, TACOSignal, ETFPrice, AlertSubscriber, PaperTrade
+from .feed import (
+    build_latest_signals, build_trump_feed, build_performance,
+    latest_signals_version, trump_feed_version, performance_version
+)
+from .http_cache import CompressionMiddleware, conditional_response
+from sqlalchemy import func
+from .search import search_statements
+from .signal_index import get_symbol_signals, get_symbol_exposure
+from .quote_stream import QuoteStreamer, SimulatedQuoteProvider, YFinanceQuoteProvider, latest_quotes, load_latest_prices
+from .etf_universe import ETF_SYMBOLS
+from .signal_engine import SignalDecayEngine
+from .snapshot_publisher import resolve_snapshot_file
+from .shared_cache import SharedSnapshotCache, SharedSnapshotPublisher
+from .paper_trading import PaperPortfolio, load_signal_pnl
+from .rolling_stats import RollingStatsService, select_stats
+from .price_reaction import ReactionUpdater, get_statement_reaction
+from .price_series import get_price_series, series_version, DEFAULT_BUDGET
+from .alerts import (
+    AlertDispatcher, AlertSubscriberIn, create_subscriber, subscriber_dict, deactivate_subscriber, check_admin_token
+)
+import threading
+from typing import Optional
+import os
 import random
 from datetime import datetime, timedelta
 import json
 
-app = FastAPI(title="🌮 TACO Trading API", version="1.0.0")
+app = FastAPI(
+    title="🌮 TACO Trading API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # CORS 설정
 app.add_middleware(
@@ -17,11 +45,141 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli 응답 압축 (1KB 이상 JSON)
+app.add_middleware(CompressionMiddleware)
+
+# API 프로세스 내 시세 스트리머 (QUOTE_STREAM_INTERVAL 설정 시 시작)
+quote_streamer = None
+
+# 신호 감쇠/만료 엔진 (심볼별 순노출도를 메모리에서 유지)
+signal_engine = SignalDecayEngine(half_life_hours=float(os.getenv("SIGNAL_HALF_LIFE_HOURS", "12")))
+
+# 멀티 워커 모드의 프로세스 간 공유 캐시 (serve.py가 SHARED_CACHE_PATH 지정)
+# 리더 워커 하나만 백그라운드 작업을 실행하고 스냅샷을 기록, 나머지 워커는 읽기만 함
+shared_cache = SharedSnapshotCache(os.environ["SHARED_CACHE_PATH"]) if os.getenv("SHARED_CACHE_PATH") else None
+shared_publisher = None
+leader_stop = threading.Event()
+
+# 신호 기반 모의 투자 포트폴리오 (시세 틱마다 평가, 주기적으로 새 신호 반영/만기 청산/스냅샷)
+paper_portfolio = PaperPortfolio(capital=float(os.getenv("PAPER_CAPITAL", "100000")))
+
+# 심볼 간 이동 상관/변동성 (새 가격 행을 증분 반영)
+rolling_stats = RollingStatsService()
+
+# 발언 이후 가격 반응 사전 계산 (미완료 창은 새 가격이 들어오면 채움)
+reaction_updater = ReactionUpdater()
+
+# 신호 알림 발송기 (리더 워커에서만 실행, 신호 커밋 시 즉시 깨어남)
+alert_dispatcher = AlertDispatcher(poll_interval=float(os.getenv("ALERT_POLL_INTERVAL", "1")))
+
 @app.on_event("startup")
 async def startup_event():
     """서버 시작시 데이터베이스 초기화 및 샘플 데이터 생성"""
-    init_db()
-    await create_sample_data()
+    # serve.py는 워커를 띄우기 전에 한 번만 초기화
+    if not os.getenv("TACO_SKIP_INIT"):
+        init_db()
+        await create_sample_data()
+
+    if shared_cache is None or shared_cache.acquire_writer():
+        start_background_jobs()
+    else:
+        threading.Thread(target=wait_for_leadership, daemon=True).start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료시 시세 스트리밍 및 신호 엔진 중단 (남은 시세 저장)"""
+    leader_stop.set()
+    if quote_streamer:
+        quote_streamer.stop(timeout=10)
+    if shared_publisher:
+        shared_publisher.stop(timeout=5)
+    signal_engine.stop(timeout=5)
+    alert_dispatcher.stop(timeout=5)
+    paper_portfolio.stop(timeout=5)
+    rolling_stats.stop(timeout=5)
+    reaction_updater.stop(timeout=5)
+
+def is_leader():
+    return shared_cache is None or shared_cache.is_writer
+
+def start_background_jobs():
+    """시세 스트리밍, 신호 엔진, 알림 발송, (멀티 워커 모드) 공유 스냅샷 기록 시작"""
+    global shared_publisher
+    start_quote_stream()
+    signal_engine.refresh()
+    signal_engine.start(interval=float(os.getenv("SIGNAL_ENGINE_INTERVAL", "30")))
+    alert_dispatcher.start()
+    latest_quotes.subscribe(paper_portfolio.on_quotes)
+    paper_portfolio.refresh()
+    paper_portfolio.start(
+        interval=float(os.getenv("PAPER_REFRESH_INTERVAL", "30")),
+        snapshot_interval=float(os.getenv("PAPER_SNAPSHOT_INTERVAL", "300"))
+    )
+    rolling_stats.warm_up()
+    rolling_stats.start(interval=float(os.getenv("ROLLING_STATS_INTERVAL", "30")))
+    reaction_updater.start(interval=float(os.getenv("REACTION_UPDATE_INTERVAL", "300")))
+    if shared_cache:
+        shared_publisher = SharedSnapshotPublisher(
+            shared_cache, build_shared_snapshot, interval=float(os.getenv("SHARED_CACHE_INTERVAL", "2"))
+        )
+        shared_publisher.start()
+
+def wait_for_leadership(interval: float = 10.0):
+    """리더 워커가 종료되면 잠금을 이어받아 백그라운드 작업 시작"""
+    while not leader_stop.wait(interval):
+        if shared_cache.acquire_writer():
+            start_background_jobs()
+            return
+
+def build_shared_snapshot() -> dict:
+    """공유 캐시에 기록할 최신 시세/신호/노출도 스냅샷"""
+    db = SessionLocal()
+    try:
+        if quote_streamer:
+            quotes, quotes_updated_at = latest_quotes.snapshot(), latest_quotes.updated_at
+        else:
+            quotes = load_latest_prices(db)
+            quotes_updated_at = max((q["timestamp"] for q in quotes), default=None)
+        return {
+            "quotes": quotes,
+            "quotes_updated_at": quotes_updated_at,
+            "latest_signals": build_latest_signals(db, SHARED_SIGNAL_LIMIT),
+            "latest_signals_version": list(latest_signals_version(db)),
+            "exposure": signal_engine.exposure(),
+            "active_signals": len(signal_engine.signals),
+            "refreshed_at": signal_engine.refreshed_at,
+            "performance": paper_portfolio.performance(),
+            "signal_pnl": list(paper_portfolio.signal_pnl().values()),
+            "rolling_stats": rolling_stats.export()
+        }
+    finally:
+        db.close()
+
+def read_shared_snapshot():
+    """리더가 아닌 워커에서 공유 스냅샷 읽기 (리더 또는 단일 프로세스면 None)"""
+    if is_leader():
+        return None
+    return shared_cache.read()
+
+# 공유 캐시에 담는 최신 신호 수 (/api/latest-signals 기본 limit)
+SHARED_SIGNAL_LIMIT = 10
+# 목록 API 한 번에 반환하는 최대 행 수 (SQLite는 LIMIT -1을 무제한으로 해석하므로 하한도 검증)
+MAX_PAGE_LIMIT = 100
+
+def start_quote_stream():
+    """QUOTE_STREAM_INTERVAL 환경 변수가 있으면 API 프로세스 안에서 시세 스트리밍 시작"""
+    global quote_streamer
+    interval = os.getenv("QUOTE_STREAM_INTERVAL")
+    if not interval:
+        return
+    provider = SimulatedQuoteProvider() if os.getenv("QUOTE_PROVIDER") == "simulated" else YFinanceQuoteProvider()
+    quote_streamer = QuoteStreamer(
+        provider,
+        ETF_SYMBOLS,
+        interval=float(interval),
+        commit_interval=float(os.getenv("QUOTE_COMMIT_INTERVAL", "30"))
+    )
+    quote_streamer.start()
 
 async def create_sample_data():
     """데모용 샘플 데이터 생성"""
@@ -64,7 +222,7 @@ async def create_sample_data():
         statement = TrumpStatement(
             original_text=stmt_data["original"],
             korean_translation=stmt_data["korean"],
-            keywords=stmt_data["keywords"],# [k.strip() for k in stmt_data["keywords"].split(',')]
+            keywords=stmt_data["keywords"],
             taco_probability=stmt_data["taco_probability"], 
             is_analyzed=True,
             posted_at=datetime.now() - timedelta(minutes=i*5)
@@ -103,72 +261,75 @@ async def root():
     return {"message": "🌮 TACO Trading API is running!", "status": "healthy"}
 
 @app.get("/api/latest-signals")
-async def get_latest_signals(limit: int = 10, db: Session = Depends(get_db)):
+async def get_latest_signals(request: Request, response: Response,
+                             limit: int = Query(SHARED_SIGNAL_LIMIT, ge=1, le=MAX_PAGE_LIMIT), db: Session = Depends(get_db)):
     """최신 TACO 신호 조회"""
-    signals = db.query(TACOSignal).filter(
-        TACOSignal.is_active == True
-    ).order_by(TACOSignal.created_at.desc()).limit(limit).all()
-    
-    result = []
-    for signal in signals:
-        statement = db.query(TrumpStatement).filter(
-            TrumpStatement.id == signal.statement_id
-        ).first()
-        
-        result.append({
-            "id": signal.id,
-            "signal_type": signal.signal_type,
-            "confidence": signal.confidence,
-            "statement": {
-                "original": statement.original_text,
-                "korean": statement.korean_translation,
-                "keywords": [k.strip() for k in statement.keywords.split(',')], # statement.keywords,
-                "posted_at": statement.posted_at.isoformat()
-            },
-            "affected_etfs": signal.affected_etfs,
-            "created_at": signal.created_at.isoformat(),
-            "entry_timing": signal.entry_timing
-        })
-    
-    return {"signals": result}
+    snapshot = read_shared_snapshot()
+    if snapshot and limit == SHARED_SIGNAL_LIMIT:
+        not_modified = conditional_response(request, response, None, *snapshot["latest_signals_version"])
+        if not_modified:
+            return not_modified
+        return snapshot["latest_signals"]
+
+    last_modified, *counts = latest_signals_version(db)
+    not_modified = conditional_response(request, response, last_modified, *counts)
+    if not_modified:
+        return not_modified
+    return build_latest_signals(db, limit)
 
 @app.get("/api/trump-feed")
-async def get_trump_feed(limit: int = 20, db: Session = Depends(get_db)):
+async def get_trump_feed(request: Request, response: Response,
+                         limit: int = Query(20, ge=1, le=MAX_PAGE_LIMIT), db: Session = Depends(get_db)):
     """트럼프 최신 발언 피드"""
-    statements = db.query(TrumpStatement).filter(
-        TrumpStatement.is_analyzed == True
-    ).order_by(TrumpStatement.posted_at.desc()).limit(limit).all()
-    
-    result = []
-    for stmt in statements:
-        # 시간 차이 계산
-        time_diff = datetime.now() - stmt.posted_at
-        if time_diff.days > 0:
-            time_ago = f"{time_diff.days}일 전"
-        elif time_diff.seconds > 3600:
-            hours = time_diff.seconds // 3600
-            time_ago = f"{hours}시간 전"
-        elif time_diff.seconds > 60:
-            minutes = time_diff.seconds // 60
-            time_ago = f"{minutes}분 전"
-        else:
-            time_ago = "방금 전"
-        
-        result.append({
-            "id": stmt.id,
-            "original_text": stmt.original_text,
-            "korean_translation": stmt.korean_translation,
-            "keywords": [k.strip() for k in stmt.keywords.split(',')], # stmt.keywords,
-            "taco_probability": stmt.taco_probability,
-            "source": stmt.source,
-            "posted_at": stmt.posted_at.isoformat(),
-            "time_ago": time_ago
-        })
-    
-    return {"statements": result}
+    last_modified, *counts = trump_feed_version(db)
+    # time_ago가 분 단위로 바뀌므로 현재 분도 검증자에 포함
+    not_modified = conditional_response(request, response, last_modified, *counts, datetime.now().strftime("%Y%m%d%H%M"))
+    if not_modified:
+        return not_modified
+    return build_trump_feed(db, limit)
+
+@app.get("/api/latest-prices")
+async def get_latest_prices(request: Request, response: Response, symbols: str = None, db: Session = Depends(get_db)):
+    """심볼별 최신 ETF 가격 (스트리밍 중이면 DB 대신 메모리 캐시에서 조회)"""
+    symbol_list = [s.strip().upper() for s in symbols.split(',')] if symbols else None
+    snapshot = read_shared_snapshot()
+    if snapshot:
+        not_modified = conditional_response(request, response, None, snapshot["quotes_updated_at"], len(snapshot["quotes"]), max_age=5)
+        if not_modified:
+            return not_modified
+        quotes = snapshot["quotes"]
+        if symbol_list:
+            quotes = [q for q in quotes if q["symbol"] in symbol_list]
+        return {"source": "shared", "prices": quotes}
+
+    if quote_streamer:
+        not_modified = conditional_response(request, response, latest_quotes.updated_at, latest_quotes.version, max_age=5)
+        if not_modified:
+            return not_modified
+        return {"source": "cache", "prices": latest_quotes.snapshot(symbol_list)}
+
+    last_modified = db.query(func.max(ETFPrice.timestamp)).scalar()
+    not_modified = conditional_response(request, response, last_modified, max_age=5)
+    if not_modified:
+        return not_modified
+    return {"source": "db", "prices": load_latest_prices(db, symbol_list)}
+
+@app.get("/api/statements/{statement_id}/reaction")
+async def get_reaction(statement_id: int, db: Session = Depends(get_db)):
+    """발언 이후 영향 ETF의 5m/1h/1d/3d 수익률 (사전 계산 결과 조회)"""
+    reactions = get_statement_reaction(db, statement_id)
+    if not reactions and db.get(TrumpStatement, statement_id) is None:
+        raise HTTPException(status_code=404, detail="발언을 찾을 수 없습니다.")
+    return {"statement_id": statement_id, "reactions": reactions, "pending": not reactions}
+
+@app.get("/api/search")
+async def search(q: str, limit: int = Query(20, ge=1, le=MAX_PAGE_LIMIT), offset: int = Query(0, ge=0),
+                 db: Session = Depends(get_db)):
+    """발언 전문 검색 (영문/한국어/키워드, 관련도 순) 및 키워드 패싯"""
+    return search_statements(db, q, limit, offset)
 
 @app.get("/api/etf-prices")
-async def get_etf_prices(symbols: str = None, db: Session = Depends(get_db)):
+async def get_etf_prices(request: Request, response: Response, symbols: str = None, db: Session = Depends(get_db)):
     """ETF 가격 데이터 조회"""
     query = db.query(ETFPrice)
     
@@ -176,6 +337,11 @@ async def get_etf_prices(symbols: str = None, db: Session = Depends(get_db)):
         symbol_list = [s.strip().upper() for s in symbols.split(',')]
         query = query.filter(ETFPrice.symbol.in_(symbol_list))
     
+    last_modified, count = query.with_entities(func.max(ETFPrice.timestamp), func.count(ETFPrice.id)).one()
+    not_modified = conditional_response(request, response, last_modified, count)
+    if not_modified:
+        return not_modified
+    
     prices = query.order_by(ETFPrice.timestamp.desc()).all()
     
     result = []
@@ -191,21 +357,154 @@ async def get_etf_prices(symbols: str = None, db: Session = Depends(get_db)):
     
     return {"etf_prices": result}
 
-@app.get("/api/performance")
-async def get_performance(db: Session = Depends(get_db)):
-    """TACO 성과 데이터"""
-    total_signals = db.query(TACOSignal).count()
-    successful_signals = int(total_signals * 0.78)  # 78% 성공률
-    
+@app.get("/api/etfs/{symbol}/series")
+async def get_etf_series(request: Request, response: Response, symbol: str, range_name: str = Query("3m", alias="range"),
+                         points: int = DEFAULT_BUDGET, method: str = "lttb", db: Session = Depends(get_db)):
+    """차트용 ETF 가격 시계열 (서버에서 LTTB/min-max 다운샘플링, 포인트 예산 이내)"""
+    version = tuple(series_version(db, symbol.upper()))
+    not_modified = conditional_response(request, response, version[0], version[1], max_age=60)
+    if not_modified:
+        return not_modified
+    try:
+        return get_price_series(db, symbol, range_name, points, method, version=version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/etfs/{symbol}/signals")
+async def get_etf_signals(symbol: str, active_only: bool = True,
+                          limit: int = Query(50, ge=1, le=MAX_PAGE_LIMIT), db: Session = Depends(get_db)):
+    """특정 ETF에 영향을 주는 TACO 신호 조회"""
     return {
-        "total_return_30d": 127.5,
-        "win_rate": 78.0,
-        "total_profit": 12450.0,
-        "total_signals": total_signals,
-        "successful_signals": successful_signals,
-        "average_holding_days": 3.2
+        "symbol": symbol.upper(),
+        "signals": get_symbol_signals(db, symbol, active_only, limit)
     }
 
+@app.get("/api/etfs/{symbol}/exposure")
+async def get_etf_exposure(symbol: str, active_only: bool = True, db: Session = Depends(get_db)):
+    """특정 ETF의 신호 집계 노출도"""
+    exposure = get_symbol_exposure(db, [symbol], active_only)
+    if not exposure:
+        return {"symbol": symbol.upper(), "signal_count": 0, "net_exposure": 0.0,
+                "gross_exposure": 0.0, "last_signal_at": None}
+    return exposure[0]
+
+@app.get("/api/exposure")
+async def get_exposure(symbols: str = None):
+    """활성 신호의 감쇠 반영 심볼별 순노출도 (메모리에서 조회)"""
+    symbol_list = [s.strip().upper() for s in symbols.split(',')] if symbols else None
+    snapshot = read_shared_snapshot()
+    if snapshot:
+        exposure = snapshot["exposure"]
+        if symbol_list:
+            exposure = {s: v for s, v in exposure.items() if s in symbol_list}
+        return {"exposure": exposure, "active_signals": snapshot["active_signals"], "refreshed_at": snapshot["refreshed_at"]}
+
+    return {
+        "exposure": signal_engine.exposure(symbol_list),
+        "active_signals": len(signal_engine.signals),
+        "refreshed_at": signal_engine.refreshed_at
+    }
+
+def require_alert_admin(x_alert_token: Optional[str] = Header(None)):
+    """구독 관리 API 인증 (ALERT_ADMIN_TOKEN과 X-Alert-Token 헤더 비교, 토큰 미설정이면 항상 거부)"""
+    if not check_admin_token(x_alert_token):
+        raise HTTPException(status_code=403, detail="알림 구독 관리 토큰이 필요합니다.")
+
+@app.get("/api/alerts/subscribers", dependencies=[Depends(require_alert_admin)])
+async def list_alert_subscribers(db: Session = Depends(get_db)):
+    """신호 알림 구독자 목록"""
+    return {"subscribers": [subscriber_dict(s) for s in db.query(AlertSubscriber).order_by(AlertSubscriber.id)]}
+
+@app.post("/api/alerts/subscribers", dependencies=[Depends(require_alert_admin)])
+async def add_alert_subscriber(data: AlertSubscriberIn, db: Session = Depends(get_db)):
+    """신호 알림 구독 등록 (webhook 또는 로컬 소켓)"""
+    try:
+        return subscriber_dict(create_subscriber(db, data))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.delete("/api/alerts/subscribers/{subscriber_id}", dependencies=[Depends(require_alert_admin)])
+async def remove_alert_subscriber(subscriber_id: int, db: Session = Depends(get_db)):
+    """신호 알림 구독 해지 (대기 중인 알림은 발송하지 않음)"""
+    subscriber = db.get(AlertSubscriber, subscriber_id)
+    if subscriber is None:
+        raise HTTPException(status_code=404, detail="구독자를 찾을 수 없습니다.")
+    cancelled = deactivate_subscriber(db, subscriber)
+    return {**subscriber_dict(subscriber), "cancelled_alerts": cancelled}
+
+@app.get("/api/alerts/metrics")
+async def get_alert_metrics():
+    """알림 전달 지연 분포와 발송/재시도/실패 건수"""
+    return {**alert_dispatcher.metrics.snapshot(), "pending": alert_dispatcher.pending_count()}
+
+def read_rolling_stats(window: str, symbols: str = None) -> dict:
+    symbol_list = [s.strip().upper() for s in symbols.split(',')] if symbols else None
+    snapshot = read_shared_snapshot()
+    exported = snapshot["rolling_stats"] if snapshot else rolling_stats.export()
+    stats = select_stats(exported, window, symbol_list)
+    if stats is None:
+        raise HTTPException(status_code=400, detail=f"지원하는 창: {', '.join(exported)}")
+    return stats
+
+@app.get("/api/stats/correlation")
+async def get_rolling_correlation(window: str = "1d", symbols: str = None):
+    """심볼 간 이동 창 수익률 상관행렬 (증분 유지, 요청 시 재계산 없음)"""
+    stats = read_rolling_stats(window, symbols)
+    return {key: stats[key] for key in ("window", "bar_seconds", "size", "observations", "last_bar_at", "symbols", "correlation")}
+
+@app.get("/api/stats/volatility")
+async def get_rolling_volatility(window: str = "1d", symbols: str = None):
+    """심볼별 이동 창 수익률 변동성 (봉 단위, 연율화)"""
+    stats = read_rolling_stats(window, symbols)
+    return {key: stats[key] for key in ("window", "bar_seconds", "size", "observations", "last_bar_at",
+                                        "volatility", "annualized_volatility")}
+
+@app.get("/api/performance")
+async def get_performance(request: Request, response: Response, db: Session = Depends(get_db)):
+    """TACO 성과 데이터 (모의 투자 포트폴리오 실시간 평가)"""
+    snapshot = read_shared_snapshot()
+    if snapshot:
+        performance = snapshot["performance"]
+    else:
+        performance = build_performance(db, paper_portfolio if paper_portfolio.refreshed_at else None)
+    last_modified, count = performance_version(db)
+    # 평가손익은 시세에 따라 바뀌므로 자산 평가액도 검증자에 포함
+    not_modified = conditional_response(
+        request, response, last_modified, count, performance["equity"], performance["open_positions"], max_age=60
+    )
+    if not_modified:
+        return not_modified
+    return performance
+
+@app.get("/api/performance/signals")
+async def get_signal_performance(signal_id: int = None, db: Session = Depends(get_db)):
+    """신호별 모의 투자 손익 (실현 + 평가)"""
+    snapshot = read_shared_snapshot()
+    if snapshot and "signal_pnl" in snapshot:
+        signals = [entry for entry in snapshot["signal_pnl"] if signal_id is None or entry["signal_id"] == signal_id]
+        return {"signals": signals, "refreshed_at": snapshot["performance"]["refreshed_at"]}
+    if paper_portfolio.refreshed_at:
+        return {"signals": list(paper_portfolio.signal_pnl(signal_id).values()), "refreshed_at": paper_portfolio.refreshed_at}
+    # 포트폴리오를 실행하지 않는 워커(공유 스냅샷 없음)는 마지막으로 저장된 포지션으로 응답
+    refreshed_at = db.query(func.max(PaperTrade.updated_at)).scalar()
+    return {"signals": list(load_signal_pnl(db, signal_id).values()), "refreshed_at": refreshed_at}
+
+@app.get("/snapshots/{name}.json")
+async def get_snapshot(name: str, request: Request):
+    """발행된 정적 스냅샷 제공 (사전 압축 파일을 그대로 전송, DB 조회 없음)"""
+    path, encoding, digest = resolve_snapshot_file(name, request.headers.get("accept-encoding", ""))
+    if path is None or not path.exists():
+        raise HTTPException(status_code=404, detail="스냅샷이 발행되지 않았습니다.")
+
+    # 인코딩마다 바이트가 다르므로 ETag도 인코딩별로 구분 (캐시가 다른 인코딩 본문을 재사용하지 않도록)
+    etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60", "Vary": "Accept-Encoding"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(path, media_type="application/json", headers=headers)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
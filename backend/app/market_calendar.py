@@ -0,0 +1,141 @@
+import logging
+from datetime import datetime, date, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+# 주요 정규장 휴장일 (조기 폐장은 정규장으로 취급)
+# 표에 있는 마지막 해까지만 휴장일을 알 수 있으므로 해가 바뀌기 전에 다음 해 휴장일을 추가해야 함
+NYSE_HOLIDAYS = {
+    # 2025
+    date(2025, 1, 1), date(2025, 1, 9), date(2025, 1, 20), date(2025, 2, 17),
+    date(2025, 4, 18), date(2025, 5, 26), date(2025, 6, 19), date(2025, 7, 4),
+    date(2025, 9, 1), date(2025, 11, 27), date(2025, 12, 25),
+    # 2026
+    date(2026, 1, 1), date(2026, 1, 19), date(2026, 2, 16), date(2026, 4, 3),
+    date(2026, 5, 25), date(2026, 6, 19), date(2026, 7, 3), date(2026, 9, 7),
+    date(2026, 11, 26), date(2026, 12, 25),
+}
+
+KRX_HOLIDAYS = {
+    # 2025
+    date(2025, 1, 1), date(2025, 1, 27), date(2025, 1, 28), date(2025, 1, 29),
+    date(2025, 1, 30), date(2025, 3, 3), date(2025, 5, 1), date(2025, 5, 5),
+    date(2025, 5, 6), date(2025, 6, 3), date(2025, 6, 6), date(2025, 8, 15),
+    date(2025, 10, 3), date(2025, 10, 6), date(2025, 10, 7), date(2025, 10, 8),
+    date(2025, 10, 9), date(2025, 12, 25), date(2025, 12, 31),
+    # 2026
+    date(2026, 1, 1), date(2026, 2, 16), date(2026, 2, 17), date(2026, 2, 18),
+    date(2026, 3, 2), date(2026, 5, 1), date(2026, 5, 5), date(2026, 5, 25),
+    date(2026, 6, 3), date(2026, 8, 17), date(2026, 9, 24), date(2026, 9, 25),
+    date(2026, 10, 5), date(2026, 10, 9), date(2026, 12, 25), date(2026, 12, 31),
+}
+
+def _to_utc(at: Optional[datetime]) -> datetime:
+    """naive datetime은 UTC로 간주 (ETFPrice.timestamp와 같은 기준)"""
+    if at is None:
+        return datetime.now(timezone.utc)
+    if at.tzinfo is None:
+        return at.replace(tzinfo=timezone.utc)
+    return at.astimezone(timezone.utc)
+
+class ExchangeCalendar:
+    """거래소 정규장 시간과 휴장일 기반 세션 판단"""
+
+    def __init__(self, code: str, tz: str, open_time: time, close_time: time, holidays: Iterable[date] = ()):
+        self.code = code
+        self.tz = ZoneInfo(tz)
+        self.open_time = open_time
+        self.close_time = close_time
+        self.holidays = set(holidays)
+        # 휴장일 표가 다루는 마지막 날 (표에 있는 마지막 해의 12월 31일)
+        self.holidays_until = date(max(self.holidays).year, 12, 31) if self.holidays else None
+        self._warned_years = set()
+
+    def is_trading_day(self, day: date) -> bool:
+        self._check_holiday_table(day)
+        return day.weekday() < 5 and day not in self.holidays
+
+    def _check_holiday_table(self, day: date):
+        """휴장일 표 범위를 벗어난 날짜는 휴장일도 평일 거래일로 취급되므로 해마다 한 번 경고"""
+        if self.holidays_until is None or day <= self.holidays_until or day.year in self._warned_years:
+            return
+        self._warned_years.add(day.year)
+        logger.warning(f"⚠️ {self.code} 휴장일 표가 {self.holidays_until}까지만 있음, "
+                       f"{day.year}년 휴장일은 거래일로 취급됩니다 (market_calendar.py에 추가 필요)")
+
+    def session(self, day: date):
+        """해당 거래일의 (개장, 폐장) 시각 (UTC aware)"""
+        open_at = datetime.combine(day, self.open_time, tzinfo=self.tz).astimezone(timezone.utc)
+        close_at = datetime.combine(day, self.close_time, tzinfo=self.tz).astimezone(timezone.utc)
+        return open_at, close_at
+
+    def is_open(self, at: Optional[datetime] = None) -> bool:
+        at = _to_utc(at)
+        day = at.astimezone(self.tz).date()
+        if not self.is_trading_day(day):
+            return False
+        open_at, close_at = self.session(day)
+        return open_at <= at < close_at
+
+    def next_open(self, at: Optional[datetime] = None) -> datetime:
+        """at 이후 처음 개장하는 시각 (이미 장중이면 at)"""
+        at = _to_utc(at)
+        if self.is_open(at):
+            return at
+        day = at.astimezone(self.tz).date()
+        for offset in range(0, 15):
+            candidate = day + timedelta(days=offset)
+            if self.is_trading_day(candidate):
+                open_at, _ = self.session(candidate)
+                if open_at > at:
+                    return open_at
+        raise ValueError(f"{self.code}: 다음 개장일을 찾을 수 없습니다.")
+
+    def last_close(self, at: Optional[datetime] = None) -> datetime:
+        """at 이전의 가장 최근 폐장 시각"""
+        at = _to_utc(at)
+        day = at.astimezone(self.tz).date()
+        for offset in range(0, 15):
+            candidate = day - timedelta(days=offset)
+            if self.is_trading_day(candidate):
+                _, close_at = self.session(candidate)
+                if close_at <= at:
+                    return close_at
+        raise ValueError(f"{self.code}: 최근 폐장일을 찾을 수 없습니다.")
+
+NYSE = ExchangeCalendar("NYSE", "America/New_York", time(9, 30), time(16, 0), NYSE_HOLIDAYS)
+KRX = ExchangeCalendar("KRX", "Asia/Seoul", time(9, 0), time(15, 30), KRX_HOLIDAYS)
+
+# 심볼 접미사별 거래소 (접미사가 없으면 미국 상장)
+SUFFIX_CALENDARS = {
+    ".KS": KRX,
+    ".KQ": KRX,
+}
+
+def calendar_for_symbol(symbol: str) -> ExchangeCalendar:
+    for suffix, calendar in SUFFIX_CALENDARS.items():
+        if symbol.upper().endswith(suffix):
+            return calendar
+    return NYSE
+
+def group_symbols_by_calendar(symbols: Iterable[str]) -> Dict[str, List[str]]:
+    """거래소 코드별 심볼 목록"""
+    groups = {}
+    for symbol in symbols:
+        groups.setdefault(calendar_for_symbol(symbol).code, []).append(symbol)
+    return groups
+
+def needs_refresh(symbol: str, last_updated: Optional[datetime], at: Optional[datetime] = None) -> bool:
+    """시세 갱신 필요 여부
+
+    장중이면 항상 갱신, 장 마감 후에는 마지막 폐장 이후 저장된 시세가 없을 때만 1회 갱신
+    (휴장 중 같은 종가를 중복 저장하지 않음)
+    """
+    calendar = calendar_for_symbol(symbol)
+    if calendar.is_open(at):
+        return True
+    if last_updated is None:
+        return True
+    return _to_utc(last_updated) < calendar.last_close(at)
@@ -1,7 +1,81 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, JSON, Index, event, inspect
+from sqlalchemy.orm import Session, validates
 from sqlalchemy.sql import func
 from .database import Base
 import datetime
+import json
+import ast
+
+def normalize_keywords(value):
+    """키워드 값을 문자열 배열로 정규화 (리스트, JSON 문자열, 콤마 구분 문자열 모두 허용)"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return []
+        if text.startswith('['):
+            try:
+                value = json.loads(text)
+            except ValueError:
+                try:
+                    value = ast.literal_eval(text)
+                except (ValueError, SyntaxError):
+                    value = text.strip('[]').split(',')
+        else:
+            value = text.split(',')
+    return [str(k).strip().strip('\'"') for k in value if str(k).strip()]
+
+# LLM 응답 필드(taco_probability, trade_relevance)와 신뢰도는 0~100 퍼센트로 저장
+PERCENT_COLUMNS = (
+    ("trump_statements", "trade_relevance"),
+    ("trump_statements", "taco_probability"),
+    ("taco_signals", "confidence"),
+    ("alert_subscribers", "min_confidence"),
+)
+
+def percent_to_ratio(value) -> float:
+    """0~100 퍼센트 값을 0~1 가중치로 변환 (None은 0)"""
+    if not value:
+        return 0.0
+    return value / 100
+
+# affected_etfs에 방향/영향도가 없을 때 사용할 기본값
+DEFAULT_ETF_IMPACT = 0.5
+SIGNAL_DIRECTIONS = {"BUY": "up", "SELL": "down"}
+
+def parse_affected_etfs(value, signal_type=None):
+    """affected_etfs 값을 [{symbol, direction, impact}] 목록으로 정규화
+
+    GPT 응답 형식(dict 목록) 외에 심볼 문자열 목록, 이중 인코딩된 JSON 문자열도 허용
+    """
+    while isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.split(',')
+    if not value:
+        return []
+
+    default_direction = SIGNAL_DIRECTIONS.get((signal_type or "").upper(), "neutral")
+    impacts = []
+    for item in value:
+        if isinstance(item, dict):
+            symbol = str(item.get("symbol") or "").strip().upper()
+            direction = str(item.get("direction") or default_direction).lower()
+            impact = item.get("impact")
+        else:
+            symbol = str(item).strip().upper()
+            direction = default_direction
+            impact = None
+        if not symbol:
+            continue
+        try:
+            impact = float(impact) if impact is not None else DEFAULT_ETF_IMPACT
+        except (TypeError, ValueError):
+            impact = DEFAULT_ETF_IMPACT
+        impacts.append({"symbol": symbol, "direction": direction, "impact": impact})
+    return impacts
 
 class TrumpStatement(Base):
     __tablename__ = "trump_statements"
@@ -14,20 +88,24 @@ class TrumpStatement(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     
     # AI 분석 결과
-    keywords = Column(String(500), nullable=True)
+    keywords = Column(JSON, nullable=True)  # 키워드 배열 (저장 시점에 정규화)
     sentiment_score = Column(Float, nullable=True)
-    trade_relevance = Column(Float, nullable=True)
-    taco_probability = Column(Float, nullable=True)
+    trade_relevance = Column(Float, nullable=True)  # 0~100
+    taco_probability = Column(Float, nullable=True)  # 0~100
     
     is_analyzed = Column(Boolean, default=False)
 
+    @validates('keywords')
+    def _normalize_keywords(self, key, value):
+        return normalize_keywords(value)
+
 class TACOSignal(Base):
     __tablename__ = "taco_signals"
     
     id = Column(Integer, primary_key=True)
     statement_id = Column(Integer, nullable=False)
     signal_type = Column(String(10))  # BUY, SELL, WATCH
-    confidence = Column(Float)
+    confidence = Column(Float)  # 0~100
     
     affected_etfs = Column(JSON)
     entry_timing = Column(String(20), default="immediate")
@@ -36,6 +114,10 @@ class TACOSignal(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=func.now())
 
+    __table_args__ = (
+        Index("ix_taco_signals_is_active_created_at", "is_active", "created_at"),
+    )
+
 class ETFPrice(Base):
     __tablename__ = "etf_prices"
     
@@ -45,4 +127,198 @@ class ETFPrice(Base):
     price = Column(Float, nullable=False)
     change_percent = Column(Float, default=0.0)
     volume = Column(Integer, default=0)
-    timestamp = Column(DateTime, default=func.now())
\ No newline at end of file
+    timestamp = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index("ix_etf_prices_symbol_timestamp", "symbol", "timestamp"),
+    )
+
+class SignalETFImpact(Base):
+    """신호별 영향 ETF 역색인 (affected_etfs JSON을 심볼 단위로 정규화)"""
+    __tablename__ = "signal_etf_impacts"
+
+    id = Column(Integer, primary_key=True)
+    signal_id = Column(Integer, nullable=False, index=True)
+    symbol = Column(String(20), nullable=False)
+    direction = Column(String(10))  # up, down, neutral
+    impact = Column(Float, default=DEFAULT_ETF_IMPACT)
+    created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index("ix_signal_etf_impacts_symbol_created_at", "symbol", "created_at"),
+    )
+
+def signal_impact_rows(signal):
+    """TACOSignal 하나에서 signal_etf_impacts 행 목록 생성"""
+    created_at = signal.created_at if isinstance(signal.created_at, datetime.datetime) else datetime.datetime.utcnow()
+    return [
+        dict(signal_id=signal.id, created_at=created_at, **impact)
+        for impact in parse_affected_etfs(signal.affected_etfs, signal.signal_type)
+    ]
+
+@event.listens_for(TACOSignal, "after_insert")
+def _index_signal_impacts(mapper, connection, signal):
+    """신호 저장과 같은 트랜잭션에서 역색인 행 추가"""
+    rows = signal_impact_rows(signal)
+    if rows:
+        connection.execute(SignalETFImpact.__table__.insert(), rows)
+
+# 역색인에 영향을 주는 신호 필드 (ORM flush만 감지: query().update()/delete()로는 바꾸지 말 것,
+# affected_etfs는 제자리 수정 대신 재할당)
+INDEXED_SIGNAL_FIELDS = ("affected_etfs", "signal_type", "created_at")
+
+@event.listens_for(TACOSignal, "after_update")
+def _reindex_signal_impacts(mapper, connection, signal):
+    """affected_etfs/signal_type/created_at이 바뀐 신호의 역색인 행을 같은 트랜잭션에서 다시 생성"""
+    state = inspect(signal)
+    if not any(state.attrs[name].history.has_changes() for name in INDEXED_SIGNAL_FIELDS):
+        return
+    table = SignalETFImpact.__table__
+    connection.execute(table.delete().where(table.c.signal_id == signal.id))
+    _index_signal_impacts(mapper, connection, signal)
+
+@event.listens_for(TACOSignal, "after_delete")
+def _unindex_signal_impacts(mapper, connection, signal):
+    """신호 삭제와 같은 트랜잭션에서 역색인 행 삭제"""
+    table = SignalETFImpact.__table__
+    connection.execute(table.delete().where(table.c.signal_id == signal.id))
+
+class StatementFingerprint(Base):
+    """발언 유사중복 색인 (64비트 SimHash와 16비트 밴드, 클러스터 대표 발언 id)"""
+    __tablename__ = "statement_fingerprints"
+
+    statement_id = Column(Integer, primary_key=True)
+    simhash = Column(Integer, nullable=False)
+    band0 = Column(Integer, nullable=False, index=True)
+    band1 = Column(Integer, nullable=False, index=True)
+    band2 = Column(Integer, nullable=False, index=True)
+    band3 = Column(Integer, nullable=False, index=True)
+    cluster_id = Column(Integer, nullable=False, index=True)
+
+@event.listens_for(TrumpStatement, "after_insert")
+def _fingerprint_statement(mapper, connection, statement):
+    """발언 저장과 같은 트랜잭션에서 유사중복 지문 저장 및 클러스터 배정"""
+    from .near_dup import assign_fingerprint
+    assign_fingerprint(connection, statement.id, statement.original_text)
+
+class BackfillWatermark(Base):
+    """심볼/봉 간격별 과거 시세 백필 진행 위치 (중단 후 이어받기용)"""
+    __tablename__ = "backfill_watermarks"
+
+    symbol = Column(String(20), primary_key=True)
+    interval = Column(String(10), primary_key=True)  # 1d, 1h, 5m ...
+    last_timestamp = Column(DateTime, nullable=False)  # 마지막으로 적재한 봉 시각 (UTC)
+    last_close = Column(Float)  # 다음 청크의 첫 봉 변화율 계산용
+    rows = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=func.now())
+
+class CrawlState(Base):
+    """소스별 크롤링 진행 상태 (중단 후 이어받기와 증분 수집 기준)"""
+    __tablename__ = "crawl_states"
+
+    source = Column(String(100), primary_key=True)  # 예: truth_social:@realDonaldTrump
+    newest_post_id = Column(String(50), nullable=True)
+    newest_posted_at = Column(DateTime, nullable=True)  # 증분 수집은 이 시각까지 내려오면 중단
+    oldest_posted_at = Column(DateTime, nullable=True)  # 과거 수집 재개 시 이 시각 이전부터 처리
+    scroll_count = Column(Integer, default=0)
+    total_saved = Column(Integer, default=0)
+    history_complete = Column(Boolean, default=False)
+    updated_at = Column(DateTime, default=func.now())
+
+class AlertSubscriber(Base):
+    """신호 알림 구독자 (webhook URL 또는 로컬 소켓, 심볼/최소 신뢰도/신호 종류 필터)"""
+    __tablename__ = "alert_subscribers"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    kind = Column(String(20), default="webhook")  # webhook, socket
+    target = Column(String(500), nullable=False)  # URL, unix:/경로, tcp:호스트:포트
+    symbols = Column(JSON, nullable=True)  # None이면 전체
+    signal_types = Column(JSON, nullable=True)  # None이면 전체
+    min_confidence = Column(Float, default=0.0)  # 0~100
+    batch_size = Column(Integer, default=20)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=func.now())
+
+class AlertOutbox(Base):
+    """구독자별 신호 알림 발송 대기열 (신호와 같은 트랜잭션에 적재되어 재시작해도 유실 없음)"""
+    __tablename__ = "alert_outbox"
+
+    id = Column(Integer, primary_key=True)
+    subscriber_id = Column(Integer, nullable=False)
+    signal_id = Column(Integer, nullable=False, index=True)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(10), default="pending")  # pending, sending, delivered, failed, cancelled
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)  # 적재 시각 (전달 지연 측정 기준, 마이크로초)
+    delivered_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_alert_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+@event.listens_for(TACOSignal, "after_insert")
+def _enqueue_signal_alerts(mapper, connection, signal):
+    """신호 저장과 같은 트랜잭션에서 구독자 알림을 outbox에 적재"""
+    from sqlalchemy.orm import object_session
+    from .alerts import enqueue_signal_alerts
+    if enqueue_signal_alerts(connection, signal):
+        session = object_session(signal)
+        if session is not None:
+            session.info["alerts_enqueued"] = True
+
+@event.listens_for(Session, "after_commit")
+def _wake_alert_dispatcher(session):
+    """outbox에 알림이 적재된 트랜잭션이 커밋되면 디스패처를 즉시 깨움"""
+    if session.info.pop("alerts_enqueued", False):
+        from .alerts import notify_dispatcher
+        notify_dispatcher()
+
+class PaperTrade(Base):
+    """모의 투자 포지션 (신호 x 영향 ETF 단위, 주기적 스냅샷 시 갱신)"""
+    __tablename__ = "paper_trades"
+
+    signal_id = Column(Integer, primary_key=True)
+    symbol = Column(String(20), primary_key=True)
+    direction = Column(String(10))  # long, short
+    quantity = Column(Float, nullable=False)  # 부호 포함 (short는 음수)
+    entry_price = Column(Float, nullable=False)
+    entry_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    exit_price = Column(Float, nullable=True)
+    exit_at = Column(DateTime, nullable=True)
+    last_price = Column(Float, nullable=True)
+    pnl = Column(Float, default=0.0)  # 청산 전에는 평가손익
+    status = Column(String(10), default="open")  # open, closed
+    updated_at = Column(DateTime, default=func.now())
+
+class PortfolioSnapshot(Base):
+    """모의 투자 포트폴리오 주기 스냅샷 (자산 곡선)"""
+    __tablename__ = "portfolio_snapshots"
+
+    id = Column(Integer, primary_key=True)
+    taken_at = Column(DateTime, nullable=False, index=True)
+    equity = Column(Float, nullable=False)
+    realized_pnl = Column(Float, default=0.0)
+    unrealized_pnl = Column(Float, default=0.0)
+    gross_exposure = Column(Float, default=0.0)
+    open_positions = Column(Integer, default=0)
+    closed_positions = Column(Integer, default=0)
+
+class StatementReaction(Base):
+    """발언 이후 ETF 창별 수익률 (발언 x 심볼, 사전 계산)"""
+    __tablename__ = "statement_reactions"
+
+    statement_id = Column(Integer, primary_key=True)
+    symbol = Column(String(20), primary_key=True)
+    base_at = Column(DateTime, nullable=True)  # 기준가 봉 시각 (발언 직전 마지막 가격)
+    base_price = Column(Float, nullable=True)
+    anchor_at = Column(DateTime, nullable=True)  # 발언 이후 첫 거래 가능 시각 (장외면 다음 개장)
+    return_5m = Column(Float, nullable=True)
+    return_1h = Column(Float, nullable=True)
+    return_1d = Column(Float, nullable=True)
+    return_3d = Column(Float, nullable=True)
+    complete = Column(Boolean, default=False)  # 모든 창의 목표 시각 이후 가격까지 반영됨
+    updated_at = Column(DateTime, default=func.now())
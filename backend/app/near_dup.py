@@ -0,0 +1,109 @@
+import hashlib
+import logging
+from typing import Optional
+from sqlalchemy import select, or_, text as sql_text
+from .relevance_filter import tokenize
+
+logger = logging.getLogger(__name__)
+
+# 64비트 SimHash를 16비트 4개 밴드로 나눠 색인
+# 해밍 거리 3 이하인 두 지문은 비둘기집 원리로 최소 한 밴드가 일치
+SIMHASH_BITS = 64
+BAND_COUNT = 4
+BAND_BITS = SIMHASH_BITS // BAND_COUNT
+MAX_DISTANCE = 3
+
+# 토큰이 너무 적은 발언(링크만 있는 게시글 등)은 오탐이 많아 클러스터링하지 않음
+MIN_TOKENS = 5
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+def simhash(text: str) -> int:
+    """유니그램 + 바이그램 가중치 기반 64비트 SimHash"""
+    tokens = tokenize(text)
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    vector = [0] * SIMHASH_BITS
+    for gram in grams:
+        h = _token_hash(gram)
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += 1 if (h >> bit) & 1 else -1
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        if vector[bit] > 0:
+            value |= 1 << bit
+    return value
+
+def to_signed(value: int) -> int:
+    """SQLite INTEGER(부호 있는 64비트)에 저장할 수 있도록 변환"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+def bands(value: int):
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (i * BAND_BITS)) & mask for i in range(BAND_COUNT)]
+
+def hamming(a: int, b: int) -> int:
+    return bin(to_unsigned(a) ^ to_unsigned(b)).count("1")
+
+def find_near_duplicate(connection, text: str, max_distance: int = MAX_DISTANCE,
+                        exclude_id: Optional[int] = None) -> Optional[dict]:
+    """밴드 색인으로 후보를 좁힌 뒤 해밍 거리가 가장 가까운 기존 발언 반환"""
+    from .model import StatementFingerprint
+
+    if len(tokenize(text)) < MIN_TOKENS:
+        return None
+    value = simhash(text)
+    table = StatementFingerprint.__table__
+    query = select(table.c.statement_id, table.c.simhash, table.c.cluster_id).where(
+        or_(*[getattr(table.c, f"band{i}") == band for i, band in enumerate(bands(value))])
+    )
+    if exclude_id is not None:
+        query = query.where(table.c.statement_id != exclude_id)
+
+    best = None
+    for row in connection.execute(query):
+        distance = hamming(value, row.simhash)
+        if distance <= max_distance and (best is None or distance < best["distance"]):
+            best = {"statement_id": row.statement_id, "cluster_id": row.cluster_id, "distance": distance}
+    return best
+
+def assign_fingerprint(connection, statement_id: int, text: str) -> int:
+    """발언 지문 저장 및 클러스터 배정 (가까운 기존 발언이 없으면 자기 자신이 대표)"""
+    from .model import StatementFingerprint
+
+    match = find_near_duplicate(connection, text or "", exclude_id=statement_id)
+    cluster_id = match["cluster_id"] if match else statement_id
+    value = simhash(text or "")
+    connection.execute(StatementFingerprint.__table__.insert(), {
+        "statement_id": statement_id,
+        "simhash": to_signed(value),
+        "cluster_id": cluster_id,
+        **{f"band{i}": band for i, band in enumerate(bands(value))}
+    })
+    return cluster_id
+
+def backfill_fingerprints(engine) -> int:
+    """지문이 없는 기존 발언을 id 순서대로 색인 (먼저 저장된 발언이 클러스터 대표)"""
+    with engine.begin() as connection:
+        rows = connection.execute(sql_text("""
+            SELECT id, original_text FROM trump_statements
+            WHERE id NOT IN (SELECT statement_id FROM statement_fingerprints)
+            ORDER BY id
+        """)).fetchall()
+        for statement_id, original_text in rows:
+            assign_fingerprint(connection, statement_id, original_text)
+    if rows:
+        logger.info(f"✅ 발언 유사중복 지문 백필 완료: {len(rows)}건")
+    return len(rows)
+
+def get_cluster_root(db, statement_id: int):
+    """발언이 속한 클러스터의 대표 발언 id"""
+    from .model import StatementFingerprint
+
+    row = db.query(StatementFingerprint.cluster_id).filter(
+        StatementFingerprint.statement_id == statement_id
+    ).first()
+    return row.cluster_id if row else statement_id
@@ -0,0 +1,393 @@
+import time
+import heapq
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from .database import SessionLocal
+from .model import TACOSignal, ETFPrice, PaperTrade, PortfolioSnapshot, parse_affected_etfs, percent_to_ratio
+from .signal_index import DIRECTION_SIGN
+from .quote_stream import load_latest_prices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPITAL = 100_000.0
+# 신뢰도 1, 영향도 1인 신호가 ETF 하나에 배정하는 자본 비중
+MAX_POSITION_PCT = 0.1
+DEFAULT_DURATION_HOURS = 24
+RETURN_WINDOW = timedelta(days=30)
+
+def price_at(db, symbol: str, at: datetime) -> Optional[float]:
+    """at 이후 첫 가격 (없으면 None) - (symbol, timestamp) 인덱스 사용"""
+    row = db.query(ETFPrice.price).filter(
+        ETFPrice.symbol == symbol, ETFPrice.timestamp >= at
+    ).order_by(ETFPrice.timestamp).limit(1).first()
+    return row.price if row else None
+
+def load_signal_pnl(db, signal_id: Optional[int] = None) -> Dict[int, dict]:
+    """snapshot()이 저장한 paper_trades로 신호별 손익 재구성 (포트폴리오를 실행하지 않는 워커용, 쿼리 한 번)"""
+    query = db.query(PaperTrade)
+    if signal_id is not None:
+        query = query.filter(PaperTrade.signal_id == signal_id)
+    result = {}
+    for trade in query.order_by(PaperTrade.signal_id, PaperTrade.symbol).all():
+        entry = result.setdefault(trade.signal_id, {
+            "signal_id": trade.signal_id, "realized_pnl": 0.0, "unrealized_pnl": 0.0,
+            "open_positions": 0, "closed_positions": 0, "positions": []
+        })
+        pnl = trade.pnl or 0.0
+        if trade.exit_price is not None:
+            entry["realized_pnl"] += pnl
+            entry["closed_positions"] += 1
+        else:
+            entry["unrealized_pnl"] += pnl
+            entry["open_positions"] += 1
+        entry["positions"].append({
+            "symbol": trade.symbol,
+            "quantity": round(trade.quantity, 6),
+            "entry_price": trade.entry_price,
+            "entry_at": trade.entry_at,
+            "expires_at": trade.expires_at,
+            "exit_price": trade.exit_price,
+            "last_price": trade.last_price,
+            "pnl": round(pnl, 2),
+            "status": trade.status
+        })
+    for entry in result.values():
+        entry["realized_pnl"] = round(entry["realized_pnl"], 2)
+        entry["unrealized_pnl"] = round(entry["unrealized_pnl"], 2)
+    return result
+
+class PaperPosition:
+    """신호 하나가 ETF 하나에 낸 모의 포지션"""
+    __slots__ = ("signal_id", "symbol", "quantity", "entry_price", "entry_at", "expires_at",
+                 "exit_price", "exit_at", "notional")
+
+    def __init__(self, signal_id: int, symbol: str, notional: float, entry_at: datetime, expires_at: datetime):
+        self.signal_id = signal_id
+        self.symbol = symbol
+        self.notional = notional  # 부호 포함 목표 금액 (가격이 들어오면 수량 결정)
+        self.quantity = 0.0
+        self.entry_price = None
+        self.entry_at = entry_at
+        self.expires_at = expires_at
+        self.exit_price = None
+        self.exit_at = None
+
+    @property
+    def key(self):
+        return (self.signal_id, self.symbol)
+
+    @property
+    def is_open(self) -> bool:
+        return self.entry_price is not None and self.exit_price is None
+
+    def pnl(self, price: Optional[float]) -> float:
+        if self.entry_price is None:
+            return 0.0
+        mark = self.exit_price if self.exit_price is not None else price
+        return self.quantity * ((mark if mark is not None else self.entry_price) - self.entry_price)
+
+class PaperPortfolio:
+    """TACO 신호를 모의 포지션으로 바꿔 실시간 평가하는 포트폴리오
+
+    - 포지션 크기: 자본 * MAX_POSITION_PCT * 신뢰도 * affected_etfs 영향도, 방향(up/down)에 따라 long/short
+    - 평가손익은 심볼별 (순수량, 순매입금액)만 유지하므로 시세 틱 하나 반영은 O(1)
+      (포지션 수백 개여도 틱마다 전체를 다시 계산하지 않음)
+    - expected_duration 시간이 지나면 청산, 기존 신호는 DB 가격 이력으로 진입/청산가 결정
+    - snapshot()이 변경된 포지션과 자산 스냅샷을 주기적으로 DB에 저장
+    """
+
+    def __init__(self, capital: float = DEFAULT_CAPITAL, max_position_pct: float = MAX_POSITION_PCT,
+                 session_factory=SessionLocal):
+        self.capital = capital
+        self.max_position_pct = max_position_pct
+        self.session_factory = session_factory
+        self.positions = {}
+        self.pending = defaultdict(list)  # 가격이 아직 없는 심볼의 진입 대기 포지션
+        self.net_quantity = defaultdict(float)
+        self.net_cost = defaultdict(float)
+        self.prices = {}
+        self.unrealized = 0.0
+        self.realized = 0.0
+        self.expiry_heap = []
+        self.dirty = set()
+        self.last_signal_id = 0
+        self.refreshed_at = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _open(self, position: PaperPosition, price: float):
+        position.entry_price = price
+        position.quantity = position.notional / price
+        self.net_quantity[position.symbol] += position.quantity
+        self.net_cost[position.symbol] += position.quantity * price
+        current = self.prices.get(position.symbol, price)
+        self.unrealized += position.quantity * (current - price)
+        heapq.heappush(self.expiry_heap, (position.expires_at, position.signal_id, position.symbol))
+        self.dirty.add(position.key)
+
+    def _close(self, position: PaperPosition, price: float, at: datetime):
+        current = self.prices.get(position.symbol, price)
+        self.unrealized -= position.quantity * (current - position.entry_price)
+        self.net_quantity[position.symbol] -= position.quantity
+        self.net_cost[position.symbol] -= position.quantity * position.entry_price
+        position.exit_price, position.exit_at = price, at
+        self.realized += position.pnl(price)
+        self.dirty.add(position.key)
+
+    def add_signal(self, signal, db=None) -> List[PaperPosition]:
+        """신호의 영향 ETF마다 포지션 생성 (진입가: 신호 시각 이후 첫 DB 가격, 없으면 현재 시세)"""
+        weight = percent_to_ratio(signal.confidence)
+        created_at = signal.created_at or datetime.utcnow()
+        expires_at = created_at + timedelta(hours=signal.expected_duration or DEFAULT_DURATION_HOURS)
+        opened = []
+        with self._lock:
+            for impact in parse_affected_etfs(signal.affected_etfs, signal.signal_type):
+                sign = DIRECTION_SIGN.get(impact["direction"], 0)
+                key = (signal.id, impact["symbol"])
+                if not sign or not weight or key in self.positions:
+                    continue
+                notional = sign * self.capital * self.max_position_pct * weight * impact["impact"]
+                position = PaperPosition(signal.id, impact["symbol"], notional, created_at, expires_at)
+                self.positions[key] = position
+                price = price_at(db, position.symbol, created_at) if db is not None else None
+                price = price or self.prices.get(position.symbol)
+                if price:
+                    self._open(position, price)
+                else:
+                    self.pending[position.symbol].append(position)
+                opened.append(position)
+            self.last_signal_id = max(self.last_signal_id, signal.id)
+        return opened
+
+    def on_quotes(self, quotes: List[dict]):
+        """시세 틱 반영: 심볼별 순수량 * 가격 변화만큼 평가손익 갱신, 대기 포지션 진입"""
+        with self._lock:
+            for quote in quotes:
+                symbol, price = quote["symbol"], quote["price"]
+                if not price:
+                    continue
+                previous = self.prices.get(symbol)
+                self.prices[symbol] = price
+                if previous is not None:
+                    self.unrealized += self.net_quantity.get(symbol, 0.0) * (price - previous)
+                if symbol in self.pending:
+                    for position in self.pending.pop(symbol):
+                        self._open(position, price)
+
+    def expire(self, now: Optional[datetime] = None, db=None) -> int:
+        """만기 지난 포지션 청산 (청산가: 만기 이후 첫 DB 가격, 없으면 현재 시세)"""
+        now = now or datetime.utcnow()
+        closed = 0
+        with self._lock:
+            while self.expiry_heap and self.expiry_heap[0][0] <= now:
+                expires_at, signal_id, symbol = heapq.heappop(self.expiry_heap)
+                position = self.positions[(signal_id, symbol)]
+                if not position.is_open:
+                    continue
+                price = price_at(db, symbol, expires_at) if db is not None else None
+                price = price or self.prices.get(symbol, position.entry_price)
+                self._close(position, price, min(now, expires_at))
+                closed += 1
+        return closed
+
+    def recompute(self):
+        """누적 평가손익을 심볼별 순수량/순매입금액으로 다시 계산 (부동소수 오차 보정)"""
+        with self._lock:
+            self.unrealized = sum((
+                quantity * self.prices[symbol] - self.net_cost[symbol]
+                for symbol, quantity in self.net_quantity.items()
+                if quantity and symbol in self.prices
+            ), 0.0)
+
+    def refresh(self, now: Optional[datetime] = None, db=None) -> dict:
+        """새 신호 반영, 만기 청산, 시세 캐시가 비어 있으면 DB 최신 가격으로 평가"""
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            if not self.prices:
+                self.on_quotes(load_latest_prices(db))
+            signals = db.query(TACOSignal).filter(TACOSignal.id > self.last_signal_id).order_by(TACOSignal.id).all()
+            for signal in signals:
+                self.add_signal(signal, db)
+            closed = self.expire(now, db)
+        finally:
+            if own_session:
+                db.close()
+        self.recompute()
+        self.refreshed_at = datetime.utcnow()
+        return {"new_signals": len(signals), "closed": closed, "open": self.open_count()}
+
+    def open_count(self) -> int:
+        with self._lock:
+            return sum(1 for p in self.positions.values() if p.is_open)
+
+    def signal_pnl(self, signal_id: Optional[int] = None) -> Dict[int, dict]:
+        """신호별 손익 (실현 + 평가)"""
+        result = {}
+        with self._lock:
+            for position in self.positions.values():
+                if signal_id is not None and position.signal_id != signal_id:
+                    continue
+                entry = result.setdefault(position.signal_id, {
+                    "signal_id": position.signal_id, "realized_pnl": 0.0, "unrealized_pnl": 0.0,
+                    "open_positions": 0, "closed_positions": 0, "positions": []
+                })
+                pnl = position.pnl(self.prices.get(position.symbol))
+                if position.exit_price is not None:
+                    entry["realized_pnl"] += pnl
+                    entry["closed_positions"] += 1
+                elif position.entry_price is not None:
+                    entry["unrealized_pnl"] += pnl
+                    entry["open_positions"] += 1
+                entry["positions"].append({
+                    "symbol": position.symbol,
+                    "quantity": round(position.quantity, 6),
+                    "entry_price": position.entry_price,
+                    "entry_at": position.entry_at,
+                    "expires_at": position.expires_at,
+                    "exit_price": position.exit_price,
+                    "last_price": self.prices.get(position.symbol),
+                    "pnl": round(pnl, 2),
+                    "status": "closed" if position.exit_price is not None else "open" if position.entry_price else "pending"
+                })
+        for entry in result.values():
+            entry["realized_pnl"] = round(entry["realized_pnl"], 2)
+            entry["unrealized_pnl"] = round(entry["unrealized_pnl"], 2)
+        return result
+
+    def performance(self, now: Optional[datetime] = None) -> dict:
+        """/api/performance 응답 (기존 필드 + 포트폴리오 지표)"""
+        now = now or datetime.utcnow()
+        with self._lock:
+            signals = self.signal_pnl()
+            closed = [s for s in signals.values() if s["closed_positions"] and not s["open_positions"]]
+            successful = [s for s in closed if s["realized_pnl"] > 0]
+            holdings = [
+                (p.exit_at - p.entry_at).total_seconds() / 86400
+                for p in self.positions.values() if p.exit_at is not None
+            ]
+            recent = sum(
+                p.pnl(self.prices.get(p.symbol)) for p in self.positions.values() if p.entry_at >= now - RETURN_WINDOW
+            )
+            gross = sum(
+                abs(quantity) * self.prices.get(symbol, 0.0) for symbol, quantity in self.net_quantity.items()
+            )
+            return {
+                "total_return_30d": round(recent / self.capital * 100, 2),
+                "win_rate": round(len(successful) / len(closed) * 100, 1) if closed else 0.0,
+                "total_profit": round(self.realized + self.unrealized, 2),
+                "total_signals": len(signals),
+                "successful_signals": len(successful),
+                "average_holding_days": round(sum(holdings) / len(holdings), 1) if holdings else 0.0,
+                "equity": round(self.capital + self.realized + self.unrealized, 2),
+                "realized_pnl": round(self.realized, 2),
+                "unrealized_pnl": round(self.unrealized, 2),
+                "gross_exposure": round(gross, 2),
+                "open_positions": sum(s["open_positions"] for s in signals.values()),
+                "refreshed_at": self.refreshed_at
+            }
+
+    def snapshot(self, db=None) -> int:
+        """변경된 포지션(paper_trades)과 자산 스냅샷(portfolio_snapshots) 저장"""
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            with self._lock:
+                keys, self.dirty = self.dirty, set()
+                now = datetime.utcnow()
+                for key in keys:
+                    position = self.positions[key]
+                    if position.entry_price is None:
+                        continue
+                    db.merge(PaperTrade(
+                        signal_id=position.signal_id,
+                        symbol=position.symbol,
+                        direction="long" if position.quantity > 0 else "short",
+                        quantity=position.quantity,
+                        entry_price=position.entry_price,
+                        entry_at=position.entry_at,
+                        expires_at=position.expires_at,
+                        exit_price=position.exit_price,
+                        exit_at=position.exit_at,
+                        last_price=self.prices.get(position.symbol),
+                        pnl=position.pnl(self.prices.get(position.symbol)),
+                        status="closed" if position.exit_price is not None else "open",
+                        updated_at=now
+                    ))
+                performance = self.performance(now)
+                db.add(PortfolioSnapshot(
+                    taken_at=now,
+                    equity=performance["equity"],
+                    realized_pnl=performance["realized_pnl"],
+                    unrealized_pnl=performance["unrealized_pnl"],
+                    gross_exposure=performance["gross_exposure"],
+                    open_positions=performance["open_positions"],
+                    closed_positions=sum(1 for p in self.positions.values() if p.exit_price is not None)
+                ))
+            db.commit()
+        except Exception:
+            db.rollback()
+            self.dirty |= keys
+            raise
+        finally:
+            if own_session:
+                db.close()
+        return len(keys)
+
+    def run(self, interval: float = 30.0, snapshot_interval: float = 300.0):
+        next_snapshot = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                if time.monotonic() >= next_snapshot:
+                    self.snapshot()
+                    next_snapshot = time.monotonic() + snapshot_interval
+            except Exception as e:
+                logger.error(f"모의 투자 갱신 오류: {str(e)}")
+            self._stop.wait(interval)
+
+    def start(self, interval: float = 30.0, snapshot_interval: float = 300.0):
+        """백그라운드 스레드에서 주기적으로 refresh, snapshot_interval마다 snapshot 실행"""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, kwargs={"interval": interval, "snapshot_interval": snapshot_interval}, daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        try:
+            self.snapshot()
+        except Exception as e:
+            logger.error(f"모의 투자 스냅샷 저장 오류: {str(e)}")
+
+if __name__ == "__main__":
+    import sys
+    import json
+    import argparse
+    from pathlib import Path
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from app.database import init_db
+
+    parser = argparse.ArgumentParser(description='TACO 신호 모의 투자 (DB 신호/가격 이력으로 재구성)')
+    parser.add_argument('--capital', type=float, default=DEFAULT_CAPITAL, help='초기 자본')
+    parser.add_argument('--snapshot', action='store_true', help='포지션과 자산 스냅샷을 DB에 저장')
+    parser.add_argument('--signals', action='store_true', help='신호별 손익 출력')
+    args = parser.parse_args()
+
+    init_db()
+    portfolio = PaperPortfolio(capital=args.capital)
+    print(portfolio.refresh())
+    if args.signals:
+        print(json.dumps(list(portfolio.signal_pnl().values()), ensure_ascii=False, indent=2, default=str))
+    print(json.dumps(portfolio.performance(), ensure_ascii=False, indent=2, default=str))
+    if args.snapshot:
+        print(f"💾 포지션 {portfolio.snapshot()}건 저장")
@@ -0,0 +1,250 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, or_
+from .database import SessionLocal
+from .model import TrumpStatement, TACOSignal, SignalETFImpact, ETFPrice, StatementReaction
+from .market_calendar import calendar_for_symbol
+from .etf_universe import ETF_SYMBOLS
+
+logger = logging.getLogger(__name__)
+
+# 창 이름: (장중 시간 간격, 거래일 수) - 둘 중 하나만 사용
+REACTION_WINDOWS = {
+    "5m": (timedelta(minutes=5), 0),
+    "1h": (timedelta(hours=1), 0),
+    "1d": (None, 1),
+    "3d": (None, 3),
+}
+# 신호가 없는 발언도 시장 전체 반응은 볼 수 있도록 항상 포함하는 심볼
+BENCHMARK_SYMBOLS = ["SPY"]
+# 이 기간이 지나도 가격이 채워지지 않은 창은 비워 둔 채 완료 처리
+FINALIZE_AFTER = timedelta(days=10)
+# 발언 직전 가격을 찾을 때 거슬러 올라가는 최대 기간
+LOOKBACK = timedelta(days=7)
+
+def _naive_utc(at: datetime) -> datetime:
+    return at.astimezone(timezone.utc).replace(tzinfo=None) if at.tzinfo else at
+
+def window_targets(symbol: str, posted_at: datetime) -> dict:
+    """발언 시각을 거래소 세션에 맞춰 창별 목표 시각 계산 (naive UTC)
+
+    anchor: 장중이면 발언 시각, 장외/휴장이면 다음 개장 시각 (다음 거래 가능 봉)
+    장중 창(5m/1h)은 anchor 세션 폐장을 넘지 않고, 일 단위 창은 N거래일 뒤 같은 현지 시각 (세션 안으로 보정)
+    """
+    calendar = calendar_for_symbol(symbol)
+    anchor = calendar.next_open(posted_at)
+    local = anchor.astimezone(calendar.tz)
+    _, session_close = calendar.session(local.date())
+    targets = {"anchor": _naive_utc(anchor)}
+    for name, (delta, days) in REACTION_WINDOWS.items():
+        if delta is not None:
+            targets[name] = _naive_utc(min(anchor + delta, session_close))
+            continue
+        day, remaining = local.date(), days
+        while remaining:
+            day += timedelta(days=1)
+            if calendar.is_trading_day(day):
+                remaining -= 1
+        open_at, close_at = calendar.session(day)
+        target = datetime.combine(day, local.timetz()).astimezone(timezone.utc)
+        targets[name] = _naive_utc(min(max(target, open_at), close_at))
+    return targets
+
+def compute_reactions(timestamps: np.ndarray, prices: np.ndarray, statements: List[tuple], symbol: str) -> List[dict]:
+    """정렬된 가격 시계열에서 발언별 창 수익률을 정렬 탐색(searchsorted)으로 계산
+
+    기준가: 발언 시각 이전 마지막 가격 (없으면 anchor 이후 첫 가격)
+    창 종료가: 목표 시각 이전 마지막 가격 (anchor 이후여야 함)
+    statements: [(statement_id, posted_at)]
+    """
+    if not len(timestamps):
+        return []
+    latest = timestamps[-1]
+    rows = []
+    for statement_id, posted_at in statements:
+        targets = window_targets(symbol, posted_at)
+        posted = np.datetime64(_naive_utc(posted_at))
+        anchor = np.datetime64(targets["anchor"])
+        before = np.searchsorted(timestamps, posted, side="right") - 1
+        first_after = np.searchsorted(timestamps, anchor, side="left")
+        if before >= 0 and posted - timestamps[before] <= np.timedelta64(LOOKBACK):
+            base_index = before
+        elif first_after < len(timestamps):
+            base_index = first_after
+        else:
+            continue
+
+        base = prices[base_index]
+        row = {
+            "statement_id": statement_id,
+            "symbol": symbol,
+            "base_at": timestamps[base_index].astype("datetime64[us]").item(),
+            "base_price": float(base),
+            "anchor_at": targets["anchor"],
+            "complete": True,
+        }
+        for name in REACTION_WINDOWS:
+            target = np.datetime64(targets[name])
+            end = np.searchsorted(timestamps, target, side="right") - 1
+            value = None
+            if end >= first_after and end >= 0 and base:
+                value = round(float(prices[end] / base - 1), 6)
+            if latest < target:
+                row["complete"] = False
+            row[f"return_{name}"] = value
+        rows.append(row)
+    return rows
+
+def statement_symbols(db, statement_ids: List[int]) -> Dict[int, set]:
+    """발언별 반응을 계산할 심볼 (신호의 영향 ETF + 기준 지수)"""
+    symbols = defaultdict(lambda: {s for s in BENCHMARK_SYMBOLS if s in ETF_SYMBOLS})
+    rows = db.query(TACOSignal.statement_id, SignalETFImpact.symbol).join(
+        SignalETFImpact, SignalETFImpact.signal_id == TACOSignal.id
+    ).filter(TACOSignal.statement_id.in_(statement_ids)).all()
+    for statement_id in statement_ids:
+        symbols[statement_id]
+    for statement_id, symbol in rows:
+        symbols[statement_id].add(symbol)
+    return symbols
+
+def load_series(db, symbol: str, start: datetime, end: Optional[datetime] = None):
+    """심볼 가격 시계열 (시각 정렬, numpy 배열) - (symbol, timestamp) 인덱스 범위 조회"""
+    query = db.query(ETFPrice.timestamp, ETFPrice.price).filter(
+        ETFPrice.symbol == symbol, ETFPrice.timestamp >= start
+    )
+    if end is not None:
+        query = query.filter(ETFPrice.timestamp <= end)
+    rows = query.order_by(ETFPrice.timestamp).all()
+    timestamps = np.array([row.timestamp for row in rows], dtype="datetime64[us]")
+    prices = np.array([row.price for row in rows], dtype=float)
+    return timestamps, prices
+
+def pending_statements(db, limit: int = 500, now: Optional[datetime] = None) -> List[TrumpStatement]:
+    """반응이 아직 없거나 미완료인 발언, 또는 나중에 생긴 신호의 영향 ETF 반응이 빠진 발언
+
+    (분석 전에 기준 지수 행만 완료된 발언도 신호가 생기면 다시 계산)
+    """
+    now = now or datetime.utcnow()
+    done = db.query(StatementReaction.statement_id).distinct()
+    incomplete = db.query(StatementReaction.statement_id).filter(StatementReaction.complete == False).distinct()
+    missing = db.query(TACOSignal.statement_id).join(
+        SignalETFImpact, SignalETFImpact.signal_id == TACOSignal.id
+    ).outerjoin(StatementReaction, and_(
+        StatementReaction.statement_id == TACOSignal.statement_id,
+        StatementReaction.symbol == SignalETFImpact.symbol
+    )).filter(StatementReaction.statement_id.is_(None)).distinct()
+    return db.query(TrumpStatement).filter(
+        TrumpStatement.posted_at.isnot(None),
+        or_(~TrumpStatement.id.in_(done), TrumpStatement.id.in_(incomplete), TrumpStatement.id.in_(missing))
+    ).order_by(TrumpStatement.posted_at.desc()).limit(limit).all()
+
+def update_reactions(db, limit: int = 500, now: Optional[datetime] = None) -> dict:
+    """미계산/미완료 발언의 창 수익률을 계산해 statement_reactions에 저장 (증분)"""
+    now = now or datetime.utcnow()
+    statements = pending_statements(db, limit, now)
+    if not statements:
+        return {"statements": 0, "rows": 0, "complete": 0}
+
+    symbols = statement_symbols(db, [s.id for s in statements])
+    by_symbol = defaultdict(list)
+    for statement in statements:
+        for symbol in symbols[statement.id]:
+            by_symbol[symbol].append((statement.id, statement.posted_at))
+
+    saved = complete = 0
+    for symbol, items in by_symbol.items():
+        start = min(posted_at for _, posted_at in items) - LOOKBACK
+        timestamps, prices = load_series(db, symbol, start)
+        rows = {row["statement_id"]: row for row in compute_reactions(timestamps, prices, items, symbol)}
+        for statement_id, posted_at in items:
+            row = rows.get(statement_id)
+            if row is None:
+                if now - posted_at <= FINALIZE_AFTER:
+                    continue
+                # 오래된 발언인데 가격 이력이 없으면 빈 행으로 완료 처리 (매번 다시 조회하지 않도록)
+                row = {"statement_id": statement_id, "symbol": symbol, "complete": True}
+            elif not row["complete"] and now - posted_at > FINALIZE_AFTER:
+                row["complete"] = True
+            db.merge(StatementReaction(updated_at=now, **row))
+            saved += 1
+            complete += row["complete"]
+    db.commit()
+    logger.info(f"📐 발언 가격 반응 갱신: 발언 {len(statements)}개, {saved}행 (완료 {complete}행)")
+    return {"statements": len(statements), "rows": saved, "complete": complete}
+
+def get_statement_reaction(db, statement_id: int) -> List[dict]:
+    """발언 하나의 심볼별 창 수익률 (기본키 범위 조회)"""
+    rows = db.query(StatementReaction).filter(StatementReaction.statement_id == statement_id).order_by(
+        StatementReaction.symbol
+    ).all()
+    return [
+        {
+            "symbol": row.symbol,
+            "base_at": row.base_at,
+            "base_price": row.base_price,
+            "anchor_at": row.anchor_at,
+            "returns": {name: getattr(row, f"return_{name}") for name in REACTION_WINDOWS},
+            "complete": row.complete
+        }
+        for row in rows
+    ]
+
+class ReactionUpdater:
+    """주기적으로 update_reactions 실행 (새 가격이 들어오면 미완료 창이 채워짐)"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self, interval: float = 300.0):
+        while not self._stop.is_set():
+            db = self.session_factory()
+            try:
+                update_reactions(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"발언 가격 반응 갱신 오류: {str(e)}")
+            finally:
+                db.close()
+            self._stop.wait(interval)
+
+    def start(self, interval: float = 300.0):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, kwargs={"interval": interval}, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+    from pathlib import Path
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from app.database import init_db
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='발언 이후 ETF 가격 반응(5m/1h/1d/3d) 사전 계산')
+    parser.add_argument('--limit', type=int, default=500, help='한 번에 처리할 최대 발언 수')
+    parser.add_argument('--statement', type=int, help='계산 후 출력할 발언 id')
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        print(update_reactions(db, limit=args.limit))
+        if args.statement:
+            for reaction in get_statement_reaction(db, args.statement):
+                print(reaction)
+    finally:
+        db.close()
@@ -0,0 +1,161 @@
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from .model import ETFPrice
+
+logger = logging.getLogger(__name__)
+
+# 조회 범위: 심볼의 마지막 가격 시각 기준 과거 기간 (None이면 전체)
+SERIES_RANGES = {
+    "1d": timedelta(days=1),
+    "1w": timedelta(weeks=1),
+    "1m": timedelta(days=31),
+    "3m": timedelta(days=92),
+    "6m": timedelta(days=183),
+    "1y": timedelta(days=366),
+    "all": None,
+}
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+MIN_BUDGET = 10
+MAX_BUDGET = 5000
+DEFAULT_BUDGET = 500
+# (심볼, 범위, 포인트 수, 방식)별 결과를 보관할 최대 개수
+MAX_CACHE_ENTRIES = 256
+
+def lttb(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets로 남길 인덱스 선택 (처음/끝 점 포함, 시각 순)
+
+    버킷 평균은 reduceat으로 한 번에 계산, 버킷 안 삼각형 넓이도 벡터 연산
+    (직전 버킷에서 고른 점에 의존하므로 버킷 단위 반복만 남음)
+    """
+    n = len(x)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # 버킷 i의 세 번째 꼭짓점: 다음 버킷 평균 (마지막 버킷은 마지막 점)
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+def minmax(y: np.ndarray, budget: int) -> np.ndarray:
+    """버킷별 최저/최고 점 인덱스 (전체를 2차원으로 접어 한 번에 계산, 처음/끝 점 포함)"""
+    n = len(y)
+    if budget >= n or budget < 4:
+        return np.arange(n)
+    size = -(-n // ((budget - 2) // 2))
+    buckets = -(-n // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    picked = np.concatenate(([0, n - 1], offsets + np.nanargmin(padded, axis=1), offsets + np.nanargmax(padded, axis=1)))
+    return np.unique(picked)
+
+def downsample(timestamps: np.ndarray, prices: np.ndarray, budget: int, method: str = "lttb") -> np.ndarray:
+    """포인트 예산에 맞춰 남길 인덱스 반환 (timestamps: datetime64, 시각 순 정렬)"""
+    if method == "minmax":
+        return minmax(prices, budget)
+    x = (timestamps - timestamps[0]).astype("timedelta64[ms]").astype(np.float64) if len(timestamps) else timestamps
+    return lttb(x, prices, budget)
+
+def series_version(db, symbol: str) -> Tuple[Optional[datetime], int]:
+    """심볼 가격 이력의 (마지막 시각, 행 수) - 바뀌면 캐시 무효화"""
+    return db.query(func.max(ETFPrice.timestamp), func.count(ETFPrice.id)).filter(ETFPrice.symbol == symbol).one()
+
+def load_range(db, symbol: str, range_name: str, last_at: Optional[datetime]):
+    """(symbol, timestamp) 인덱스 범위 조회로 시각 정렬 numpy 배열 반환"""
+    query = db.query(ETFPrice.timestamp, ETFPrice.price).filter(ETFPrice.symbol == symbol)
+    span = SERIES_RANGES[range_name]
+    if span is not None and last_at is not None:
+        query = query.filter(ETFPrice.timestamp >= last_at - span)
+    rows = query.order_by(ETFPrice.timestamp).all()
+    timestamps = np.array([row.timestamp for row in rows], dtype="datetime64[ms]")
+    prices = np.array([row.price for row in rows], dtype=np.float64)
+    return timestamps, prices
+
+class SeriesCache:
+    """(심볼, 범위, 포인트 수, 방식)별 다운샘플 결과 LRU 캐시
+
+    심볼의 (마지막 시각, 행 수)가 바뀌면 해당 항목은 다시 계산
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+series_cache = SeriesCache()
+
+def get_price_series(db, symbol: str, range_name: str = "3m", budget: int = DEFAULT_BUDGET,
+                     method: str = "lttb", cache: Optional[SeriesCache] = series_cache,
+                     version: Optional[tuple] = None) -> dict:
+    """심볼 가격 시계열을 포인트 예산에 맞춰 서버에서 다운샘플링 (캐시 우선)"""
+    if range_name not in SERIES_RANGES:
+        raise ValueError(f"지원하는 범위: {', '.join(SERIES_RANGES)}")
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"지원하는 방식: {', '.join(DOWNSAMPLE_METHODS)}")
+    symbol = symbol.upper()
+    budget = min(max(int(budget), MIN_BUDGET), MAX_BUDGET)
+    version = version or tuple(series_version(db, symbol))
+    key = (symbol, range_name, budget, method)
+    if cache is not None:
+        cached = cache.get(key, version)
+        if cached is not None:
+            return cached
+
+    timestamps, prices = load_range(db, symbol, range_name, version[0])
+    keep = downsample(timestamps, prices, budget, method) if len(timestamps) else np.arange(0)
+    result = {
+        "symbol": symbol,
+        "range": range_name,
+        "budget": budget,
+        "method": method,
+        "raw_points": len(timestamps),
+        "points": len(keep),
+        "timestamps": np.datetime_as_string(timestamps[keep], unit="s").tolist(),
+        "prices": np.round(prices[keep], 4).tolist(),
+    }
+    if cache is not None:
+        cache.put(key, version, result)
+    return result
@@ -0,0 +1,265 @@
+import time
+import random
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from .database import SessionLocal
+from .model import ETFPrice
+from .market_calendar import needs_refresh
+from .bulk_insert import bulk_insert_prices
+
+logger = logging.getLogger(__name__)
+
+class QuoteProvider:
+    """시세 제공자 인터페이스
+
+    get_quotes는 심볼별로 ETFPrice 컬럼과 같은 키를 가진 dict 목록을 반환
+    (symbol, description, price, change_percent, volume, timestamp)
+    """
+
+    def get_quotes(self, symbols: Dict[str, str]) -> List[dict]:
+        raise NotImplementedError
+
+class YFinanceQuoteProvider(QuoteProvider):
+    """yfinance 기반 시세 제공자 (ETFPriceUpdater.get_etf_data 재사용)"""
+
+    def __init__(self):
+        from .etf_updater import ETFPriceUpdater
+        self.updater = ETFPriceUpdater()
+
+    def get_quotes(self, symbols):
+        quotes = []
+        for symbol, description in symbols.items():
+            self.updater.etf_symbols.setdefault(symbol, description)
+            quote = self.updater.get_etf_data(symbol)
+            if quote:
+                quotes.append(quote)
+        return quotes
+
+class SimulatedQuoteProvider(QuoteProvider):
+    """테스트용 로컬 시세 생성기 (랜덤 워크, 일부 틱은 가격/거래량 변화 없음)"""
+
+    def __init__(self, seed: Optional[int] = None, unchanged_ratio: float = 0.3, volatility: float = 0.002):
+        self.random = random.Random(seed)
+        self.unchanged_ratio = unchanged_ratio
+        self.volatility = volatility
+        self.state = {}
+
+    def get_quotes(self, symbols):
+        quotes = []
+        now = datetime.utcnow()
+        for symbol, description in symbols.items():
+            if symbol not in self.state:
+                base = self.random.uniform(20000, 40000) if ".KS" in symbol else self.random.uniform(30, 600)
+                self.state[symbol] = {"open": base, "price": base, "volume": 0}
+            state = self.state[symbol]
+            if self.random.random() >= self.unchanged_ratio:
+                state["price"] = round(state["price"] * (1 + self.random.gauss(0, self.volatility)), 4)
+                state["volume"] += self.random.randint(100, 10000)
+            quotes.append({
+                "symbol": symbol,
+                "description": description,
+                "price": state["price"],
+                "change_percent": (state["price"] - state["open"]) / state["open"] * 100,
+                "volume": state["volume"],
+                "timestamp": now
+            })
+        return quotes
+
+class LatestQuoteCache:
+    """심볼별 최신 시세 인메모리 캐시 (API가 DB 조회 없이 읽음)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._quotes = {}
+        self._listeners = []
+        self.version = 0
+        self.updated_at = None
+
+    def subscribe(self, listener):
+        """변경 시세 목록을 받을 콜백 등록 (예: 모의 투자 평가)"""
+        self._listeners.append(listener)
+
+    def update(self, quotes: List[dict]):
+        if not quotes:
+            return
+        with self._lock:
+            for quote in quotes:
+                self._quotes[quote["symbol"]] = dict(quote)
+            self.version += 1
+            self.updated_at = datetime.utcnow()
+        for listener in self._listeners:
+            try:
+                listener(quotes)
+            except Exception as e:
+                logger.error(f"시세 콜백 오류: {str(e)}")
+
+    def get(self, symbol: str) -> Optional[dict]:
+        with self._lock:
+            quote = self._quotes.get(symbol)
+            return dict(quote) if quote else None
+
+    def snapshot(self, symbols: Optional[List[str]] = None) -> List[dict]:
+        with self._lock:
+            keys = symbols if symbols is not None else sorted(self._quotes)
+            return [dict(self._quotes[s]) for s in keys if s in self._quotes]
+
+    def __len__(self):
+        return len(self._quotes)
+
+# API 프로세스에서 공유하는 최신 시세 캐시
+latest_quotes = LatestQuoteCache()
+
+def load_latest_prices(db, symbols: Optional[List[str]] = None) -> List[dict]:
+    """DB에서 심볼별 최신 가격 1건씩 조회"""
+    latest = db.query(
+        ETFPrice.symbol, func.max(ETFPrice.timestamp).label("timestamp")
+    ).group_by(ETFPrice.symbol).subquery()
+    query = db.query(ETFPrice).join(
+        latest, (ETFPrice.symbol == latest.c.symbol) & (ETFPrice.timestamp == latest.c.timestamp)
+    )
+    if symbols:
+        query = query.filter(ETFPrice.symbol.in_(symbols))
+    return [
+        {
+            "symbol": row.symbol,
+            "description": row.description,
+            "price": row.price,
+            "change_percent": row.change_percent,
+            "volume": row.volume,
+            "timestamp": row.timestamp
+        }
+        for row in query.order_by(ETFPrice.symbol).all()
+    ]
+
+class QuoteStreamer:
+    """주기적으로 시세를 가져와 변경분만 캐시에 반영하고 일정 간격으로 일괄 저장
+
+    calendar_aware이면 장중인 거래소의 심볼만 매 간격 폴링하고,
+    장 마감 중인 심볼은 마지막 폐장 이후 한 번만 조회
+    """
+
+    def __init__(self, provider: QuoteProvider, symbols: Dict[str, str], session_factory=SessionLocal,
+                 interval: float = 5.0, commit_interval: float = 30.0, cache: LatestQuoteCache = latest_quotes,
+                 calendar_aware: bool = True):
+        self.provider = provider
+        self.symbols = symbols
+        self.session_factory = session_factory
+        self.interval = interval
+        self.commit_interval = commit_interval
+        self.cache = cache
+        self.calendar_aware = calendar_aware
+        self.pending = []
+        self.last_written = {}
+        self.last_polled = {}
+        self.stats = {"polls": 0, "quotes": 0, "changed": 0, "written": 0, "commits": 0, "skipped_closed": 0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def warm_up(self):
+        """DB의 최신 가격으로 캐시와 중복 판단 기준을 초기화"""
+        db = self.session_factory()
+        try:
+            quotes = load_latest_prices(db, list(self.symbols))
+        finally:
+            db.close()
+        self.cache.update(quotes)
+        for quote in quotes:
+            self.last_written[quote["symbol"]] = (quote["price"], quote["volume"])
+            self.last_polled[quote["symbol"]] = quote["timestamp"]
+
+    def due_symbols(self, now: Optional[datetime] = None) -> Dict[str, str]:
+        """이번 폴링에서 조회할 심볼 (장 마감 중이고 이미 종가를 받은 심볼 제외)"""
+        if not self.calendar_aware:
+            return self.symbols
+        now = now or datetime.utcnow()
+        return {
+            symbol: description for symbol, description in self.symbols.items()
+            if needs_refresh(symbol, self.last_polled.get(symbol), now)
+        }
+
+    def poll_once(self) -> List[dict]:
+        """시세 1회 조회 후 가격/거래량이 바뀐 시세만 반환"""
+        now = datetime.utcnow()
+        due = self.due_symbols(now)
+        self.stats["skipped_closed"] += len(self.symbols) - len(due)
+        if not due:
+            return []
+        quotes = self.provider.get_quotes(due)
+        for symbol in due:
+            self.last_polled[symbol] = now
+
+        changed = []
+        for quote in quotes:
+            key = (quote["price"], quote["volume"])
+            if self.last_written.get(quote["symbol"]) == key:
+                continue
+            self.last_written[quote["symbol"]] = key
+            changed.append(quote)
+
+        self.cache.update(changed)
+        self.pending.extend(changed)
+        self.stats["polls"] += 1
+        self.stats["quotes"] += len(quotes)
+        self.stats["changed"] += len(changed)
+        return changed
+
+    def flush(self) -> int:
+        """쌓인 변경 시세를 한 번의 트랜잭션으로 일괄 저장"""
+        if not self.pending:
+            return 0
+        rows, self.pending = self.pending, []
+        db = self.session_factory()
+        try:
+            bulk_insert_prices(db, rows)
+            db.commit()
+        except Exception as e:
+            logger.error(f"시세 일괄 저장 오류: {str(e)}")
+            db.rollback()
+            self.pending = rows + self.pending
+            return 0
+        finally:
+            db.close()
+        self.stats["written"] += len(rows)
+        self.stats["commits"] += 1
+        return len(rows)
+
+    def run(self, duration: Optional[float] = None):
+        """duration초 동안(없으면 stop 호출 전까지) 폴링 루프 실행"""
+        self.warm_up()
+        started = time.monotonic()
+        last_commit = started
+        logger.info(f"📡 시세 스트리밍 시작: {len(self.symbols)}개 종목, {self.interval}초 간격, {self.commit_interval}초마다 저장")
+
+        try:
+            while not self._stop.is_set():
+                tick_started = time.monotonic()
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    logger.error(f"시세 조회 오류: {str(e)}")
+
+                now = time.monotonic()
+                if now - last_commit >= self.commit_interval:
+                    self.flush()
+                    last_commit = now
+                if duration is not None and now - started >= duration:
+                    break
+                self._stop.wait(max(0.0, self.interval - (now - tick_started)))
+        finally:
+            self.flush()
+            logger.info(f"📡 시세 스트리밍 종료: {self.stats}")
+
+    def start(self, duration: Optional[float] = None):
+        """백그라운드 스레드에서 폴링 루프 시작"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, kwargs={"duration": duration}, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
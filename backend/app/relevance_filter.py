@@ -0,0 +1,208 @@
+import re
+import sys
+import json
+import math
+import random
+import logging
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 무역/시장 관련 어휘 가중치 (학습된 모델이 없을 때의 기본 점수)
+TRADE_LEXICON = {
+    "tariff": 3.0, "tariffs": 3.0, "trade": 2.5, "deficit": 2.0, "import": 2.0, "imports": 2.0,
+    "export": 2.0, "exports": 2.0, "china": 2.0, "xi": 2.0, "eu": 2.0, "european": 1.5,
+    "europe": 1.5, "japan": 1.5, "canada": 1.5, "mexico": 1.5, "germany": 1.5, "korea": 1.5,
+    "deal": 1.5, "negotiation": 1.5, "negotiations": 1.5, "sanctions": 1.5, "fed": 2.0,
+    "rate": 1.5, "rates": 1.5, "powell": 2.0, "inflation": 2.0, "prices": 1.5, "market": 2.0,
+    "stock": 2.0, "stocks": 2.0, "economy": 2.0, "economic": 2.0, "dollar": 1.5, "dollars": 1.0,
+    "oil": 1.5, "gasoline": 1.5, "energy": 1.5, "steel": 2.0, "metal": 1.5, "aluminum": 2.0,
+    "manufacturing": 1.5, "jobs": 1.5, "budget": 1.0, "tax": 1.5, "taxes": 1.5, "bill": 0.5,
+    "treasury": 1.5, "billions": 1.0, "trillion": 1.0, "growth": 1.0, "bank": 1.0, "crypto": 1.0,
+    "관세": 3.0, "무역": 2.5, "중국": 2.0, "시장": 2.0, "경제": 2.0, "금리": 2.0, "수출": 2.0,
+    "수입": 2.0, "환율": 2.0, "주식": 2.0, "물가": 2.0,
+}
+LEXICON_SCALE = 4.0
+
+# 학습 레이블 기준: trade_relevance가 이 값 이상이면 무역 관련 발언
+LABEL_THRESHOLD = 0.5
+DEFAULT_THRESHOLD = 0.2
+HASH_DIM = 1 << 18
+
+MODEL_PATH = Path(__file__).resolve().parent / "relevance_model.json"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+def lexicon_score(text: str) -> float:
+    """어휘 가중치 합을 0~1 점수로 변환"""
+    total = sum(TRADE_LEXICON.get(token, 0.0) for token in set(tokenize(text)))
+    return 1 - math.exp(-total / LEXICON_SCALE)
+
+def _features(text: str) -> Dict[int, float]:
+    """해시 bag-of-words(유니그램+바이그램) + 어휘 점수 특성"""
+    tokens = tokenize(text)
+    grams = tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+    features = {}
+    for gram in grams:
+        index = zlib.crc32(gram.encode("utf-8")) % HASH_DIM
+        features[index] = 1.0
+    features[HASH_DIM] = lexicon_score(text)  # 어휘 점수
+    features[HASH_DIM + 1] = 1.0  # 절편
+    return features
+
+def _sigmoid(z: float) -> float:
+    if z < -30:
+        return 0.0
+    if z > 30:
+        return 1.0
+    return 1 / (1 + math.exp(-z))
+
+class RelevanceClassifier:
+    """CPU 전용 로지스틱 회귀 관련성 분류기 (해시 특성, 과거 trade_relevance 레이블로 학습)"""
+
+    def __init__(self, weights: Optional[Dict[int, float]] = None, threshold: float = DEFAULT_THRESHOLD):
+        self.weights = weights or {}
+        self.threshold = threshold
+
+    @property
+    def is_trained(self) -> bool:
+        return bool(self.weights)
+
+    def score(self, text: str) -> float:
+        """무역 관련 확률 (학습 전에는 어휘 점수)"""
+        if not self.is_trained:
+            return lexicon_score(text)
+        z = sum(self.weights.get(i, 0.0) * v for i, v in _features(text).items())
+        return _sigmoid(z)
+
+    def should_analyze(self, text: str) -> bool:
+        return self.score(text) >= self.threshold
+
+    def fit(self, texts: List[str], labels: List[int], epochs: int = 30, learning_rate: float = 0.2,
+            l2: float = 1e-4, seed: int = 42):
+        """SGD로 로지스틱 회귀 학습"""
+        samples = [(_features(t), y) for t, y in zip(texts, labels)]
+        rng = random.Random(seed)
+        weights = {HASH_DIM: 2.0}
+        for epoch in range(epochs):
+            rng.shuffle(samples)
+            rate = learning_rate / (1 + epoch * 0.1)
+            for features, label in samples:
+                z = sum(weights.get(i, 0.0) * v for i, v in features.items())
+                gradient = _sigmoid(z) - label
+                for i, v in features.items():
+                    w = weights.get(i, 0.0)
+                    weights[i] = w - rate * (gradient * v + l2 * w)
+        self.weights = {i: w for i, w in weights.items() if abs(w) > 1e-6}
+        return self
+
+    def choose_threshold(self, texts: List[str], labels: List[int], target_recall: float = 0.95,
+                         folds: int = 5, seed: int = 42) -> float:
+        """교차 검증 점수 기준으로 관련 발언 재현율이 target_recall 이상인 가장 높은 임계값 선택
+
+        학습 데이터 점수는 과적합으로 1에 가깝기 때문에 fold 밖 점수를 사용
+        """
+        indices = list(range(len(texts)))
+        random.Random(seed).shuffle(indices)
+        positives = []
+        for fold in range(folds):
+            held = set(indices[fold::folds])
+            model = RelevanceClassifier().fit(
+                [texts[i] for i in indices if i not in held],
+                [labels[i] for i in indices if i not in held],
+                seed=seed
+            )
+            positives.extend(model.score(texts[i]) for i in held if labels[i])
+        positives.sort(reverse=True)
+        if positives:
+            keep = max(1, math.ceil(len(positives) * target_recall))
+            self.threshold = positives[keep - 1]
+        return self.threshold
+
+    def save(self, path: Path = MODEL_PATH):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"threshold": self.threshold, "weights": self.weights}, f)
+
+    @classmethod
+    def load(cls, path: Path = MODEL_PATH, threshold: Optional[float] = None) -> "RelevanceClassifier":
+        """저장된 모델 로드 (없으면 어휘 점수 기반 분류기)"""
+        if not Path(path).exists():
+            return cls(threshold=threshold if threshold is not None else DEFAULT_THRESHOLD)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        weights = {int(i): w for i, w in data["weights"].items()}
+        return cls(weights, threshold if threshold is not None else data["threshold"])
+
+def load_labeled_statements(db) -> Tuple[List[str], List[int]]:
+    """분석 완료된 발언과 trade_relevance 레이블 조회"""
+    from .model import TrumpStatement, percent_to_ratio
+
+    rows = db.query(TrumpStatement.original_text, TrumpStatement.trade_relevance).filter(
+        TrumpStatement.is_analyzed == True,
+        TrumpStatement.trade_relevance.isnot(None)
+    ).all()
+    texts = [row.original_text for row in rows]
+    labels = [int(percent_to_ratio(row.trade_relevance) >= LABEL_THRESHOLD) for row in rows]
+    return texts, labels
+
+def evaluate(texts: List[str], labels: List[int], holdout: float = 0.3, target_recall: float = 0.95,
+             seed: int = 42) -> dict:
+    """학습/검증 분할 후 LLM 호출 생략 비율과 검증 재현율 계산"""
+    indices = list(range(len(texts)))
+    random.Random(seed).shuffle(indices)
+    split = int(len(indices) * (1 - holdout))
+    train, test = indices[:split], indices[split:]
+
+    classifier = RelevanceClassifier().fit([texts[i] for i in train], [labels[i] for i in train], seed=seed)
+    classifier.choose_threshold([texts[i] for i in train], [labels[i] for i in train], target_recall)
+
+    kept = [i for i in test if classifier.should_analyze(texts[i])]
+    positives = [i for i in test if labels[i]]
+    kept_positives = [i for i in kept if labels[i]]
+    lexicon_kept = [i for i in test if lexicon_score(texts[i]) >= DEFAULT_THRESHOLD]
+    return {
+        "train_size": len(train),
+        "test_size": len(test),
+        "threshold": round(classifier.threshold, 4),
+        "calls_avoided": round(1 - len(kept) / len(test), 4) if test else 0.0,
+        "recall": round(len(kept_positives) / len(positives), 4) if positives else None,
+        "lexicon_calls_avoided": round(1 - len(lexicon_kept) / len(test), 4) if test else 0.0,
+        "lexicon_recall": round(sum(labels[i] for i in lexicon_kept) / len(positives), 4) if positives else None,
+    }
+
+if __name__ == "__main__":
+    import argparse
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description='LLM 호출 전 무역 관련성 사전 필터')
+    parser.add_argument('--train', action='store_true', help='전체 레이블로 학습 후 모델 저장')
+    parser.add_argument('--evaluate', action='store_true', help='검증 데이터로 호출 생략 비율/재현율 평가')
+    parser.add_argument('--holdout', type=float, default=0.3, help='검증 데이터 비율')
+    parser.add_argument('--target-recall', type=float, default=0.95, help='임계값 선택 기준 재현율')
+    parser.add_argument('--score', type=str, help='텍스트 하나의 관련성 점수 출력')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        texts, labels = load_labeled_statements(db)
+    finally:
+        db.close()
+
+    if args.evaluate:
+        report = evaluate(texts, labels, args.holdout, args.target_recall)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.train:
+        classifier = RelevanceClassifier().fit(texts, labels)
+        classifier.choose_threshold(texts, labels, args.target_recall)
+        classifier.save()
+        logger.info(f"✅ 관련성 모델 저장: {MODEL_PATH} (학습 {len(texts)}건, 임계값 {classifier.threshold:.3f})")
+    if args.score:
+        print(f"{RelevanceClassifier.load().score(args.score):.4f}")
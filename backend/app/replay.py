@@ -0,0 +1,408 @@
+import sys
+import time
+import zlib
+import queue
+import logging
+import tempfile
+import threading
+from html.parser import HTMLParser
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import List, Optional
+from .etf_universe import ETF_SYMBOLS
+from .relevance_filter import RelevanceClassifier, lexicon_score, tokenize
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_PAGE = Path(__file__).resolve().parent / "truth_social_page.html"
+STAGES = ("crawl", "analyze", "signal", "api", "e2e")
+# API 단계 폴링: API_POLL_MIN초부터 두 배씩 API_POLL_MAX초까지 간격을 늘리며 API_TIMEOUT초 동안 확인
+API_POLL_MIN = 0.005
+API_POLL_MAX = 0.2
+API_TIMEOUT = 10.0
+API_POLL_LIMIT = 50
+
+# 스텁 분석기의 방향 판단 어휘 (완화 -> BUY, 강경 -> SELL)
+EASING_WORDS = {"deal", "agreement", "pause", "delay", "talks", "progress", "great", "lower", "cut"}
+HAWKISH_WORDS = {"tariff", "tariffs", "sanction", "sanctions", "ban", "war", "retaliate", "penalty", "raise"}
+
+class TimelinePageParser(HTMLParser):
+    """저장된 Truth Social 타임라인 HTML에서 게시글(data-index, 본문, 작성 시각) 추출"""
+
+    def __init__(self):
+        super().__init__()
+        self.posts = []
+        self._current = None
+        self._depth = 0
+        self._markup_depth = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "div" and "data-index" in attrs and "data-item-index" in attrs:
+            self._current = {"data_index": attrs["data-index"], "content": "", "time": None}
+            self._depth = 0
+        if self._current is None:
+            return
+        if tag == "div":
+            self._depth += 1
+        if tag == "p" and attrs.get("data-markup") == "true":
+            self._markup_depth = self._depth
+        if tag == "time" and attrs.get("title"):
+            self._current["time"] = attrs["title"]
+
+    def handle_endtag(self, tag):
+        if self._current is None or tag != "div":
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            if self._current["content"].strip():
+                self.posts.append(self._current)
+            self._current, self._markup_depth = None, None
+
+    def handle_data(self, data):
+        if self._current is not None and self._markup_depth is not None:
+            self._current["content"] += data
+
+def load_fixture_posts(path: Path = FIXTURE_PAGE) -> List[dict]:
+    from dateutil import parser as date_parser
+
+    page = TimelinePageParser()
+    page.feed(Path(path).read_text(encoding="utf-8"))
+    return [
+        {
+            "content": post["content"].strip(),
+            "timestamp": date_parser.parse(post["time"]) if post["time"] else datetime.utcnow(),
+            "data_index": post["data_index"],
+        }
+        for post in page.posts
+    ]
+
+def load_recorded_posts(db, limit: int = 1000) -> List[dict]:
+    """기존 DB에 기록된 발언을 게시 시각 순으로 로드"""
+    from .model import TrumpStatement
+
+    rows = db.query(TrumpStatement.id, TrumpStatement.original_text, TrumpStatement.posted_at).filter(
+        TrumpStatement.original_text.isnot(None)
+    ).order_by(TrumpStatement.posted_at).limit(limit).all()
+    return [
+        {"content": row.original_text, "timestamp": row.posted_at or datetime.utcnow(), "data_index": str(row.id)}
+        for row in rows
+    ]
+
+def load_recorded_ticks(db, limit: int = 10000) -> List[dict]:
+    from .model import ETFPrice
+
+    rows = db.query(ETFPrice).order_by(ETFPrice.timestamp).limit(limit).all()
+    return [
+        {"symbol": p.symbol, "description": p.description, "price": p.price,
+         "change_percent": p.change_percent, "volume": p.volume, "timestamp": p.timestamp}
+        for p in rows
+    ]
+
+def repeat_posts(posts: List[dict], times: int) -> List[dict]:
+    """처리량 측정용으로 게시글을 반복 (본문이 같으면 중복 제거되므로 회차 표시를 붙임)"""
+    if times <= 1:
+        return posts
+    span = (posts[-1]["timestamp"] - posts[0]["timestamp"]) + timedelta(minutes=1)
+    return [
+        {**post, "content": f"{post['content']} (replay {k})", "timestamp": post["timestamp"] + span * k}
+        for k in range(times) for post in posts
+    ]
+
+def create_stub_analyzer(llm_latency: float = 0.0, translate_latency: float = 0.0,
+                         relevance_filter: Optional[RelevanceClassifier] = None):
+    """OpenAI 없이 어휘 기반으로 분석 결과를 만드는 TrumpAnalyzer (지연 시간 흉내 가능)"""
+    from .trump_analyzer import TrumpAnalyzer
+
+    class StubAnalyzer(TrumpAnalyzer):
+        def analyze_with_gpt(self, text):
+            if llm_latency:
+                time.sleep(llm_latency)
+            tokens = set(tokenize(text))
+            easing, hawkish = len(tokens & EASING_WORDS), len(tokens & HAWKISH_WORDS)
+            score = lexicon_score(text)
+            signal_type = "BUY" if easing > hawkish else "SELL" if hawkish > easing else "WATCH"
+            symbols = list(ETF_SYMBOLS)
+            seed = zlib.crc32(text.encode())
+            return {
+                "key_points": sorted(tokens)[:5],
+                "sentiment_score": round((easing - hawkish) / max(easing + hawkish, 1), 2),
+                "trade_relevance": round(score * 100),
+                "taco_probability": round(50 + score * 50),
+                "signal_type": signal_type,
+                "affected_etfs": [
+                    {"symbol": symbols[(seed >> (i * 8)) % len(symbols)],
+                     "direction": "up" if signal_type == "BUY" else "down", "impact": 0.6}
+                    for i in range(3)
+                ]
+            }
+
+        def translate_to_korean(self, text):
+            if translate_latency:
+                time.sleep(translate_latency)
+            return f"[번역] {text[:80]}"
+
+    analyzer = StubAnalyzer("replay", relevance_filter=relevance_filter)
+    analyzer.request_interval = 0
+    return analyzer
+
+def _percentiles(values: List[float]) -> dict:
+    if not values:
+        return {"count": 0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(len(values) * q))]
+    return {"count": len(values), "p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": values[-1]}
+
+class ReplayHarness:
+    """기록된 게시글/시세를 크롤러 -> 분석기 -> 신호 엔진 -> API 파이프라인으로 재생
+
+    단계마다 스레드 하나와 큐로 연결해 실제 배포처럼 파이프라인으로 동작하고,
+    게시글별 단계 통과 시각으로 단계/종단 지연과 처리량을 계산 (임시 DB 사용, 외부 서비스는 스텁)
+    """
+
+    def __init__(self, posts: List[dict], ticks: Optional[List[dict]] = None, speedup: float = 60.0,
+                 analyzer=None, db_path: Optional[str] = None):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from .database import Base
+
+        self.posts = sorted(posts, key=lambda p: p["timestamp"])
+        self.ticks = sorted(ticks or [], key=lambda t: t["timestamp"])
+        self.speedup = speedup
+        self.analyzer = analyzer or create_stub_analyzer()
+        self._tmp = None
+        if db_path is None:
+            self._tmp = tempfile.TemporaryDirectory()
+            db_path = f"{self._tmp.name}/replay.db"
+        self.engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False, "timeout": 30})
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.items = []
+        self.tick_latencies = []
+        self.api_misses = 0  # API_TIMEOUT 안에 응답에 보이지 않은 신호 (종단 지연에서 제외)
+
+    def _scheduled(self, base: datetime, started: float, at: datetime) -> float:
+        if not self.speedup:
+            return started
+        return started + (at - base).total_seconds() / self.speedup
+
+    def _feed_posts(self, out: "queue.Queue", started: float):
+        base = self.posts[0]["timestamp"]
+        for post in self.posts:
+            delay = self._scheduled(base, started, post["timestamp"]) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            item = {"post": post, "arrival": time.perf_counter()}
+            self.items.append(item)
+            out.put(item)
+        out.put(None)
+
+    def _feed_ticks(self, started: float):
+        """시세 틱 재생: 같은 시각 틱을 묶어 bulk insert + 최신 시세 캐시 갱신"""
+        from .bulk_insert import bulk_insert_prices
+        from .quote_stream import latest_quotes
+
+        if not self.ticks:
+            return
+        base = self.ticks[0]["timestamp"] if self.posts == [] else self.posts[0]["timestamp"]
+        batch = []
+        for i, tick in enumerate(self.ticks):
+            batch.append(tick)
+            if i + 1 < len(self.ticks) and self.ticks[i + 1]["timestamp"] == tick["timestamp"]:
+                continue
+            delay = self._scheduled(base, started, tick["timestamp"]) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            arrival = time.perf_counter()
+            db = self.Session()
+            try:
+                bulk_insert_prices(db, batch)
+                db.commit()
+            finally:
+                db.close()
+            latest_quotes.update(batch)
+            self.tick_latencies.append(time.perf_counter() - arrival)
+            batch = []
+
+    def _crawl_stage(self, inbox: "queue.Queue", outbox: "queue.Queue"):
+        """크롤러 단계: CrawlStateStore로 게시글 저장 (배치 크기 1 - 지연 최소)"""
+        from .crawl_state import CrawlStateStore
+        from .model import TrumpStatement
+
+        store = CrawlStateStore("replay", session_factory=self.Session)
+        while (item := inbox.get()) is not None:
+            store.flush([item["post"]], caught_up=True)
+            db = self.Session()
+            try:
+                item["statement_id"] = db.query(TrumpStatement.id).filter(
+                    TrumpStatement.original_text == item["post"]["content"]
+                ).scalar()
+            finally:
+                db.close()
+            item["crawl"] = time.perf_counter()
+            outbox.put(item)
+        outbox.put(None)
+
+    def _analyze_stage(self, inbox: "queue.Queue", outbox: "queue.Queue"):
+        from .model import TrumpStatement
+
+        while (item := inbox.get()) is not None:
+            db = self.Session()
+            try:
+                statement = db.get(TrumpStatement, item["statement_id"])
+                signal = self.analyzer.analyze_statement(statement, db) if statement else None
+                db.commit()
+                item["signal_id"] = signal.id if signal else None
+            except Exception as e:
+                logger.error(f"재생 분석 오류: {str(e)}")
+                db.rollback()
+                item["signal_id"] = None
+            finally:
+                db.close()
+            item["analyze"] = time.perf_counter()
+            if item["signal_id"]:
+                outbox.put(item)
+        outbox.put(None)
+
+    def _signal_stage(self, engine, inbox: "queue.Queue", outbox: "queue.Queue"):
+        while (item := inbox.get()) is not None:
+            if item["signal_id"] not in engine.signals:
+                engine.refresh()
+            item["signal"] = time.perf_counter()
+            outbox.put(item)
+        outbox.put(None)
+
+    def _api_stage(self, client, inbox: "queue.Queue"):
+        """API 단계: 신호가 /api/latest-signals 응답에 보일 때까지 간격을 늘리며 조회 (보인 경우만 시각 기록)"""
+        while (item := inbox.get()) is not None:
+            deadline = time.perf_counter() + API_TIMEOUT
+            interval = API_POLL_MIN
+            while True:
+                # 재생 중 쌓인 신호에 밀려 조회 범위 밖으로 나가지 않도록 게시글 수만큼 조회
+                response = client.get("/api/latest-signals", params={"limit": max(API_POLL_LIMIT, len(self.items))})
+                if any(s["id"] == item["signal_id"] for s in response.json()["signals"]):
+                    item["api"] = time.perf_counter()
+                    break
+                if time.perf_counter() + interval > deadline:
+                    self.api_misses += 1
+                    logger.warning(f"신호 {item['signal_id']}가 {API_TIMEOUT:g}초 안에 API 응답에 보이지 않음")
+                    break
+                time.sleep(interval)
+                interval = min(interval * 2, API_POLL_MAX)
+
+    def run(self) -> dict:
+        from fastapi.testclient import TestClient
+        from .database import get_db
+        from . import main as api
+
+        def override_get_db():
+            db = self.Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        api.app.dependency_overrides[get_db] = override_get_db
+        engine_factory = api.signal_engine.session_factory
+        api.signal_engine.session_factory = self.Session
+        client = TestClient(api.app)  # startup 이벤트(샘플 데이터, 스트리머)는 실행하지 않음
+
+        queues = [queue.Queue() for _ in range(4)]
+        started = time.perf_counter() + 0.05
+        threads = [
+            threading.Thread(target=self._feed_posts, args=(queues[0], started)),
+            threading.Thread(target=self._feed_ticks, args=(started,)),
+            threading.Thread(target=self._crawl_stage, args=(queues[0], queues[1])),
+            threading.Thread(target=self._analyze_stage, args=(queues[1], queues[2])),
+            threading.Thread(target=self._signal_stage, args=(api.signal_engine, queues[2], queues[3])),
+            threading.Thread(target=self._api_stage, args=(client, queues[3])),
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            api.app.dependency_overrides.clear()
+            api.signal_engine.session_factory = engine_factory
+        return self.report(started)
+
+    def report(self, started: float) -> dict:
+        latencies = {stage: [] for stage in STAGES}
+        for item in self.items:
+            if "crawl" in item:
+                latencies["crawl"].append(item["crawl"] - item["arrival"])
+            if "analyze" in item:
+                latencies["analyze"].append(item["analyze"] - item["crawl"])
+            if "signal" in item:
+                latencies["signal"].append(item["signal"] - item["analyze"])
+            if "api" in item:
+                latencies["api"].append(item["api"] - item["signal"])
+                latencies["e2e"].append(item["api"] - item["arrival"])
+
+        finished = max((item.get("api", item.get("analyze", started)) for item in self.items), default=started)
+        elapsed = max(finished - started, 1e-9)
+        return {
+            "posts": len(self.items),
+            "signals": len(latencies["e2e"]),
+            "api_misses": self.api_misses,
+            "elapsed": elapsed,
+            "posts_per_second": len(self.items) / elapsed,
+            "signals_per_second": len(latencies["e2e"]) / elapsed,
+            "stages": {stage: _percentiles(values) for stage, values in latencies.items()},
+            "ticks": _percentiles(self.tick_latencies),
+        }
+
+def print_report(result: dict, speedup: float):
+    print(f"\n=== 재생 결과 (배속 {'최대' if not speedup else f'x{speedup:g}'}) ===")
+    print(f"게시글 {result['posts']}개, 신호 {result['signals']}개, {result['elapsed']:.2f}초")
+    if result["api_misses"]:
+        print(f"⚠️ API 응답에 보이지 않은 신호 {result['api_misses']}개 (종단 지연에서 제외)")
+    print(f"처리량: 게시글 {result['posts_per_second']:.1f}/초, 신호 {result['signals_per_second']:.1f}/초")
+    print(f"\n{'단계':<10} {'건수':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  (ms)")
+    rows = list(result["stages"].items()) + [("tick", result["ticks"])]
+    for stage, stats in rows:
+        print(f"{stage:<10} {stats['count']:>6} " + " ".join(
+            f"{stats[key] * 1000:9.2f}" for key in ("p50", "p90", "p99", "max")
+        ))
+
+if __name__ == "__main__":
+    import argparse
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from app.database import SessionLocal
+    from app.quote_stream import SimulatedQuoteProvider
+
+    parser = argparse.ArgumentParser(description='파이프라인 재생 (크롤러 -> 분석기 -> 신호 -> API 지연 측정)')
+    parser.add_argument('--source', choices=["db", "fixture"], default="db", help='게시글 출처 (기존 DB 또는 저장된 타임라인 HTML)')
+    parser.add_argument('--fixture', type=str, default=str(FIXTURE_PAGE), help='타임라인 HTML 경로')
+    parser.add_argument('--speedup', type=float, default=0, help='재생 배속 (0: 대기 없이 최대 속도)')
+    parser.add_argument('--repeat', type=int, default=1, help='게시글 반복 횟수 (처리량 측정용)')
+    parser.add_argument('--ticks', type=int, default=0, help='함께 재생할 시뮬레이션 시세 틱 묶음 수 (0: DB 기록 시세 사용)')
+    parser.add_argument('--llm-latency', type=float, default=0.0, help='스텁 LLM 응답 지연(초)')
+    parser.add_argument('--translate-latency', type=float, default=0.0, help='스텁 번역 지연(초)')
+    parser.add_argument('--analyze-all', action='store_true', help='사전 필터 없이 모든 게시글 분석')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    db = SessionLocal()
+    try:
+        posts = load_fixture_posts(args.fixture) if args.source == "fixture" else load_recorded_posts(db)
+        ticks = [] if args.ticks else load_recorded_ticks(db)
+    finally:
+        db.close()
+    posts = repeat_posts(posts, args.repeat)
+
+    if args.ticks and posts:
+        provider = SimulatedQuoteProvider(seed=0, unchanged_ratio=0)
+        step = (posts[-1]["timestamp"] - posts[0]["timestamp"]) / args.ticks
+        for i in range(args.ticks):
+            for quote in provider.get_quotes(ETF_SYMBOLS):
+                ticks.append({**quote, "timestamp": posts[0]["timestamp"] + step * i})
+
+    relevance = RelevanceClassifier(threshold=0.0) if args.analyze_all else None
+    harness = ReplayHarness(
+        posts, ticks, speedup=args.speedup,
+        analyzer=create_stub_analyzer(args.llm_latency, args.translate_latency, relevance)
+    )
+    print_report(harness.run(), args.speedup)
@@ -0,0 +1,276 @@
+import math
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from .database import SessionLocal
+from .model import ETFPrice
+from .etf_universe import ETF_SYMBOLS
+
+logger = logging.getLogger(__name__)
+
+# 창 이름: (봉 길이(초), 창 크기(봉 수))
+DEFAULT_WINDOWS = {
+    "5m": (300, 288),
+    "1h": (3600, 120),
+    "1d": (86400, 60),
+}
+TRADING_DAYS = 252
+TRADING_SECONDS_PER_DAY = 6.5 * 3600
+EPOCH = datetime(1970, 1, 1)
+
+def periods_per_year(bar_seconds: int) -> float:
+    if bar_seconds >= 86400:
+        return TRADING_DAYS * 86400 / bar_seconds
+    return TRADING_DAYS * TRADING_SECONDS_PER_DAY / bar_seconds
+
+def _clean(values: np.ndarray, digits: int = 6):
+    """NaN은 None으로 바꿔 JSON 직렬화 가능한 리스트로 변환"""
+    return [
+        _clean(row, digits) if isinstance(row, np.ndarray) else (None if math.isnan(row) else round(float(row), digits))
+        for row in values
+    ]
+
+class RollingWindow:
+    """심볼 전체의 봉 수익률 이동 창 통계 (평균/분산/공분산을 증분 유지)
+
+    봉이 닫힐 때마다 수익률 벡터 r을 링 버퍼에 넣고 쌍별 합계(관측 수, Σr, Σr², Σrrᵀ)에 더하고, 창에서 빠지는 벡터는 뺌
+    -> 갱신 O(N²) (N: 심볼 수), 가격 이력 전체를 다시 읽지 않음
+    이번 봉이나 직전 봉에 가격이 없는 심볼(장이 닫힌 KRX 종목 등)의 수익률은 결측으로 두고,
+    상관/분산은 두 심볼 모두 관측된 봉만으로 계산 (pairwise-complete), 누적 오차는 창 크기마다 버퍼로 재계산
+    """
+
+    def __init__(self, symbols: List[str], bar_seconds: int, size: int):
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.bar_seconds = bar_seconds
+        self.size = size
+        n = len(self.symbols)
+        self.buffer = np.full((size, n), np.nan)
+        self.pos = 0
+        self.count = 0
+        # [i, j]: i, j 모두 관측된 봉에 대한 합계 (pairs: 봉 수, sum/squares: r_i, r_i², cross: r_i·r_j)
+        self.pairs = np.zeros((n, n))
+        self.sum = np.zeros((n, n))
+        self.squares = np.zeros((n, n))
+        self.cross = np.zeros((n, n))
+        self.last_close = np.full(n, np.nan)
+        self.current = np.full(n, np.nan)
+        self.bar_start = None
+        self.last_bar_at = None
+        self.updates = 0
+        self.late = 0
+
+    def _bar(self, at: datetime) -> int:
+        return int((at.replace(tzinfo=None) - EPOCH).total_seconds()) // self.bar_seconds
+
+    def add_price(self, symbol: str, price: float, at: datetime):
+        i = self.index.get(symbol)
+        if i is None or not price:
+            return
+        bar = self._bar(at)
+        if self.bar_start is None:
+            self.bar_start = bar
+        elif bar > self.bar_start:
+            self.close_bar()
+            self.bar_start = bar
+        elif bar < self.bar_start:
+            # 이미 닫힌 봉의 가격 (늦게 들어온 백필 등)은 이동 창에 반영하지 않음
+            self.late += 1
+            return
+        self.current[i] = price
+
+    def close_bar(self):
+        """형성 중인 봉을 닫고 직전 봉 대비 수익률을 창에 추가 (어느 한쪽에 가격이 없으면 결측)"""
+        close = self.current
+        self.current = np.full(len(self.symbols), np.nan)
+        previous, self.last_close = self.last_close, close
+        if self.bar_start is not None:
+            self.last_bar_at = EPOCH + timedelta(seconds=self.bar_start * self.bar_seconds)
+        if np.isnan(previous).all():
+            return
+        with np.errstate(invalid="ignore"):
+            self.push(close / previous - 1)
+
+    def _accumulate(self, returns: np.ndarray, sign: float):
+        observed = ~np.isnan(returns)
+        mask = observed.astype(float)
+        values = np.where(observed, returns, 0.0)
+        self.pairs += sign * np.outer(mask, mask)
+        self.sum += sign * np.outer(values, mask)
+        self.squares += sign * np.outer(values * values, mask)
+        self.cross += sign * np.outer(values, values)
+
+    def push(self, returns: np.ndarray):
+        if self.count == self.size:
+            self._accumulate(self.buffer[self.pos], -1)
+        else:
+            self.count += 1
+        self.buffer[self.pos] = returns
+        self._accumulate(returns, 1)
+        self.pos = (self.pos + 1) % self.size
+        self.updates += 1
+        if self.updates % self.size == 0:
+            self.resync()
+
+    def resync(self):
+        rows = self.buffer[:self.count]
+        observed = ~np.isnan(rows)
+        mask = observed.astype(float)
+        values = np.where(observed, rows, 0.0)
+        self.pairs = mask.T @ mask
+        self.sum = values.T @ mask
+        self.squares = (values * values).T @ mask
+        self.cross = values.T @ values
+
+    def _pairwise(self, total: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """쌍별 관측 수 기준 표본 (공)분산, 관측 2개 미만이면 NaN"""
+        n = self.pairs
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = (total - left * right / n) / (n - 1)
+        result[n < 2] = np.nan
+        return result
+
+    def variance(self) -> np.ndarray:
+        """[i, j]: i, j 모두 관측된 봉에서의 i 수익률 분산"""
+        return self._pairwise(self.squares, self.sum, self.sum)
+
+    def covariance(self) -> Optional[np.ndarray]:
+        if self.count < 2:
+            return None
+        return self._pairwise(self.cross, self.sum, self.sum.T)
+
+    def correlation(self) -> Optional[np.ndarray]:
+        cov = self.covariance()
+        if cov is None:
+            return None
+        variance = self.variance()
+        scale = np.clip(variance, 0, None) * np.clip(variance.T, 0, None)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = cov / np.sqrt(scale)
+        corr[~(scale > 1e-36)] = np.nan
+        return np.clip(corr, -1, 1)
+
+    def volatility(self) -> Optional[np.ndarray]:
+        if self.count < 2:
+            return None
+        return np.sqrt(np.clip(np.diag(self.variance()), 0, None))
+
+    def export(self) -> dict:
+        """공유 캐시/API용 직렬화 (변동성은 봉 단위와 연율화 모두)"""
+        volatility = self.volatility()
+        correlation = self.correlation()
+        annualize = math.sqrt(periods_per_year(self.bar_seconds))
+        return {
+            "symbols": self.symbols,
+            "bar_seconds": self.bar_seconds,
+            "window": self.size,
+            "observations": self.count,
+            "last_bar_at": self.last_bar_at,
+            "volatility": _clean(volatility) if volatility is not None else None,
+            "annualized_volatility": _clean(volatility * annualize, 4) if volatility is not None else None,
+            "correlation": _clean(correlation, 4) if correlation is not None else None,
+        }
+
+class RollingStatsService:
+    """새 ETFPrice 행을 id 순으로 읽어 여러 이동 창(5m/1h/1d)을 증분 갱신"""
+
+    def __init__(self, symbols: Optional[List[str]] = None, windows: Dict[str, tuple] = DEFAULT_WINDOWS,
+                 session_factory=SessionLocal):
+        self.symbols = list(symbols or ETF_SYMBOLS)
+        self.windows = {name: RollingWindow(self.symbols, bar, size) for name, (bar, size) in windows.items()}
+        self.session_factory = session_factory
+        self.last_price_id = 0
+        self.refreshed_at = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_prices(self, rows) -> int:
+        """(id, symbol, price, timestamp) 행을 시각 순으로 모든 창에 반영"""
+        count = 0
+        with self._lock:
+            for row_id, symbol, price, at in rows:
+                for window in self.windows.values():
+                    window.add_price(symbol, price, at)
+                self.last_price_id = max(self.last_price_id, row_id)
+                count += 1
+        return count
+
+    def _query(self, db, since: Optional[datetime] = None):
+        query = db.query(ETFPrice.id, ETFPrice.symbol, ETFPrice.price, ETFPrice.timestamp).filter(
+            ETFPrice.id > self.last_price_id
+        )
+        if since is not None:
+            query = query.filter(ETFPrice.timestamp >= since)
+        return query.order_by(ETFPrice.timestamp, ETFPrice.id).yield_per(10000)
+
+    def warm_up(self, now: Optional[datetime] = None) -> int:
+        """가장 긴 창을 채울 만큼의 가격 이력만 읽어 초기화"""
+        now = now or datetime.utcnow()
+        span = max(window.bar_seconds * (window.size + 2) for window in self.windows.values())
+        db = self.session_factory()
+        try:
+            loaded = self.add_prices(self._query(db, now - timedelta(seconds=span)))
+            self.last_price_id = max(self.last_price_id, db.query(ETFPrice.id).order_by(ETFPrice.id.desc()).limit(1).scalar() or 0)
+        finally:
+            db.close()
+        self.refreshed_at = datetime.utcnow()
+        logger.info(f"📈 이동 상관/변동성 초기화: 가격 {loaded:,}행")
+        return loaded
+
+    def refresh(self) -> int:
+        db = self.session_factory()
+        try:
+            loaded = self.add_prices(self._query(db))
+        finally:
+            db.close()
+        self.refreshed_at = datetime.utcnow()
+        return loaded
+
+    def export(self) -> dict:
+        with self._lock:
+            return {name: window.export() for name, window in self.windows.items()}
+
+    def run(self, interval: float = 30.0):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"이동 상관/변동성 갱신 오류: {str(e)}")
+            self._stop.wait(interval)
+
+    def start(self, interval: float = 30.0):
+        """백그라운드 스레드에서 주기적으로 새 가격 반영"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, kwargs={"interval": interval}, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+def select_stats(exported: dict, window: str, symbols: Optional[List[str]] = None) -> Optional[dict]:
+    """export() 결과에서 창 하나와 심볼 부분집합만 추림 (상관행렬도 부분 행렬로)"""
+    stats = exported.get(window)
+    if stats is None:
+        return None
+    names = stats["symbols"]
+    keep = [names.index(s) for s in symbols if s in names] if symbols else list(range(len(names)))
+    selected = [names[i] for i in keep]
+    volatility, annualized, correlation = stats["volatility"], stats["annualized_volatility"], stats["correlation"]
+    return {
+        "window": window,
+        "bar_seconds": stats["bar_seconds"],
+        "size": stats["window"],
+        "observations": stats["observations"],
+        "last_bar_at": stats["last_bar_at"],
+        "symbols": selected,
+        "volatility": {names[i]: volatility[i] for i in keep} if volatility else {},
+        "annualized_volatility": {names[i]: annualized[i] for i in keep} if annualized else {},
+        "correlation": [[correlation[i][j] for j in keep] for i in keep] if correlation else None,
+    }
@@ -0,0 +1,128 @@
+import json
+import logging
+from collections import Counter
+from sqlalchemy import text, DateTime, JSON
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# trump_statements를 원본으로 하는 외부 콘텐츠(external content) FTS5 인덱스
+# 영문 원문, 한국어 번역, 키워드(JSON 배열 텍스트)를 함께 색인
+SEARCH_TABLE = "statement_search"
+
+CREATE_INDEX_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        original_text, korean_translation, keywords,
+        content='trump_statements', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # INSERT/UPDATE/DELETE 시 트리거로 인덱스를 동기화
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trump_statements_search_ai AFTER INSERT ON trump_statements BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, original_text, korean_translation, keywords)
+        VALUES (new.id, new.original_text, new.korean_translation, new.keywords);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trump_statements_search_ad AFTER DELETE ON trump_statements BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, original_text, korean_translation, keywords)
+        VALUES ('delete', old.id, old.original_text, old.korean_translation, old.keywords);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trump_statements_search_au AFTER UPDATE ON trump_statements BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, original_text, korean_translation, keywords)
+        VALUES ('delete', old.id, old.original_text, old.korean_translation, old.keywords);
+        INSERT INTO {SEARCH_TABLE}(rowid, original_text, korean_translation, keywords)
+        VALUES (new.id, new.original_text, new.korean_translation, new.keywords);
+    END
+    """,
+]
+
+# bm25 컬럼 가중치 (원문, 번역, 키워드) - 키워드 일치를 더 높게 평가
+BM25_WEIGHTS = (1.0, 1.0, 2.0)
+
+# 키워드 패싯 집계에 사용할 상위 결과 수
+FACET_SAMPLE_SIZE = 500
+
+def init_search_index(engine):
+    """FTS5 검색 인덱스와 동기화 트리거 생성 (최초 생성 시 기존 데이터 색인)"""
+    if engine.dialect.name != "sqlite":
+        logger.warning("전문 검색 인덱스는 SQLite(FTS5)에서만 지원됩니다.")
+        return False
+
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": SEARCH_TABLE}
+        ).first()
+        for statement in CREATE_INDEX_SQL:
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+            logger.info("✅ 발언 검색 인덱스 생성 완료")
+    return True
+
+def build_match_query(query: str) -> str:
+    """사용자 입력을 FTS5 MATCH 구문으로 변환 (토큰별 접두어 검색, AND 결합)"""
+    tokens = [t.replace('"', '') for t in query.split()]
+    return " ".join(f'"{t}"*' for t in tokens if t)
+
+def search_statements(db: Session, query: str, limit: int = 20, offset: int = 0) -> dict:
+    """발언 전문 검색 (bm25 순위) 및 키워드 패싯 집계"""
+    match = build_match_query(query)
+    if not match:
+        return {"query": query, "total": 0, "results": [], "facets": {"keywords": []}}
+
+    params = {"match": match, "limit": limit, "offset": offset}
+    rows = db.execute(text(f"""
+        SELECT s.id, s.original_text, s.korean_translation, s.keywords,
+               s.taco_probability, s.source, s.posted_at,
+               snippet({SEARCH_TABLE}, -1, '[', ']', '…', 12) AS snippet,
+               bm25({SEARCH_TABLE}, {', '.join(map(str, BM25_WEIGHTS))}) AS score
+        FROM {SEARCH_TABLE}
+        JOIN trump_statements s ON s.id = {SEARCH_TABLE}.rowid
+        WHERE {SEARCH_TABLE} MATCH :match
+        ORDER BY score
+        LIMIT :limit OFFSET :offset
+    """).columns(posted_at=DateTime, keywords=JSON), params).fetchall()
+
+    total = db.execute(text(
+        f"SELECT count(*) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match"
+    ), params).scalar()
+
+    # 패싯은 순위 상위 결과에서 집계해 대량 매칭 시에도 응답 시간을 제한
+    facet_rows = db.execute(text(f"""
+        SELECT keywords FROM {SEARCH_TABLE}
+        WHERE {SEARCH_TABLE} MATCH :match
+        ORDER BY rank
+        LIMIT {FACET_SAMPLE_SIZE}
+    """), params).fetchall()
+    facet_counter = Counter()
+    for (keywords,) in facet_rows:
+        if keywords:
+            facet_counter.update(set(json.loads(keywords)))
+
+    return {
+        "query": query,
+        "total": total,
+        "results": [
+            {
+                "id": row.id,
+                "original_text": row.original_text,
+                "korean_translation": row.korean_translation,
+                "keywords": row.keywords or [],
+                "taco_probability": row.taco_probability,
+                "source": row.source,
+                "posted_at": row.posted_at,
+                "snippet": row.snippet,
+                "score": -row.score
+            }
+            for row in rows
+        ],
+        "facets": {"keywords": [
+            {"keyword": keyword, "count": count}
+            for keyword, count in facet_counter.most_common(20)
+        ]}
+    }
@@ -0,0 +1,137 @@
+import os
+import mmap
+import time
+import struct
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# 파일 레이아웃: [magic 4B][seq u64][length u32][payload]
+# seqlock 방식 - 쓰는 중에는 seq가 홀수, 읽는 쪽은 seq가 짝수이고 앞뒤가 같을 때만 채택
+MAGIC = b"TACO"
+HEADER = struct.Struct("<4sQI")
+DEFAULT_SIZE = 8 * 1024 * 1024
+
+class SharedSnapshotCache:
+    """워커 프로세스 간 공유하는 mmap 기반 스냅샷 캐시
+
+    리더 워커 하나만 쓰고(시세 스트리머/신호 엔진 실행), 나머지 워커는 SQLite 대신 여기서 읽음
+    """
+
+    def __init__(self, path, size: int = DEFAULT_SIZE):
+        self.path = Path(path)
+        self.size = size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._lock_file = None
+        self._cached_seq = None
+        self._cached_value = None
+
+    def _header(self):
+        return HEADER.unpack_from(self._mmap, 0)
+
+    def write(self, value: dict):
+        """스냅샷 전체를 교체 (리더 워커만 호출)"""
+        payload = orjson.dumps(value)
+        if HEADER.size + len(payload) > self.size:
+            raise ValueError(f"공유 캐시 크기 초과: {len(payload)} bytes")
+        magic, seq, _ = self._header()
+        seq = seq if magic == MAGIC else 0
+        if seq % 2:
+            seq += 1  # 이전 리더가 쓰는 도중 종료된 경우
+        HEADER.pack_into(self._mmap, 0, MAGIC, seq + 1, 0)
+        self._mmap[HEADER.size:HEADER.size + len(payload)] = payload
+        HEADER.pack_into(self._mmap, 0, MAGIC, seq + 2, len(payload))
+
+    def read(self, retries: int = 100) -> Optional[dict]:
+        """일관된 스냅샷 읽기 (seq가 바뀌지 않았으면 이전에 디코딩한 값 재사용)"""
+        for _ in range(retries):
+            magic, seq, length = self._header()
+            if magic != MAGIC or seq == 0:
+                return None
+            if seq % 2:
+                time.sleep(0)
+                continue
+            if seq == self._cached_seq:
+                return self._cached_value
+            payload = self._mmap[HEADER.size:HEADER.size + length]
+            if self._header()[1] != seq:
+                continue
+            self._cached_seq, self._cached_value = seq, orjson.loads(payload)
+            return self._cached_value
+        return None
+
+    @property
+    def seq(self) -> int:
+        magic, seq, _ = self._header()
+        return seq if magic == MAGIC else 0
+
+    def acquire_writer(self) -> bool:
+        """리더(쓰기 담당) 잠금 시도 - 프로세스가 종료되면 OS가 잠금을 해제"""
+        if self._lock_file is not None:
+            return True
+        lock_file = open(f"{self.path}.lock", "a+")
+        try:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        logger.info(f"🔑 공유 캐시 리더 워커 (pid {os.getpid()})")
+        return True
+
+    @property
+    def is_writer(self) -> bool:
+        return self._lock_file is not None
+
+class SharedSnapshotPublisher:
+    """리더 워커에서 build()가 만든 스냅샷을 주기적으로 공유 캐시에 기록하는 스레드"""
+
+    def __init__(self, cache: SharedSnapshotCache, build, interval: float = 2.0):
+        self.cache = cache
+        self.build = build
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def publish(self):
+        try:
+            self.cache.write(self.build())
+        except Exception as e:
+            logger.error(f"공유 캐시 기록 오류: {str(e)}")
+
+    def run(self):
+        while not self._stop.is_set():
+            self.publish()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
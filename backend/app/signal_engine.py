@@ -0,0 +1,203 @@
+import math
+import heapq
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from .database import SessionLocal
+from .model import TACOSignal, SignalETFImpact, percent_to_ratio
+from .signal_index import DIRECTION_SIGN
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HALF_LIFE_HOURS = 12.0
+
+# 누적값에 곱한 성장 계수 exp(λ(t - t0))가 이 값을 넘기 전에 재기준화 (지수 항 overflow 방지)
+# 경과 시간이 아니라 계수로 정하므로 반감기가 짧아도 안전 (2**40 = 반감기 40번)
+REBASE_GROWTH = 2 ** 40
+
+class SignalDecayEngine:
+    """활성 신호의 신뢰도를 시간 감쇠시키고 심볼별 순노출도를 메모리에서 증분 유지
+
+    신호 i의 기여도 w_i * exp(-λ(t - t_i))는 exp(-λ(t - t0)) * w_i * exp(λ(t_i - t0))로
+    분해되므로, 심볼별로 w_i * exp(λ(t_i - t0)) 합만 유지하면 조회 시 공통 계수 하나만 곱하면 됨
+    -> 신호 추가/만료는 O(변경 신호 수), 조회는 O(심볼 수)
+    """
+
+    def __init__(self, half_life_hours: float = DEFAULT_HALF_LIFE_HOURS, session_factory=SessionLocal):
+        self.decay_rate = math.log(2) / (half_life_hours * 3600)
+        self.rebase_after = timedelta(seconds=math.log(REBASE_GROWTH) / self.decay_rate)
+        self.session_factory = session_factory
+        self.epoch = datetime.utcnow()
+        self.signals = {}
+        self.net = defaultdict(float)
+        self.gross = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.expiry_heap = []
+        self.last_signal_id = 0
+        self.refreshed_at = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _growth(self, at: datetime) -> float:
+        return math.exp(self.decay_rate * (at - self.epoch).total_seconds())
+
+    def _decay(self, at: datetime) -> float:
+        """1 / _growth(at) (오래 갱신되지 않았어도 overflow 대신 0으로 수렴)"""
+        return math.exp(-self.decay_rate * (at - self.epoch).total_seconds())
+
+    def _rebase_if_needed(self, now: datetime):
+        if now - self.epoch > self.rebase_after:
+            self._rebase(now)
+
+    def decayed_confidence(self, signal_id: int, now: Optional[datetime] = None) -> Optional[float]:
+        """감쇠가 반영된 현재 신뢰도 (0~1)"""
+        signal = self.signals.get(signal_id)
+        if signal is None:
+            return None
+        age = ((now or datetime.utcnow()) - signal["created_at"]).total_seconds()
+        return signal["weight"] * math.exp(-self.decay_rate * max(age, 0.0))
+
+    def add_signal(self, signal_id: int, created_at: datetime, confidence: float,
+                   expected_duration: Optional[int], impacts: List[dict]):
+        with self._lock:
+            if signal_id in self.signals:
+                return
+            weight = percent_to_ratio(confidence)
+            growth = self._growth(created_at)
+            contributions = {}
+            for impact in impacts:
+                value = weight * (impact["impact"] or 0.0) * growth
+                sign = DIRECTION_SIGN.get(impact["direction"], 0)
+                symbol = impact["symbol"]
+                net, gross = contributions.get(symbol, (0.0, 0.0))
+                contributions[symbol] = (net + sign * value, gross + abs(sign) * value)
+
+            for symbol, (net, gross) in contributions.items():
+                self.net[symbol] += net
+                self.gross[symbol] += gross
+                self.counts[symbol] += 1
+
+            expires_at = created_at + timedelta(hours=expected_duration or 24)
+            self.signals[signal_id] = {
+                "created_at": created_at,
+                "expires_at": expires_at,
+                "weight": weight,
+                "contributions": contributions
+            }
+            heapq.heappush(self.expiry_heap, (expires_at, signal_id))
+            self.last_signal_id = max(self.last_signal_id, signal_id)
+
+    def remove_signal(self, signal_id: int):
+        with self._lock:
+            signal = self.signals.pop(signal_id, None)
+            if signal is None:
+                return
+            for symbol, (net, gross) in signal["contributions"].items():
+                self.net[symbol] -= net
+                self.gross[symbol] -= gross
+                self.counts[symbol] -= 1
+                if self.counts[symbol] <= 0:
+                    del self.net[symbol], self.gross[symbol], self.counts[symbol]
+
+    def _rebase(self, now: datetime):
+        """기준 시각을 now로 옮기고 누적값을 다시 스케일 (드물게 O(전체))"""
+        factor = self._decay(now)
+        for symbol in self.net:
+            self.net[symbol] *= factor
+            self.gross[symbol] *= factor
+        for signal in self.signals.values():
+            signal["contributions"] = {
+                symbol: (net * factor, gross * factor)
+                for symbol, (net, gross) in signal["contributions"].items()
+            }
+        self.epoch = now
+
+    def _load_signals(self, db, query):
+        """신호와 역색인 행을 함께 조회해 엔진에 추가"""
+        signals = query.order_by(TACOSignal.id).all()
+        if not signals:
+            return 0
+        impacts = defaultdict(list)
+        rows = db.query(SignalETFImpact).filter(
+            SignalETFImpact.signal_id.in_([s.id for s in signals])
+        ).all()
+        for row in rows:
+            impacts[row.signal_id].append({"symbol": row.symbol, "direction": row.direction, "impact": row.impact})
+        for signal in signals:
+            self.add_signal(signal.id, signal.created_at or datetime.utcnow(), signal.confidence,
+                            signal.expected_duration, impacts[signal.id])
+        return len(signals)
+
+    def refresh(self, now: Optional[datetime] = None) -> dict:
+        """새 신호 반영 + 기간이 지난 신호 만료 (is_active=False로 저장)"""
+        now = now or datetime.utcnow()
+        db = self.session_factory()
+        try:
+            with self._lock:
+                self._rebase_if_needed(now)
+
+                added = self._load_signals(db, db.query(TACOSignal).filter(
+                    TACOSignal.is_active == True,
+                    TACOSignal.id > self.last_signal_id
+                ))
+
+                expired = []
+                while self.expiry_heap and self.expiry_heap[0][0] <= now:
+                    _, signal_id = heapq.heappop(self.expiry_heap)
+                    if signal_id in self.signals:
+                        self.remove_signal(signal_id)
+                        expired.append(signal_id)
+                self.refreshed_at = now
+
+            if expired:
+                db.query(TACOSignal).filter(TACOSignal.id.in_(expired)).update(
+                    {TACOSignal.is_active: False}, synchronize_session=False
+                )
+                db.commit()
+                logger.info(f"⏱️  만료된 신호 {len(expired)}개 비활성화")
+            return {"added": added, "expired": len(expired), "active": len(self.signals)}
+        except Exception as e:
+            logger.error(f"신호 엔진 갱신 오류: {str(e)}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def exposure(self, symbols: Optional[List[str]] = None, now: Optional[datetime] = None) -> Dict[str, dict]:
+        """심볼별 감쇠 반영 순노출도/총노출도"""
+        now = now or datetime.utcnow()
+        with self._lock:
+            self._rebase_if_needed(now)
+            decay = self._decay(now)
+            keys = [s.upper() for s in symbols] if symbols else sorted(self.net)
+            return {
+                symbol: {
+                    "net_exposure": round(self.net[symbol] * decay, 6),
+                    "gross_exposure": round(self.gross[symbol] * decay, 6),
+                    "signal_count": self.counts[symbol]
+                }
+                for symbol in keys if symbol in self.counts
+            }
+
+    def run(self, interval: float = 30.0):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"신호 엔진 주기 갱신 실패: {str(e)}")
+            self._stop.wait(interval)
+
+    def start(self, interval: float = 30.0):
+        """백그라운드 스레드에서 주기적으로 refresh 실행"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, kwargs={"interval": interval}, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
@@ -0,0 +1,103 @@
+import logging
+from typing import List, Optional
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, sessionmaker
+from .model import TACOSignal, TrumpStatement, SignalETFImpact, signal_impact_rows
+
+logger = logging.getLogger(__name__)
+
+DIRECTION_SIGN = {"up": 1, "down": -1}
+
+def backfill_signal_impacts(engine) -> int:
+    """역색인 행이 없는 기존 신호의 affected_etfs JSON을 signal_etf_impacts로 채움"""
+    db = sessionmaker(bind=engine)()
+    try:
+        indexed = db.query(SignalETFImpact.signal_id).distinct()
+        signals = db.query(TACOSignal).filter(~TACOSignal.id.in_(indexed)).all()
+
+        rows = []
+        for signal in signals:
+            rows.extend(signal_impact_rows(signal))
+        if rows:
+            db.execute(SignalETFImpact.__table__.insert(), rows)
+            db.commit()
+            logger.info(f"✅ 신호-ETF 역색인 백필 완료: 신호 {len(signals)}개, {len(rows)}행")
+        return len(rows)
+    finally:
+        db.close()
+
+def get_symbol_signals(db: Session, symbol: str, active_only: bool = True, limit: int = 50) -> List[dict]:
+    """특정 ETF에 영향을 주는 신호 목록 (최신순)"""
+    query = db.query(
+        SignalETFImpact.direction,
+        SignalETFImpact.impact,
+        TACOSignal.id,
+        TACOSignal.signal_type,
+        TACOSignal.confidence,
+        TACOSignal.is_active,
+        TACOSignal.created_at,
+        TACOSignal.expected_duration,
+        TrumpStatement.id.label("statement_id"),
+        TrumpStatement.original_text,
+        TrumpStatement.korean_translation,
+    ).join(
+        TACOSignal, TACOSignal.id == SignalETFImpact.signal_id
+    ).outerjoin(
+        TrumpStatement, TrumpStatement.id == TACOSignal.statement_id
+    ).filter(SignalETFImpact.symbol == symbol.upper())
+
+    if active_only:
+        query = query.filter(TACOSignal.is_active == True)
+
+    rows = query.order_by(SignalETFImpact.created_at.desc()).limit(limit).all()
+    return [
+        {
+            "signal_id": row.id,
+            "signal_type": row.signal_type,
+            "confidence": row.confidence,
+            "direction": row.direction,
+            "impact": row.impact,
+            "is_active": row.is_active,
+            "created_at": row.created_at,
+            "expected_duration": row.expected_duration,
+            "statement": {
+                "id": row.statement_id,
+                "original": row.original_text,
+                "korean": row.korean_translation
+            }
+        }
+        for row in rows
+    ]
+
+def get_symbol_exposure(db: Session, symbols: Optional[List[str]] = None, active_only: bool = True) -> List[dict]:
+    """심볼별 집계 노출도 (방향 * 영향도 * 신뢰도 합계)"""
+    weight = func.coalesce(TACOSignal.confidence, 0.0) / 100.0
+    sign = case(
+        (SignalETFImpact.direction == "up", 1),
+        (SignalETFImpact.direction == "down", -1),
+        else_=0
+    )
+    query = db.query(
+        SignalETFImpact.symbol,
+        func.count(SignalETFImpact.id).label("signal_count"),
+        func.sum(sign * SignalETFImpact.impact * weight).label("net_exposure"),
+        func.sum(func.abs(sign) * SignalETFImpact.impact * weight).label("gross_exposure"),
+        func.max(SignalETFImpact.created_at).label("last_signal_at"),
+    ).join(TACOSignal, TACOSignal.id == SignalETFImpact.signal_id)
+
+    if active_only:
+        query = query.filter(TACOSignal.is_active == True)
+    if symbols:
+        query = query.filter(SignalETFImpact.symbol.in_([s.upper() for s in symbols]))
+
+    rows = query.group_by(SignalETFImpact.symbol).order_by(SignalETFImpact.symbol).all()
+    return [
+        {
+            "symbol": row.symbol,
+            "signal_count": row.signal_count,
+            "net_exposure": round(row.net_exposure or 0.0, 6),
+            "gross_exposure": round(row.gross_exposure or 0.0, 6),
+            "last_signal_at": row.last_signal_at
+        }
+        for row in rows
+    ]
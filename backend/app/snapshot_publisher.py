@@ -0,0 +1,138 @@
+import os
+import sys
+import gzip
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+import orjson
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 생성
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 기본 발행 위치: backend/snapshots (SNAPSHOT_DIR 환경 변수로 변경 가능)
+SNAPSHOT_DIR = Path(os.getenv("SNAPSHOT_DIR", Path(__file__).resolve().parent.parent / "snapshots"))
+MANIFEST_NAME = "manifest.json"
+KEEP_VERSIONS = 3
+
+def render_payloads(db) -> dict:
+    """대시보드 엔드포인트 응답을 이름별로 렌더링"""
+    from .feed import build_latest_signals, build_trump_feed, build_performance
+    from .quote_stream import load_latest_prices
+
+    return {
+        "latest-signals": build_latest_signals(db),
+        "trump-feed": build_trump_feed(db),
+        "latest-prices": {"source": "snapshot", "prices": load_latest_prices(db)},
+        "performance": build_performance(db),
+    }
+
+def _write_file(path: Path, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+def publish(db, out_dir: Path = SNAPSHOT_DIR) -> dict:
+    """스냅샷 번들 발행
+
+    1. 내용 해시가 붙은 불변 파일(.json, .json.gz, .json.br)을 새 버전 디렉토리에 기록
+    2. manifest.json을 임시 파일에 쓴 뒤 os.replace로 교체 (원자적 전환)
+    독자는 항상 manifest가 가리키는 완성된 번들만 보게 됨
+    """
+    out_dir = Path(out_dir)
+    generated_at = datetime.utcnow()
+    payloads = {name: orjson.dumps(payload) for name, payload in render_payloads(db).items()}
+
+    bundle_hash = hashlib.sha256(b"".join(
+        hashlib.sha256(data).digest() for _, data in sorted(payloads.items())
+    )).hexdigest()[:16]
+    version_dir = out_dir / "versions" / bundle_hash
+    staging_dir = out_dir / "versions" / f".{bundle_hash}.tmp"
+
+    files = {}
+    if not version_dir.exists():
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+        for name, data in payloads.items():
+            _write_file(staging_dir / f"{name}.json", data)
+            _write_file(staging_dir / f"{name}.json.gz", gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli:
+                _write_file(staging_dir / f"{name}.json.br", brotli.compress(data, quality=11))
+        os.replace(staging_dir, version_dir)
+
+    for name, data in payloads.items():
+        encodings = ["gzip", "br"] if brotli else ["gzip"]
+        files[name] = {
+            "path": f"versions/{bundle_hash}/{name}.json",
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "bytes": len(data),
+            "encodings": encodings
+        }
+
+    manifest = {"version": bundle_hash, "generated_at": generated_at, "files": files}
+    manifest_tmp = out_dir / f".{MANIFEST_NAME}.tmp"
+    _write_file(manifest_tmp, orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+    os.replace(manifest_tmp, out_dir / MANIFEST_NAME)
+
+    _cleanup_versions(out_dir, keep=bundle_hash)
+    logger.info(f"📦 대시보드 스냅샷 발행 완료: {bundle_hash} ({len(files)}개 파일)")
+    return manifest
+
+def _cleanup_versions(out_dir: Path, keep: str, keep_count: int = KEEP_VERSIONS):
+    """오래된 번들 삭제 (현재 버전과 최근 keep_count개는 유지해 읽는 중인 독자 보호)"""
+    versions = sorted(
+        (p for p in (out_dir / "versions").iterdir() if p.is_dir() and not p.name.startswith(".")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True
+    )
+    for path in versions[keep_count:]:
+        if path.name != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+def load_manifest(out_dir: Path = SNAPSHOT_DIR) -> Optional[dict]:
+    path = Path(out_dir) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return orjson.loads(path.read_bytes())
+
+def resolve_snapshot_file(name: str, accept_encoding: str = "", out_dir: Path = SNAPSHOT_DIR):
+    """현재 번들에서 요청 인코딩에 맞는 사전 압축 파일 경로와 Content-Encoding 반환"""
+    from .http_cache import choose_encoding
+
+    manifest = load_manifest(out_dir)
+    if not manifest or name not in manifest["files"]:
+        return None, None, None
+    entry = manifest["files"][name]
+    base = Path(out_dir) / entry["path"]
+    encoding = choose_encoding(accept_encoding, entry["encodings"])
+    if encoding == "br":
+        return Path(f"{base}.br"), "br", entry["sha256"]
+    if encoding == "gzip":
+        return Path(f"{base}.gz"), "gzip", entry["sha256"]
+    return base, None, entry["sha256"]
+
+if __name__ == "__main__":
+    import argparse
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description='대시보드 정적 스냅샷 발행')
+    parser.add_argument('--out', type=str, default=str(SNAPSHOT_DIR), help='발행 디렉토리')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        manifest = publish(db, Path(args.out))
+        print(orjson.dumps(manifest, option=orjson.OPT_INDENT_2).decode())
+    finally:
+        db.close()
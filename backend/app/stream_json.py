@@ -0,0 +1,88 @@
+import json
+import logging
+from typing import Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class IncrementalJSONParser:
+    """토큰 단위로 들어오는 텍스트에서 최상위 JSON 객체의 필드를 값이 닫히는 즉시 꺼냄
+
+    첫 '{' 이전 텍스트(```json 펜스 등)는 무시, 문자열 안의 괄호/따옴표는 이스케이프까지 추적
+    문자열/배열/객체 값은 닫히는 글자에서, 숫자/불리언/null은 뒤따르는 ',' 또는 '}'에서 완료
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.done = False
+        self.in_string = False
+        self.escape = False
+        self.expecting = "key"
+        self.key = None
+        self.token: List[str] = []
+        self.fields = {}
+
+    def _finish_value(self, out: list):
+        raw = "".join(self.token).strip()
+        self.token = []
+        self.expecting = "key"
+        if not raw:
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            logger.debug(f"스트림 JSON 필드 파싱 실패: {self.key}={raw[:80]}")
+            return
+        self.fields[self.key] = value
+        out.append((self.key, value))
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """새 텍스트 조각을 넣고 이번에 완료된 (필드, 값) 목록 반환"""
+        out = []
+        for ch in text:
+            if self.done:
+                break
+            if not self.started:
+                if ch == "{":
+                    self.started, self.depth = True, 1
+                continue
+
+            if self.in_string:
+                self.token.append(ch)
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.expecting == "value":
+                        self._finish_value(out)
+                continue
+
+            if self.depth == 1:
+                if ch == ":" and self.expecting == "key":
+                    try:
+                        self.key = json.loads("".join(self.token).strip())
+                    except ValueError:
+                        self.key = None
+                    self.token = []
+                    self.expecting = "value"
+                    continue
+                if ch in ",}":
+                    if self.expecting == "value":
+                        self._finish_value(out)
+                    self.token = []
+                    if ch == "}":
+                        self.depth, self.done = 0, True
+                    continue
+
+            if ch == '"':
+                self.in_string = True
+            elif ch in "[{":
+                self.depth += 1
+            elif ch in "]}":
+                self.depth -= 1
+            self.token.append(ch)
+            if self.depth == 1 and ch in "]}":
+                self._finish_value(out)
+        return out
@@ -1,38 +1,87 @@
 import os
 import openai
-from datetime import datetime, timedelta
 import requests
+from datetime import datetime, timedelta
 import json
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from .database import get_db
 from .model import TrumpStatement, TACOSignal
+from .relevance_filter import RelevanceClassifier
+from .near_dup import find_near_duplicate, get_cluster_root
+from .ingestion import NewsAPIConnector
+from .analysis_queue import PriorityAnalysisQueue
+from .stream_json import IncrementalJSONParser
 import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ANALYSIS_PROMPT = """당신은 트럼프 관련 뉴스를 분석하는 정치/경제 전문가입니다.
+다음 텍스트를 분석하여 JSON 형식으로 응답해주세요.
+
+분석해야 할 항목 (이 순서대로 작성):
+1. signal_type: 매매 신호 ("BUY", "SELL", "WATCH" 중 하나)
+2. taco_probability: TACO 확률 (0 ~ 100)
+3. affected_etfs: 영향받는 ETF 목록
+4. trade_relevance: 무역 관련성 (0 ~ 100)
+5. sentiment_score: 감성 점수 (-1 ~ 1)
+6. key_points: 주요 포인트 목록 (한국어로)
+
+분석 시 고려사항:
+- 무역 정책 관련성
+- 시장 영향도
+- 정치적 맥락
+- 경제적 파급효과
+
+응답 형식:
+{
+    "signal_type": "BUY",
+    "taco_probability": 90,
+    "affected_etfs": [
+        {
+            "symbol": "XLK",
+            "direction": "up",
+            "impact": 0.8
+        }
+    ],
+    "trade_relevance": 85,
+    "sentiment_score": 0.8,
+    "key_points": ["주요 포인트1", "주요 포인트2"]
+}"""
+# 스트리밍 분석에서 이 필드가 모두 도착하면 나머지를 기다리지 않고 신호부터 저장
+SIGNAL_FIELDS = ("signal_type", "taco_probability", "affected_etfs")
+# 스트림 중 API/연결 오류 (응답 조각 JSON 파싱 오류 포함)
+STREAM_ERRORS = (openai.error.OpenAIError, requests.RequestException, ValueError)
+
+def analysis_messages(text: str) -> List[Dict]:
+    return [
+        {"role": "system", "content": ANALYSIS_PROMPT},
+        {"role": "user", "content": text}
+    ]
+
 class TrumpAnalyzer:
-    def __init__(self, openai_api_key: str):
-        """트럼프 분석기 초기화"""
+    def __init__(self, openai_api_key: str, relevance_filter: Optional[RelevanceClassifier] = None):
+        """트럼프 분석기 초기화 (relevance_filter: LLM 호출 전 무역 관련성 사전 필터)"""
         self.openai_api_key = openai_api_key
         openai.api_key = openai_api_key
+        self.relevance_filter = relevance_filter or RelevanceClassifier.load()
+        self.filter_stats = {"candidates": 0, "skipped": 0, "near_duplicates": 0}
+        self.request_interval = 1.0  # LLM 호출 간 대기(초)
+        self.queue = PriorityAnalysisQueue(self.relevance_filter)  # 미분석 발언 처리 순서
+        self.streaming = os.getenv("ANALYSIS_STREAMING", "0") == "1"  # 신호 필드부터 저장하는 스트리밍 분석
         
     def collect_news(self, days: int = 7) -> List[Dict]:
-        """트럼프 관련 뉴스 수집"""
-        news_url = "https://newsapi.org/v2/everything"
-        params = {
-            'q': 'Trump',
-            'from': (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d'),
-            'sortBy': 'publishedAt',
-            'language': 'en'
-        }
-        
+        """트럼프 관련 뉴스 수집 (NewsAPI 전체 페이지)"""
+        api_key = os.getenv('NEWSAPI_KEY')
+        if not api_key:
+            logger.warning("NEWSAPI_KEY 환경 변수가 없어 뉴스 수집을 건너뜁니다.")
+            return []
+
         try:
-            response = requests.get(news_url, params=params)
-            news_data = response.json()
-            return news_data.get('articles', [])
+            return NewsAPIConnector(api_key, days=days).fetch_articles()
         except Exception as e:
             logger.error(f"뉴스 수집 중 오류 발생: {e}")
             return []
@@ -65,41 +114,7 @@ class TrumpAnalyzer:
         try:
             response = openai.ChatCompletion.create(
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": """당신은 트럼프 관련 뉴스를 분석하는 정치/경제 전문가입니다.
-                    다음 텍스트를 분석하여 JSON 형식으로 응답해주세요.
-                    
-                    분석해야 할 항목:
-                    1. key_points: 주요 포인트 목록 (한국어로)
-                    2. sentiment_score: 감성 점수 (-1 ~ 1)
-                    3. trade_relevance: 무역 관련성 (0 ~ 100)
-                    4. taco_probability: TACO 확률 (0 ~ 100)
-                    5. signal_type: 매매 신호 ("BUY", "SELL", "WATCH" 중 하나)
-                    6. affected_etfs: 영향받는 ETF 목록
-                    
-                    분석 시 고려사항:
-                    - 무역 정책 관련성
-                    - 시장 영향도
-                    - 정치적 맥락
-                    - 경제적 파급효과
-                    
-                    응답 형식:
-                    {
-                        "key_points": ["주요 포인트1", "주요 포인트2"],
-                        "sentiment_score": 0.8,
-                        "trade_relevance": 85,
-                        "taco_probability": 90,
-                        "signal_type": "BUY",
-                        "affected_etfs": [
-                            {
-                                "symbol": "XLK",
-                                "direction": "up",
-                                "impact": 0.8
-                            }
-                        ]
-                    }"""},
-                    {"role": "user", "content": text}
-                ],
+                messages=analysis_messages(text),
                 temperature=0.7,
                 max_tokens=500
             )
@@ -108,57 +123,252 @@ class TrumpAnalyzer:
             logger.error(f"GPT 분석 중 오류 발생: {e}")
             return None
 
+    def stream_analysis(self, text: str) -> Iterator[Tuple[str, Any]]:
+        """분석 응답을 스트리밍으로 받아 JSON 필드가 완성되는 순서대로 (필드, 값) 반환"""
+        response = openai.ChatCompletion.create(
+            model="gpt-3.5-turbo",
+            messages=analysis_messages(text),
+            temperature=0.7,
+            max_tokens=500,
+            stream=True
+        )
+        parser = IncrementalJSONParser()
+        for chunk in response:
+            delta = chunk.choices[0].delta.get("content") if chunk.choices else None
+            if delta:
+                yield from parser.feed(delta)
+
+    def copy_root_analysis(self, statement: TrumpStatement, root: TrumpStatement):
+        """클러스터 대표 발언의 분석 결과를 복사해 분석 완료 처리 (신호는 만들지 않음)"""
+        statement.korean_translation = root.korean_translation
+        statement.keywords = root.keywords
+        statement.sentiment_score = root.sentiment_score
+        statement.trade_relevance = root.trade_relevance
+        statement.taco_probability = root.taco_probability
+        statement.is_analyzed = True
+
+    def save_near_duplicate(self, article: Dict, db: Session) -> bool:
+        """이미 분석된 발언의 변형이면 대표 발언의 분석 결과를 복사해 저장"""
+        match = find_near_duplicate(db.connection(), article['description'])
+        if not match:
+            return False
+        root = db.get(TrumpStatement, match['cluster_id'])
+        if root is None or not root.is_analyzed:
+            return False
+
+        statement = TrumpStatement(
+            original_text=article['description'],
+            source=article.get('source', {}).get('name', 'Unknown'),
+            posted_at=datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00'))
+        )
+        self.copy_root_analysis(statement, root)
+        db.add(statement)
+        db.flush()
+        logger.info(f"유사중복 발언 (대표 id: {root.id}, 해밍 거리: {match['distance']}) - 분석 재사용")
+        return True
+
+    def reuse_cluster_analysis(self, statement: TrumpStatement, db: Session) -> bool:
+        """저장된 발언이 이미 분석된 클러스터 대표의 변형(재게시 등)이면 분석 결과를 복사"""
+        root_id = get_cluster_root(db, statement.id)
+        if root_id == statement.id:
+            return False
+        root = db.get(TrumpStatement, root_id)
+        if root is None or not root.is_analyzed:
+            return False
+        self.copy_root_analysis(statement, root)
+        self.filter_stats["near_duplicates"] += 1
+        logger.info(f"유사중복 발언 (id: {statement.id}, 대표 id: {root.id}) - 분석 재사용")
+        return True
+
+    def cluster_root_pending(self, statement: TrumpStatement, db: Session) -> bool:
+        """클러스터 대표 발언이 아직 분석 대기 중인지 (대표보다 먼저 꺼낸 변형은 대표 분석을 기다림)"""
+        root_id = get_cluster_root(db, statement.id)
+        if root_id == statement.id:
+            return False
+        root = db.get(TrumpStatement, root_id)
+        return root is not None and not root.is_analyzed and root.trade_relevance is None
+
+    def store_signal(self, statement: TrumpStatement, analysis: Dict, db: Session) -> TACOSignal:
+        """신호 필드(signal_type/taco_probability/affected_etfs)로 발언을 분석 완료 처리하고 TACO 신호 추가"""
+        statement.taco_probability = analysis.get('taco_probability', 0)
+        statement.is_analyzed = True
+        db.flush()
+        
+        signal = TACOSignal(
+            statement_id=statement.id,
+            signal_type=analysis.get('signal_type', 'WATCH'),
+            confidence=analysis.get('taco_probability', 0),
+            affected_etfs=analysis.get('affected_etfs', []),
+            entry_timing="immediate",
+            expected_duration=24,
+            is_active=True
+        )
+        db.add(signal)
+        return signal
+
+    def store_details(self, statement: TrumpStatement, analysis: Dict):
+        """신호 외 분석 결과(주요 포인트, 감성, 무역 관련성) 기록
+
+        응답에 없는 필드는 비워 둠 (기본값 0을 쓰면 관련성 학습에서 음성 레이블로 쓰임)
+        """
+        if 'key_points' in analysis:
+            statement.keywords = analysis['key_points']
+        if 'sentiment_score' in analysis:
+            statement.sentiment_score = analysis['sentiment_score']
+        if 'trade_relevance' in analysis:
+            statement.trade_relevance = analysis['trade_relevance']
+
+    def store_analysis(self, statement: TrumpStatement, analysis: Dict, korean_translation: Optional[str],
+                       db: Session) -> TACOSignal:
+        """발언에 분석 결과를 기록하고 TACO 신호 추가 (커밋은 호출자가 담당)"""
+        statement.korean_translation = korean_translation
+        self.store_details(statement, analysis)
+        return self.store_signal(statement, analysis, db)
+
+    def passes_filter(self, statement: TrumpStatement) -> bool:
+        """LLM 호출 전 사전 필터 (걸러지면 관련성 점수만 기록)"""
+        self.filter_stats["candidates"] += 1
+        score = self.relevance_filter.score(statement.original_text)
+        if score < self.relevance_filter.threshold:
+            self.filter_stats["skipped"] += 1
+            statement.trade_relevance = score * 100  # 필터 점수(0~1)를 LLM과 같은 0~100으로 기록
+            return False
+        return True
+
+    def analyze_statement(self, statement: TrumpStatement, db: Session) -> Optional[TACOSignal]:
+        """크롤러가 저장한 미분석 발언 하나를 분석 (유사중복이면 대표 분석 재사용, 사전 필터에서 걸러지면 관련성 점수만 기록)"""
+        if self.reuse_cluster_analysis(statement, db) or not self.passes_filter(statement):
+            return None
+        
+        analysis = self.analyze_with_gpt(statement.original_text)
+        if not analysis:
+            return None
+        korean_translation = self.translate_to_korean(statement.original_text)
+        return self.store_analysis(statement, analysis, korean_translation, db)
+
+    def analyze_statement_streaming(self, statement: TrumpStatement, db: Session) -> Optional[TACOSignal]:
+        """스트리밍 분석: 신호 필드가 완성되는 즉시 신호를 커밋하고, 주요 포인트와 번역은 이어서 갱신
+
+        번역은 분석 스트림과 동시에 요청하고, 마지막 번역 반영은 호출자가 커밋
+        """
+        if self.reuse_cluster_analysis(statement, db) or not self.passes_filter(statement):
+            return None
+        
+        text = statement.original_text
+        pool = ThreadPoolExecutor(max_workers=1)
+        translation = pool.submit(self.translate_to_korean, text)
+        try:
+            analysis, signal = {}, None
+            stream = self.stream_analysis(text)
+            while True:
+                # 스트림 오류만 여기서 처리 (DB 커밋 오류는 호출자가 롤백하도록 그대로 전달)
+                try:
+                    key, value = next(stream)
+                except StopIteration:
+                    break
+                except STREAM_ERRORS as e:
+                    logger.error(f"GPT 스트리밍 분석 중 오류 발생: {e}")
+                    break
+                analysis[key] = value
+                if signal is None and all(field in analysis for field in SIGNAL_FIELDS):
+                    signal = self.store_signal(statement, analysis, db)
+                    db.commit()
+                    logger.info(f"⚡ 신호 선반영 (id: {statement.id}, {signal.signal_type}, {signal.confidence})")
+            if signal is None:
+                # 신호 필드가 다 오기 전에 끊김: 저장하지 않고 비분석 경로처럼 다시 대기
+                logger.warning(f"신호 필드 미완성으로 스트림 종료 (id: {statement.id}, 받은 필드: {list(analysis)})")
+                return None
+            self.store_details(statement, analysis)
+            db.commit()
+            statement.korean_translation = translation.result()
+            return signal
+        finally:
+            # 실패로 끝나면 번역 응답을 기다리지 않음 (대기 중이면 취소, 진행 중이면 버림)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def analyze_pending(self, db: Session, limit: int = 20) -> int:
+        """크롤링된 미분석 발언을 우선순위 큐 순서로 분석해 발언마다 커밋, 생성한 신호 수 반환"""
+        self.queue.load_pending(db)
+        
+        created = 0
+        failed, deferred = [], []
+        for item in self.queue.drain(limit):
+            statement = db.get(TrumpStatement, item.statement_id)
+            if statement is None or statement.is_analyzed or statement.trade_relevance is not None:
+                self.queue.metrics.incr("stale")  # 다른 프로세스가 이미 처리
+                continue
+            if self.cluster_root_pending(statement, db):
+                deferred.append(item)  # 같은 회차에서 대표가 분석되면 그 결과를 재사용
+                continue
+            created += self.analyze_item(item, statement, db, failed)
+        for item in deferred:
+            statement = db.get(TrumpStatement, item.statement_id)
+            if statement is None or statement.is_analyzed or statement.trade_relevance is not None:
+                continue
+            if self.cluster_root_pending(statement, db):
+                failed.append(item)  # 대표 분석이 실패/미처리: 다음 회차에 대표와 함께 다시 대기
+                continue
+            created += self.analyze_item(item, statement, db, failed)
+        for item in failed:
+            self.queue.requeue(item)
+        return created
+
+    def analyze_item(self, item, statement: TrumpStatement, db: Session, failed: list) -> int:
+        """큐 항목 하나를 분석해 커밋, 생성한 신호 수 반환 (다시 대기할 항목은 failed에 추가)"""
+        created = 0
+        try:
+            analyze = self.analyze_statement_streaming if self.streaming else self.analyze_statement
+            if analyze(statement, db):
+                created = 1
+                self.queue.metrics.incr("signals")
+            db.commit()
+        except Exception as e:
+            logger.error(f"발언 분석 오류 (id: {statement.id}): {str(e)}")
+            db.rollback()
+        if not statement.is_analyzed and statement.trade_relevance is None:
+            failed.append(item)  # LLM 실패 등: 이번 회차가 끝난 뒤 다시 대기
+        if not item.cheap:
+            time.sleep(self.request_interval)
+        return created
+
     def save_to_db(self, news_articles: List[Dict], db: Session):
-        """분석 결과를 데이터베이스에 저장"""
-        saved_count = 0
+        """수집한 뉴스를 미분석 발언으로 저장한 뒤 우선순위 큐 순서로 분석"""
+        queued_count = 0
         
         try:
             for article in news_articles:
+                if not article.get('description'):
+                    continue
+
                 # 중복 체크
                 existing = db.query(TrumpStatement).filter_by(
                     original_text=article['description']
                 ).first()
                 
                 if not existing:
-                    # GPT 분석 수행
-                    analysis = self.analyze_with_gpt(article['description'])
-                    if analysis:
-                        # 한글 번역
-                        korean_translation = self.translate_to_korean(article['description'])
-                        
-                        # 트럼프 발언 저장
-                        statement = TrumpStatement(
-                            original_text=article['description'],
-                            korean_translation=korean_translation,
-                            source=article.get('source', {}).get('name', 'Unknown'),
-                            posted_at=datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00')),
-                            keywords=','.join(analysis.get('key_points', [])),
-                            sentiment_score=analysis.get('sentiment_score', 0),
-                            trade_relevance=analysis.get('trade_relevance', 0),
-                            taco_probability=analysis.get('taco_probability', 0),
-                            is_analyzed=True
-                        )
-                        db.add(statement)
-                        db.flush()
-                        
-                        # TACO 신호 저장
-                        signal = TACOSignal(
-                            statement_id=statement.id,
-                            signal_type=analysis.get('signal_type', 'WATCH'),
-                            confidence=analysis.get('taco_probability', 0),
-                            affected_etfs=analysis.get('affected_etfs', []),
-                            entry_timing="immediate",
-                            expected_duration=24,
-                            is_active=True
-                        )
-                        db.add(signal)
-                        saved_count += 1
-                        
-                        # API 호출 제한을 위한 대기
-                        time.sleep(1)
+                    # 유사중복: 같은 발언의 변형이면 기존 분석을 재사용하고 신호는 만들지 않음
+                    if self.save_near_duplicate(article, db):
+                        self.filter_stats["near_duplicates"] += 1
+                        continue
+
+                    # 미분석 발언으로 저장 -> 크롤링 발언과 같은 우선순위 큐에서 분석
+                    db.add(TrumpStatement(
+                        original_text=article['description'],
+                        source=article.get('source', {}).get('name', 'Unknown'),
+                        posted_at=datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00')),
+                        is_analyzed=False
+                    ))
+                    db.flush()
+                    queued_count += 1
             
             db.commit()
+            saved_count = self.analyze_pending(db, limit=queued_count) if queued_count else 0
             logger.info(f"{saved_count}개의 새로운 분석 결과가 저장되었습니다.")
+            if self.filter_stats["near_duplicates"]:
+                logger.info(f"유사중복 {self.filter_stats['near_duplicates']}건은 기존 분석을 재사용했습니다.")
+            if self.filter_stats["candidates"]:
+                skipped_ratio = self.filter_stats["skipped"] / self.filter_stats["candidates"] * 100
+                logger.info(f"사전 필터로 LLM 호출 {self.filter_stats['skipped']}/{self.filter_stats['candidates']}건 생략 ({skipped_ratio:.1f}%)")
             
         except Exception as e:
             logger.error(f"데이터베이스 저장 중 오류: {str(e)}")
@@ -176,6 +386,11 @@ def main():
     db = next(get_db())
     
     try:
+        # 크롤러가 저장한 미분석 발언 분석
+        created = analyzer.analyze_pending(db, limit=50)
+        logger.info(f"크롤링 발언 분석 완료: 신호 {created}개 생성")
+        logger.info(f"분석 큐 지표: {analyzer.queue.snapshot()}")
+        
         # 뉴스 수집
         logger.info("뉴스 수집 중...")
         news_articles = analyzer.collect_news()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+신호 알림 발송 벤치마크
+로컬 webhook 수신 서버와 unix 소켓 수신기를 띄우고 임시 DB에 신호를 커밋한 뒤,
+커밋 시각부터 수신기가 받은 시각까지의 지연, 필터, 재시도, 재시작 후 재발송을 확인합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.database import Base
+from app.model import TrumpStatement, TACOSignal, AlertOutbox
+from app.alerts import AlertDispatcher, AlertSubscriberIn, create_subscriber
+import app.alerts as alerts
+
+received = {}
+received_lock = threading.Lock()
+
+def record(name, payloads):
+    now = time.perf_counter()
+    with received_lock:
+        for payload in payloads:
+            received.setdefault(name, {})[payload["signal_id"]] = now
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    fail_first = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if WebhookHandler.fail_first > 0:
+            WebhookHandler.fail_first -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        record("webhook", body["alerts"])
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def socket_receiver(path):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+
+    def serve():
+        while True:
+            conn, _ = server.accept()
+            with conn, conn.makefile("rb") as stream:
+                record("socket", [json.loads(line) for line in stream])
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server
+
+def commit_signals(Session, count, start_index=0, interval=0.0):
+    """발언 + 신호를 하나씩 커밋하고 신호별 커밋 완료 시각 반환"""
+    committed = {}
+    for i in range(start_index, start_index + count):
+        db = Session()
+        try:
+            statement = TrumpStatement(original_text=f"tariff deal update {i}", is_analyzed=True)
+            db.add(statement)
+            db.flush()
+            symbol = "SPY" if i % 2 == 0 else "QQQ"
+            signal = TACOSignal(statement_id=statement.id, signal_type="BUY" if i % 3 else "SELL",
+                                confidence=50 + (i % 5) * 10, affected_etfs=[{"symbol": symbol, "direction": "up", "impact": 0.7}])
+            db.add(signal)
+            db.commit()
+            committed[signal.id] = (time.perf_counter(), symbol, signal.signal_type, signal.confidence)
+        finally:
+            db.close()
+        if interval:
+            time.sleep(interval)
+    return committed
+
+def wait_for(names, expected, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with received_lock:
+            if all(len(received.get(name, {})) >= expected[name] for name in names):
+                return True
+        time.sleep(0.01)
+    return False
+
+def report(label, name, committed):
+    with received_lock:
+        latencies = [(received[name][sid] - committed[sid][0]) * 1000 for sid in received.get(name, {}) if sid in committed]
+    if not latencies:
+        print(f"{label:<28} 수신 없음")
+        return
+    latencies.sort()
+    print(f"{label:<28} {len(latencies):>5}건  p50 {statistics.median(latencies):7.2f}ms  "
+          f"p90 {latencies[int(len(latencies) * 0.9)]:7.2f}ms  max {latencies[-1]:7.2f}ms")
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='신호 알림 발송 벤치마크 (로컬 webhook/소켓 수신기)')
+    parser.add_argument('--signals', type=int, default=200, help='커밋할 신호 수')
+    parser.add_argument('--interval', type=float, default=0.05, help='신호 커밋 간격(초, 0이면 연속 커밋)')
+    parser.add_argument('--fail-first', type=int, default=2, help='webhook이 처음 몇 번 503을 응답할지 (재시도 확인)')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{tmp}/alerts.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookHandler)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    socket_path = os.path.join(tmp, "alerts.sock")
+    socket_receiver(socket_path)
+
+    db = Session()
+    create_subscriber(db, AlertSubscriberIn(name="webhook-all", target=f"http://127.0.0.1:{http_server.server_port}/hook"))
+    create_subscriber(db, AlertSubscriberIn(name="socket-spy-buy", kind="socket", target=f"unix:{socket_path}",
+                                            symbols=["SPY"], signal_types=["BUY"], min_confidence=60))
+    db.close()
+
+    alerts.RETRY_BASE_SECONDS = 0.05
+    dispatcher = AlertDispatcher(session_factory=Session, poll_interval=1.0)
+    dispatcher.start()
+
+    # 1) 정상 발송: 커밋 -> 수신 지연
+    committed = commit_signals(Session, args.signals, interval=args.interval)
+    expected_socket = sum(1 for _, symbol, kind, conf in committed.values() if symbol == "SPY" and kind == "BUY" and conf >= 60)
+    ok = wait_for(["webhook", "socket"], {"webhook": args.signals, "socket": expected_socket})
+    print(f"\n=== 신호 {args.signals}개 커밋 (간격 {args.interval}초) -> 수신 (완료: {ok}) ===")
+    report("webhook (전체 구독)", "webhook", committed)
+    report(f"socket (SPY/BUY/≥60, 기대 {expected_socket})", "socket", committed)
+
+    # 2) 재시도: 수신 서버가 처음 몇 번 실패
+    WebhookHandler.fail_first = args.fail_first
+    retry_committed = commit_signals(Session, 20, start_index=args.signals)
+    ok = wait_for(["webhook"], {"webhook": args.signals + 20})
+    print(f"\n=== webhook 503 {args.fail_first}회 후 재시도 (완료: {ok}) ===")
+    report("webhook (재시도 포함)", "webhook", retry_committed)
+
+    # 3) 재시작: 발송기 중단 중에 커밋된 신호도 재시작 후 발송
+    dispatcher.stop(timeout=5)
+    restart_committed = commit_signals(Session, 20, start_index=args.signals + 20)
+    dispatcher = AlertDispatcher(session_factory=Session, poll_interval=1.0)
+    dispatcher.start()
+    ok = wait_for(["webhook"], {"webhook": args.signals + 40})
+    print(f"\n=== 발송기 중단 중 커밋된 신호 20개 재시작 후 발송 (완료: {ok}) ===")
+    report("webhook (중단 시간 포함)", "webhook", restart_committed)
+
+    db = Session()
+    statuses = dict(db.query(AlertOutbox.status, func.count(AlertOutbox.id)).group_by(AlertOutbox.status).all())
+    db.close()
+    print(f"outbox 상태: {statuses}")
+    print(f"발송기 지표: {dispatcher.metrics.snapshot()['counts']}")
+    dispatcher.stop(timeout=5)
+    http_server.shutdown()
+
+if __name__ == "__main__":
+    main()
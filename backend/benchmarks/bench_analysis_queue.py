@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+분석 큐 순서 벤치마크
+밀린 발언(지난 뉴스 + 무관한 게시글)이 쌓인 상태에서 새 발언이 계속 들어올 때,
+기존 순서(저장 순 / 게시 최신순)와 PriorityAnalysisQueue의 발언 -> 신호 시간과 최대 대기를 가상 시계로 비교합니다.
+"""
+
+import sys
+import random
+import statistics
+from pathlib import Path
+from datetime import datetime, timedelta
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.relevance_filter import RelevanceClassifier
+from app.analysis_queue import PriorityAnalysisQueue
+
+TRADE_TEXTS = [
+    "We will put a 50% tariff on China starting next week, trade deal is off",
+    "Tariffs on European steel and aluminum are going up, the EU has been very unfair on trade",
+    "Korea must pay more, tariffs on Korean autos and Samsung chips coming",
+    "Big trade deal with Japan, tariffs cut, stock market will go up",
+]
+# 사전 필터는 통과하지만(LLM 호출) 시장을 움직이지 않는 발언
+MIDDLE_TEXTS = [
+    "The economy is doing great, jobs numbers are strong",
+    "Gasoline prices are way down, energy independence",
+    "Our budget bill cuts taxes for everyone",
+]
+OTHER_TEXTS = [
+    "Happy birthday to a great American patriot",
+    "The fake news media is at it again, total witch hunt",
+    "Thank you Ohio, what a crowd tonight",
+    "Congratulations to our great team on a wonderful win",
+]
+
+def pick_text(rng, moving_share: float):
+    """(본문, 시장 영향 여부) - 나머지는 절반씩 중간 관련성/무관"""
+    roll = rng.random()
+    if roll < moving_share:
+        return rng.choice(TRADE_TEXTS), True
+    if roll < moving_share + (1 - moving_share) / 2:
+        return rng.choice(MIDDLE_TEXTS), False
+    return rng.choice(OTHER_TEXTS), False
+
+def make_statements(backlog: int, arrivals: int, start: datetime, span: timedelta, seed: int = 0):
+    """(id, text, posted_at, created_at, market_moving, is_new) - 밀린 발언은 start 시점에 이미 저장, 새 발언은 span 동안 도착"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(backlog):
+        text, moving = pick_text(rng, 0.3)
+        rows.append((len(rows) + 1, f"{text} #{i}", start - timedelta(days=rng.uniform(1, 7)), start, moving, False))
+    for i in range(arrivals):
+        text, moving = pick_text(rng, 0.25)
+        created = start + span * rng.random()
+        rows.append((len(rows) + 1, f"{text} (new {i})", created - timedelta(minutes=rng.uniform(0, 3)), created, moving, True))
+    return sorted(rows, key=lambda row: row[3])
+
+def simulate(rows, policy: str, start: datetime, llm_seconds: float, relevance: RelevanceClassifier):
+    """가상 시계로 한 건씩 분석 (LLM 호출은 llm_seconds, 사전 필터에서 걸러지면 0초)
+
+    신호 시간은 시장 영향 발언만 집계 (새로 들어온 발언 / 밀려 있던 발언 따로)
+    """
+    queue = PriorityAnalysisQueue(relevance) if policy == "priority" else None
+    pending, waits, to_signal, backlog_signal = [], [], [], []
+    now, next_row = start, 0
+    while next_row < len(rows) or pending:
+        while next_row < len(rows) and rows[next_row][3] <= now:
+            row = rows[next_row]
+            if queue is not None:
+                queue.push(row[0], row[1], row[2], row[3], now=now)
+            pending.append(row)
+            next_row += 1
+        if queue is not None:
+            item = queue.pop(now)
+            picked = next(row for row in pending if row[0] == item.statement_id) if item else None
+        elif pending:
+            key = (lambda row: row[0]) if policy == "fifo" else (lambda row: start - row[2])
+            picked = min(pending, key=key)
+        else:
+            picked = None
+        if picked is None:
+            now = rows[next_row][3]
+            continue
+        pending.remove(picked)
+        waits.append((now - picked[3]).total_seconds())
+        cost = llm_seconds if relevance.should_analyze(picked[1]) else 0.0
+        now += timedelta(seconds=cost)
+        if picked[4]:
+            (to_signal if picked[5] else backlog_signal).append((now - picked[3]).total_seconds())
+    return waits, to_signal, backlog_signal, queue
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='분석 큐 순서 벤치마크 (가상 시계)')
+    parser.add_argument('--backlog', type=int, default=600, help='시작 시점에 밀려 있는 발언 수')
+    parser.add_argument('--arrivals', type=int, default=60, help='측정 구간 동안 새로 들어오는 발언 수')
+    parser.add_argument('--span-minutes', type=float, default=60, help='새 발언이 들어오는 구간(분)')
+    parser.add_argument('--llm-seconds', type=float, default=8.0, help='LLM 분석 1건 소요 시간(초)')
+    args = parser.parse_args()
+
+    # 미국 개장 30분 전부터 시작 (개장 직전 발언이 세션 점수를 받는 구간)
+    start = datetime(2025, 6, 10, 13, 0)
+    relevance = RelevanceClassifier()
+    rows = make_statements(args.backlog, args.arrivals, start, timedelta(minutes=args.span_minutes))
+    print(f"밀린 발언 {args.backlog}개 + 새 발언 {args.arrivals}개 ({args.span_minutes:.0f}분), LLM {args.llm_seconds}초/건")
+    print(f"{'순서':<10} {'새 발언 신호 p50':>16} {'p90':>8} {'max':>8}   {'밀린 발언 신호 p50':>18} {'대기 max':>10}")
+    for policy in ("fifo", "newest", "priority"):
+        waits, to_signal, backlog_signal, queue = simulate(rows, policy, start, args.llm_seconds, relevance)
+        p90 = sorted(to_signal)[int(len(to_signal) * 0.9)]
+        print(f"{policy:<10} {statistics.median(to_signal):15.0f}s {p90:7.0f}s {max(to_signal):7.0f}s   "
+              f"{statistics.median(backlog_signal):17.0f}s {max(waits):9.0f}s")
+        if queue is not None:
+            print(f"  큐 지표: {queue.snapshot()['counts']}  대기: {queue.snapshot()['wait']}")
+
+if __name__ == "__main__":
+    main()
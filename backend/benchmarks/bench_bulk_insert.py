@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+ETF 가격 삽입 벤치마크
+행마다 ETFPrice ORM 객체를 만들어 db.add 하는 기존 방식과
+컬럼 배열(dict / DataFrame)을 Core executemany로 넣는 bulk_insert_prices를 비교합니다.
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.database import Base
+from app.model import ETFPrice
+from app.etf_universe import ETF_SYMBOLS
+from app.bulk_insert import bulk_insert_prices
+
+def make_columns(rows: int) -> dict:
+    """fetch 단계가 내놓는 형태의 컬럼 배열"""
+    rng = np.random.default_rng(0)
+    symbols = np.array(list(ETF_SYMBOLS))
+    start = np.datetime64(datetime(2024, 1, 1))
+    return {
+        "symbol": symbols[np.arange(rows) % len(symbols)],
+        "price": rng.uniform(50, 600, rows).round(2),
+        "change_percent": rng.normal(0, 1, rows).round(4),
+        "volume": rng.integers(1000, 10_000_000, rows),
+        "timestamp": start + np.arange(rows).astype("timedelta64[m]"),
+    }
+
+def orm_insert(Session, columns):
+    db = Session()
+    try:
+        for symbol, price, change, volume, ts in zip(*(columns[c].tolist() for c in
+                                                      ("symbol", "price", "change_percent", "volume", "timestamp"))):
+            db.add(ETFPrice(
+                symbol=symbol,
+                description=ETF_SYMBOLS[symbol],
+                price=price,
+                change_percent=change,
+                volume=volume,
+                timestamp=ts
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+def bulk_dict_insert(engine, columns):
+    with engine.begin() as conn:
+        bulk_insert_prices(conn, columns)
+
+def bulk_frame_insert(engine, frame):
+    with engine.begin() as conn:
+        bulk_insert_prices(conn, frame)
+
+def measure(label, rows, fn):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {rows:>10,}행  {elapsed:8.2f} s  {rows / elapsed:12,.0f} 행/초")
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='ETF 가격 삽입 벤치마크 (ORM vs Core bulk)')
+    parser.add_argument('--sizes', type=str, default="1000,100000,1000000", help='행 수 목록')
+    parser.add_argument('--orm-max', type=int, default=1_000_000, help='ORM 방식을 측정할 최대 행 수')
+    args = parser.parse_args()
+
+    for rows in [int(size) for size in args.sizes.split(",")]:
+        columns = make_columns(rows)
+        frame = pd.DataFrame(columns)
+        print(f"\n=== {rows:,}행 ===")
+        with tempfile.TemporaryDirectory() as tmp:
+            cases = [
+                ("Core bulk (dict 배열)", lambda engine: bulk_dict_insert(engine, columns)),
+                ("Core bulk (DataFrame)", lambda engine: bulk_frame_insert(engine, frame)),
+            ]
+            if rows <= args.orm_max:
+                cases.insert(0, ("ORM db.add", lambda engine: orm_insert(sessionmaker(bind=engine), columns)))
+            for i, (label, fn) in enumerate(cases):
+                engine = create_engine(f"sqlite:///{tmp}/bench{i}.db")
+                Base.metadata.create_all(bind=engine, tables=[ETFPrice.__table__])
+                measure(label, rows, lambda: fn(engine))
+                engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+브라우저 풀 벤치마크
+매 크롤링마다 Chrome을 새로 띄우는 기존 방식(cold)과 DriverPool 세션을 재사용하는 방식(warm)의
+크롤링 1회당 페이지 준비 시간(기동 + 타임라인 로딩 + 종료)을 비교합니다.
+기본 URL은 저장된 app/truth_social_page.html이라 네트워크 없이 실행 가능 (Chrome/chromedriver 필요)
+"""
+
+import sys
+import time
+import statistics
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from app.driver_pool import DriverPool, create_chrome_driver
+
+POST_XPATH = "//div[@data-index]"
+
+def open_page(driver, url, timeout):
+    if driver.current_url == url:
+        driver.refresh()
+    else:
+        driver.get(url)
+    WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.XPATH, POST_XPATH)))
+
+def cold_crawl(url, timeout):
+    driver = create_chrome_driver(headless=True)
+    try:
+        open_page(driver, url, timeout)
+    finally:
+        driver.quit()
+
+def report(label, durations):
+    print(f"{label:<8} 평균 {statistics.mean(durations):6.2f}초  "
+          f"최소 {min(durations):6.2f}초  최대 {max(durations):6.2f}초  ({len(durations)}회)")
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='브라우저 풀 벤치마크 (cold vs warm)')
+    parser.add_argument('--url', type=str, default=(backend_dir / "app" / "truth_social_page.html").as_uri(),
+                        help='크롤링할 페이지 URL')
+    parser.add_argument('--runs', type=int, default=5, help='방식별 반복 횟수')
+    parser.add_argument('--timeout', type=float, default=15, help='게시글 로딩 대기 최대 시간(초)')
+    args = parser.parse_args()
+
+    cold = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        cold_crawl(args.url, args.timeout)
+        cold.append(time.perf_counter() - started)
+
+    warm = []
+    with DriverPool(size=1, factory=lambda: create_chrome_driver(headless=True)) as pool:
+        pool.warm_up(args.url)
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            with pool.acquire() as session:
+                open_page(session.driver, args.url, args.timeout)
+            warm.append(time.perf_counter() - started)
+        stats = pool.stats
+
+    print(f"\n=== 크롤링 1회당 페이지 준비 시간: {args.url} ===")
+    report("cold", cold)
+    report("warm", warm)
+    print(f"크롤링 1회당 절감: {statistics.mean(cold) - statistics.mean(warm):.2f}초, 풀 상태: {stats}")
+
+if __name__ == "__main__":
+    main()
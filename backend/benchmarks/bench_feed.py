@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+피드 직렬화 벤치마크
+기존 방식(ORM 객체 + 키워드 split + json.dumps)과
+현재 방식(컬럼 조회 + 저장된 키워드 배열 + orjson)의 행당 비용을 비교합니다.
+"""
+
+import sys
+import json
+import time
+import random
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import orjson
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi.encoders import jsonable_encoder
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.database import Base
+from app.model import TrumpStatement, TACOSignal
+from app.feed import build_latest_signals, build_trump_feed, format_time_ago
+
+def seed(db, rows):
+    """벤치마크용 발언/신호 데이터 생성"""
+    now = datetime.now()
+    for i in range(rows):
+        statement = TrumpStatement(
+            original_text=f"Statement {i} about tariffs on China and the EU",
+            korean_translation=f"발언 {i}: 중국과 EU 관세",
+            source="bench",
+            keywords=["관세", "중국", "유럽연합", f"키워드{i % 17}"],
+            taco_probability=random.uniform(0, 100),
+            is_analyzed=True,
+            posted_at=now - timedelta(minutes=i)
+        )
+        db.add(statement)
+        db.flush()
+        db.add(TACOSignal(
+            statement_id=statement.id,
+            signal_type="BUY",
+            confidence=statement.taco_probability,
+            affected_etfs=[{"symbol": "FXI", "direction": "up", "impact": 0.7}]
+        ))
+    db.commit()
+
+def legacy_feed(db, limit):
+    """변경 전 /api/trump-feed 구현 (키워드는 콤마 문자열로 가정)"""
+    statements = db.query(TrumpStatement).filter(
+        TrumpStatement.is_analyzed == True
+    ).order_by(TrumpStatement.posted_at.desc()).limit(limit).all()
+
+    result = []
+    for stmt in statements:
+        result.append({
+            "id": stmt.id,
+            "original_text": stmt.original_text,
+            "korean_translation": stmt.korean_translation,
+            "keywords": [k.strip() for k in ','.join(stmt.keywords).split(',')],
+            "taco_probability": stmt.taco_probability,
+            "source": stmt.source,
+            "posted_at": stmt.posted_at.isoformat(),
+            "time_ago": format_time_ago(stmt.posted_at, datetime.now())
+        })
+    return json.dumps(jsonable_encoder({"statements": result})).encode()
+
+def legacy_signals(db, limit):
+    """변경 전 /api/latest-signals 구현 (신호마다 발언을 별도 조회)"""
+    signals = db.query(TACOSignal).filter(
+        TACOSignal.is_active == True
+    ).order_by(TACOSignal.created_at.desc()).limit(limit).all()
+
+    result = []
+    for signal in signals:
+        statement = db.query(TrumpStatement).filter(
+            TrumpStatement.id == signal.statement_id
+        ).first()
+        result.append({
+            "id": signal.id,
+            "signal_type": signal.signal_type,
+            "confidence": signal.confidence,
+            "statement": {
+                "original": statement.original_text,
+                "korean": statement.korean_translation,
+                "keywords": [k.strip() for k in ','.join(statement.keywords).split(',')],
+                "posted_at": statement.posted_at.isoformat()
+            },
+            "affected_etfs": signal.affected_etfs,
+            "created_at": signal.created_at.isoformat(),
+            "entry_timing": signal.entry_timing
+        })
+    return json.dumps(jsonable_encoder({"signals": result})).encode()
+
+def measure(label, func, db, limit, repeat):
+    """함수 실행 시간을 측정하고 행당 비용 출력"""
+    func(db, limit)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        db.expire_all()
+        func(db, limit)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<28} {elapsed * 1000:8.2f} ms/요청  {elapsed / limit * 1e6:8.2f} µs/행")
+    return elapsed
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='피드 직렬화 벤치마크')
+    parser.add_argument('--rows', type=int, default=1000, help='생성할 발언 수')
+    parser.add_argument('--limit', type=int, default=1000, help='요청당 조회 행 수')
+    parser.add_argument('--repeat', type=int, default=20, help='반복 횟수')
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db, args.rows)
+
+    print(f"\n=== 피드 직렬화 벤치마크 (limit={args.limit}) ===")
+    old = measure("trump-feed (기존)", legacy_feed, db, args.limit, args.repeat)
+    new = measure("trump-feed (orjson)", lambda d, l: orjson.dumps(build_trump_feed(d, l)), db, args.limit, args.repeat)
+    print(f"  -> {old / new:.1f}배")
+    old = measure("latest-signals (기존)", legacy_signals, db, args.limit, args.repeat)
+    new = measure("latest-signals (orjson)", lambda d, l: orjson.dumps(build_latest_signals(d, l)), db, args.limit, args.repeat)
+    print(f"  -> {old / new:.1f}배")
+    db.close()
+
+if __name__ == "__main__":
+    main()
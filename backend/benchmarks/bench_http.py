@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+HTTP 응답 압축/조건부 요청 벤치마크
+/api/etf-prices 전체 이력을 identity, gzip, br, 304(재검증)로 요청해
+전송 바이트와 지연 시간을 비교합니다. (fastapi TestClient 사용, httpx 필요)
+"""
+
+import sys
+import time
+import random
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.database import Base, get_db
+from app.model import ETFPrice
+from app.etf_universe import ETF_SYMBOLS
+from app.main import app
+
+def seed(engine, rows):
+    """심볼별 분 단위 가격 이력 생성"""
+    symbols = list(ETF_SYMBOLS)
+    start = datetime.utcnow() - timedelta(minutes=rows)
+    data = [
+        {
+            "symbol": symbols[i % len(symbols)],
+            "description": ETF_SYMBOLS[symbols[i % len(symbols)]],
+            "price": round(random.uniform(50, 600), 2),
+            "change_percent": round(random.uniform(-3, 3), 4),
+            "volume": random.randint(1000, 10000000),
+            "timestamp": start + timedelta(minutes=i)
+        }
+        for i in range(rows)
+    ]
+    with engine.begin() as conn:
+        conn.execute(ETFPrice.__table__.insert(), data)
+
+def measure(client, label, headers, repeat):
+    """요청 반복 후 평균 지연과 전송 바이트 출력"""
+    client.get("/api/etf-prices", headers=headers)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get("/api/etf-prices", headers=headers)
+    elapsed = (time.perf_counter() - start) / repeat
+    wire_bytes = int(response.headers.get("content-length", 0))
+    print(f"{label:<12} {response.status_code:>4}  {wire_bytes:>12,} bytes  {elapsed * 1000:9.2f} ms")
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='HTTP 압축/캐시 벤치마크')
+    parser.add_argument('--rows', type=int, default=50000, help='가격 이력 행 수')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.rows)
+        SessionLocal = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)  # startup 이벤트(샘플 데이터, 스트리머)는 실행하지 않음
+
+        print(f"\n=== /api/etf-prices ({args.rows:,}행) ===")
+        measure(client, "identity", {"Accept-Encoding": "identity"}, args.repeat)
+        measure(client, "gzip", {"Accept-Encoding": "gzip"}, args.repeat)
+        measure(client, "br", {"Accept-Encoding": "br"}, args.repeat)
+        etag = client.get("/api/etf-prices").headers["etag"]
+        measure(client, "304", {"If-None-Match": etag}, args.repeat)
+        app.dependency_overrides.clear()
+
+if __name__ == "__main__":
+    main()
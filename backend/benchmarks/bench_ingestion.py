@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+다중 소스 수집 벤치마크
+NewsAPI / X / Truth Social API를 흉내 내는 로컬 HTTP 스텁을 띄우고 임시 DB로 수집해,
+페이지 넘김, 소스별 워터마크(두 번째 수집은 새 항목만), 429 처리,
+느린 소스가 다른 소스를 늦추지 않는지(동시 수집 시간)를 확인합니다.
+"""
+
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.database import Base
+from app.model import TrumpStatement, CrawlState
+from app.ingestion import IngestionRunner, NewsAPIConnector, XConnector, TruthSocialConnector
+
+# NewsAPI 커넥터의 첫 수집 범위(최근 7일) 안에 들도록 최근 시각부터 생성
+START = datetime.utcnow().replace(microsecond=0) - timedelta(days=3)
+
+class StubData:
+    """소스별 게시글 (id가 클수록 최신)"""
+
+    def __init__(self, count):
+        self.lock = threading.Lock()
+        self.items = {"news": [], "x": [], "truth": []}
+        self.requests = {"news": 0, "x": 0, "truth": 0}
+        self.rate_limit_once = {"truth"}
+        self.slow = {}
+        self.add(count)
+
+    def add(self, count):
+        with self.lock:
+            for name, posts in self.items.items():
+                base = len(posts)
+                for i in range(base, base + count):
+                    posts.append({"id": i + 1, "at": START + timedelta(minutes=i), "text": f"{name} tariff post {i}"})
+
+    def newest_first(self, name):
+        return sorted(self.items[name], key=lambda p: p["id"], reverse=True)
+
+data = None
+
+def iso(at):
+    return at.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class StubHandler(BaseHTTPRequestHandler):
+    def reply(self, status, body, headers=None):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        name = "news" if url.path.startswith("/v2") else "x" if url.path.startswith("/2/") else "truth"
+        with data.lock:
+            data.requests[name] += 1
+            if name in data.rate_limit_once:
+                data.rate_limit_once.discard(name)
+                return self.reply(429, {"error": "rate limited"}, {"Retry-After": "0"})
+            posts = data.newest_first(name)
+        time.sleep(data.slow.get(name, 0))
+
+        if name == "news":
+            since = datetime.fromisoformat(query["from"])
+            posts = [p for p in posts if p["at"] >= since]
+            size, page = int(query["pageSize"]), int(query["page"])
+            articles = [{"source": {"name": "Stub News"}, "description": p["text"], "publishedAt": iso(p["at"])}
+                        for p in posts[(page - 1) * size:page * size]]
+            return self.reply(200, {"status": "ok", "totalResults": len(posts), "articles": articles})
+
+        if name == "x":
+            if "/users/by/username/" in url.path:
+                return self.reply(200, {"data": {"id": "42"}})
+            since = int(query.get("since_id", 0))
+            posts = [p for p in posts if p["id"] > since]
+            offset = int(query.get("pagination_token", 0))
+            size = int(query["max_results"])
+            page = posts[offset:offset + size]
+            meta = {"result_count": len(page)}
+            if offset + size < len(posts):
+                meta["next_token"] = str(offset + size)
+            return self.reply(200, {"data": [{"id": str(p["id"]), "text": p["text"], "created_at": iso(p["at"])} for p in page],
+                                    "meta": meta})
+
+        if url.path.endswith("/lookup"):
+            return self.reply(200, {"id": "7"})
+        since, max_id = int(query.get("since_id", 0)), int(query.get("max_id", 10 ** 9))
+        posts = [p for p in posts if since < p["id"] < max_id][:int(query["limit"])]
+        return self.reply(200, [{"id": str(p["id"]), "content": f"<p>{p['text']} &amp; more</p>", "created_at": iso(p["at"]),
+                                 "reblog": None} for p in posts])
+
+    def log_message(self, *args):
+        pass
+
+def make_connectors(base_url):
+    # 스텁이므로 호출 한도는 넉넉하게 (실서비스 기본값이면 X는 15분에 5회)
+    limit = {"base_url": base_url, "max_pages": 50, "rate_limit": (1000, 1.0)}
+    return [
+        NewsAPIConnector("stub-key", **limit),
+        XConnector("stub-token", **limit),
+        TruthSocialConnector(**limit),
+    ]
+
+def counts(Session):
+    db = Session()
+    try:
+        by_source = dict(db.query(TrumpStatement.source, func.count(TrumpStatement.id)).group_by(TrumpStatement.source).all())
+        marks = {row.source: (row.newest_post_id, row.newest_posted_at) for row in db.query(CrawlState).all()}
+        return by_source, marks
+    finally:
+        db.close()
+
+def main():
+    import argparse
+    global data
+
+    parser = argparse.ArgumentParser(description='다중 소스 수집 벤치마크 (로컬 HTTP 스텁)')
+    parser.add_argument('--posts', type=int, default=450, help='소스별 초기 게시글 수')
+    parser.add_argument('--new-posts', type=int, default=25, help='두 번째 수집 전에 추가할 소스별 게시글 수')
+    parser.add_argument('--slow', type=float, default=0.5, help='X 스텁의 페이지당 지연(초)')
+    args = parser.parse_args()
+
+    data = StubData(args.posts)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    tmp = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{tmp}/ingestion.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    # 1) 초기 수집: 전체 페이지, Truth Social은 첫 요청에 429
+    runner = IngestionRunner(make_connectors(base_url), session_factory=Session)
+    started = time.perf_counter()
+    first = asyncio.run(runner.run_once())
+    print(f"\n=== 초기 수집 ({time.perf_counter() - started:.2f}초) ===")
+    print(f"저장: {first}")
+    retry = asyncio.run(runner.run_once())
+    print(f"429 이후 재수집: {retry}")
+    by_source, marks = counts(Session)
+    print(f"출처별 발언: {by_source}")
+    print(f"워터마크: {marks}")
+    print(f"스텁 요청 수: {data.requests}")
+
+    # 2) 증분 수집: 새 항목만 (요청 수도 새 페이지 분만)
+    data.add(args.new_posts)
+    before = dict(data.requests)
+    second = asyncio.run(runner.run_once())
+    print(f"\n=== 새 게시글 {args.new_posts}개씩 추가 후 증분 수집 ===")
+    print(f"저장: {second}  추가 요청: { {k: data.requests[k] - before[k] for k in before} }")
+
+    # 3) 느린 소스 격리: X가 페이지마다 지연돼도 다른 소스 수집 시간은 그대로
+    data.add(args.new_posts)
+    data.slow["x"] = args.slow
+    runner = IngestionRunner(make_connectors(base_url), session_factory=Session)
+    started = time.perf_counter()
+    third = asyncio.run(runner.run_once())
+    total = time.perf_counter() - started
+    print(f"\n=== X 스텁 {args.slow}초 지연 시 동시 수집 (전체 {total:.2f}초) ===")
+    print(f"저장: {third}")
+    for source, stats in runner.stats.items():
+        print(f"  {source:<36} {stats['last_duration']:6.2f}초")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
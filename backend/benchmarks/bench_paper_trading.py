@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+모의 투자 평가 벤치마크
+포지션 수백~수천 개를 연 상태에서 시세 틱 하나(전 종목 시세 묶음)를 반영하는 시간을
+PaperPortfolio.on_quotes(심볼별 순수량 증분)와 포지션 전체를 다시 평가하는 방식으로 비교합니다.
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.etf_universe import ETF_SYMBOLS
+from app.paper_trading import PaperPortfolio
+
+def make_signals(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    symbols = list(ETF_SYMBOLS)
+    now = datetime.utcnow()
+    for i in range(count):
+        yield SimpleNamespace(
+            id=i + 1,
+            signal_type=rng.choice(["BUY", "SELL"]),
+            confidence=rng.uniform(50, 95),
+            affected_etfs=[{"symbol": s, "direction": rng.choice(["up", "down"]), "impact": rng.uniform(0.3, 1.0)}
+                           for s in rng.sample(symbols, 3)],
+            expected_duration=rng.choice([12, 24, 72]),
+            created_at=now - timedelta(minutes=rng.randint(0, 600))
+        )
+
+def naive_mark(portfolio: PaperPortfolio) -> float:
+    """포지션마다 현재가로 평가손익을 다시 합산하는 방식"""
+    return sum(p.pnl(portfolio.prices.get(p.symbol)) for p in portfolio.positions.values() if p.is_open)
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='모의 투자 틱 평가 벤치마크')
+    parser.add_argument('--positions', type=str, default="300,3000,30000", help='신호 수 목록 (신호당 포지션 3개)')
+    parser.add_argument('--ticks', type=int, default=2000, help='반영할 시세 틱 수')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    symbols = list(ETF_SYMBOLS)
+    for count in [int(c) // 3 for c in args.positions.split(",")]:
+        portfolio = PaperPortfolio()
+        portfolio.on_quotes([{"symbol": s, "price": rng.uniform(20, 500)} for s in symbols])
+        for signal in make_signals(count):
+            portfolio.add_signal(signal)
+        ticks = [
+            [{"symbol": s, "price": portfolio.prices[s] * (1 + rng.gauss(0, 0.001))} for s in symbols]
+            for _ in range(args.ticks)
+        ]
+
+        started = time.perf_counter()
+        for tick in ticks:
+            portfolio.on_quotes(tick)
+        incremental = (time.perf_counter() - started) / args.ticks
+
+        started = time.perf_counter()
+        for tick in ticks[:200]:
+            portfolio.on_quotes(tick)
+            naive_mark(portfolio)
+        naive = (time.perf_counter() - started) / 200
+
+        drift = abs(portfolio.unrealized - naive_mark(portfolio))
+        print(f"포지션 {portfolio.open_count():>6}개  틱당({len(symbols)}종목) 증분 {incremental * 1e6:8.1f}µs  "
+              f"전체 재평가 {naive * 1e6:10.1f}µs  (증분 누적 오차 {drift:.2e})")
+
+if __name__ == "__main__":
+    main()
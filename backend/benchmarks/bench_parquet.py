@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+파케이 이력 조회 벤치마크
+etf_prices 전체 이력을 ORM 조회, pandas.read_sql, 파케이(전체/컬럼 선택/심볼 조건)로
+읽어 시간과 결과 DataFrame 메모리를 비교합니다. (pyarrow 필요)
+"""
+
+import sys
+import time
+import sqlite3
+import random
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.database import Base
+from app.model import ETFPrice
+from app.etf_universe import ETF_SYMBOLS
+from app.columnar_export import sync, read_table
+
+def seed(engine, rows):
+    """심볼별 분 단위 가격 이력 생성 (약 rows / 심볼 수 분에 걸쳐 분포)"""
+    symbols = list(ETF_SYMBOLS)
+    start = datetime(2020, 1, 1)
+    step = timedelta(minutes=1)
+    with engine.begin() as conn:
+        for offset in range(0, rows, 100_000):
+            conn.execute(ETFPrice.__table__.insert(), [
+                {
+                    "symbol": symbols[i % len(symbols)],
+                    "description": ETF_SYMBOLS[symbols[i % len(symbols)]],
+                    "price": round(random.uniform(50, 600), 2),
+                    "change_percent": round(random.uniform(-3, 3), 4),
+                    "volume": random.randint(1000, 10000000),
+                    "timestamp": start + step * (i // len(symbols))
+                }
+                for i in range(offset, min(offset + 100_000, rows))
+            ])
+
+def measure(label, fn):
+    started = time.perf_counter()
+    frame = fn()
+    elapsed = time.perf_counter() - started
+    memory = frame.memory_usage(deep=True).sum() / 1024 / 1024
+    print(f"{label:<28} {len(frame):>10,}행  {elapsed * 1000:9.1f} ms  {memory:8.1f} MB")
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='파케이 이력 조회 벤치마크')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='가격 이력 행 수')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.rows)
+        out = Path(tmp) / "parquet"
+
+        started = time.perf_counter()
+        sync(engine, out, ["etf_prices"])
+        print(f"\n초기 내보내기: {(time.perf_counter() - started):.2f}초")
+        started = time.perf_counter()
+        sync(engine, out, ["etf_prices"])
+        print(f"증분 내보내기(새 행 없음): {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        Session = sessionmaker(bind=engine)
+        symbol = next(iter(ETF_SYMBOLS))
+        last_week = datetime(2020, 1, 1) + timedelta(minutes=args.rows // len(ETF_SYMBOLS)) - timedelta(days=7)
+
+        def orm_load():
+            db = Session()
+            try:
+                return pd.DataFrame([
+                    {"symbol": p.symbol, "price": p.price, "timestamp": p.timestamp}
+                    for p in db.query(ETFPrice).all()
+                ])
+            finally:
+                db.close()
+
+        print(f"\n=== etf_prices ({args.rows:,}행) ===")
+        measure("ORM 전체 조회", orm_load)
+        measure("pandas.read_sql 전체", lambda: pd.read_sql(
+            "SELECT * FROM etf_prices", sqlite3.connect(f"{tmp}/bench.db"), parse_dates=["timestamp"]
+        ))
+        measure("파케이 전체", lambda: read_table("etf_prices", out_dir=out))
+        measure("파케이 3개 컬럼", lambda: read_table("etf_prices", ["symbol", "price", "timestamp"], out_dir=out))
+        measure(f"파케이 {symbol} 조건", lambda: read_table(
+            "etf_prices", ["price", "timestamp"], filters=[("symbol", "=", symbol)], out_dir=out
+        ))
+        measure("파케이 최근 7일(기간 조건)", lambda: read_table(
+            "etf_prices", ["symbol", "price", "timestamp"], start=last_week, out_dir=out
+        ))
+
+if __name__ == "__main__":
+    main()
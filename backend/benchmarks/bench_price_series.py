@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+차트 시계열 다운샘플링 벤치마크
+NumPy LTTB/min-max 구현의 처리 시간과 응답 크기를 원본 전송과 비교하고,
+LTTB 결과가 순수 파이썬 참조 구현과 같은 점을 고르는지 확인합니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import orjson
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.price_series import lttb, minmax
+
+def reference_lttb(x, y, budget):
+    """원 논문 방식의 순수 파이썬 LTTB (비교용)"""
+    n = len(x)
+    if budget >= n or budget < 3:
+        return list(range(n))
+    every = (n - 2) / (budget - 2)
+    selected = [0]
+    a = 0
+    for i in range(budget - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        next_lo, next_hi = hi, min(int((i + 2) * every) + 1, n - 1)
+        if i == budget - 3:
+            cx, cy = x[n - 1], y[n - 1]
+        else:
+            cx = sum(x[next_lo:next_hi]) / (next_hi - next_lo)
+            cy = sum(y[next_lo:next_hi]) / (next_hi - next_lo)
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((x[a] - cx) * (y[j] - y[a]) - (x[a] - x[j]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='차트 시계열 다운샘플링 벤치마크 (LTTB/min-max)')
+    parser.add_argument('--points', type=str, default="10000,100000,1000000", help='원본 가격 포인트 수 목록')
+    parser.add_argument('--budget', type=int, default=500, help='응답 포인트 수')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in [int(p) for p in args.points.split(",")]:
+        x = np.arange(n, dtype=np.float64) * 60_000
+        y = 100 * np.cumprod(1 + rng.normal(0, 0.001, n))
+        raw_bytes = len(orjson.dumps({"timestamps": x.tolist(), "prices": y.tolist()}))
+
+        lttb_time, keep = timed(lambda: lttb(x, y, args.budget))
+        minmax_time, keep_mm = timed(lambda: minmax(y, args.budget))
+        sample_bytes = len(orjson.dumps({"timestamps": x[keep].tolist(), "prices": y[keep].tolist()}))
+        line = (f"{n:>9,}점 -> {args.budget}점  LTTB {lttb_time * 1000:7.2f}ms  min-max {minmax_time * 1000:6.2f}ms  "
+                f"응답 {raw_bytes / 1024:9.1f}KB -> {sample_bytes / 1024:5.1f}KB")
+        if n <= 100000:
+            ref_time, ref = timed(lambda: reference_lttb(x.tolist(), y.tolist(), args.budget), repeat=1)
+            line += f"  순수 파이썬 {ref_time * 1000:8.1f}ms  일치 {list(keep) == ref}"
+        line += f"  min-max 범위 보존 {y[keep_mm].min() == y.min() and y[keep_mm].max() == y.max()}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
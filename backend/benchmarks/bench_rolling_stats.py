@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+이동 상관/변동성 벤치마크
+가격 행이 들어올 때마다 RollingWindow로 증분 갱신하는 방식과
+가격 테이블 전체를 pandas로 피벗해 수익률 상관행렬/변동성을 다시 계산하는 방식을 비교하고,
+마지막 결과가 pandas 계산과 일치하는지 확인합니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.etf_universe import ETF_SYMBOLS
+from app.rolling_stats import RollingWindow
+
+def make_prices(bars: int, symbols, seed: int = 0) -> pd.DataFrame:
+    """공통 요인 + 개별 잡음 수익률로 만든 (timestamp, symbol, price) 긴 형식 테이블"""
+    rng = np.random.default_rng(seed)
+    n = len(symbols)
+    factor = rng.normal(0, 0.004, bars)[:, None]
+    returns = factor * rng.uniform(0.2, 1.5, n) + rng.normal(0, 0.003, (bars, n))
+    prices = 100 * np.cumprod(1 + returns, axis=0)
+    start = datetime(2024, 1, 2)
+    timestamps = [start + timedelta(hours=i) for i in range(bars)]
+    return pd.DataFrame({
+        "timestamp": np.repeat(timestamps, n),
+        "symbol": np.tile(symbols, bars),
+        "price": prices.ravel(),
+    })
+
+def pandas_stats(table: pd.DataFrame, window: int):
+    wide = table.pivot(index="timestamp", columns="symbol", values="price")
+    returns = wide.pct_change().iloc[1:].tail(window)
+    return returns.corr(), returns.std()
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='이동 상관/변동성 벤치마크 (증분 vs pandas 재계산)')
+    parser.add_argument('--bars', type=str, default="1000,10000,50000", help='가격 이력 봉 수 목록')
+    parser.add_argument('--window', type=int, default=120, help='이동 창 크기(봉)')
+    parser.add_argument('--updates', type=int, default=50, help='측정할 새 봉 수')
+    args = parser.parse_args()
+
+    symbols = list(ETF_SYMBOLS)
+    for bars in [int(b) for b in args.bars.split(",")]:
+        table = make_prices(bars + args.updates, symbols)
+        n = len(symbols)
+        history, new_rows = table.iloc[:bars * n], table.iloc[bars * n:]
+
+        window = RollingWindow(symbols, bar_seconds=3600, size=args.window)
+        for row in history.itertuples(index=False):
+            window.add_price(row.symbol, row.price, row.timestamp.to_pydatetime())
+
+        # 증분: 새 봉의 가격 행 반영 + 상관/변동성 조회
+        started = time.perf_counter()
+        for row in new_rows.itertuples(index=False):
+            window.add_price(row.symbol, row.price, row.timestamp.to_pydatetime())
+            if row.symbol == symbols[-1]:
+                window.correlation(), window.volatility()
+        incremental = (time.perf_counter() - started) / args.updates
+
+        # pandas: 새 봉마다 가격 테이블 전체를 다시 피벗/계산
+        started = time.perf_counter()
+        for k in range(1, args.updates + 1):
+            corr, std = pandas_stats(table.iloc[:(bars + k) * n], args.window)
+        full = (time.perf_counter() - started) / args.updates
+
+        # 형성 중인 마지막 봉은 닫히지 않았으므로 비교는 직전 봉까지
+        expected_corr, expected_std = pandas_stats(table.iloc[:(bars + args.updates - 1) * n], args.window)
+        order = [symbols.index(s) for s in expected_corr.columns]
+        corr_error = np.nanmax(np.abs(window.correlation()[np.ix_(order, order)] - expected_corr.values))
+        std_error = np.nanmax(np.abs(window.volatility()[order] - expected_std.values))
+        print(f"이력 {bars:>6}봉 x {n}종목  증분 {incremental * 1000:8.3f}ms/봉  pandas 재계산 {full * 1000:9.2f}ms/봉  "
+              f"({full / incremental:6.0f}배)  오차 corr {corr_error:.1e} std {std_error:.1e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+스트리밍 분석 벤치마크
+OpenAI Chat Completions API를 흉내 내는 로컬 스트리밍(SSE) 스텁을 띄우고 임시 DB로 발언을 분석해,
+기존 방식(전체 응답 -> 번역 -> 저장)과 스트리밍 방식(신호 필드 완성 즉시 저장)의
+대시보드 기준 신호 노출 시간과 세부 분석/번역 반영 시간을 비교합니다.
+"""
+
+import sys
+import json
+import time
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.database import Base
+from app.model import TrumpStatement, TACOSignal
+from app.relevance_filter import RelevanceClassifier
+from app.trump_analyzer import TrumpAnalyzer
+
+TEXTS = [
+    "We will put a 50% tariff on China starting next week, trade deal is off",
+    "Tariffs on European steel and aluminum are going up, the EU has been very unfair on trade",
+    "Korea must pay more, tariffs on Korean autos and Samsung chips coming",
+    "Big trade deal with Japan, tariffs cut, stock market will go up",
+]
+
+ANALYSIS = {
+    "signal_type": "BUY",
+    "taco_probability": 72,
+    "affected_etfs": [{"symbol": "FXI", "direction": "down", "impact": 0.7},
+                      {"symbol": "SPY", "direction": "down", "impact": 0.4}],
+    "trade_relevance": 90,
+    "sentiment_score": -0.6,
+    "key_points": ["중국산 제품 50% 관세 예고", "무역 협상 중단 선언", "다음 주부터 시행",
+                   "보복 관세 가능성", "증시 변동성 확대 예상"],
+}
+
+class StubConfig:
+    token_delay = 0.02      # 스트리밍 토큰 간 지연(초)
+    translate_delay = 1.0   # 번역 응답 지연(초)
+    chunk_chars = 4         # 토큰 하나의 글자 수
+
+def analysis_chunks():
+    """들여쓰기된 JSON 응답을 토큰 크기로 자름 (프롬프트의 필드 순서대로)"""
+    raw = json.dumps(ANALYSIS, ensure_ascii=False, indent=4)
+    size = StubConfig.chunk_chars
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def reply(self, body):
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        system = request["messages"][0]["content"]
+        base = {"id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()), "model": request["model"]}
+
+        if "번역" in system:
+            time.sleep(StubConfig.translate_delay)
+            text = request["messages"][-1]["content"]
+            return self.reply({**base, "choices": [{"index": 0, "finish_reason": "stop",
+                                                    "message": {"role": "assistant", "content": f"[번역] {text}"}}]})
+
+        chunks = analysis_chunks()
+        if not request.get("stream"):
+            time.sleep(StubConfig.token_delay * len(chunks))
+            return self.reply({**base, "choices": [{"index": 0, "finish_reason": "stop",
+                                                    "message": {"role": "assistant", "content": "".join(chunks)}}]})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(payload):
+            data = f"data: {payload}\n\n".encode()
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        base["object"] = "chat.completion.chunk"
+        send(json.dumps({**base, "choices": [{"index": 0, "delta": {"role": "assistant"}, "finish_reason": None}]}))
+        for chunk in chunks:
+            time.sleep(StubConfig.token_delay)
+            send(json.dumps({**base, "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]}))
+        send(json.dumps({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}))
+        send("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+class DashboardPoller(threading.Thread):
+    """대시보드처럼 별도 세션으로 DB를 폴링해 발언별 신호/세부 분석/번역이 처음 보인 시각 기록"""
+
+    def __init__(self, Session, interval=0.005):
+        super().__init__(daemon=True)
+        self.Session = Session
+        self.interval = interval
+        self.seen = {"signal": {}, "details": {}, "translation": {}}
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            db = self.Session()
+            try:
+                now = time.perf_counter()
+                rows = db.query(TACOSignal.statement_id, TrumpStatement.trade_relevance, TrumpStatement.korean_translation).join(
+                    TrumpStatement, TrumpStatement.id == TACOSignal.statement_id
+                ).all()
+            finally:
+                db.close()
+            for statement_id, relevance, translation in rows:
+                self.seen["signal"].setdefault(statement_id, now)
+                if relevance is not None:
+                    self.seen["details"].setdefault(statement_id, now)
+                if translation is not None:
+                    self.seen["translation"].setdefault(statement_id, now)
+            time.sleep(self.interval)
+
+def run(streaming: bool, count: int, relevance: RelevanceClassifier):
+    tmp = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{tmp}/analysis.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    for i in range(count):
+        db.add(TrumpStatement(original_text=f"{TEXTS[i % len(TEXTS)]} #{i}", source="bench", is_analyzed=False))
+    db.commit()
+
+    analyzer = TrumpAnalyzer("stub", relevance_filter=relevance)
+    openai.api_key = "stub"
+    analyzer.request_interval = 0
+    analyzer.streaming = streaming
+    poller = DashboardPoller(Session)
+    poller.start()
+
+    # 발언마다 분석 시작 시각을 기록해 시작 -> 대시보드 노출 시간을 잼
+    started = {}
+    original = analyzer.passes_filter
+    def passes_filter(statement):
+        started[statement.id] = time.perf_counter()
+        return original(statement)
+    analyzer.passes_filter = passes_filter
+
+    total_started = time.perf_counter()
+    created = analyzer.analyze_pending(db, limit=count)
+    total = time.perf_counter() - total_started
+    time.sleep(poller.interval * 4)
+    poller.stop_event.set()
+    poller.join()
+    db.close()
+
+    latency = {stage: [seen[sid] - started[sid] for sid in seen] for stage, seen in poller.seen.items()}
+    return created, total, latency
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='스트리밍 분석 벤치마크 (로컬 OpenAI 스트리밍 스텁)')
+    parser.add_argument('--statements', type=int, default=8, help='분석할 발언 수')
+    parser.add_argument('--token-delay', type=float, default=0.02, help='스트리밍 토큰 간 지연(초)')
+    parser.add_argument('--translate-delay', type=float, default=1.0, help='번역 응답 지연(초)')
+    args = parser.parse_args()
+
+    StubConfig.token_delay = args.token_delay
+    StubConfig.translate_delay = args.translate_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    openai.api_base = f"http://127.0.0.1:{server.server_port}/v1"
+
+    chunks = len(analysis_chunks())
+    print(f"발언 {args.statements}개, 분석 응답 {chunks}토큰 x {args.token_delay}초 "
+          f"(전체 {chunks * args.token_delay:.2f}초), 번역 {args.translate_delay}초")
+    print(f"{'방식':<10} {'신호 p50':>10} {'max':>8}   {'세부 p50':>10}   {'번역 p50':>10}   {'전체':>8}")
+    relevance = RelevanceClassifier()
+    for streaming in (False, True):
+        created, total, latency = run(streaming, args.statements, relevance)
+        median = lambda values: statistics.median(values) if values else float("nan")
+        name = "streaming" if streaming else "blocking"
+        print(f"{name:<10} {median(latency['signal']):9.2f}s {max(latency['signal'], default=float('nan')):7.2f}s   "
+              f"{median(latency['details']):9.2f}s   {median(latency['translation']):9.2f}s   {total:7.2f}s  (신호 {created}개)")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+멀티 프로세스 서빙 부하 테스트
+serve.py를 워커 수별(기본 1, 2, 4)로 띄우고 여러 클라이언트 프로세스로
+대시보드 엔드포인트를 반복 호출해 처리량(req/s)과 지연 분포를 비교합니다.
+주의: 서버가 backend/app/taco_trading.db를 사용하므로 복사본 트리에서 실행하는 것을 권장
+"""
+
+import os
+import sys
+import time
+import signal
+import statistics
+import subprocess
+import http.client
+from pathlib import Path
+from multiprocessing import Pool
+
+backend_dir = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = [
+    "/api/latest-prices",
+    "/api/latest-signals",
+    "/api/exposure",
+    "/api/trump-feed",
+]
+
+def wait_until_ready(port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def client_worker(args):
+    """keep-alive 연결 하나로 duration 동안 엔드포인트를 순환 호출"""
+    port, duration = args
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    latencies = []
+    errors = 0
+    i = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        path = ENDPOINTS[i % len(ENDPOINTS)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    return latencies, errors
+
+def run_level(workers: int, port: int, clients: int, duration: float, server_args):
+    server = subprocess.Popen(
+        [sys.executable, str(backend_dir / "serve.py"), "--port", str(port), "--workers", str(workers), *server_args],
+        cwd=backend_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_until_ready(port):
+            print(f"워커 {workers}개: 서버 시작 실패")
+            return None
+        time.sleep(2)  # 나머지 워커 기동 및 공유 캐시 첫 기록 대기
+        with Pool(clients) as pool:
+            results = pool.map(client_worker, [(port, duration)] * clients)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    latencies = sorted(l for result in results for l in result[0])
+    errors = sum(result[1] for result in results)
+    rps = len(latencies) / duration
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0
+    print(f"워커 {workers:>2}개  {rps:9.1f} req/s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  오류 {errors}")
+    return rps
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='멀티 프로세스 서빙 부하 테스트')
+    parser.add_argument('--workers', type=str, default="1,2,4", help='비교할 워커 수 목록')
+    parser.add_argument('--clients', type=int, default=16, help='동시 클라이언트 프로세스 수')
+    parser.add_argument('--duration', type=float, default=10.0, help='워커 수별 측정 시간(초)')
+    parser.add_argument('--port', type=int, default=8765, help='테스트 서버 포트')
+    parser.add_argument('--uvicorn', action='store_true', help='gunicorn 대신 uvicorn 멀티 워커 사용')
+    args = parser.parse_args()
+
+    server_args = ["--uvicorn"] if args.uvicorn else []
+    print(f"\n=== 부하 테스트 (클라이언트 {args.clients}개, {args.duration:.0f}초, CPU {os.cpu_count()}개) ===")
+    levels = [int(w) for w in args.workers.split(",")]
+    baseline = None
+    for workers in levels:
+        rps = run_level(workers, args.port, args.clients, args.duration, server_args)
+        if rps and baseline is None:
+            baseline = rps
+        elif rps and baseline:
+            print(f"          → 워커 {levels[0]}개 대비 {rps / baseline:.2f}배")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+TACO Trading API 운영 서버 (멀티 프로세스)
+- 워커 수 기본값은 CPU 코어 수
+- gunicorn이 있으면 UvicornWorker로 실행 (kill -HUP <master pid>로 무중단 재시작)
+- gunicorn이 없으면(Windows 등) uvicorn 멀티 워커로 실행
+- 워커 간 최신 시세/신호는 mmap 공유 캐시로 공유 (리더 워커 하나만 기록)
+개발 중에는 자동 리로드가 되는 run.py를 사용하세요.
+"""
+
+import os
+import sys
+import tempfile
+import subprocess
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent
+sys.path.append(str(backend_dir))
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+# 마스터가 app 패키지를 import하지 않도록 DB 초기화는 별도 프로세스에서 실행
+INIT_SCRIPT = (
+    "import asyncio\n"
+    "from app.main import init_db, create_sample_data\n"
+    "init_db()\n"
+    "asyncio.run(create_sample_data())\n"
+)
+
+def init_database():
+    """현재 코드 기준으로 DB 초기화/마이그레이션 (하위 프로세스, 실패하면 예외)"""
+    subprocess.run([sys.executable, "-c", INIT_SCRIPT], cwd=backend_dir, check=True)
+
+def prepare(shared_cache_path: str):
+    """워커를 띄우기 전에 한 번만 DB 초기화 (워커끼리 마이그레이션 경쟁 방지)
+
+    마스터에서 app.main을 import하면 워커가 마스터의 모듈을 물려받아
+    kill -HUP으로 재시작해도 새 코드를 읽지 않으므로 초기화는 하위 프로세스에서 실행
+    """
+    os.environ["SHARED_CACHE_PATH"] = shared_cache_path
+    init_database()
+    os.environ["TACO_SKIP_INIT"] = "1"
+
+def run_gunicorn(host: str, port: int, workers: int, pidfile: str = None):
+    from gunicorn.app.base import BaseApplication
+
+    class TacoApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "graceful_timeout": 30,
+        "timeout": 60,
+        "keepalive": 5,
+        "pidfile": pidfile,
+        # kill -HUP: 새 워커를 띄우기 전에 새 코드의 마이그레이션 적용
+        "on_reload": lambda arbiter: init_database(),
+        "loglevel": "info",
+    }
+    TacoApplication(options).run()
+
+def run_uvicorn(host: str, port: int, workers: int):
+    import uvicorn
+    uvicorn.run("app.main:app", host=host, port=port, workers=workers, log_level="info")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='TACO Trading API 운영 서버')
+    parser.add_argument('--host', type=str, default="0.0.0.0", help='바인드 주소')
+    parser.add_argument('--port', type=int, default=8000, help='포트')
+    parser.add_argument('--workers', type=int, default=default_workers(), help='워커 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--pidfile', type=str, default=None, help='gunicorn 마스터 PID 파일 (무중단 재시작용)')
+    parser.add_argument('--shared-cache', type=str,
+                        default=os.getenv("SHARED_CACHE_PATH", str(Path(tempfile.gettempdir()) / "taco_shared_cache.bin")),
+                        help='워커 간 공유 캐시 파일 경로')
+    parser.add_argument('--uvicorn', action='store_true', help='gunicorn 대신 uvicorn 멀티 워커로 실행')
+    args = parser.parse_args()
+
+    # database.py의 DB 경로가 backend 기준 상대 경로
+    os.chdir(backend_dir)
+    print(f"🌮 TACO Trading API 운영 서버 시작 (워커 {args.workers}개)...")
+    prepare(args.shared_cache)
+
+    try:
+        import gunicorn  # noqa: F401
+        use_gunicorn = not args.uvicorn
+    except ImportError:
+        use_gunicorn = False
+
+    if use_gunicorn:
+        run_gunicorn(args.host, args.port, args.workers, args.pidfile)
+    else:
+        run_uvicorn(args.host, args.port, args.workers)
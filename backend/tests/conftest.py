@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.database import Base
+from app import model  # noqa: F401 (테이블 등록)
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """테스트마다 새 SQLite 파일 DB (운영 DB는 건드리지 않음)"""
+    engine = create_engine(f"sqlite:///{tmp_path}/test.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.alerts import AlertSubscriberIn, create_subscriber, deactivate_subscriber, validate_target, ADMIN_TOKEN_ENV
+from app.database import get_db
+from app.model import AlertOutbox
+
+@pytest.mark.parametrize("kind,target", [
+    ("webhook", "http://hooks.example.com/taco"),
+    ("webhook", "https://hooks.example.com:8443/taco"),
+    ("socket", "tcp:hooks.example.com:9000"),
+    ("socket", "unix:/run/taco/alerts.sock"),
+])
+def test_allowlisted_targets(kind, target):
+    validate_target(kind, target, ["hooks.example.com", "unix:/run/taco"])
+
+@pytest.mark.parametrize("kind,target", [
+    ("webhook", "http://169.254.169.254/latest/meta-data"),
+    ("webhook", "http://localhost:8000/api"),
+    ("socket", "tcp:10.0.0.5:6379"),
+    ("socket", "tcp:127.0.0.1:6379"),
+    ("socket", "unix:/run/taco-evil/x.sock"),
+    ("socket", "unix:/run/taco/../docker.sock"),
+])
+def test_targets_outside_allowlist_rejected(kind, target):
+    with pytest.raises(ValueError):
+        validate_target(kind, target, ["hooks.example.com", "unix:/run/taco"])
+
+@pytest.mark.parametrize("kind,target", [
+    ("webhook", "file:///etc/passwd"),
+    ("webhook", "gopher://127.0.0.1:25/"),
+    ("socket", "tcp:127.0.0.1:notaport"),
+    ("socket", "unix:relative.sock"),
+    ("socket", "udp:127.0.0.1:53"),
+])
+def test_malformed_targets_rejected(kind, target):
+    with pytest.raises(ValueError):
+        validate_target(kind, target, [])
+
+def add_outbox(db, subscriber_id, status):
+    now = datetime.utcnow()
+    db.add(AlertOutbox(subscriber_id=subscriber_id, signal_id=1, payload={}, status=status,
+                       attempts=0, next_attempt_at=now, created_at=now))
+
+def test_deactivate_cancels_pending_alerts(session_factory):
+    db = session_factory()
+    try:
+        subscriber = create_subscriber(db, AlertSubscriberIn(name="desk", target="http://127.0.0.1:9000/hook"))
+        other = create_subscriber(db, AlertSubscriberIn(name="other", target="http://127.0.0.1:9001/hook"))
+        for status in ("pending", "pending", "sending", "delivered"):
+            add_outbox(db, subscriber.id, status)
+        add_outbox(db, other.id, "pending")
+        db.commit()
+
+        assert deactivate_subscriber(db, subscriber) == 2
+        statuses = sorted(status for (status,) in db.query(AlertOutbox.status).filter_by(subscriber_id=subscriber.id))
+        assert statuses == ["cancelled", "cancelled", "delivered", "sending"]
+        assert db.query(AlertOutbox).filter_by(subscriber_id=other.id, status="pending").count() == 1
+        assert not subscriber.is_active
+    finally:
+        db.close()
+
+@pytest.fixture
+def client(session_factory):
+    from app.main import app
+
+    def override_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    app.dependency_overrides[get_db] = override_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def test_subscriber_api_requires_token(client, monkeypatch):
+    body = {"name": "desk", "target": "http://127.0.0.1:9000/hook"}
+    monkeypatch.delenv(ADMIN_TOKEN_ENV, raising=False)
+    assert client.post("/api/alerts/subscribers", json=body).status_code == 403
+
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, "secret")
+    assert client.post("/api/alerts/subscribers", json=body, headers={"X-Alert-Token": "wrong"}).status_code == 403
+    assert client.get("/api/alerts/subscribers").status_code == 403
+    created = client.post("/api/alerts/subscribers", json=body, headers={"X-Alert-Token": "secret"})
+    assert created.status_code == 200
+    removed = client.delete(f"/api/alerts/subscribers/{created.json()['id']}", headers={"X-Alert-Token": "secret"})
+    assert removed.json()["cancelled_alerts"] == 0
+
+def test_subscriber_api_rejects_target_outside_allowlist(client, monkeypatch):
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, "secret")
+    monkeypatch.setenv("ALERT_TARGET_ALLOWLIST", "hooks.example.com")
+    response = client.post("/api/alerts/subscribers", json={"name": "x", "target": "http://169.254.169.254/"},
+                           headers={"X-Alert-Token": "secret"})
+    assert response.status_code == 400
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from app.analysis_queue import PriorityAnalysisQueue
+from app.relevance_filter import RelevanceClassifier
+
+TARIFF = "We will put a 50% tariff on China starting next week, trade deal is off"
+MIDDLE = "The economy is doing great, jobs numbers are strong"
+OTHER = "Happy birthday to a great American patriot"
+
+# 토요일 (NYSE/KRX 모두 휴장, 다음 개장까지 하루 이상)
+SATURDAY = datetime(2025, 6, 7, 12, 0)
+
+def heap_ok(heap) -> bool:
+    return all(heap[(i - 1) // 2].key <= heap[i].key for i in range(1, len(heap)))
+
+def test_cheap_items_do_not_use_up_limit():
+    queue = PriorityAnalysisQueue(RelevanceClassifier())
+    for i in range(100):
+        queue.push(i + 1, f"{OTHER} #{i}", posted_at=SATURDAY - timedelta(days=7), now=SATURDAY)
+    queue.push(1000, TARIFF, posted_at=SATURDAY, now=SATURDAY)
+
+    drained = list(queue.drain(20, now=SATURDAY))
+    assert 1000 in [item.statement_id for item in drained]
+    assert sum(not item.cheap for item in drained) == 1
+    assert len(queue) == 0
+
+def test_limit_counts_only_llm_items():
+    queue = PriorityAnalysisQueue(RelevanceClassifier())
+    for i in range(5):
+        queue.push(i + 1, f"{TARIFF} #{i}", posted_at=SATURDAY, now=SATURDAY)
+    drained = list(queue.drain(3, now=SATURDAY))
+    assert len(drained) == 3
+    assert len(queue) == 2
+
+def test_relevant_fresh_statement_first():
+    queue = PriorityAnalysisQueue(RelevanceClassifier())
+    queue.push(1, MIDDLE, posted_at=SATURDAY - timedelta(days=2), now=SATURDAY)
+    queue.push(2, TARIFF, posted_at=SATURDAY, now=SATURDAY)
+    assert queue.pop(SATURDAY).statement_id == 2
+
+def test_starved_item_is_served():
+    queue = PriorityAnalysisQueue(RelevanceClassifier(), fair_share=2)
+    queue.push(1, MIDDLE, posted_at=SATURDAY - timedelta(days=3), enqueued_at=SATURDAY - timedelta(hours=1), now=SATURDAY)
+    for i in range(5):
+        queue.push(10 + i, f"{TARIFF} #{i}", posted_at=SATURDAY, now=SATURDAY)
+    order = [queue.pop(SATURDAY).statement_id for _ in range(2)]
+    assert order[1] == 1
+    assert queue.metrics.counts["starved"] == 1
+
+def test_requeue_after_starvation_pop_keeps_heap_valid():
+    queue = PriorityAnalysisQueue(RelevanceClassifier(), fair_share=1)
+    queue.push(1, MIDDLE, posted_at=SATURDAY - timedelta(days=3), enqueued_at=SATURDAY - timedelta(hours=1), now=SATURDAY)
+    for i in range(6):
+        queue.push(10 + i, f"{TARIFF} #{i}", posted_at=SATURDAY - timedelta(days=3), now=SATURDAY)
+    item = queue.pop(SATURDAY)
+    assert item.statement_id == 1  # 가장 오래 기다린 발언 (우선순위 힙에는 남아 있음)
+
+    # 장중에 다시 넣으면 세션 점수가 올라 우선순위가 바뀜
+    queue.requeue(item, now=datetime(2025, 6, 9, 15, 0))
+    assert heap_ok(queue._heap)
+    ids = [queue.pop(SATURDAY + timedelta(seconds=1)).statement_id for _ in range(7)]
+    assert sorted(ids) == [1] + [10 + i for i in range(6)]
+    assert queue.pop(SATURDAY) is None
+    assert queue.metrics.counts["retried"] == 1
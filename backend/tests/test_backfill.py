@@ -0,0 +1,45 @@
+from collections import Counter
+from datetime import datetime
+
+from app.backfill import BackfillEngine, FixtureBarProvider
+from app.model import BackfillWatermark, ETFPrice
+
+START, END = datetime(2025, 3, 3), datetime(2025, 3, 8)
+
+def backfill(session_factory, interval):
+    engine = BackfillEngine(FixtureBarProvider(), {"SPY": "S&P 500"}, interval=interval,
+                            workers=1, session_factory=session_factory)
+    return engine.run(START, END)
+
+def price_rows(session_factory):
+    db = session_factory()
+    try:
+        return [(row.timestamp, row.price) for row in db.query(ETFPrice).order_by(ETFPrice.timestamp)]
+    finally:
+        db.close()
+
+def test_backfill_skips_bars_already_covered_by_live_quotes(session_factory):
+    bars = FixtureBarProvider().get_bars("SPY", START, END, "5m")
+    live = bars[10]["timestamp"]
+    db = session_factory()
+    db.add(ETFPrice(symbol="SPY", description="S&P 500", price=500.0, change_percent=0.0, volume=1, timestamp=live))
+    db.commit()
+    db.close()
+
+    backfill(session_factory, "5m")
+    rows = price_rows(session_factory)
+    assert len(rows) == len(bars)
+    assert not [stamp for stamp, count in Counter(stamp for stamp, _ in rows).items() if count > 1]
+    assert (live, 500.0) in rows
+
+def test_daily_backfill_does_not_duplicate_intraday_sessions(session_factory):
+    backfill(session_factory, "5m")
+    intraday = price_rows(session_factory)
+
+    backfill(session_factory, "1d")
+    assert price_rows(session_factory) == intraday
+
+    db = session_factory()
+    mark = db.query(BackfillWatermark).filter_by(interval="1d").one()
+    db.close()
+    assert mark.last_timestamp == FixtureBarProvider().get_bars("SPY", START, END, "1d")[-1]["timestamp"]
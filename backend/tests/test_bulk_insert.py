@@ -0,0 +1,33 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.bulk_insert import bulk_insert_prices, columns_from
+from app.model import ETFPrice
+
+pd = pytest.importorskip("pandas")
+
+def test_datetime64_ns_array_converted_to_datetime():
+    timestamps = np.array(["2026-03-02T14:30:00.000000123", "NaT"], dtype="datetime64[ns]")
+    columns = columns_from({"symbol": np.array(["SPY", "QQQ"]), "price": np.array([500.0, 400.0]),
+                            "timestamp": timestamps})
+    assert columns["timestamp"] == [datetime(2026, 3, 2, 14, 30), None]
+
+def test_bulk_insert_dataframe_values(session_factory):
+    frame = pd.DataFrame({
+        "symbol": ["SPY", "SPY", "FXI"],
+        "price": [500.0, 501.5, 30.2],
+        "timestamp": pd.to_datetime(["2026-03-02 14:30", "2026-03-02 14:35", "2026-03-02 14:35"]).astype("datetime64[ns]"),
+    })
+    db = session_factory()
+    try:
+        data = {name: frame[name].values for name in frame.columns}
+        assert data["timestamp"].dtype == np.dtype("datetime64[ns]")
+        assert bulk_insert_prices(db, data) == 3
+        db.commit()
+        rows = db.query(ETFPrice.symbol, ETFPrice.price, ETFPrice.timestamp).order_by(ETFPrice.id).all()
+        assert [tuple(row) for row in rows[:2]] == [("SPY", 500.0, datetime(2026, 3, 2, 14, 30)),
+                                                    ("SPY", 501.5, datetime(2026, 3, 2, 14, 35))]
+    finally:
+        db.close()
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.columnar_export import SETTLE_AFTER, read_table, sync
+from app.model import TrumpStatement
+
+POSTED = datetime(2026, 3, 2, 14, 30)
+
+def test_statements_exported_only_after_analysis(session_factory, tmp_path):
+    db = session_factory()
+    engine = db.get_bind()
+    out = tmp_path / "parquet"
+    try:
+        db.add_all([
+            TrumpStatement(id=1, original_text="analyzed", posted_at=POSTED, is_analyzed=True, trade_relevance=80),
+            TrumpStatement(id=2, original_text="pending", posted_at=POSTED, is_analyzed=False),
+            TrumpStatement(id=3, original_text="skipped", posted_at=POSTED, is_analyzed=False, trade_relevance=5),
+        ])
+        db.commit()
+
+        result = sync(engine, out, ["trump_statements"])[0]
+        assert (result["exported"], result["watermark"]) == (1, 1)
+
+        # 분석이 끝나면 결과가 채워진 상태로 이어서 내보냄
+        pending = db.get(TrumpStatement, 2)
+        pending.is_analyzed, pending.trade_relevance, pending.korean_translation = True, 70, "번역"
+        db.commit()
+        result = sync(engine, out, ["trump_statements"])[0]
+        assert (result["exported"], result["watermark"]) == (2, 3)
+
+        frame = read_table("trump_statements", out_dir=out).sort_values("id")
+        assert frame["id"].tolist() == [1, 2, 3]
+        assert frame["is_analyzed"].tolist() == [True, True, False]
+        assert frame["korean_translation"].tolist()[1] == "번역"
+    finally:
+        db.close()
+
+def test_stuck_statement_does_not_block_watermark(session_factory, tmp_path):
+    db = session_factory()
+    engine = db.get_bind()
+    out = tmp_path / "parquet"
+    try:
+        created = datetime.utcnow() - SETTLE_AFTER - timedelta(hours=1)
+        db.add_all([
+            TrumpStatement(id=1, original_text="stuck", posted_at=POSTED, created_at=created, is_analyzed=False),
+            TrumpStatement(id=2, original_text="analyzed", posted_at=POSTED, is_analyzed=True, trade_relevance=80),
+        ])
+        db.commit()
+        result = sync(engine, out, ["trump_statements"], chunk_rows=1)[0]
+        assert (result["exported"], result["watermark"]) == (2, 2)
+    finally:
+        db.close()
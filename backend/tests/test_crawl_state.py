@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from app.crawl_state import CrawlStateStore
+from app.model import TrumpStatement
+
+START = datetime(2025, 6, 1, 12, 0)
+
+def make_posts(first: int, last: int):
+    """id first..last 게시글을 피드 순서(최신순)로"""
+    return [
+        {"content": f"post {i}", "timestamp": START + timedelta(minutes=i), "post_id": str(i), "source": "test"}
+        for i in range(last, first - 1, -1)
+    ]
+
+def seed(session_factory, count: int) -> CrawlStateStore:
+    store = CrawlStateStore("test", session_factory)
+    store.flush(make_posts(1, count))
+    store.mark_history_complete()
+    return store
+
+def test_first_crawl_records_bounds(session_factory):
+    store = seed(session_factory, 10)
+    state = CrawlStateStore("test", session_factory).state
+    assert state["newest_posted_at"] == START + timedelta(minutes=10)
+    assert state["newest_post_id"] == "10"
+    assert state["oldest_posted_at"] == START + timedelta(minutes=1)
+    assert state["history_complete"]
+    assert store.state["total_saved"] == 10
+
+def test_interrupted_incremental_crawl_keeps_old_watermark(session_factory):
+    seed(session_factory, 10)
+    # 새 게시글 50개 중 최신 20개만 저장하고 크롤러가 죽음
+    store = CrawlStateStore("test", session_factory)
+    store.flush(make_posts(31, 60))
+    assert store.pending_newest[0] == START + timedelta(minutes=60)
+
+    resumed = CrawlStateStore("test", session_factory)
+    assert resumed.state["newest_posted_at"] == START + timedelta(minutes=10)
+    assert not resumed.is_covered(START + timedelta(minutes=25))
+
+def test_watermark_moves_once_caught_up(session_factory):
+    seed(session_factory, 10)
+    store = CrawlStateStore("test", session_factory)
+    store.flush(make_posts(31, 60))
+    assert store.flush(make_posts(11, 30)) == 20
+    store.mark_caught_up()
+
+    state = CrawlStateStore("test", session_factory).state
+    assert state["newest_posted_at"] == START + timedelta(minutes=60)
+    assert state["newest_post_id"] == "60"
+    db = session_factory()
+    try:
+        assert db.query(TrumpStatement).count() == 60
+    finally:
+        db.close()
+
+def test_flush_caught_up_in_same_transaction(session_factory):
+    seed(session_factory, 10)
+    store = CrawlStateStore("test", session_factory)
+    store.flush(make_posts(11, 15), caught_up=True)
+    assert store.pending_newest is None
+    assert CrawlStateStore("test", session_factory).state["newest_posted_at"] == START + timedelta(minutes=15)
+
+def test_flush_skips_existing_content(session_factory):
+    store = seed(session_factory, 10)
+    assert store.flush(make_posts(5, 12), caught_up=True) == 2
@@ -0,0 +1,70 @@
+import queue
+
+import pytest
+
+from app.driver_pool import DriverPool
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return 1 if script == "return 1" else None
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.alive = False
+
+class FlakyFactory:
+    """fail이 True인 동안 세션 생성 실패"""
+
+    def __init__(self):
+        self.fail = False
+        self.drivers = []
+
+    def __call__(self):
+        if self.fail:
+            raise RuntimeError("chrome failed to start")
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return driver
+
+def test_failed_replace_on_acquire_keeps_pool_size():
+    factory = FlakyFactory()
+    pool = DriverPool(size=1, factory=factory, max_memory_mb=float("inf"))
+    factory.drivers[0].alive = False  # 유휴 중 브라우저가 죽음
+
+    factory.fail = True
+    with pytest.raises(RuntimeError):
+        with pool.acquire(timeout=1):
+            pass
+    assert pool._idle.qsize() == 1
+
+    # 다음 대여에서 다시 교체 시도
+    factory.fail = False
+    with pool.acquire(timeout=1) as session:
+        assert session.is_healthy()
+    assert pool.stats["unhealthy"] == 2
+    assert pool._idle.qsize() == 1
+
+def test_release_recycles_after_max_pages():
+    factory = FlakyFactory()
+    pool = DriverPool(size=1, factory=factory, max_pages=2, max_memory_mb=float("inf"))
+    first = None
+    for _ in range(2):
+        with pool.acquire(timeout=1) as session:
+            first = first or session
+    with pool.acquire(timeout=1) as session:
+        assert session is not first
+    assert pool.stats["recycled"] == 1
+
+def test_acquire_times_out_when_pool_busy():
+    pool = DriverPool(size=1, factory=FlakyFactory(), max_memory_mb=float("inf"))
+    with pool.acquire(timeout=1):
+        with pytest.raises(queue.Empty):
+            with pool.acquire(timeout=0.01):
+                pass
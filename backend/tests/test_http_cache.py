@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.http_cache import CompressionMiddleware, conditional_response
+
+UPDATED = datetime(2026, 3, 2, 14, 30)
+
+def make_client(state: dict) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @app.api_route("/items", methods=["GET", "HEAD"])
+    def items(request: Request, response: Response):
+        not_modified = conditional_response(request, response, UPDATED, *state["validators"])
+        if not_modified:
+            return not_modified
+        return {"items": ["x" * 20] * state["count"]}
+
+    return TestClient(app)
+
+def test_if_modified_since_ignored_when_validators_change():
+    state = {"validators": (1,), "count": 1}
+    client = make_client(state)
+    first = client.get("/items")
+    last_modified = first.headers["last-modified"]
+
+    # 마지막 수정 시각은 같지만 행 수가 바뀜 -> IMS만 보낸 클라이언트도 새 응답을 받아야 함
+    state.update(validators=(2,), count=2)
+    response = client.get("/items", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+
+    # ETag는 그대로 비교
+    etag = response.headers["etag"]
+    assert client.get("/items", headers={"If-None-Match": etag}).status_code == 304
+
+def test_if_modified_since_used_without_validators():
+    client = make_client({"validators": (), "count": 1})
+    last_modified = client.get("/items").headers["last-modified"]
+    assert client.get("/items", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+def test_head_passes_through_compression():
+    client = make_client({"validators": (), "count": 5})
+    get = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert get.headers["content-encoding"] == "gzip"
+    head = client.head("/items", headers={"Accept-Encoding": "gzip"})
+    assert head.status_code == 200
+    assert "content-encoding" not in head.headers
+    assert int(head.headers["content-length"]) == len(client.get("/items", headers={"Accept-Encoding": "identity"}).content)
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+from app.crawl_state import CrawlStateStore
+from app.ingestion import IngestionRunner, NewsAPIConnector, TruthSocialConnector
+
+START = datetime(2025, 6, 1, 12, 0)
+
+class FakeTruthSocial(TruthSocialConnector):
+    """id 1..count 게시글을 Mastodon API처럼 최신순 페이지로 반환"""
+    page_size = 5
+
+    def __init__(self, count: int, **kwargs):
+        super().__init__(**kwargs)
+        self.count = count
+
+    def get(self, path, params=None, allow_status=()):
+        if path.endswith("/lookup"):
+            return {"id": "1"}
+        since_id = int(params.get("since_id") or 0)
+        max_id = int(params.get("max_id") or self.count + 1)
+        ids = [i for i in range(self.count, 0, -1) if since_id < i < max_id][:params["limit"]]
+        return [{"id": str(i), "content": f"<p>post {i}</p>", "created_at": (START + timedelta(minutes=i)).isoformat()}
+                for i in ids]
+
+def watermark(session_factory, source):
+    return CrawlStateStore(source, session_factory).state["newest_post_id"]
+
+def test_watermark_held_until_connector_reaches_it(session_factory):
+    connector = FakeTruthSocial(4, max_pages=2)
+    runner = IngestionRunner([connector], session_factory)
+    assert runner.poll(connector) == 4
+    assert watermark(session_factory, connector.source) == "4"
+
+    # 새 게시글 20개 중 max_pages(2) x 5개만 받음 -> 워터마크를 옮기지 않음
+    connector.count = 24
+    assert runner.poll(connector) == 10
+    assert watermark(session_factory, connector.source) == "4"
+
+    # 페이지 한도를 늘려 이전 워터마크까지 받으면 최신 경계 기록
+    connector.max_pages = 10
+    assert runner.poll(connector) == 10
+    assert watermark(session_factory, connector.source) == "24"
+
+class FakeNewsAPI(NewsAPIConnector):
+    def __init__(self, pages, **kwargs):
+        super().__init__("key", **kwargs)
+        self.pages = pages
+
+    def get(self, path, params=None, allow_status=()):
+        return self.pages[params["page"] - 1]
+
+def article(minutes: int) -> dict:
+    return {"description": f"article {minutes}", "source": {"name": "Test"},
+            "publishedAt": f"{(START + timedelta(minutes=minutes)).isoformat()}Z"}
+
+def test_newsapi_result_limit_is_not_caught_up():
+    full = [{"status": "ok", "totalResults": 2, "articles": [article(2), article(1)]}]
+    assert FakeNewsAPI(full).fetch({})[1]
+
+    limited = [{"status": "ok", "totalResults": 300, "articles": [article(3)] * 100},
+               {"status": "error", "code": "maximumResultsReached", "message": "limit"}]
+    posts, caught_up = FakeNewsAPI(limited).fetch({})
+    assert len(posts) == 100 and not caught_up
@@ -0,0 +1,23 @@
+import logging
+from datetime import date, time
+
+from app import market_calendar
+from app.market_calendar import ExchangeCalendar, NYSE
+
+def test_known_holiday_is_not_trading_day():
+    assert not NYSE.is_trading_day(date(2026, 12, 25))
+    assert NYSE.is_trading_day(date(2026, 12, 24))
+
+def test_warns_once_per_year_past_holiday_table(caplog):
+    calendar = ExchangeCalendar("TEST", "UTC", time(9), time(16), {date(2026, 1, 1)})
+    with caplog.at_level(logging.WARNING, logger=market_calendar.__name__):
+        assert calendar.is_trading_day(date(2026, 12, 31))
+        assert not caplog.records
+
+        calendar.is_trading_day(date(2027, 1, 1))
+        calendar.is_trading_day(date(2027, 7, 5))
+        assert len(caplog.records) == 1
+        assert "2026-12-31" in caplog.records[0].getMessage()
+
+        calendar.is_trading_day(date(2028, 1, 3))
+        assert len(caplog.records) == 2
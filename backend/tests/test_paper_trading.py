@@ -0,0 +1,28 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.paper_trading import PaperPortfolio, load_signal_pnl
+
+NOW = datetime(2025, 6, 10, 14, 0)
+
+def make_signal(signal_id, signal_type, etfs, confidence=80):
+    return SimpleNamespace(id=signal_id, signal_type=signal_type, confidence=confidence, created_at=NOW,
+                           expected_duration=24, affected_etfs=etfs)
+
+def test_saved_trades_match_live_signal_pnl(session_factory):
+    portfolio = PaperPortfolio(session_factory=session_factory)
+    portfolio.on_quotes([{"symbol": "SPY", "price": 500.0}, {"symbol": "FXI", "price": 30.0}])
+    portfolio.add_signal(make_signal(1, "BUY", [{"symbol": "SPY", "direction": "up", "impact": 0.8}]))
+    portfolio.add_signal(make_signal(2, "SELL", [{"symbol": "FXI", "direction": "down", "impact": 0.5},
+                                                 {"symbol": "SPY", "direction": "down", "impact": 0.3}]))
+    portfolio.on_quotes([{"symbol": "SPY", "price": 510.0}, {"symbol": "FXI", "price": 29.0}])
+    portfolio.snapshot()
+
+    db = session_factory()
+    try:
+        assert len(portfolio.signal_pnl()) == 2
+        assert load_signal_pnl(db) == portfolio.signal_pnl()
+        assert load_signal_pnl(db, 2) == portfolio.signal_pnl(2)
+        assert load_signal_pnl(db, 99) == {}
+    finally:
+        db.close()
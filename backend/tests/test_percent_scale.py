@@ -0,0 +1,41 @@
+import pytest
+
+from app import database
+from app.alerts import matches
+from app.model import TACOSignal, TrumpStatement, percent_to_ratio
+
+def test_percent_to_ratio_uses_one_scale():
+    assert percent_to_ratio(None) == 0.0
+    assert percent_to_ratio(0) == 0.0
+    assert percent_to_ratio(1) == pytest.approx(0.01)
+    assert percent_to_ratio(72) == pytest.approx(0.72)
+    assert percent_to_ratio(100) == pytest.approx(1.0)
+
+def test_low_confidence_does_not_pass_subscriber_threshold():
+    subscriber = {"signal_types": None, "symbols": None, "min_confidence": 50}
+    assert not matches(subscriber, "BUY", 1, {"SPY"})
+    assert matches(subscriber, "BUY", 50, {"SPY"})
+
+def test_migrate_db_rescales_legacy_ratios_once(session_factory, monkeypatch):
+    db = session_factory()
+    db.add(TrumpStatement(id=1, original_text="legacy", trade_relevance=0.9, taco_probability=1.0))
+    db.add(TACOSignal(id=1, statement_id=1, signal_type="BUY", confidence=0.75))
+    db.commit()
+    engine = db.get_bind()
+    monkeypatch.setattr(database, "engine", engine)
+
+    database.migrate_db()
+    db.expire_all()
+    statement = db.get(TrumpStatement, 1)
+    assert statement.trade_relevance == pytest.approx(90)
+    assert statement.taco_probability == pytest.approx(100)
+    assert db.get(TACOSignal, 1).confidence == pytest.approx(75)
+
+    # 보정 이후 LLM이 1(%)로 답한 값은 다시 보정하지 않음
+    db.add(TACOSignal(id=2, statement_id=1, signal_type="SELL", confidence=1))
+    db.commit()
+    database.migrate_db()
+    db.expire_all()
+    assert db.get(TACOSignal, 2).confidence == 1
+    assert db.get(TACOSignal, 1).confidence == pytest.approx(75)
+    db.close()
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from app.model import ETFPrice, StatementReaction, TACOSignal, TrumpStatement
+from app.price_reaction import update_reactions
+
+NOW = datetime(2026, 3, 20, 12, 0)
+POSTED = datetime(2026, 3, 2, 15, 0)  # 월요일 장중 (UTC)
+
+def add_prices(db, symbol):
+    at = POSTED - timedelta(hours=1)
+    price = 100.0
+    while at < POSTED + timedelta(days=6):
+        db.add(ETFPrice(symbol=symbol, price=price, timestamp=at))
+        at += timedelta(minutes=5)
+        price += 0.01
+
+def reactions(db):
+    return sorted((row.symbol, row.complete) for row in db.query(StatementReaction).all())
+
+def test_signal_added_after_benchmark_reaction_is_computed(session_factory):
+    db = session_factory()
+    try:
+        add_prices(db, "SPY")
+        add_prices(db, "FXI")
+        statement = TrumpStatement(original_text="tariffs on China", posted_at=POSTED, is_analyzed=False)
+        db.add(statement)
+        db.commit()
+
+        # 분석 전에는 기준 지수만 계산되고 모든 창이 지나 완료 처리
+        assert update_reactions(db, now=NOW)["statements"] == 1
+        assert reactions(db) == [("SPY", True)]
+        assert update_reactions(db, now=NOW)["statements"] == 0
+
+        db.add(TACOSignal(statement_id=statement.id, signal_type="SELL", confidence=80,
+                          affected_etfs=[{"symbol": "FXI", "direction": "down", "impact": 0.7}]))
+        db.commit()
+        assert update_reactions(db, now=NOW)["statements"] == 1
+        assert reactions(db) == [("FXI", True), ("SPY", True)]
+        assert update_reactions(db, now=NOW)["statements"] == 0
+    finally:
+        db.close()
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from app.price_series import downsample, lttb, minmax
+
+def reference_lttb(x, y, budget):
+    """점 단위 반복으로 구현한 LTTB (같은 버킷 경계)"""
+    n = len(x)
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    selected, a = [0], 0
+    for i in range(budget - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < budget - 2:
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((x[a] - cx) * (y[j] - y[a]) - (x[a] - x[j]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return np.array(selected)
+
+@pytest.fixture
+def walk():
+    rng = np.random.default_rng(7)
+    y = 100 + np.cumsum(rng.normal(size=5000))
+    x = np.cumsum(rng.uniform(0.5, 2.0, size=5000))
+    return x, y
+
+@pytest.mark.parametrize("budget", [3, 4, 50, 333, 4999])
+def test_lttb_matches_reference(walk, budget):
+    x, y = walk
+    np.testing.assert_array_equal(lttb(x, y, budget), reference_lttb(x, y, budget))
+
+def test_lttb_keeps_endpoints_in_order(walk):
+    x, y = walk
+    picked = lttb(x, y, 200)
+    assert len(picked) == 200
+    assert picked[0] == 0 and picked[-1] == len(x) - 1
+    assert np.all(np.diff(picked) > 0)
+
+@pytest.mark.parametrize("budget", [0, 2, 10, 11])
+def test_small_budget_or_short_series_returned_whole(budget):
+    y = np.arange(10, dtype=np.float64)
+    np.testing.assert_array_equal(lttb(y, y, budget), np.arange(10))
+
+def test_minmax_keeps_extremes_within_budget(walk):
+    _, y = walk
+    for budget in (4, 5, 100, 1001):
+        picked = minmax(y, budget)
+        assert len(picked) <= budget
+        assert np.all(np.diff(picked) > 0)
+        assert {0, len(y) - 1, int(y.argmin()), int(y.argmax())} <= set(picked.tolist())
+
+def test_minmax_uneven_last_bucket():
+    y = np.array([5.0, 1.0, 9.0, 3.0, 7.0, 0.0, 8.0])
+    picked = minmax(y, 6)
+    assert {0, 6, 2, 5} <= set(picked.tolist())
+    assert len(picked) <= 6
+
+def test_downsample_uses_time_axis():
+    timestamps = np.array(["2026-01-01T00:00", "2026-01-01T00:01", "2026-01-01T00:02", "2026-01-01T09:00",
+                           "2026-01-01T09:01"], dtype="datetime64[ms]")
+    prices = np.array([1.0, 1.0, 5.0, 1.0, 1.0])
+    assert downsample(timestamps, prices, 3).tolist() == [0, 2, 4]
+    assert downsample(timestamps[:0], prices[:0], 3).tolist() == []
@@ -0,0 +1,59 @@
+import queue
+
+from app import replay
+from app.replay import ReplayHarness
+
+class FakeResponse:
+    def __init__(self, signals):
+        self.signals = signals
+
+    def json(self):
+        return {"signals": self.signals}
+
+class FakeClient:
+    """visible_after번째 조회부터 signal_ids가 응답에 보임"""
+
+    def __init__(self, signal_ids, visible_after):
+        self.signal_ids = signal_ids
+        self.visible_after = visible_after
+        self.calls = []
+
+    def get(self, path, params=None):
+        self.calls.append(params)
+        visible = len(self.calls) >= self.visible_after
+        return FakeResponse([{"id": sid} for sid in self.signal_ids] if visible else [])
+
+def run_api_stage(harness, client, item):
+    inbox = queue.Queue()
+    inbox.put(item)
+    inbox.put(None)
+    harness._api_stage(client, inbox)
+
+def test_api_latency_recorded_only_when_signal_seen(monkeypatch):
+    monkeypatch.setattr(replay, "API_TIMEOUT", 0.05)
+    sleeps = []
+    monkeypatch.setattr(replay.time, "sleep", sleeps.append)
+    harness = ReplayHarness([])
+
+    seen = {"signal_id": 1, "arrival": 0.0, "crawl": 0.0, "analyze": 0.0, "signal": 0.0}
+    run_api_stage(harness, FakeClient([1], visible_after=3), seen)
+    assert "api" in seen
+    assert sleeps == [replay.API_POLL_MIN, replay.API_POLL_MIN * 2]
+
+    missing = {"signal_id": 2, "arrival": 0.0, "crawl": 0.0, "analyze": 0.0, "signal": 0.0}
+    run_api_stage(harness, FakeClient([1], visible_after=1), missing)
+    assert "api" not in missing
+    assert harness.api_misses == 1
+
+    harness.items = [seen, missing]
+    result = harness.report(0.0)
+    assert result["signals"] == 1
+    assert result["api_misses"] == 1
+    assert result["stages"]["signal"]["count"] == 2
+
+def test_api_poll_window_covers_all_replayed_posts():
+    harness = ReplayHarness([])
+    harness.items = [{} for _ in range(replay.API_POLL_LIMIT * 3)]
+    client = FakeClient([7], visible_after=1)
+    run_api_stage(harness, client, {"signal_id": 7})
+    assert client.calls == [{"limit": replay.API_POLL_LIMIT * 3}]
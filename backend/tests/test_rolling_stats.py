@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.rolling_stats import RollingWindow
+
+SYMBOLS = ["SPY", "QQQ", "069500.KS", "229200.KS"]
+
+def make_prices(bars: int, seed: int = 0) -> pd.DataFrame:
+    """미국 종목은 짝수 시간대, KRX 종목은 일부 시간대에만 가격이 있는 긴 형식 테이블"""
+    rng = np.random.default_rng(seed)
+    factor = rng.normal(0, 0.004, bars)[:, None]
+    returns = factor * rng.uniform(0.5, 1.5, len(SYMBOLS)) + rng.normal(0, 0.003, (bars, len(SYMBOLS)))
+    prices = 100 * np.cumprod(1 + returns, axis=0)
+    start = datetime(2024, 1, 2)
+    rows = []
+    for t in range(bars):
+        us_open, krx_open = t % 24 < 14, t % 24 >= 10
+        for j, symbol in enumerate(SYMBOLS):
+            if (krx_open if symbol.endswith(".KS") else us_open):
+                rows.append((start + timedelta(hours=t), symbol, prices[t, j]))
+    return pd.DataFrame(rows, columns=["timestamp", "symbol", "price"])
+
+def feed(table: pd.DataFrame, size: int) -> RollingWindow:
+    window = RollingWindow(SYMBOLS, bar_seconds=3600, size=size)
+    for row in table.itertuples(index=False):
+        window.add_price(row.symbol, row.price, row.timestamp.to_pydatetime())
+    return window
+
+def pandas_stats(table: pd.DataFrame, size: int):
+    wide = table.pivot(index="timestamp", columns="symbol", values="price")[SYMBOLS]
+    # 형성 중인 마지막 봉은 닫히지 않았으므로 제외
+    returns = wide.iloc[:-1].pct_change(fill_method=None).iloc[1:].tail(size)
+    return returns.corr(), returns.std()
+
+def test_matches_pandas_pairwise_complete_stats_with_closed_markets():
+    table = make_prices(500)
+    window = feed(table, size=120)
+    expected_corr, expected_std = pandas_stats(table, 120)
+
+    np.testing.assert_allclose(window.correlation(), expected_corr.values, atol=1e-9)
+    np.testing.assert_allclose(window.volatility(), expected_std.values, atol=1e-12)
+    assert (window.volatility() > 0.003).all()
+
+def test_incremental_sums_survive_resync():
+    table = make_prices(300, seed=3)
+    window = feed(table, size=50)
+    corr, std = window.correlation(), window.volatility()
+    window.resync()
+    np.testing.assert_allclose(window.correlation(), corr, atol=1e-12)
+    np.testing.assert_allclose(window.volatility(), std, atol=1e-15)
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.model import TrumpStatement
+from app.search import init_search_index
+
+@pytest.fixture
+def client(session_factory):
+    from app.main import app
+
+    db = session_factory()
+    init_search_index(db.get_bind())
+    for i in range(30):
+        db.add(TrumpStatement(original_text=f"tariff statement {i}", source="truth_social", posted_at=datetime(2025, 4, 1, i % 24)))
+    db.commit()
+    db.close()
+
+    def override_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    app.dependency_overrides[get_db] = override_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def test_search_pages_results(client):
+    page = client.get("/api/search", params={"q": "tariff", "limit": 10, "offset": 25}).json()
+    assert page["total"] == 30
+    assert len(page["results"]) == 5
+
+@pytest.mark.parametrize("params", [{"limit": -1}, {"limit": 0}, {"limit": 101}, {"offset": -1}])
+def test_search_rejects_unbounded_paging(client, params):
+    assert client.get("/api/search", params={"q": "tariff", **params}).status_code == 422
+
+@pytest.mark.parametrize("path", ["/api/latest-signals", "/api/trump-feed", "/api/etfs/SPY/signals"])
+def test_list_endpoints_clamp_limit(client, path):
+    assert client.get(path, params={"limit": -1}).status_code == 422
+    assert client.get(path, params={"limit": 1000}).status_code == 422
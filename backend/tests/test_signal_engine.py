@@ -0,0 +1,36 @@
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.signal_engine import SignalDecayEngine
+
+NOW = datetime(2025, 6, 10, 14, 0)
+IMPACTS = [{"symbol": "SPY", "direction": "up", "impact": 0.5}]
+
+def make_engine(session_factory, half_life_hours):
+    engine = SignalDecayEngine(half_life_hours=half_life_hours, session_factory=session_factory)
+    engine.epoch = NOW
+    return engine
+
+@pytest.mark.parametrize("half_life_hours", [0.01, 0.5, 12.0])
+def test_short_half_life_does_not_overflow(session_factory, half_life_hours):
+    engine = make_engine(session_factory, half_life_hours)
+    engine.add_signal(1, NOW, 100, 24 * 365, IMPACTS)
+    later = NOW + timedelta(days=30)
+    assert engine.exposure(now=later)["SPY"]["net_exposure"] == pytest.approx(0.0, abs=1e-6)
+    assert engine.refresh(now=later)["active"] == 1
+    assert engine.epoch == later
+
+def test_exposure_unchanged_by_rebase(session_factory):
+    engine = make_engine(session_factory, 0.5)
+    engine.add_signal(1, NOW, 100, 24, IMPACTS)
+    at = NOW + timedelta(hours=1)
+    expected = 0.5 * math.exp(-math.log(2) / 1800 * 3600)
+    assert engine.exposure(now=at)["SPY"]["net_exposure"] == pytest.approx(expected)
+
+    # 재기준화 이후 추가한 신호도 같은 감쇠
+    engine.refresh(now=NOW + engine.rebase_after + timedelta(seconds=1))
+    rebased_at = engine.epoch
+    engine.add_signal(2, rebased_at, 100, 24, IMPACTS)
+    assert engine.exposure(now=rebased_at + timedelta(hours=1))["SPY"]["net_exposure"] == pytest.approx(expected, rel=1e-6)
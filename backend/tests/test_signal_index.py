@@ -0,0 +1,30 @@
+from app.model import TACOSignal, SignalETFImpact
+
+def impacts(db, signal_id):
+    rows = db.query(SignalETFImpact).filter_by(signal_id=signal_id).order_by(SignalETFImpact.symbol)
+    return [(row.symbol, row.direction) for row in rows]
+
+def test_index_follows_signal_updates_and_deletes(session_factory):
+    db = session_factory()
+    try:
+        signal = TACOSignal(statement_id=1, signal_type="BUY", confidence=80, affected_etfs=["SPY", "QQQ"])
+        other = TACOSignal(statement_id=2, signal_type="SELL", confidence=60, affected_etfs=["SPY"])
+        db.add_all([signal, other])
+        db.commit()
+        assert impacts(db, signal.id) == [("QQQ", "up"), ("SPY", "up")]
+
+        signal.confidence = 70
+        db.commit()
+        assert impacts(db, signal.id) == [("QQQ", "up"), ("SPY", "up")]
+
+        signal.affected_etfs = ["SOXX"]
+        signal.signal_type = "SELL"
+        db.commit()
+        assert impacts(db, signal.id) == [("SOXX", "down")]
+
+        db.delete(signal)
+        db.commit()
+        assert db.query(SignalETFImpact).filter(SignalETFImpact.signal_id != other.id).count() == 0
+        assert impacts(db, other.id) == [("SPY", "down")]
+    finally:
+        db.close()
@@ -0,0 +1,58 @@
+import gzip
+from pathlib import Path
+
+import orjson
+import pytest
+
+from app import http_cache
+from app.snapshot_publisher import MANIFEST_NAME, resolve_snapshot_file
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    manifest = {"version": "v1", "files": {"latest-signals": {
+        "path": "versions/v1/latest-signals.json", "sha256": "abc", "bytes": 2, "encodings": ["gzip", "br"],
+    }}}
+    (tmp_path / MANIFEST_NAME).write_bytes(orjson.dumps(manifest))
+    return tmp_path
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("br;q=0, gzip;q=0", None),
+    ("identity", None),
+])
+def test_resolve_snapshot_file_respects_q_zero(snapshot_dir, accept_encoding, expected):
+    path, encoding, digest = resolve_snapshot_file("latest-signals", accept_encoding, snapshot_dir)
+    assert encoding == expected
+    suffix = {"br": ".br", "gzip": ".gz", None: ""}[expected]
+    assert path == Path(f"{snapshot_dir}/versions/v1/latest-signals.json{suffix}")
+    assert digest == "abc"
+
+def test_choose_encoding_limited_to_available():
+    assert http_cache.choose_encoding("br, gzip", ["gzip"]) == "gzip"
+    assert http_cache.choose_encoding("br", ["gzip"]) is None
+
+def test_snapshot_etag_differs_per_encoding(snapshot_dir, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import main, snapshot_publisher
+
+    version_dir = snapshot_dir / "versions" / "v1"
+    version_dir.mkdir(parents=True)
+    brotli = pytest.importorskip("brotli")
+    (version_dir / "latest-signals.json").write_bytes(b"{}")
+    (version_dir / "latest-signals.json.gz").write_bytes(gzip.compress(b"{}"))
+    (version_dir / "latest-signals.json.br").write_bytes(brotli.compress(b"{}"))
+    monkeypatch.setattr(main, "resolve_snapshot_file", lambda name, accept_encoding: snapshot_publisher.resolve_snapshot_file(
+        name, accept_encoding, snapshot_dir))
+    client = TestClient(main.app)
+
+    tags = {encoding: client.get("/snapshots/latest-signals.json", headers={"Accept-Encoding": encoding}).headers["etag"]
+            for encoding in ("br", "gzip", "identity")}
+    assert len(set(tags.values())) == 3
+
+    # 다른 인코딩의 ETag로는 304를 받지 않음
+    response = client.get("/snapshots/latest-signals.json", headers={"Accept-Encoding": "gzip", "If-None-Match": tags["br"]})
+    assert response.status_code == 200
+    response = client.get("/snapshots/latest-signals.json", headers={"Accept-Encoding": "gzip", "If-None-Match": tags["gzip"]})
+    assert response.status_code == 304
@@ -0,0 +1,74 @@
+import json
+import random
+
+from app.stream_json import IncrementalJSONParser
+
+ANALYSIS = {
+    "signal_type": "SELL",
+    "taco_probability": 72.5,
+    "affected_etfs": [{"symbol": "FXI", "direction": "down", "impact": 0.7}],
+    "trade_relevance": 90,
+    "sentiment_score": -0.6,
+    "key_points": ["중국 \"50%\" 관세 {예고}", "무역 협상 중단, [재개 미정]", "역슬래시 \\ 포함"],
+    "is_final": True,
+    "note": None,
+}
+
+def feed_all(parser, chunks):
+    out = []
+    for chunk in chunks:
+        out.extend(parser.feed(chunk))
+    return out
+
+def test_whole_document():
+    parser = IncrementalJSONParser()
+    out = parser.feed(json.dumps(ANALYSIS, ensure_ascii=False))
+    assert [key for key, _ in out] == list(ANALYSIS)
+    assert parser.fields == ANALYSIS
+
+def test_random_chunking_matches_json_loads():
+    raw = json.dumps(ANALYSIS, ensure_ascii=False, indent=4)
+    rng = random.Random(0)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(raw)), rng.randint(1, 40)))
+        chunks = [raw[a:b] for a, b in zip([0] + cuts, cuts + [len(raw)])]
+        parser = IncrementalJSONParser()
+        assert dict(feed_all(parser, chunks)) == ANALYSIS
+
+def test_single_characters_with_escapes():
+    parser = IncrementalJSONParser()
+    raw = json.dumps({"text": "say \"hi\" \\ {not nested} [x]", "n": 1})
+    assert feed_all(parser, list(raw)) == [("text", "say \"hi\" \\ {not nested} [x]"), ("n", 1)]
+
+def test_nested_value_emitted_when_closed():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"etfs": [{"symbol": "SPY", "tags": ["a", "b"]}') == []
+    assert parser.feed(', {"symbol": "QQQ"}]') == [("etfs", [{"symbol": "SPY", "tags": ["a", "b"]}, {"symbol": "QQQ"}])]
+
+def test_signal_fields_emitted_before_document_ends():
+    raw = json.dumps(ANALYSIS, ensure_ascii=False)
+    cut = raw.index('"trade_relevance"')
+    parser = IncrementalJSONParser()
+    out = parser.feed(raw[:cut])
+    assert [key for key, _ in out] == ["signal_type", "taco_probability", "affected_etfs"]
+
+def test_scalar_waits_for_delimiter():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"taco_probability": 7') == []
+    assert parser.feed('5, "x": true}') == [("taco_probability", 75), ("x", True)]
+
+def test_partial_stream_keeps_only_complete_fields():
+    parser = IncrementalJSONParser()
+    parser.feed('{"signal_type": "BUY", "affected_etfs": [{"symbol": "SP')
+    assert parser.fields == {"signal_type": "BUY"}
+    assert not parser.done
+
+def test_ignores_fence_and_trailing_text():
+    parser = IncrementalJSONParser()
+    out = feed_all(parser, ["```json\n{", '"a": 1', "}\n```", '{"b": 2}'])
+    assert out == [("a", 1)]
+    assert parser.done
+
+def test_invalid_value_is_skipped():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"a": nope, "b": 2}') == [("b", 2)]
@@ -0,0 +1,188 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+
+from app.model import TrumpStatement, TACOSignal
+from app.relevance_filter import RelevanceClassifier
+from app.trump_analyzer import TrumpAnalyzer
+
+TARIFF = "We will put a 50% tariff on China starting next week, trade deal is off"
+
+ANALYSIS = {
+    "signal_type": "SELL",
+    "taco_probability": 72,
+    "affected_etfs": [{"symbol": "FXI", "direction": "down", "impact": 0.7}],
+    "trade_relevance": 90,
+    "sentiment_score": -0.6,
+    "key_points": ["중국산 제품 50% 관세 예고", "무역 협상 중단"],
+}
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    """로컬 OpenAI Chat Completions 스텁 (stream=True면 SSE, drop_after개 조각 뒤 연결을 끊을 수 있음)"""
+    protocol_version = "HTTP/1.1"
+    drop_after = None
+    translate_delay = 0.0
+    requests = []
+
+    def reply(self, body):
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        FakeOpenAI.requests.append(request)
+        base = {"id": "chatcmpl-test", "created": 0, "model": request["model"]}
+        if "번역" in request["messages"][0]["content"]:
+            time.sleep(self.translate_delay)
+            return self.reply({**base, "object": "chat.completion", "choices": [
+                {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "[번역]"}}]})
+
+        raw = json.dumps(ANALYSIS, ensure_ascii=False)
+        chunks = [raw[i:i + 5] for i in range(0, len(raw), 5)]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(payload):
+            data = f"data: {payload}\n\n".encode()
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        for i, chunk in enumerate(chunks):
+            if self.drop_after is not None and i >= self.drop_after:
+                self.close_connection = True
+                return  # 종료 청크 없이 끊음
+            send(json.dumps({**base, "object": "chat.completion.chunk",
+                             "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]}))
+        send("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    FakeOpenAI.drop_after = None
+    FakeOpenAI.translate_delay = 0.0
+    FakeOpenAI.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(openai, "api_base", f"http://127.0.0.1:{server.server_port}/v1")
+    yield FakeOpenAI
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def analyzer(fake_openai):
+    analyzer = TrumpAnalyzer("test-key", relevance_filter=RelevanceClassifier())
+    analyzer.request_interval = 0
+    analyzer.streaming = True
+    return analyzer
+
+def add_statement(db, text=TARIFF) -> TrumpStatement:
+    statement = TrumpStatement(original_text=text, source="test", is_analyzed=False)
+    db.add(statement)
+    db.commit()
+    return statement
+
+def test_stream_analysis_yields_fields_in_order(analyzer, fake_openai):
+    fields = list(analyzer.stream_analysis(TARIFF))
+    assert dict(fields) == ANALYSIS
+    assert [key for key, _ in fields][:3] == ["signal_type", "taco_probability", "affected_etfs"]
+    assert fake_openai.requests[0]["stream"] is True
+
+def test_streaming_stores_signal_then_details(analyzer, session_factory):
+    db = session_factory()
+    try:
+        statement = add_statement(db)
+        signal = analyzer.analyze_statement_streaming(statement, db)
+        db.commit()
+
+        assert signal.signal_type == "SELL"
+        assert signal.confidence == 72
+        assert signal.affected_etfs == ANALYSIS["affected_etfs"]
+        db.refresh(statement)
+        assert statement.is_analyzed
+        assert statement.keywords == ANALYSIS["key_points"]
+        assert statement.trade_relevance == 90
+        assert statement.korean_translation == "[번역]"
+    finally:
+        db.close()
+
+def test_dropped_stream_before_signal_fields_is_retried(analyzer, fake_openai, session_factory):
+    fake_openai.drop_after = 5  # affected_etfs 도착 전
+    db = session_factory()
+    try:
+        statement = add_statement(db)
+        assert analyzer.analyze_statement_streaming(statement, db) is None
+        db.commit()
+        db.refresh(statement)
+        assert not statement.is_analyzed
+        assert statement.trade_relevance is None
+        assert db.query(TACOSignal).count() == 0
+
+        # 다음 회차에서 다시 분석
+        assert analyzer.analyze_pending(db, limit=5) == 0
+        assert len(analyzer.queue) == 1
+        fake_openai.drop_after = None
+        assert analyzer.analyze_pending(db, limit=5) == 1
+        assert db.query(TACOSignal).filter_by(statement_id=statement.id).count() == 1
+    finally:
+        db.close()
+
+def test_stream_dropped_after_signal_leaves_missing_details_empty(analyzer, fake_openai, session_factory):
+    raw = json.dumps(ANALYSIS, ensure_ascii=False)
+    fake_openai.drop_after = raw.index('"trade_relevance"') // 5 + 1  # 신호 필드 이후, trade_relevance 값 전
+    db = session_factory()
+    try:
+        statement = add_statement(db)
+        signal = analyzer.analyze_statement_streaming(statement, db)
+        db.commit()
+        assert signal.signal_type == "SELL"
+        db.refresh(statement)
+        assert statement.is_analyzed
+        # 받지 못한 필드는 0/빈 값이 아니라 NULL (관련성 학습 레이블에서 제외)
+        assert statement.trade_relevance is None
+        assert statement.sentiment_score is None
+        assert statement.keywords is None
+    finally:
+        db.close()
+
+def test_failed_stream_does_not_wait_for_translation(analyzer, fake_openai, session_factory):
+    fake_openai.drop_after = 5
+    fake_openai.translate_delay = 2.0
+    db = session_factory()
+    try:
+        statement = add_statement(db)
+        started = time.perf_counter()
+        assert analyzer.analyze_statement_streaming(statement, db) is None
+        assert time.perf_counter() - started < 1.0
+    finally:
+        db.close()
+
+def test_commit_error_is_not_swallowed(analyzer, session_factory, monkeypatch):
+    db = session_factory()
+    try:
+        statement = add_statement(db)
+
+        commits = []
+        def broken_commit():
+            commits.append(1)
+            raise RuntimeError("database is locked")
+        monkeypatch.setattr(db, "commit", broken_commit)
+        # 신호 커밋 실패는 GPT 오류로 삼키지 않고 실패한 세션에 더 쓰지 않은 채 호출자에게 전달
+        with pytest.raises(RuntimeError):
+            analyzer.analyze_statement_streaming(statement, db)
+        assert len(commits) == 1
+    finally:
+        db.rollback()
+        db.close()
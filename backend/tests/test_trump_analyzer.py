@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.model import TrumpStatement, TACOSignal
+from app.replay import create_stub_analyzer
+
+TARIFF = "We will put a 50% tariff on China starting next week, trade deal is off"
+OTHER = "Happy birthday to a great American patriot"
+
+def article(text: str, published: str = "2025-06-10T13:00:00Z") -> dict:
+    return {"description": text, "source": {"name": "Test News"}, "publishedAt": published}
+
+def test_save_to_db_analyzes_through_queue(session_factory):
+    analyzer = create_stub_analyzer()
+    db = session_factory()
+    try:
+        articles = [article(f"{OTHER} #{i}", "2025-06-01T00:00:00Z") for i in range(30)] + [article(TARIFF)]
+        analyzer.save_to_db(articles, db)
+
+        statement = db.query(TrumpStatement).filter_by(original_text=TARIFF).one()
+        assert statement.is_analyzed
+        assert db.query(TACOSignal).filter_by(statement_id=statement.id).count() == 1
+        # 걸러진 기사도 관련성 점수와 함께 저장되고 LLM 분석은 생략
+        skipped = db.query(TrumpStatement).filter(TrumpStatement.original_text != TARIFF).all()
+        assert len(skipped) == 30
+        assert all(not row.is_analyzed and row.trade_relevance is not None for row in skipped)
+        assert len(analyzer.queue) == 0
+    finally:
+        db.close()
+
+def test_repost_reuses_cluster_analysis(session_factory):
+    analyzer = create_stub_analyzer()
+    db = session_factory()
+    try:
+        db.add(TrumpStatement(original_text=TARIFF, source="Truth Social", is_analyzed=False))
+        db.commit()
+        assert analyzer.analyze_pending(db) == 1
+
+        # 크롤러/수집기가 저장한 재게시 변형은 LLM 호출과 신호 없이 대표 분석을 복사
+        repost = TrumpStatement(original_text=f"{TARIFF.upper()}!!", source="X", is_analyzed=False)
+        db.add(repost)
+        db.commit()
+        analyzer.analyze_with_gpt = lambda text: pytest.fail("유사중복 발언을 다시 분석함")
+        assert analyzer.analyze_pending(db) == 0
+
+        root = db.query(TrumpStatement).filter_by(original_text=TARIFF).one()
+        db.refresh(repost)
+        assert repost.is_analyzed
+        assert repost.taco_probability == root.taco_probability
+        assert repost.keywords == root.keywords
+        assert db.query(TACOSignal).count() == 1
+        assert analyzer.filter_stats["near_duplicates"] == 1
+    finally:
+        db.close()
+
+def test_variant_queued_with_root_waits_for_root(session_factory):
+    analyzer = create_stub_analyzer()
+    calls = []
+    analyze_with_gpt = analyzer.analyze_with_gpt
+    analyzer.analyze_with_gpt = lambda text: calls.append(text) or analyze_with_gpt(text)
+    db = session_factory()
+    try:
+        # 변형이 더 최근 기사라 대표보다 먼저 꺼내짐
+        now = datetime.utcnow()
+        variant = f"{TARIFF.upper()}!!"
+        analyzer.save_to_db([article(TARIFF, f"{(now - timedelta(days=1)).isoformat()}Z"),
+                             article(variant, f"{now.isoformat()}Z")], db)
+
+        assert calls == [TARIFF]
+        assert db.query(TACOSignal).count() == 1
+        copy = db.query(TrumpStatement).filter_by(original_text=variant).one()
+        assert copy.is_analyzed
+        assert analyzer.filter_stats["near_duplicates"] == 1
+        assert len(analyzer.queue) == 0
+    finally:
+        db.close()
@@ -33,8 +33,8 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def run_script(script_path, description):
-    """스크립트를 실행하고 결과를 로깅합니다."""
+def run_script(script_path, description, module=None):
+    """스크립트(또는 module이 주어지면 backend 기준 python -m 모듈)를 실행하고 결과를 로깅합니다."""
     try:
         logger.info(f"시작: {description}")
         
@@ -43,9 +43,14 @@ def run_script(script_path, description):
         if not venv_python.exists():
             venv_python = sys.executable  # 가상환경이 없으면 시스템 Python 사용
         
+        if module:
+            command, cwd = [str(venv_python), "-m", module], backend_dir
+        else:
+            command, cwd = [str(venv_python), str(script_path)], app_dir
+        
         result = subprocess.run(
-            [str(venv_python), str(script_path)],
-            cwd=str(app_dir),
+            command,
+            cwd=str(cwd),
             capture_output=True,
             text=True,
             encoding='utf-8'
@@ -75,16 +80,20 @@ def main():
     # 실행할 스크립트들 (순서 중요)
     scripts = [
         (app_dir / "crowling.py", "트럼프 SNS 크롤링"),
+        (app_dir / "ingestion.py", "다중 소스 발언 수집", "app.ingestion"),
         (app_dir / "trump_analyzer.py", "LLM 분석"),
-        (app_dir / "etf_updater.py", "ETF 데이터 업데이트")
+        (app_dir / "etf_updater.py", "ETF 데이터 업데이트"),
+        (app_dir / "price_reaction.py", "발언 가격 반응 계산", "app.price_reaction"),
+        (app_dir / "snapshot_publisher.py", "대시보드 스냅샷 발행", "app.snapshot_publisher"),
+        (app_dir / "columnar_export.py", "파케이 이력 동기화", "app.columnar_export")
     ]
     
     success_count = 0
     total_count = len(scripts)
     
-    for script_path, description in scripts:
+    for script_path, description, *module in scripts:
         if script_path.exists():
-            if run_script(script_path, description):
+            if run_script(script_path, description, *module):
                 success_count += 1
             else:
                 logger.warning(f"스크립트 실행 실패: {script_path}")